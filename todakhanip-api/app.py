@@ -1,20 +1,58 @@
-from flask import Flask, request
+from flask import Flask, Response, request, stream_with_context
 from dotenv import load_dotenv
 import os
-import requests
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from utils.product_parser import extract_product_info
-from utils.translation_manager import load_translation_data, translate_ingredients_batch
-from utils.health_analysis import get_health_analysis, get_comprehensive_health_analysis
-from prompts.api_prompts import API_MESSAGES, HTTP_STATUS_CODES, RESPONSE_KEYS
-from prompts.constants import (
-    OPENFOODFACTS_API_BASE_URL,
-    API_TIMEOUT,
-    FLASK_HOST,
-    FLASK_PORT,
-    FLASK_DEBUG,
+from utils.product_parser import (
+    extract_product_info,
+    get_ingredients_string,
+    apply_ingredient_translations,
+    parse_products_data,
 )
+from utils.translation_manager import (
+    load_translation_data,
+    load_ingredient_dictionary,
+    load_legacy_translations,
+    legacy_translations_checked,
+    translate_ingredients_batch,
+)
+from utils.health_analysis import (
+    get_health_analysis,
+    get_comprehensive_health_analysis,
+    get_health_analysis_stream,
+    get_comprehensive_health_analysis_stream,
+)
+from utils.streaming import (
+    STREAM_HEADERS,
+    select_stream_content_type,
+    format_stream_event,
+)
+from utils.mongo_client import get_mongo_health
+from utils.product_cache import get_product, get_products, is_product_cached
+from utils.metrics import METRICS_CONTENT_TYPE, render_metrics
+from utils.bulkheads import (
+    LLM_POOL,
+    MONGO_POOL,
+    OFF_POOL,
+    BulkheadFullError,
+    submit,
+)
+from utils.stage_graph import StageGraph
+from utils.api_responses import (
+    success_response,
+    invalid_json_error,
+    product_not_found_error,
+    no_valid_products_error,
+    unexpected_error,
+    unexpected_error_event,
+    health_profile_request_error,
+    comprehensive_request_error,
+    request_barcodes,
+    product_lookup_error,
+    comprehensive_summary,
+    comprehensive_response,
+    mongo_health_response,
+    cache_health_response,
+)
+from prompts.constants import FLASK_HOST, FLASK_PORT, FLASK_DEBUG
 
 # Load environment variables
 load_dotenv()
@@ -24,9 +62,75 @@ app = Flask(__name__)
 # Flask 앱 시작 시 번역 데이터 미리 로드
 print("🔄 번역 데이터 로드 중...")
 load_translation_data()
+load_ingredient_dictionary()
 print("✅ Flask 앱 초기화 완료")
 
 
+def run_ingredients_translation(barcode, product_info, load_legacy=None):
+    """원료 텍스트를 모아 번역"""
+    ingredients_string = get_ingredients_string(product_info)
+    if ingredients_string:
+        return translate_ingredients_batch(barcode, ingredients_string, load_legacy)
+    return {}
+
+
+def build_barcode_analysis_graph(barcode, health_profile):
+    """
+    POST /barcode 처리 단계 그래프
+
+    제품 조회(OFF)와 기존 번역 문서 조회(MongoDB)를 동시에 시작하고, 제품 정보가
+    추출되는 즉시 건강 분석과 원료 번역을 시작한다. 번역은 원료 사전에 없는 원료가
+    있을 때만 미리 시작해 둔 MongoDB 조회 결과를 기다린다.
+
+    제품이 메모리 캐시에 있거나(가릴 OFF 지연이 없음) 최근에 기존 번역 문서를 조회한
+    바코드는 미리 조회하지 않고, 필요하면 번역 단계가 직접 조회한다.
+    """
+    prefetch = not is_product_cached(barcode) and not legacy_translations_checked(
+        barcode
+    )
+
+    def translate(product_info, load_probe=None):
+        load_legacy = None
+        if load_probe is not None:
+
+            def load_legacy():
+                try:
+                    return load_probe()
+                except BulkheadFullError:
+                    # MongoDB 풀이 가득 차 미리 조회하지 못했으면 직접 조회
+                    return load_legacy_translations(barcode)
+
+        return run_ingredients_translation(barcode, product_info, load_legacy)
+
+    graph = StageGraph()
+    graph.add("product", lambda: get_product(barcode), pool=OFF_POOL)
+    if prefetch:
+        graph.add(
+            "translation_probe",
+            lambda: load_legacy_translations(barcode),
+            pool=MONGO_POOL,
+        )
+    graph.add(
+        "product_info",
+        lambda product: extract_product_info(product, barcode),
+        deps=("product",),
+    )
+    graph.add(
+        "health_analysis",
+        lambda product_info: get_health_analysis(product_info, health_profile),
+        deps=("product_info",),
+        pool=LLM_POOL,
+    )
+    graph.add(
+        "translations",
+        translate,
+        deps=("product_info",),
+        lazy_deps=("translation_probe",) if prefetch else (),
+        pool=LLM_POOL,
+    )
+    return graph
+
+
 @app.route("/barcode/<barcode>", methods=["GET", "POST"])
 def get_barcode_info(barcode):
     """
@@ -35,121 +139,39 @@ def get_barcode_info(barcode):
     POST: 바코드 정보 조회 + 건강 프로필 분석
     """
     try:
-        # OpenFoodFacts API 호출
-        url = f"{OPENFOODFACTS_API_BASE_URL}/{barcode}.json"
-        response = requests.get(url, timeout=API_TIMEOUT)
-
-        if response.status_code == 200:
-            data = response.json()
-            # 제품이 존재하는지 확인
-            if data.get("status") == 1 and data.get("product"):
-                product = data["product"]
-                # 제품 정보 추출
-                product_info = extract_product_info(product, barcode)
-
-                # POST 요청인 경우 건강 프로필 분석과 원료 번역을 병렬로 수행
-                if request.method == "POST":
-                    if not request.json:
-                        return {
-                            RESPONSE_KEYS["SUCCESS"]: False,
-                            RESPONSE_KEYS["ERROR"]: API_MESSAGES["INVALID_JSON"],
-                        }, HTTP_STATUS_CODES["BAD_REQUEST"]
-
-                    health_profile = request.json.get("health_profile")
-                    if not health_profile:
-                        return {
-                            RESPONSE_KEYS["SUCCESS"]: False,
-                            RESPONSE_KEYS["ERROR"]: "건강 프로필 정보가 필요합니다.",
-                        }, HTTP_STATUS_CODES["BAD_REQUEST"]
-
-                    # 병렬 처리를 위한 함수들
-                    def run_health_analysis():
-                        return get_health_analysis(product_info, health_profile)
-
-                    def run_ingredients_translation():
-                        barcode = product_info.get("code", "")
-                        ingredients = product_info.get("ingredients", [])
-
-                        if ingredients and barcode:
-                            # 원료 텍스트를 쉼표로 구분된 문자열로 변환
-                            ingredients_texts = []
-                            for ingredient in ingredients:
-                                if (
-                                    isinstance(ingredient, dict)
-                                    and "text" in ingredient
-                                ):
-                                    ingredients_texts.append(ingredient["text"])
-                                elif isinstance(ingredient, str):
-                                    ingredients_texts.append(ingredient)
-
-                            if ingredients_texts:
-                                ingredients_string = ",".join(ingredients_texts)
-                                return translate_ingredients_batch(
-                                    barcode, ingredients_string
-                                )
-                        return {}
-
-                    # ThreadPoolExecutor를 사용하여 병렬 처리
-                    with ThreadPoolExecutor(max_workers=2) as executor:
-                        # 두 작업을 동시에 실행
-                        health_future = executor.submit(run_health_analysis)
-                        translation_future = executor.submit(
-                            run_ingredients_translation
-                        )
-
-                        # 결과 수집
-                        health_analysis = health_future.result()
-                        translations = translation_future.result()
-
-                    # 분석 결과를 product_info에 추가
-                    product_info["health_analysis"] = health_analysis
-
-                    # 번역 결과로 ingredients.text를 대체
-                    if translations and product_info.get("ingredients"):
-                        for ingredient in product_info["ingredients"]:
-                            if isinstance(ingredient, dict) and "text" in ingredient:
-                                original_text = ingredient["text"]
-                                if original_text in translations:
-                                    ingredient["text"] = translations[original_text]
-
-                print(product_info)
-
-                return {
-                    RESPONSE_KEYS["SUCCESS"]: True,
-                    RESPONSE_KEYS["DATA"]: product_info,
-                }
-            else:
-                return {
-                    RESPONSE_KEYS["SUCCESS"]: False,
-                    RESPONSE_KEYS["ERROR"]: API_MESSAGES["PRODUCT_NOT_FOUND"],
-                }, HTTP_STATUS_CODES["NOT_FOUND"]
+        # POST 요청인 경우 단계 그래프로 조회, 분석, 번역을 겹쳐서 수행
+        if request.method == "POST":
+            request_json = request.get_json(silent=True)
+            error = health_profile_request_error(request_json)
+            if error:
+                return error
+
+            # 풀이 가득 차면 BulkheadFullError (503)
+            run = build_barcode_analysis_graph(
+                barcode, request_json["health_profile"]
+            ).run()
+            product_info = run.results["product_info"]
+            # 임계 경로 단계별 시간을 응답 헤더로 전달
+            headers = {"Server-Timing": run.server_timing()}
+            if product_info:
+                # 분석 결과를 product_info에 추가
+                product_info["health_analysis"] = run.results["health_analysis"]
+
+                # 번역 결과로 ingredients.text를 대체
+                apply_ingredient_translations(product_info, run.results["translations"])
         else:
-            return {
-                RESPONSE_KEYS["SUCCESS"]: False,
-                RESPONSE_KEYS["ERROR"]: API_MESSAGES["API_REQUEST_FAILED"].format(
-                    status_code=response.status_code
-                ),
-            }, response.status_code
-
-    except requests.exceptions.RequestException as e:
-        return {
-            RESPONSE_KEYS["SUCCESS"]: False,
-            RESPONSE_KEYS["ERROR"]: API_MESSAGES["REQUEST_ERROR"].format(error=str(e)),
-        }, HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"]
-    except json.JSONDecodeError as e:
-        return {
-            RESPONSE_KEYS["SUCCESS"]: False,
-            RESPONSE_KEYS["ERROR"]: API_MESSAGES["JSON_DECODE_ERROR"].format(
-                error=str(e)
-            ),
-        }, HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"]
+            # 제품 캐시를 거쳐 OpenFoodFacts 제품 데이터 조회
+            product = get_product(barcode)
+            product_info = extract_product_info(product, barcode) if product else None
+            headers = {}
+
+        # 제품이 존재하는지 확인
+        if product_info:
+            return success_response(product_info), 200, headers
+        return (*product_not_found_error(), headers)
+
     except Exception as e:
-        return {
-            RESPONSE_KEYS["SUCCESS"]: False,
-            RESPONSE_KEYS["ERROR"]: API_MESSAGES["UNEXPECTED_ERROR"].format(
-                error=str(e)
-            ),
-        }, HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"]
+        return product_lookup_error(e)
 
 
 @app.route("/comprehensive-analysis", methods=["POST"])
@@ -162,114 +184,228 @@ def comprehensive_health_analysis():
     - health_profile: 건강 프로필 정보 (필수)
     """
     try:
-        if not request.json:
-            return {
-                RESPONSE_KEYS["SUCCESS"]: False,
-                RESPONSE_KEYS["ERROR"]: API_MESSAGES["INVALID_JSON"],
-            }, HTTP_STATUS_CODES["BAD_REQUEST"]
+        data = request.get_json(silent=True)
+        if not data:
+            return invalid_json_error()
 
-        data = request.json
         products_data = data.get("products_data", [])
         health_profile = data.get("health_profile")
 
-        if not products_data:
-            return {
-                RESPONSE_KEYS["SUCCESS"]: False,
-                RESPONSE_KEYS["ERROR"]: "제품 데이터가 필요합니다.",
-            }, HTTP_STATUS_CODES["BAD_REQUEST"]
+        error = comprehensive_request_error(products_data, health_profile)
+        if error:
+            return error
 
-        if not health_profile:
-            return {
-                RESPONSE_KEYS["SUCCESS"]: False,
-                RESPONSE_KEYS["ERROR"]: "건강 프로필 정보가 필요합니다.",
-            }, HTTP_STATUS_CODES["BAD_REQUEST"]
+        # 제공된 제품 데이터를 직접 사용
+        products_info, failed_products = parse_products_data(products_data)
 
-        # 제품 개수 제한 (성능 고려)
-        if len(products_data) > 10:
-            return {
-                RESPONSE_KEYS["SUCCESS"]: False,
-                RESPONSE_KEYS["ERROR"]: "한 번에 최대 10개 제품까지 분석 가능합니다.",
-            }, HTTP_STATUS_CODES["BAD_REQUEST"]
+        if not products_info:
+            return no_valid_products_error()
 
-        products_info = []
-        failed_products = []
+        # 종합 건강 분석 수행
+        comprehensive_analysis = get_comprehensive_health_analysis(
+            products_info, health_profile
+        )
+
+        return comprehensive_response(
+            comprehensive_analysis, products_info, len(products_data), failed_products
+        )
+
+    except Exception as e:
+        return unexpected_error(e)
 
-        # 제공된 제품 데이터를 직접 사용
-        for product_data in products_data:
-            try:
-                # 바코드 필드 확인 (code 또는 barcode)
-                barcode = product_data.get("code") or product_data.get("barcode")
-                if not barcode:
-                    print(f"제품 데이터에 바코드가 없습니다: {product_data}")
-                    continue
-
-                # 영양 정보 필드 확인 (nutriments 또는 nutrition_data)
-                nutrition_data = product_data.get("nutriments") or product_data.get(
-                    "nutrition_data", {}
-                )
-
-                # 제품 정보 추출 및 정리
-                product_info = {
-                    "code": barcode,
-                    "product_name": product_data.get("product_name", ""),
-                    "brands": product_data.get("brands", ""),
-                    "nutriments": nutrition_data,
-                    "allergens_tags": product_data.get("allergens_tags", []),
-                    "food_groups_tags": product_data.get("food_groups_tags", []),
-                    "nutriscore_grade": product_data.get("nutriscore_grade", ""),
-                    "nutrient_levels": product_data.get("nutrient_levels", {}),
-                    "ingredients": product_data.get("ingredients", []),
-                    "serving_size": product_data.get("serving_size", ""),
-                    "quantity": product_data.get("quantity", ""),
-                    "image_url": product_data.get("image_url", ""),
-                }
-                products_info.append(product_info)
-
-            except Exception as e:
-                print(f"제품 데이터 처리 중 오류: {str(e)}")
-                barcode = product_data.get("code") or product_data.get("barcode")
-                if barcode:
-                    failed_products.append(barcode)
+
+@app.route("/comprehensive-analysis/barcodes", methods=["POST"])
+def comprehensive_barcodes_analysis():
+    """
+    바코드 목록과 건강 프로필을 받아 서버에서 제품 정보를 조회한 뒤 종합 건강 분석을 수행하는 API
+
+    제품 조회는 동시에 수행하며, 조회에 실패한 바코드는 failed_products로 알려준다.
+
+    요청 형식:
+    - barcodes: 바코드 배열 (필수)
+    - health_profile: 건강 프로필 정보 (필수)
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return invalid_json_error()
+
+        barcodes = request_barcodes(data)
+        health_profile = data.get("health_profile")
+
+        error = comprehensive_request_error(barcodes, health_profile)
+        if error:
+            return error
+
+        # 모든 제품을 동시에 조회 (동시 조회 수 제한)
+        products, failed_products = get_products(barcodes)
+        products_info = [
+            extract_product_info(product, barcode)
+            for barcode, product in products.items()
+        ]
 
         if not products_info:
-            return {
-                RESPONSE_KEYS["SUCCESS"]: False,
-                RESPONSE_KEYS["ERROR"]: "유효한 제품 정보를 찾을 수 없습니다.",
-            }, HTTP_STATUS_CODES["NOT_FOUND"]
+            return no_valid_products_error(failed_products=failed_products)
 
         # 종합 건강 분석 수행
         comprehensive_analysis = get_comprehensive_health_analysis(
             products_info, health_profile
         )
 
-        # 응답 데이터 구성
-        response_data = {
-            "comprehensive_analysis": comprehensive_analysis,
-            "analyzed_products": len(products_info),
-            "total_requested": len(products_data),
-            "failed_products": failed_products,
-            "products_summary": [
-                {
-                    "barcode": product.get("code"),
-                    "name": product.get("product_name"),
-                    "brands": product.get("brands"),
-                }
-                for product in products_info
-            ],
-        }
-
-        return {
-            RESPONSE_KEYS["SUCCESS"]: True,
-            RESPONSE_KEYS["DATA"]: response_data,
-        }
+        return comprehensive_response(
+            comprehensive_analysis, products_info, len(barcodes), failed_products
+        )
+
+    except Exception as e:
+        return unexpected_error(e)
+
+
+@app.route("/barcode/<barcode>/stream", methods=["POST"])
+def stream_barcode_analysis(barcode):
+    """
+    바코드 제품 정보를 먼저 보내고 건강 분석 결과를 생성되는 대로 스트리밍하는 API
+
+    이벤트 순서: product → token(반복) → translations → done
+    분석이 실패하면 token 뒤에 error 이벤트를 보내고 done 없이 종료
+    Accept: application/octet-stream 이면 줄 단위 JSON, 그 외에는 SSE로 응답
+    """
+    try:
+        request_json = request.get_json(silent=True)
+        error = health_profile_request_error(request_json)
+        if error:
+            return error
+        health_profile = request_json["health_profile"]
+
+        product = get_product(barcode)
+        if not product:
+            return product_not_found_error()
+        product_info = extract_product_info(product, barcode)
+        # 응답 헤더를 보내기 전에 번역을 LLM 풀에 넣어 풀이 가득 차면 503으로 응답
+        translation_future = submit(
+            LLM_POOL, run_ingredients_translation, barcode, product_info
+        )
+    except Exception as e:
+        return product_lookup_error(e)
+
+    content_type = select_stream_content_type(request.headers.get("Accept"))
+
+    def generate():
+        try:
+            # 제품 정보를 LLM 토큰보다 먼저 전송
+            yield format_stream_event("product", product_info, content_type)
+
+            chunks = []
+            for event, data in get_health_analysis_stream(product_info, health_profile):
+                yield format_stream_event(event, data, content_type)
+                if event == "error":
+                    # 분석이 실패하면 done 없이 종료
+                    translation_future.cancel()
+                    return
+                chunks.append(data["text"])
+
+            translations = translation_future.result()
+
+            apply_ingredient_translations(product_info, translations)
+            yield format_stream_event(
+                "translations",
+                {"ingredients": product_info["ingredients"]},
+                content_type,
+            )
+            yield format_stream_event(
+                "done", {"health_analysis": "".join(chunks)}, content_type
+            )
+        except Exception as e:
+            translation_future.cancel()
+            yield format_stream_event(*unexpected_error_event(e), content_type)
+
+    return Response(
+        stream_with_context(generate()),
+        content_type=content_type,
+        headers=STREAM_HEADERS,
+    )
+
+
+@app.route("/comprehensive-analysis/stream", methods=["POST"])
+def stream_comprehensive_analysis():
+    """
+    종합 건강 분석 결과를 생성되는 대로 스트리밍하는 API
+
+    이벤트 순서: summary → token(반복) → done (실패하면 done 대신 error)
+    """
+    try:
+        data = request.get_json(silent=True)
+        if not data:
+            return invalid_json_error()
+
+        products_data = data.get("products_data", [])
+        health_profile = data.get("health_profile")
 
+        error = comprehensive_request_error(products_data, health_profile)
+        if error:
+            return error
+
+        products_info, failed_products = parse_products_data(products_data)
+        if not products_info:
+            return no_valid_products_error()
     except Exception as e:
-        return {
-            RESPONSE_KEYS["SUCCESS"]: False,
-            RESPONSE_KEYS["ERROR"]: API_MESSAGES["UNEXPECTED_ERROR"].format(
-                error=str(e)
-            ),
-        }, HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"]
+        return unexpected_error(e)
+
+    content_type = select_stream_content_type(request.headers.get("Accept"))
+
+    def generate():
+        try:
+            yield format_stream_event(
+                "summary",
+                comprehensive_summary(
+                    products_info, len(products_data), failed_products
+                ),
+                content_type,
+            )
+
+            chunks = []
+            for event, data in get_comprehensive_health_analysis_stream(
+                products_info, health_profile
+            ):
+                yield format_stream_event(event, data, content_type)
+                if event == "error":
+                    return
+                chunks.append(data["text"])
+
+            yield format_stream_event(
+                "done", {"comprehensive_analysis": "".join(chunks)}, content_type
+            )
+        except Exception as e:
+            yield format_stream_event(*unexpected_error_event(e), content_type)
+
+    return Response(
+        stream_with_context(generate()),
+        content_type=content_type,
+        headers=STREAM_HEADERS,
+    )
+
+
+@app.route("/health/mongo", methods=["GET"])
+def mongo_health():
+    """
+    MongoDB 연결 상태와 커넥션 풀 지표를 확인하는 API
+    """
+    return mongo_health_response(get_mongo_health())
+
+
+@app.route("/health/cache", methods=["GET"])
+def cache_health():
+    """
+    제품 캐시, 건강 분석 캐시, 원료 사전의 적중률 통계와 스레드 풀 상태를 확인하는 API
+    """
+    return cache_health_response()
+
+
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """
+    단계별 처리 시간 히스토그램을 Prometheus 텍스트 형식으로 제공하는 API
+    """
+    return Response(render_metrics(), mimetype=METRICS_CONTENT_TYPE)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,362 @@
+"""
+비동기(ASGI) 서빙 모드
+
+app.py와 같은 라우트(/barcode/<barcode>, /comprehensive-analysis,
+/comprehensive-analysis/barcodes, 스트리밍 API, /health/mongo, /health/cache, /metrics)를
+utils/api_responses의 같은 요청 검증과 응답 형식으로 제공하되,
+OpenFoodFacts 조회(httpx), OpenAI 호출(AsyncOpenAI), MongoDB 조회(워커 스레드)를
+모두 asyncio 위에서 처리하여 한 프로세스가 수백 개의 LLM 대기 요청을 동시에 유지한다.
+
+실행:
+    hypercorn asgi:app --bind 0.0.0.0:6318
+"""
+
+import asyncio
+from quart import Quart, request
+from dotenv import load_dotenv
+from utils.product_parser import (
+    extract_product_info,
+    get_ingredients_string,
+    apply_ingredient_translations,
+    parse_products_data,
+)
+from utils.translation_manager import (
+    load_translation_data,
+    load_ingredient_dictionary,
+    translate_ingredients_batch_async,
+)
+from utils.health_analysis import (
+    get_health_analysis_async,
+    get_comprehensive_health_analysis_async,
+    get_health_analysis_stream_async,
+    get_comprehensive_health_analysis_stream_async,
+)
+from utils.streaming import (
+    STREAM_HEADERS,
+    select_stream_content_type,
+    format_stream_event,
+)
+from utils.mongo_client import get_mongo_health
+from utils.openfoodfacts_client import close_async_client
+from utils.product_cache import get_product_async, get_products_async
+from utils.metrics import METRICS_CONTENT_TYPE, render_metrics
+from utils.bulkheads import MONGO_POOL, BulkheadFullError, run_async
+from utils.api_responses import (
+    success_response,
+    invalid_json_error,
+    product_not_found_error,
+    no_valid_products_error,
+    unexpected_error,
+    unexpected_error_event,
+    health_profile_request_error,
+    comprehensive_request_error,
+    request_barcodes,
+    product_lookup_error,
+    comprehensive_summary,
+    comprehensive_response,
+    mongo_health_response,
+    cache_health_response,
+)
+from prompts.constants import FLASK_HOST, FLASK_PORT, FLASK_DEBUG
+
+# Load environment variables
+load_dotenv()
+
+app = Quart(__name__)
+
+# 앱 시작 시 번역 데이터 미리 로드
+print("🔄 번역 데이터 로드 중...")
+load_translation_data()
+load_ingredient_dictionary()
+print("✅ ASGI 앱 초기화 완료")
+
+
+@app.after_serving
+async def shutdown():
+    """서버 종료 시 비동기 HTTP 클라이언트 정리"""
+    await close_async_client()
+
+
+async def run_ingredients_translation(barcode, product_info):
+    """원료 텍스트를 모아 비동기로 번역"""
+    ingredients_string = get_ingredients_string(product_info)
+    if ingredients_string:
+        return await translate_ingredients_batch_async(barcode, ingredients_string)
+    return {}
+
+
+@app.route("/barcode/<barcode>", methods=["GET", "POST"])
+async def get_barcode_info(barcode):
+    """
+    바코드로 제품 정보를 조회하고 건강 프로필과 함께 분석하는 API (비동기)
+    GET: 바코드 정보만 조회
+    POST: 바코드 정보 조회 + 건강 프로필 분석
+    """
+    try:
+        if request.method == "POST":
+            request_json = await request.get_json(silent=True)
+            error = health_profile_request_error(request_json)
+            if error:
+                return error
+
+        # 제품 캐시를 거쳐 OpenFoodFacts 제품 데이터 조회
+        product = await get_product_async(barcode)
+
+        # 제품이 존재하는지 확인
+        if not product:
+            return product_not_found_error()
+
+        # 제품 정보 추출
+        product_info = extract_product_info(product, barcode)
+
+        # POST 요청인 경우 건강 프로필 분석과 원료 번역을 동시에 수행
+        if request.method == "POST":
+            health_analysis, translations = await asyncio.gather(
+                get_health_analysis_async(
+                    product_info, request_json["health_profile"]
+                ),
+                run_ingredients_translation(barcode, product_info),
+            )
+
+            # 분석 결과를 product_info에 추가
+            product_info["health_analysis"] = health_analysis
+
+            # 번역 결과로 ingredients.text를 대체
+            apply_ingredient_translations(product_info, translations)
+
+        return success_response(product_info)
+
+    except Exception as e:
+        return product_lookup_error(e)
+
+
+@app.route("/comprehensive-analysis", methods=["POST"])
+async def comprehensive_health_analysis():
+    """
+    제품 정보와 건강 프로필을 받아 종합적인 건강 분석을 수행하는 API (비동기)
+
+    요청 형식:
+    - products_data: 제품 정보 배열 (필수)
+    - health_profile: 건강 프로필 정보 (필수)
+    """
+    try:
+        data = await request.get_json(silent=True)
+        if not data:
+            return invalid_json_error()
+
+        products_data = data.get("products_data", [])
+        health_profile = data.get("health_profile")
+
+        error = comprehensive_request_error(products_data, health_profile)
+        if error:
+            return error
+
+        products_info, failed_products = parse_products_data(products_data)
+
+        if not products_info:
+            return no_valid_products_error()
+
+        # 종합 건강 분석 수행
+        comprehensive_analysis = await get_comprehensive_health_analysis_async(
+            products_info, health_profile
+        )
+
+        return comprehensive_response(
+            comprehensive_analysis, products_info, len(products_data), failed_products
+        )
+
+    except Exception as e:
+        return unexpected_error(e)
+
+
+@app.route("/comprehensive-analysis/barcodes", methods=["POST"])
+async def comprehensive_barcodes_analysis():
+    """
+    바코드 목록과 건강 프로필을 받아 서버에서 제품 정보를 조회한 뒤 종합 건강 분석을 수행하는 API (비동기)
+
+    제품 조회는 동시에 수행하며, 조회에 실패한 바코드는 failed_products로 알려준다.
+
+    요청 형식:
+    - barcodes: 바코드 배열 (필수)
+    - health_profile: 건강 프로필 정보 (필수)
+    """
+    try:
+        data = await request.get_json(silent=True)
+        if not data:
+            return invalid_json_error()
+
+        barcodes = request_barcodes(data)
+        health_profile = data.get("health_profile")
+
+        error = comprehensive_request_error(barcodes, health_profile)
+        if error:
+            return error
+
+        # 모든 제품을 동시에 조회 (동시 조회 수 제한)
+        products, failed_products = await get_products_async(barcodes)
+        products_info = [
+            extract_product_info(product, barcode)
+            for barcode, product in products.items()
+        ]
+
+        if not products_info:
+            return no_valid_products_error(failed_products=failed_products)
+
+        # 종합 건강 분석 수행
+        comprehensive_analysis = await get_comprehensive_health_analysis_async(
+            products_info, health_profile
+        )
+
+        return comprehensive_response(
+            comprehensive_analysis, products_info, len(barcodes), failed_products
+        )
+
+    except Exception as e:
+        return unexpected_error(e)
+
+
+@app.route("/barcode/<barcode>/stream", methods=["POST"])
+async def stream_barcode_analysis(barcode):
+    """
+    바코드 제품 정보를 먼저 보내고 건강 분석 결과를 생성되는 대로 스트리밍하는 API (비동기)
+
+    이벤트 순서: product → token(반복) → translations → done
+    분석이 실패하면 token 뒤에 error 이벤트를 보내고 done 없이 종료
+    """
+    try:
+        request_json = await request.get_json(silent=True)
+        error = health_profile_request_error(request_json)
+        if error:
+            return error
+        health_profile = request_json["health_profile"]
+
+        product = await get_product_async(barcode)
+        if not product:
+            return product_not_found_error()
+        product_info = extract_product_info(product, barcode)
+    except Exception as e:
+        return product_lookup_error(e)
+
+    content_type = select_stream_content_type(request.headers.get("Accept"))
+
+    async def generate():
+        # 제품 정보를 LLM 토큰보다 먼저 전송
+        yield format_stream_event("product", product_info, content_type)
+
+        translation_task = asyncio.create_task(
+            run_ingredients_translation(barcode, product_info)
+        )
+        try:
+            chunks = []
+            async for event, data in get_health_analysis_stream_async(
+                product_info, health_profile
+            ):
+                yield format_stream_event(event, data, content_type)
+                if event == "error":
+                    # 분석이 실패하면 done 없이 종료
+                    translation_task.cancel()
+                    return
+                chunks.append(data["text"])
+
+            apply_ingredient_translations(product_info, await translation_task)
+            yield format_stream_event(
+                "translations",
+                {"ingredients": product_info["ingredients"]},
+                content_type,
+            )
+            yield format_stream_event(
+                "done", {"health_analysis": "".join(chunks)}, content_type
+            )
+        except Exception as e:
+            translation_task.cancel()
+            yield format_stream_event(*unexpected_error_event(e), content_type)
+
+    return generate(), 200, {"Content-Type": content_type, **STREAM_HEADERS}
+
+
+@app.route("/comprehensive-analysis/stream", methods=["POST"])
+async def stream_comprehensive_analysis():
+    """
+    종합 건강 분석 결과를 생성되는 대로 스트리밍하는 API (비동기)
+
+    이벤트 순서: summary → token(반복) → done (실패하면 done 대신 error)
+    """
+    try:
+        data = await request.get_json(silent=True)
+        if not data:
+            return invalid_json_error()
+
+        products_data = data.get("products_data", [])
+        health_profile = data.get("health_profile")
+
+        error = comprehensive_request_error(products_data, health_profile)
+        if error:
+            return error
+
+        products_info, failed_products = parse_products_data(products_data)
+        if not products_info:
+            return no_valid_products_error()
+    except Exception as e:
+        return unexpected_error(e)
+
+    content_type = select_stream_content_type(request.headers.get("Accept"))
+
+    async def generate():
+        try:
+            yield format_stream_event(
+                "summary",
+                comprehensive_summary(
+                    products_info, len(products_data), failed_products
+                ),
+                content_type,
+            )
+
+            chunks = []
+            async for event, data in get_comprehensive_health_analysis_stream_async(
+                products_info, health_profile
+            ):
+                yield format_stream_event(event, data, content_type)
+                if event == "error":
+                    return
+                chunks.append(data["text"])
+
+            yield format_stream_event(
+                "done", {"comprehensive_analysis": "".join(chunks)}, content_type
+            )
+        except Exception as e:
+            yield format_stream_event(*unexpected_error_event(e), content_type)
+
+    return generate(), 200, {"Content-Type": content_type, **STREAM_HEADERS}
+
+
+@app.route("/health/mongo", methods=["GET"])
+async def mongo_health():
+    """
+    MongoDB 연결 상태와 커넥션 풀 지표를 확인하는 API (비동기)
+    """
+    try:
+        # ping이 이벤트 루프를 막지 않도록 MongoDB 풀에서 실행
+        health = await run_async(MONGO_POOL, get_mongo_health)
+    except BulkheadFullError as e:
+        return product_lookup_error(e)
+    return mongo_health_response(health)
+
+
+@app.route("/health/cache", methods=["GET"])
+async def cache_health():
+    """
+    제품 캐시, 건강 분석 캐시, 원료 사전의 적중률 통계와 스레드 풀 상태를 확인하는 API (비동기)
+    """
+    return cache_health_response()
+
+
+@app.route("/metrics", methods=["GET"])
+async def metrics():
+    """
+    단계별 처리 시간 히스토그램을 Prometheus 텍스트 형식으로 제공하는 API
+    """
+    return render_metrics(), 200, {"Content-Type": METRICS_CONTENT_TYPE}
+
+
+if __name__ == "__main__":
+    app.run(debug=FLASK_DEBUG, host=FLASK_HOST, port=FLASK_PORT)
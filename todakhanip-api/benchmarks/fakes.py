@@ -0,0 +1,436 @@
+"""
+부하 테스트/벤치마크용 프로세스 내 대역 (OpenFoodFacts, OpenAI, MongoDB)
+
+- OpenFoodFacts: test/fake_openfoodfacts_server.py의 스텁 서버에 샘플 제품을 복제한 카탈로그를 넣어 재생
+- OpenAI: 지연 시간과 토큰 스트림 속도를 조절할 수 있는 chat.completions 대역 (동기/비동기)
+- MongoDB: 앱이 사용하는 컬렉션 메서드만 구현한 메모리 컬렉션
+
+install_fakes()는 앱 모듈(app, asgi)을 임포트하기 전에 호출해야 원료 사전 로드도 대역을 사용한다.
+"""
+
+import asyncio
+import copy
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# 상위 디렉토리와 test 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, "test"))
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from fake_openfoodfacts_server import FakeOpenFoodFactsServer, load_sample_products
+from utils import (
+    analysis_cache,
+    health_analysis,
+    openfoodfacts_client,
+    product_cache,
+    translation_manager,
+)
+from utils.translation_output import parse_numbered_items
+
+# 분석 응답에 반복해서 쓰는 문장 (4글자를 1토큰으로 계산)
+ANALYSIS_SENTENCE = "당류와 포화지방 함량이 높아 하루 섭취량을 줄이는 것이 좋습니다. "
+
+
+def build_catalog(size):
+    """
+    샘플 제품 3개를 복제해 바코드가 다른 제품 size개의 카탈로그 생성
+
+    Returns:
+        dict: {바코드: OFF 응답 JSON} (샘플 원본 바코드 포함)
+    """
+    samples = load_sample_products()
+    catalog = dict(samples)
+    templates = list(samples.values())
+    for index in range(max(0, size - len(samples))):
+        template = templates[index % len(templates)]
+        code = f"88{index:011d}"
+        catalog[code] = dict(
+            template,
+            code=code,
+            product=dict(
+                template["product"],
+                code=code,
+                product_name=f"{template['product'].get('product_name', '')} #{index}",
+            ),
+        )
+    return catalog
+
+
+# ---------------------------------------------------------------------------
+# MongoDB
+# ---------------------------------------------------------------------------
+
+
+def _matches(doc, query):
+    """find/delete 필터 중 앱이 쓰는 형태(동등, $in, $gt)만 지원"""
+    for field, condition in query.items():
+        value = doc.get(field)
+        if isinstance(condition, dict):
+            if "$in" in condition and value not in condition["$in"]:
+                return False
+            if "$gt" in condition and not (value is not None and value > condition["$gt"]):
+                return False
+        elif value != condition:
+            return False
+    return True
+
+
+class FakeCursor:
+    """find 결과 (sort, limit, 반복만 지원)"""
+
+    def __init__(self, docs):
+        self._docs = docs
+
+    def sort(self, field, direction=1):
+        self._docs.sort(key=lambda doc: doc.get(field), reverse=direction < 0)
+        return self
+
+    def limit(self, count):
+        self._docs = self._docs[:count]
+        return self
+
+    def __iter__(self):
+        return iter(self._docs)
+
+
+class FakeCollection:
+    """
+    메모리 MongoDB 컬렉션
+
+    Args:
+        latency (float): 조회/저장 한 번마다 더하는 왕복 지연 시간(초)
+    """
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.operations = 0
+        self._docs = {}
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._lock:
+            self.operations += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def create_index(self, *args, **kwargs):
+        return None
+
+    def find_one(self, query, projection=None):
+        self._round_trip()
+        with self._lock:
+            if "_id" in query and not isinstance(query["_id"], dict):
+                doc = self._docs.get(query["_id"])
+                candidates = [doc] if doc is not None else []
+            else:
+                candidates = list(self._docs.values())
+            for doc in candidates:
+                if _matches(doc, query):
+                    return copy.deepcopy(doc)
+        return None
+
+    def find(self, query=None, projection=None):
+        self._round_trip()
+        with self._lock:
+            docs = [
+                copy.deepcopy(doc)
+                for doc in self._docs.values()
+                if _matches(doc, query or {})
+            ]
+        return FakeCursor(docs)
+
+    def replace_one(self, query, document, upsert=False):
+        self._round_trip()
+        with self._lock:
+            if upsert or query["_id"] in self._docs:
+                self._docs[query["_id"]] = copy.deepcopy(document)
+
+    def bulk_write(self, requests, ordered=True):
+        """UpdateOne($setOnInsert, upsert=True) 목록만 지원"""
+        self._round_trip()
+        with self._lock:
+            for request in requests:
+                # pymongo UpdateOne은 필터/갱신 내용을 공개 속성으로 노출하지 않음
+                key = request._filter["_id"]
+                if key not in self._docs and request._upsert:
+                    self._docs[key] = {
+                        "_id": key,
+                        **copy.deepcopy(request._doc.get("$setOnInsert", {})),
+                    }
+
+    def delete_one(self, query):
+        self._round_trip()
+        with self._lock:
+            self._docs.pop(query["_id"], None)
+
+    def delete_many(self, query):
+        self._round_trip()
+        with self._lock:
+            for key in [k for k, doc in self._docs.items() if _matches(doc, query)]:
+                del self._docs[key]
+
+    def estimated_document_count(self):
+        with self._lock:
+            return len(self._docs)
+
+
+class FakeMongo:
+    """컬렉션 이름별 FakeCollection 모음 (get_collection 대역)"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.collections = {}
+        self._lock = threading.Lock()
+
+    def get_collection(self, collection_name):
+        with self._lock:
+            if collection_name not in self.collections:
+                self.collections[collection_name] = FakeCollection(self.latency)
+            return self.collections[collection_name]
+
+    @property
+    def operations(self):
+        return sum(c.operations for c in self.collections.values())
+
+
+# ---------------------------------------------------------------------------
+# OpenAI
+# ---------------------------------------------------------------------------
+
+
+def _message(content):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content=content), finish_reason="stop"
+            )
+        ]
+    )
+
+
+def _chunk(text, finish_reason=None):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                delta=SimpleNamespace(content=text), finish_reason=finish_reason
+            )
+        ]
+    )
+
+
+def _split_tokens(content):
+    """4글자를 1토큰으로 보고 스트림 조각으로 나눔"""
+    return [content[i : i + 4] for i in range(0, len(content), 4)]
+
+
+class FakeChatCompletions:
+    """
+    chat.completions 대역 (동기)
+
+    원료 번역 요청에는 번호별 "번역:<원문>"을, 그 밖의 요청에는 answer_tokens 길이의 분석 문장을 응답한다.
+
+    Args:
+        latency (float): 첫 토큰까지의 지연 시간(초)
+        token_interval (float): 토큰 하나를 생성하는 시간(초)
+        answer_tokens (int): 분석 응답 길이(토큰)
+    """
+
+    def __init__(self, latency=0.3, token_interval=0.0, answer_tokens=200):
+        self.latency = latency
+        self.token_interval = token_interval
+        self.answer_tokens = answer_tokens
+        self.calls = {"translation": 0, "analysis": 0}
+        self.active = 0
+        self.peak_active = 0
+        self._lock = threading.Lock()
+
+    def _answer(self, kwargs):
+        system = kwargs["messages"][0]["content"]
+        if system == translation_manager.INGREDIENT_TRANSLATION_SYSTEM_PROMPT:
+            kind = "translation"
+            items = parse_numbered_items(kwargs["messages"][-1]["content"])
+            content = json.dumps(
+                {"t": [{"i": i, "k": f"번역:{item}"} for i, item in enumerate(items, 1)]},
+                ensure_ascii=False,
+            )
+        else:
+            kind = "analysis"
+            repeat = self.answer_tokens * 4 // len(ANALYSIS_SENTENCE) + 1
+            content = (ANALYSIS_SENTENCE * repeat)[: self.answer_tokens * 4]
+        with self._lock:
+            self.calls[kind] += 1
+        return content
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+    def _stream(self, tokens):
+        self._enter()
+        try:
+            time.sleep(self.latency)
+            for token in tokens:
+                if self.token_interval:
+                    time.sleep(self.token_interval)
+                yield _chunk(token)
+            yield _chunk(None, "stop")
+        finally:
+            self._exit()
+
+    def create(self, stream=False, **kwargs):
+        tokens = _split_tokens(self._answer(kwargs))
+        if stream:
+            return self._stream(tokens)
+        self._enter()
+        try:
+            time.sleep(self.latency + self.token_interval * len(tokens))
+        finally:
+            self._exit()
+        return _message("".join(tokens))
+
+
+class FakeAsyncChatCompletions(FakeChatCompletions):
+    """chat.completions 대역 (비동기)"""
+
+    async def _astream(self, tokens):
+        self._enter()
+        try:
+            await asyncio.sleep(self.latency)
+            for token in tokens:
+                if self.token_interval:
+                    await asyncio.sleep(self.token_interval)
+                yield _chunk(token)
+            yield _chunk(None, "stop")
+        finally:
+            self._exit()
+
+    async def create(self, stream=False, **kwargs):
+        tokens = _split_tokens(self._answer(kwargs))
+        if stream:
+            return self._astream(tokens)
+        self._enter()
+        try:
+            await asyncio.sleep(self.latency + self.token_interval * len(tokens))
+        finally:
+            self._exit()
+        return _message("".join(tokens))
+
+
+# ---------------------------------------------------------------------------
+# 설치
+# ---------------------------------------------------------------------------
+
+
+class Fakes:
+    """
+    OpenFoodFacts 스텁 서버, OpenAI 대역, 메모리 MongoDB를 앱 모듈에 연결
+
+    Args:
+        catalog_size (int): OpenFoodFacts 스텁이 응답하는 제품 수
+        off_latency (float): OpenFoodFacts 응답 지연 시간(초)
+        llm_latency (float): LLM 첫 토큰까지의 지연 시간(초)
+        llm_token_interval (float): LLM 토큰 생성 간격(초)
+        llm_answer_tokens (int): 분석 응답 길이(토큰)
+        mongo_latency (float): MongoDB 왕복 지연 시간(초)
+    """
+
+    def __init__(
+        self,
+        catalog_size=1000,
+        off_latency=0.1,
+        llm_latency=0.3,
+        llm_token_interval=0.0,
+        llm_answer_tokens=200,
+        mongo_latency=0.001,
+    ):
+        self.catalog = build_catalog(catalog_size)
+        self.off = FakeOpenFoodFactsServer(products=self.catalog, latency=off_latency)
+        self.mongo = FakeMongo(mongo_latency)
+        self.completions = FakeChatCompletions(
+            llm_latency, llm_token_interval, llm_answer_tokens
+        )
+        self.async_completions = FakeAsyncChatCompletions(
+            llm_latency, llm_token_interval, llm_answer_tokens
+        )
+
+    def install(self):
+        """앱 모듈의 외부 의존성을 대역으로 교체 (stop()에서 원래대로 복원)"""
+        self._originals = [
+            (openfoodfacts_client, "OPENFOODFACTS_API_BASE_URL"),
+            (product_cache, "PRODUCT_CACHE_PERSISTENT"),
+            (analysis_cache, "ANALYSIS_CACHE_BACKEND"),
+            *(
+                (module, "get_collection")
+                for module in (product_cache, analysis_cache, translation_manager)
+            ),
+            *(
+                (module, name)
+                for module in (health_analysis, translation_manager)
+                for name in ("client", "async_client")
+            ),
+        ]
+        self._originals = [
+            (module, name, getattr(module, name)) for module, name in self._originals
+        ]
+        self.off.start()
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL = self.off.base_url
+        openfoodfacts_client.close_session()
+
+        for module in (product_cache, analysis_cache, translation_manager):
+            module.get_collection = self.mongo.get_collection
+        product_cache.PRODUCT_CACHE_PERSISTENT = True
+        product_cache.clear_product_cache()
+        analysis_cache.set_analysis_cache_backend("mongodb")
+
+        client = SimpleNamespace(chat=SimpleNamespace(completions=self.completions))
+        async_client = SimpleNamespace(
+            chat=SimpleNamespace(completions=self.async_completions)
+        )
+        for module in (health_analysis, translation_manager):
+            module.client = client
+            module.async_client = async_client
+        self.reset()
+        return self
+
+    def reset(self):
+        """시나리오 사이에 캐시와 저장소를 비움"""
+        product_cache.clear_product_cache()
+        analysis_cache.clear_analysis_cache()
+        translation_manager.clear_ingredient_dictionary()
+        self.mongo.collections.clear()
+
+    def stop(self):
+        """스텁 서버를 멈추고 교체한 의존성을 복원"""
+        self.reset()
+        self.off.stop()
+        openfoodfacts_client.close_session()
+        for module, name, value in self._originals:
+            setattr(module, name, value)
+        analysis_cache.set_analysis_cache_backend(analysis_cache.ANALYSIS_CACHE_BACKEND)
+
+    def origin_calls(self):
+        """외부 의존성 호출 수"""
+        return {
+            "openfoodfacts": self.off.request_count,
+            "llm_translation": self.completions.calls["translation"]
+            + self.async_completions.calls["translation"],
+            "llm_analysis": self.completions.calls["analysis"]
+            + self.async_completions.calls["analysis"],
+            "mongo": self.mongo.operations,
+        }
+
+
+def install_fakes(**kwargs):
+    """Fakes를 만들어 설치한 뒤 반환"""
+    return Fakes(**kwargs).install()
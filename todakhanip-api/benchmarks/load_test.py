@@ -0,0 +1,368 @@
+#!/usr/bin/env python3
+"""
+오프라인 부하 테스트 (open-loop)
+
+OpenFoodFacts, OpenAI, MongoDB를 benchmarks/fakes.py의 프로세스 내 대역으로 바꾼 뒤
+Flask 앱(app.py) 또는 ASGI 앱(asgi.py)에 정해진 도착률로 요청을 보내고,
+엔드포인트별 처리량과 p50/p95/p99 지연 시간을 출력한다.
+
+요청은 응답을 기다리지 않고 예정된 시각에 보내며(open-loop), 지연 시간은 예정 시각부터 잰다.
+서버가 밀리면 대기 시간까지 지연 시간에 포함되므로 성능 저하가 평균에 묻히지 않는다.
+각 시나리오는 제품/분석 캐시와 원료 사전을 비운 상태에서 시작한다.
+
+시나리오:
+    hot_barcode           인기 제품 몇 개를 반복 조회 (캐시 적중 경로)
+    long_tail             많은 제품을 Zipf 분포로 조회/분석, 일부는 스트리밍 (OFF/LLM/MongoDB 경로)
+    comprehensive_basket  5~40개 바코드 장바구니 종합 분석 (map-reduce 경로)
+
+실행:
+    python benchmarks/load_test.py
+    python benchmarks/load_test.py --app asgi --scenario long_tail --rate 100 --duration 20
+    python benchmarks/load_test.py --json results.json
+    python benchmarks/load_test.py --baseline results.json   # 기준보다 느려지면 종료 코드 1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(BASE_DIR)
+
+from fakes import Fakes
+
+HEALTH_PROFILES = [
+    {"name": "홍길동", "gender": "남", "birth_year": 1982, "has_hypertension": "예"},
+    {"name": "김영희", "gender": "여", "birth_year": 1990, "has_diabetes": "예"},
+    {"name": "이철수", "gender": "남", "birth_year": 1975, "has_allergies": "예"},
+]
+
+# 시나리오별 기본 도착률(요청/초)
+DEFAULT_RATES = {
+    "hot_barcode": 100.0,
+    "long_tail": 30.0,
+    "comprehensive_basket": 3.0,
+}
+# 기준 결과 대비 허용하는 p95 증가/처리량 감소 비율
+DEFAULT_MAX_REGRESSION = 0.25
+# 요청 수가 이보다 적은 엔드포인트는 회귀 판정에서 제외
+MIN_REQUESTS_FOR_COMPARISON = 20
+
+
+class Scenario:
+    """
+    요청을 만드는 부하 시나리오
+
+    next_request(rng)는 (엔드포인트 이름, HTTP 메서드, 경로, JSON 본문)을 반환한다.
+    """
+
+    def __init__(self, name, barcodes):
+        self.name = name
+        self.barcodes = barcodes
+        # Zipf(s=1.1) 누적 가중치: 앞쪽 바코드일수록 자주 조회
+        weights = [1 / (rank**1.1) for rank in range(1, len(barcodes) + 1)]
+        total = 0.0
+        self._cum_weights = []
+        for weight in weights:
+            total += weight
+            self._cum_weights.append(total)
+
+    def _zipf_barcode(self, rng):
+        return rng.choices(self.barcodes, cum_weights=self._cum_weights)[0]
+
+    def next_request(self, rng):
+        profile = rng.choice(HEALTH_PROFILES)
+        if self.name == "hot_barcode":
+            barcode = rng.choice(self.barcodes[:3])
+            if rng.random() < 0.3:
+                return "GET /barcode/<barcode>", "GET", f"/barcode/{barcode}", None
+            return (
+                "POST /barcode/<barcode>",
+                "POST",
+                f"/barcode/{barcode}",
+                {"health_profile": profile},
+            )
+
+        if self.name == "long_tail":
+            barcode = self._zipf_barcode(rng)
+            if rng.random() < 0.2:
+                return (
+                    "POST /barcode/<barcode>/stream",
+                    "POST",
+                    f"/barcode/{barcode}/stream",
+                    {"health_profile": profile},
+                )
+            return (
+                "POST /barcode/<barcode>",
+                "POST",
+                f"/barcode/{barcode}",
+                {"health_profile": profile},
+            )
+
+        basket = list({self._zipf_barcode(rng) for _ in range(rng.randint(5, 40))})
+        return (
+            "POST /comprehensive-analysis/barcodes",
+            "POST",
+            "/comprehensive-analysis/barcodes",
+            {"barcodes": basket, "health_profile": profile},
+        )
+
+
+def _schedule(rate, duration, rng):
+    """포아송 도착 시각(시작 기준 초) 목록"""
+    arrivals = []
+    at = rng.expovariate(rate)
+    while at < duration:
+        arrivals.append(at)
+        at += rng.expovariate(rate)
+    return arrivals
+
+
+class Recorder:
+    """엔드포인트별 지연 시간과 오류 수 기록"""
+
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, latency, ok):
+        with self._lock:
+            self.latencies.setdefault(endpoint, []).append(latency)
+            if not ok:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, elapsed):
+        results = {}
+        for endpoint, latencies in sorted(self.latencies.items()):
+            latencies = sorted(latencies)
+            results[endpoint] = {
+                "requests": len(latencies),
+                "errors": self.errors.get(endpoint, 0),
+                "throughput_rps": round(len(latencies) / elapsed, 2),
+                "p50_ms": _percentile_ms(latencies, 50),
+                "p95_ms": _percentile_ms(latencies, 95),
+                "p99_ms": _percentile_ms(latencies, 99),
+                "max_ms": round(latencies[-1] * 1000, 1),
+            }
+        return results
+
+
+def _percentile_ms(sorted_values, percent):
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return round(sorted_values[index] * 1000, 1)
+
+
+def run_flask(scenario, rate, duration, workers, seed):
+    """Flask 앱에 스레드 풀로 open-loop 부하 (스레드 수 = WSGI 서버 워커 스레드 수)"""
+    import app as flask_app
+
+    rng = random.Random(seed)
+    requests = [(at, scenario.next_request(rng)) for at in _schedule(rate, duration, rng)]
+    recorder = Recorder()
+
+    def send(scheduled, request):
+        endpoint, method, path, body = request
+        try:
+            response = flask_app.app.test_client().open(path, method=method, json=body)
+            response.get_data()
+            ok = response.status_code < 500
+        except Exception:
+            ok = False
+        recorder.record(endpoint, time.perf_counter() - scheduled, ok)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for at, request in requests:
+            delay = start + at - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(send, start + at, request)
+    return recorder.summary(time.perf_counter() - start)
+
+
+def run_asgi(scenario, rate, duration, seed):
+    """ASGI 앱에 이벤트 루프 하나로 open-loop 부하"""
+    import asgi
+    from utils.openfoodfacts_client import close_async_client
+
+    rng = random.Random(seed)
+    requests = [(at, scenario.next_request(rng)) for at in _schedule(rate, duration, rng)]
+    recorder = Recorder()
+
+    async def send(client, scheduled, request):
+        endpoint, method, path, body = request
+        try:
+            response = await client.open(path, method=method, json=body)
+            await response.get_data()
+            ok = response.status_code < 500
+        except Exception:
+            ok = False
+        recorder.record(endpoint, time.perf_counter() - scheduled, ok)
+
+    async def main():
+        client = asgi.app.test_client()
+        tasks = []
+        start = time.perf_counter()
+        for at, request in requests:
+            delay = start + at - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            tasks.append(asyncio.create_task(send(client, start + at, request)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+        await close_async_client()
+        return elapsed
+
+    elapsed = asyncio.run(main())
+    return recorder.summary(elapsed)
+
+
+def print_results(scenario_name, results, origin_calls):
+    print(f"\n📊 {scenario_name}")
+    print("=" * 100)
+    print(
+        f"{'endpoint':<40}{'requests':>9}{'errors':>7}{'rps':>9}"
+        f"{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"
+    )
+    for endpoint, stats in results.items():
+        print(
+            f"{endpoint:<40}{stats['requests']:>9}{stats['errors']:>7}"
+            f"{stats['throughput_rps']:>9.2f}{stats['p50_ms']:>10.1f}"
+            f"{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+    print(f"외부 호출: {origin_calls}")
+
+
+def find_regressions(results, baseline, max_regression):
+    """
+    기준 결과보다 p95가 max_regression 넘게 늘었거나 처리량이 그만큼 줄어든 항목
+
+    Returns:
+        list: 회귀 설명 문자열 목록
+    """
+    regressions = []
+    for scenario_name, endpoints in results.items():
+        for endpoint, stats in endpoints.items():
+            base = baseline.get(scenario_name, {}).get(endpoint)
+            if base is None or base["requests"] < MIN_REQUESTS_FOR_COMPARISON:
+                continue
+            if stats["p95_ms"] > base["p95_ms"] * (1 + max_regression):
+                regressions.append(
+                    f"{scenario_name} {endpoint}: p95 {base['p95_ms']} → {stats['p95_ms']}ms"
+                )
+            if stats["throughput_rps"] < base["throughput_rps"] * (1 - max_regression):
+                regressions.append(
+                    f"{scenario_name} {endpoint}: 처리량 {base['throughput_rps']} → "
+                    f"{stats['throughput_rps']} rps"
+                )
+            if stats["errors"] > base["errors"]:
+                regressions.append(
+                    f"{scenario_name} {endpoint}: 오류 {base['errors']} → {stats['errors']}"
+                )
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="오프라인 open-loop 부하 테스트")
+    parser.add_argument("--app", choices=["flask", "asgi"], default="flask")
+    parser.add_argument(
+        "--scenario",
+        choices=[*DEFAULT_RATES, "all"],
+        default="all",
+        help="실행할 시나리오 (기본값: 전부)",
+    )
+    parser.add_argument("--rate", type=float, help="도착률(요청/초, 기본값: 시나리오별)")
+    parser.add_argument("--duration", type=float, default=10.0, help="시나리오당 부하 시간(초)")
+    parser.add_argument(
+        "--workers", type=int, default=64, help="Flask 모드의 요청 처리 스레드 수"
+    )
+    parser.add_argument("--catalog-size", type=int, default=2000, help="OFF 대역의 제품 수")
+    parser.add_argument("--off-latency", type=float, default=0.1, help="OFF 응답 지연(초)")
+    parser.add_argument("--llm-latency", type=float, default=0.3, help="LLM 첫 토큰 지연(초)")
+    parser.add_argument(
+        "--llm-token-interval", type=float, default=0.002, help="LLM 토큰 생성 간격(초)"
+    )
+    parser.add_argument("--llm-answer-tokens", type=int, default=200, help="분석 응답 길이(토큰)")
+    parser.add_argument("--mongo-latency", type=float, default=0.001, help="MongoDB 왕복 지연(초)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", help="결과를 저장할 JSON 파일")
+    parser.add_argument("--baseline", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=DEFAULT_MAX_REGRESSION,
+        help="허용하는 p95 증가/처리량 감소 비율",
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    fakes = Fakes(
+        catalog_size=args.catalog_size,
+        off_latency=args.off_latency,
+        llm_latency=args.llm_latency,
+        llm_token_interval=args.llm_token_interval,
+        llm_answer_tokens=args.llm_answer_tokens,
+        mongo_latency=args.mongo_latency,
+    ).install()
+
+    scenario_names = list(DEFAULT_RATES) if args.scenario == "all" else [args.scenario]
+    barcodes = list(fakes.catalog)
+    print(
+        f"🚀 오프라인 부하 테스트 ({args.app}, 시나리오당 {args.duration:g}초, "
+        f"제품 {len(barcodes)}개, LLM {args.llm_latency:g}초 + "
+        f"{args.llm_token_interval * 1000:g}ms/토큰, OFF {args.off_latency:g}초)"
+    )
+
+    results = {}
+    try:
+        for scenario_name in scenario_names:
+            fakes.reset()
+            before = fakes.origin_calls()
+            scenario = Scenario(scenario_name, barcodes)
+            rate = args.rate or DEFAULT_RATES[scenario_name]
+            if args.app == "flask":
+                results[scenario_name] = run_flask(
+                    scenario, rate, args.duration, args.workers, args.seed
+                )
+            else:
+                results[scenario_name] = run_asgi(scenario, rate, args.duration, args.seed)
+            after = fakes.origin_calls()
+            print_results(
+                f"{scenario_name} ({rate:g} 요청/초)",
+                results[scenario_name],
+                {key: after[key] - before[key] for key in after},
+            )
+    finally:
+        fakes.stop()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n💾 결과 저장: {args.json}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline, args.max_regression)
+        if regressions:
+            print(f"\n❌ 기준 대비 성능 저하 {len(regressions)}건")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\n✅ 기준 대비 성능 저하 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+태그 번역 마이크로 벤치마크
+
+data/sample-data-*.json의 allergens_tags/food_groups_tags로 OFF 검색 결과 한 페이지 분량을 만들어
+기존 태그별 루프, 메모이즈된 translate_tags, translate_tags_batch를 비교한다.
+
+실행:
+    python benchmarks/tag_translation_benchmark.py
+"""
+
+import sys
+import os
+import json
+import timeit
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+os.chdir(BASE_DIR)
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from utils import translation_manager
+from utils.translation_manager import (
+    translate_text,
+    translate_tags,
+    translate_tags_batch,
+)
+
+SAMPLE_FILES = ["sample-data-1.json", "sample-data-2.json", "sample-data-3.json"]
+PAGE_SIZE = 100
+REPEAT = 5
+NUMBER = 200
+TAG_FIELDS = [("allergens_tags", "allergens"), ("food_groups_tags", "food_groups")]
+
+
+def legacy_translate_tags(tags, translation_type):
+    """변경 전 translate_tags (태그마다 split 후 translate_text 호출)"""
+    if not tags:
+        return []
+
+    translated_tags = []
+    for tag in tags:
+        if ":" in tag:
+            parts = tag.split(":")
+            if len(parts) > 1:
+                translated_tags.append(translate_text(parts[1], translation_type))
+            else:
+                translated_tags.append(tag)
+        else:
+            translated_tags.append(tag)
+    return translated_tags
+
+
+def load_page():
+    """샘플 제품을 반복해 검색 결과 한 페이지 분량의 제품 목록 생성"""
+    samples = []
+    for file_name in SAMPLE_FILES:
+        with open(os.path.join("data", file_name), "r", encoding="utf-8") as f:
+            samples.append(json.load(f)["product"])
+    return [samples[i % len(samples)] for i in range(PAGE_SIZE)]
+
+
+def run_per_product(page, translate):
+    for product in page:
+        for field, translation_type in TAG_FIELDS:
+            translate(product.get(field, []), translation_type)
+
+
+def run_batch(page):
+    for field, translation_type in TAG_FIELDS:
+        translate_tags_batch([product.get(field, []) for product in page], translation_type)
+
+
+def best_us_per_page(fn):
+    timings = timeit.repeat(fn, repeat=REPEAT, number=NUMBER)
+    return min(timings) / NUMBER * 1_000_000
+
+
+def main():
+    translation_manager.load_translation_data()
+    page = load_page()
+    tag_count = sum(len(product.get(field, [])) for product in page for field, _ in TAG_FIELDS)
+
+    # 결과가 같은지 먼저 확인 (콜론이 하나인 태그는 기존 결과와 같아야 함)
+    for product in page:
+        for field, translation_type in TAG_FIELDS:
+            tags = product.get(field, [])
+            if all(tag.count(":") <= 1 for tag in tags):
+                assert legacy_translate_tags(tags, translation_type) == translate_tags(
+                    tags, translation_type
+                )
+
+    results = {
+        "기존 루프": best_us_per_page(
+            lambda: run_per_product(page, legacy_translate_tags)
+        ),
+        "translate_tags (메모이즈)": best_us_per_page(
+            lambda: run_per_product(page, translate_tags)
+        ),
+        "translate_tags_batch": best_us_per_page(lambda: run_batch(page)),
+    }
+
+    mode = "sqlite 저장소" if translation_manager.is_store_open() else "JSON"
+    print(f"📊 제품 {PAGE_SIZE}개, 태그 {tag_count}개 페이지 번역 시간 ({mode})")
+    print("=" * 50)
+    baseline = results["기존 루프"]
+    for name, elapsed_us in results.items():
+        print(f"{name:>28}: {elapsed_us:9.1f}µs  (x{baseline / elapsed_us:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,10 +11,20 @@ API_MESSAGES = {
     "REQUEST_ERROR": "Request error: {error}",
     "JSON_DECODE_ERROR": "JSON decode error: {error}",
     "UNEXPECTED_ERROR": "Unexpected error: {error}",
+    "SERVICE_BUSY": "Service is busy, please retry later",
+    "HEALTH_PROFILE_REQUIRED": "건강 프로필 정보가 필요합니다.",
+    "PRODUCTS_DATA_REQUIRED": "제품 데이터가 필요합니다.",
+    "TOO_MANY_PRODUCTS": "한 번에 최대 {max_products}개 제품까지 분석 가능합니다.",
+    "NO_VALID_PRODUCTS": "유효한 제품 정보를 찾을 수 없습니다.",
 }
 
 # HTTP 상태 코드
-HTTP_STATUS_CODES = {"BAD_REQUEST": 400, "NOT_FOUND": 404, "INTERNAL_SERVER_ERROR": 500}
+HTTP_STATUS_CODES = {
+    "BAD_REQUEST": 400,
+    "NOT_FOUND": 404,
+    "INTERNAL_SERVER_ERROR": 500,
+    "SERVICE_UNAVAILABLE": 503,
+}
 
 # 성공/실패 응답 키
 RESPONSE_KEYS = {"SUCCESS": "success", "ERROR": "error", "DATA": "data"}
@@ -51,11 +51,15 @@ COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE = """
 제품 정보 목록:
 {products_info}
 
+영양 계산 결과 (제품마다 1회 섭취량을 하루 한 번 섭취한다고 가정, serving_assumed는 100g 가정):
+{nutrition_facts}
+
 위의 건강 프로필을 가진 사용자가 여러 제품을 함께 섭취할 때의 종합적인 건강 영향을 분석해주세요.
+영양소 수치는 직접 계산하지 말고 영양 계산 결과의 값을 그대로 인용해주세요.
 다음 사항들을 고려하여 한국어로 답변해주세요:
 
 1. **영양소 상호작용**: 제품들 간의 영양소 조합이 건강에 미치는 영향
-2. **누적 효과**: 여러 제품의 영양소가 합쳐져서 나타나는 효과
+2. **누적 효과**: 영양 계산 결과의 total을 근거로 여러 제품의 영양소가 합쳐져서 나타나는 효과
 3. **균형 분석**: 전체적인 영양 균형과 부족/과다 영양소
 4. **건강 위험도**: 기존 질환(고혈압, 당뇨병, 비만 등)에 미치는 종합적 영향
 5. **알레르기 위험**: 여러 제품의 알레르기 성분 조합 분석
@@ -63,7 +67,7 @@ COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE = """
    - 어떤 제품을 우선적으로 섭취해야 하는지
    - 어떤 제품을 제한하거나 피해야 하는지
    - 대체 식품 추천
-7. **일일 영양 목표**: 이 조합으로 하루 영양 요구량 충족도
+7. **일일 영양 목표**: 영양 계산 결과의 percent_of_target(하루 목표 대비 %)을 근거로 한 하루 영양 요구량 충족도
 8. **장기적 건강 영향**: 지속적 섭취 시 예상되는 건강 변화
 
 분석 결과를 체계적이고 실용적으로 정리해주세요. 
@@ -71,9 +75,60 @@ COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE = """
 사용자가 쉽게 이해하고 실천할 수 있도록 상세하게 설명해주세요.
 """
 
+# 제품 요약 시스템 프롬프트 (map 단계, 건강 프로필과 무관하므로 사용자 간에 요약을 재사용)
+PRODUCT_SUMMARY_SYSTEM_PROMPT = (
+    "You are a nutrition analyst. Summarize a single food product's nutritional profile "
+    "as compact facts for a later combined dietary analysis. Write in Korean."
+)
+
+# 제품 요약 프롬프트 템플릿
+PRODUCT_SUMMARY_PROMPT_TEMPLATE = """
+제품 정보:
+{product_info}
+
+이 제품을 나중에 다른 제품들과 함께 종합 분석할 수 있도록 한 문단으로 요약해주세요.
+제품명, 100g당 지방/포화지방/당류/나트륨 수치와 수준, 영양 등급, 알레르기 성분, 주요 원재료와 가공 특성을 빠짐없이 포함하고,
+혈압, 혈당, 체중에 영향을 줄 수 있는 특징을 짚어주세요. 200자 이내로 작성해주세요.
+"""
+
+# 제품 요약 기반 종합 건강 분석 프롬프트 템플릿 (reduce 단계)
+BASKET_HEALTH_ANALYSIS_PROMPT_TEMPLATE = """
+건강 프로필 정보:
+{health_profile}
+
+함께 섭취하는 제품 {product_count}개의 요약:
+{product_summaries}
+
+영양 계산 결과 (제품마다 1회 섭취량을 하루 한 번 섭취한다고 가정, serving_assumed는 100g 가정):
+{nutrition_facts}
+
+위의 건강 프로필을 가진 사용자가 이 제품들을 함께 섭취할 때의 종합적인 건강 영향을 분석해주세요.
+영양소 수치는 직접 계산하지 말고 영양 계산 결과의 값을 그대로 인용해주세요.
+다음 사항들을 고려하여 한국어로 답변해주세요:
+
+1. **영양소 상호작용**: 제품들 간의 영양소 조합이 건강에 미치는 영향
+2. **누적 효과**: 영양 계산 결과의 total을 근거로 여러 제품의 영양소가 합쳐져서 나타나는 효과
+3. **균형 분석**: 전체적인 영양 균형과 부족/과다 영양소
+4. **건강 위험도**: 기존 질환(고혈압, 당뇨병, 비만 등)에 미치는 종합적 영향
+5. **알레르기 위험**: 여러 제품의 알레르기 성분 조합 분석
+6. **섭취 권장사항**: 
+   - 어떤 제품을 우선적으로 섭취해야 하는지
+   - 어떤 제품을 제한하거나 피해야 하는지
+   - 대체 식품 추천
+7. **일일 영양 목표**: 영양 계산 결과의 percent_of_target(하루 목표 대비 %)을 근거로 한 하루 영양 요구량 충족도
+8. **장기적 건강 영향**: 지속적 섭취 시 예상되는 건강 변화
+
+제품이 많으므로 제품은 번호로 가리켜도 됩니다. 분석 결과를 체계적이고 실용적으로 정리해주세요. 
+답변은 최대 1500자까지 작성 가능하며, 모든 분석 항목을 완전하게 포함하여 
+사용자가 쉽게 이해하고 실천할 수 있도록 상세하게 설명해주세요.
+"""
+
 # 모델 설정
 DEFAULT_MODEL = "gpt-3.5-turbo"
 DEFAULT_MAX_TOKENS = 500
 
 # 종합 분석용 토큰 설정
 COMPREHENSIVE_MAX_TOKENS = 2000
+
+# 제품 요약용 토큰 설정 (200자 요약)
+PRODUCT_SUMMARY_MAX_TOKENS = 300
@@ -6,11 +6,90 @@
 OPENFOODFACTS_API_BASE_URL = "https://world.openfoodfacts.org/api/v2/product"
 API_TIMEOUT = 10
 
+# OpenFoodFacts HTTP 세션 설정 (시도별 타임아웃, 재시도, 커넥션 풀)
+API_CONNECT_TIMEOUT = 3.05
+API_READ_TIMEOUT = API_TIMEOUT
+API_MAX_RETRIES = 2
+API_RETRY_BACKOFF_FACTOR = 0.2
+API_RETRY_BACKOFF_JITTER = 0.2
+API_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+API_POOL_CONNECTIONS = 4
+API_POOL_MAXSIZE = 32
+OPENFOODFACTS_USER_AGENT = "TodakHanip/1.0 (https://github.com/jjok-jam/osscontest-2025)"
+
+# extract_product_info가 사용하는 OpenFoodFacts 제품 필드 (로컬 제품 인덱스 투영용)
+OPENFOODFACTS_PRODUCT_FIELDS = (
+    "code",
+    "brands",
+    "countries_tags",
+    "product_name",
+    "product_name_en",
+    "product_type",
+    "product_quantity",
+    "product_quantity_unit",
+    "quantity",
+    "allergens_tags",
+    "food_groups_tags",
+    "nutriscore_grade",
+    "nutrient_levels",
+    "nutriments",
+    "ingredients",
+    "serving_quantity",
+    "serving_quantity_unit",
+    "serving_size",
+    "image_front_url",
+    "image_ingredients_url",
+    "image_nutrition_url",
+    "image_packaging_url",
+    "image_url",
+    "image_thumb_url",
+    "last_modified_t",
+)
+OPENFOODFACTS_NUTRIMENT_FIELDS = (
+    "energy-kcal_100g",
+    "fat_100g",
+    "saturated-fat_100g",
+    "sugars_100g",
+    "salt_100g",
+)
+OPENFOODFACTS_INGREDIENT_FIELDS = (
+    "text",
+    "percent_estimate",
+    "processing",
+    "vegan",
+    "vegetarian",
+)
+
+# 건강 분석 프롬프트에서 제외할 제품 필드 (분석에 쓰이지 않는 이미지 URL)
+PROMPT_EXCLUDED_PRODUCT_FIELDS = (
+    "image_front_url",
+    "image_ingredients_url",
+    "image_nutrition_url",
+    "image_packaging_url",
+    "image_url",
+    "image_thumb_url",
+)
+# extract_product_info가 값이 없을 때 채우는 안내 문구의 끝부분 (프롬프트에서는 제외)
+PROMPT_PLACEHOLDER_SUFFIX = "정보 없음"
+# 프롬프트에 넣는 실수 값의 소수점 자릿수
+PROMPT_FLOAT_DIGITS = 3
+
 # Flask 앱 설정
 FLASK_HOST = "0.0.0.0"
 FLASK_PORT = 6318
 FLASK_DEBUG = True
 
+# 종합 분석 요청 제한 (성능 고려)
+# 이 수 이하는 제품 정보를 한 프롬프트에 모두 넣고, 넘으면 제품별 요약 후 종합(map-reduce)
+COMPREHENSIVE_MAX_PRODUCTS = 10
+# map-reduce 방식으로 한 번에 분석할 수 있는 최대 제품 수 (주간 장보기 영수증 기준)
+COMPREHENSIVE_BASKET_MAX_PRODUCTS = 100
+# 제품별 요약을 동시에 요청할 최대 수
+PRODUCT_SUMMARY_CONCURRENCY = 8
+# 바코드 목록 종합 분석에서 동시에 조회할 최대 제품 수
+PRODUCT_BATCH_CONCURRENCY = 8
+
 # 스트리밍 응답 설정
 STREAM_CONTENT_TYPE = "application/octet-stream"
+SSE_CONTENT_TYPE = "text/event-stream"
 UTF8_ENCODING = "utf-8"
@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import subprocess
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.translation_store import (
+    TRANSLATION_FILES,
+    TRANSLATION_STORE_FILE,
+    INGREDIENT_DICTIONARY_FILES,
+    build_translation_store,
+)
+
+# 워커 하나가 번역 데이터를 로드하는 과정을 측정하는 코드 (별도 프로세스에서 실행)
+WORKER_PROBE = """
+import json, time
+from utils import translation_manager
+
+def rss_kb():
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+
+before = rss_kb()
+start = time.perf_counter()
+translation_manager.load_translation_data()
+translation_manager.translate_tags(["en:milk", "en:gluten"], "allergens")
+elapsed_ms = (time.perf_counter() - start) * 1000
+print(json.dumps({"load_ms": elapsed_ms, "rss_kb": rss_kb(), "delta_kb": rss_kb() - before}))
+"""
+
+
+def measure_worker(store_file):
+    """번역 저장소 사용 여부에 따라 워커 시작 시간과 RSS 측정"""
+    env = dict(os.environ, TRANSLATION_STORE_FILE=store_file)
+    # 측정 중에는 OpenAI를 호출하지 않지만 모듈 임포트에 키가 필요함
+    env.setdefault("OPENAI_API_KEY", "unused")
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER_PROBE],
+        cwd=BASE_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def report_worker_footprint(runs=5):
+    """JSON 로드 방식과 번역 저장소 방식의 워커별 시작 시간/RSS 비교 출력"""
+    print("\n📊 워커별 번역 데이터 로드 비교 (중앙값)")
+    print("=" * 50)
+    for label, store_file in [("JSON", ""), ("sqlite", TRANSLATION_STORE_FILE)]:
+        samples = [measure_worker(store_file) for _ in range(runs)]
+        load_ms = sorted(sample["load_ms"] for sample in samples)[runs // 2]
+        delta_kb = sorted(sample["delta_kb"] for sample in samples)[runs // 2]
+        rss_kb = sorted(sample["rss_kb"] for sample in samples)[runs // 2]
+        print(
+            f"{label:>7}: 로드 {load_ms:7.2f}ms, "
+            f"RSS 증가 {delta_kb / 1024:6.2f}MB, 전체 RSS {rss_kb / 1024:6.1f}MB"
+        )
+
+
+def main():
+    # 번역 파일 경로는 프로젝트 루트 기준
+    os.chdir(BASE_DIR)
+
+    print("🚀 번역 저장소 빌드 시작")
+    print("=" * 50)
+    start = time.perf_counter()
+    counts = build_translation_store(
+        TRANSLATION_STORE_FILE, TRANSLATION_FILES, INGREDIENT_DICTIONARY_FILES
+    )
+    elapsed = time.perf_counter() - start
+
+    for name, count in counts.items():
+        print(f"📋 {name}: {count}개")
+    size_kb = os.path.getsize(TRANSLATION_STORE_FILE) / 1024
+    print(f"💾 저장된 파일: {TRANSLATION_STORE_FILE} ({size_kb:.1f}KB, {elapsed:.2f}초)")
+
+    if sys.platform.startswith("linux"):
+        report_worker_footprint()
+
+
+if __name__ == "__main__":
+    main()
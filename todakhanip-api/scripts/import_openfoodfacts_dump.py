@@ -0,0 +1,52 @@
+import os
+import sys
+import argparse
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.local_product_store import (
+    LOCAL_PRODUCT_STORE_FILE,
+    IMPORT_CHUNK_SIZE,
+    iter_dump_products,
+    import_products,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="OpenFoodFacts 덤프(CSV/JSONL, .gz 가능)를 로컬 제품 인덱스로 가져옵니다. "
+        "전체 덤프와 일일 변경분(delta) 파일 모두 사용할 수 있습니다."
+    )
+    parser.add_argument("dump_files", nargs="+", help="가져올 덤프 파일 경로")
+    parser.add_argument(
+        "--store",
+        default=os.path.join(BASE_DIR, LOCAL_PRODUCT_STORE_FILE),
+        help="로컬 제품 인덱스 sqlite 파일 경로",
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="한 번에 저장할 제품 수"
+    )
+    args = parser.parse_args()
+
+    print("🚀 OpenFoodFacts 덤프 가져오기 시작")
+    print("=" * 50)
+    for dump_file in args.dump_files:
+        print(f"📖 파일 읽기: {dump_file}")
+        start = time.perf_counter()
+        result = import_products(
+            iter_dump_products(dump_file), args.store, args.chunk_size
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"✅ {result['read']}개 읽음, {result['written']}개 저장 "
+            f"({elapsed:.1f}초, {result['read'] / max(elapsed, 1e-9):.0f}개/초)"
+        )
+
+    print(f"💾 저장된 파일: {args.store}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+import os
+import sys
+import glob
+import gzip
+import json
+import time
+
+# 프로젝트 루트를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+# 측정 중에는 OpenAI를 호출하지 않지만 모듈 임포트에 키가 필요함
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from prompts.constants import OPENFOODFACTS_PRODUCT_FIELDS
+from utils.local_product_store import project_product
+from utils.product_parser import extract_product_info
+from utils.translation_manager import load_translation_data
+
+# 디코딩 시간 측정 반복 횟수
+DECODE_REPEAT = 200
+
+
+def fields_response(response):
+    """fields 파라미터를 붙여 요청했을 때 OpenFoodFacts가 돌려주는 응답"""
+    product = response["product"]
+    return dict(
+        response,
+        product={
+            field: product[field]
+            for field in OPENFOODFACTS_PRODUCT_FIELDS
+            if field in product
+        },
+    )
+
+
+def decode_ms(body):
+    """응답 본문 JSON 디코딩 + 투영에 걸리는 시간의 중앙값(ms)"""
+    samples = []
+    for _ in range(DECODE_REPEAT):
+        start = time.perf_counter()
+        project_product(json.loads(body)["product"])
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return samples[len(samples) // 2]
+
+
+def measure(response):
+    """전체 문서와 fields 응답의 크기(원본/gzip)와 디코딩 시간"""
+    result = {}
+    for name, payload in (("full", response), ("fields", fields_response(response))):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        result[name] = {
+            "bytes": len(body),
+            "gzip_bytes": len(gzip.compress(body)),
+            "decode_ms": decode_ms(body),
+            "product_info": extract_product_info(
+                project_product(json.loads(body)["product"]), response["code"]
+            ),
+        }
+    return result
+
+
+def main():
+    # 데이터 파일 경로는 프로젝트 루트 기준
+    os.chdir(BASE_DIR)
+    load_translation_data()
+
+    print("🚀 OpenFoodFacts 응답 크기/디코딩 비교 (전체 문서 → fields 응답)")
+    print("=" * 70)
+    totals = {"full": [0, 0, 0.0], "fields": [0, 0, 0.0]}
+    for path in sorted(glob.glob("data/sample-data-*.json")):
+        with open(path, "r", encoding="utf-8") as f:
+            response = json.load(f)
+        result = measure(response)
+        if result["full"]["product_info"] != result["fields"]["product_info"]:
+            print(f"❌ {os.path.basename(path)}: extract_product_info 결과가 다릅니다.")
+            sys.exit(1)
+
+        for name, total in totals.items():
+            total[0] += result[name]["bytes"]
+            total[1] += result[name]["gzip_bytes"]
+            total[2] += result[name]["decode_ms"]
+        full, fields = result["full"], result["fields"]
+        print(
+            f"{os.path.basename(path):>20}: "
+            f"{full['bytes']:7d} → {fields['bytes']:6d} bytes, "
+            f"gzip {full['gzip_bytes']:6d} → {fields['gzip_bytes']:5d} bytes, "
+            f"디코딩 {full['decode_ms']:.3f} → {fields['decode_ms']:.3f} ms"
+        )
+
+    full, fields = totals["full"], totals["fields"]
+    print("=" * 70)
+    print(
+        f"{'합계':>20}: 전송 {1 - fields[1] / full[1]:.0%} 감소(gzip 기준), "
+        f"원본 {1 - fields[0] / full[0]:.0%} 감소, 디코딩 {1 - fields[2] / full[2]:.0%} 감소"
+    )
+    print("✅ 모든 샘플에서 extract_product_info 결과가 같습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import os
+import sys
+import glob
+import json
+
+# 프로젝트 루트를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+# 측정 중에는 OpenAI를 호출하지 않지만 모듈 임포트에 키가 필요함
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from prompts.chat_prompts import (
+    DEFAULT_MODEL,
+    HEALTH_PROFILE_ANALYSIS_PROMPT_TEMPLATE,
+    COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE,
+)
+from utils.health_analysis import (
+    _build_health_analysis_request,
+    _build_comprehensive_analysis_request,
+)
+from utils.product_parser import extract_product_info
+from utils.prompt_projection import project_product_info
+from utils.token_budget import get_token_counter, tiktoken
+from utils.translation_manager import load_translation_data
+
+
+def load_products(data_dir):
+    """
+    data/sample-data-*.json(OpenFoodFacts API 응답)과 output.json(추출된 제품 정보) 로드
+
+    Returns:
+        list: (파일 이름, product_info) 리스트
+    """
+    products = []
+    for path in sorted(glob.glob(os.path.join(data_dir, "sample-data-*.json"))):
+        with open(path, "r", encoding="utf-8") as f:
+            response = json.load(f)
+        products.append(
+            (
+                os.path.basename(path),
+                extract_product_info(response["product"], response["code"]),
+            )
+        )
+    output_path = os.path.join(data_dir, "output.json")
+    if os.path.exists(output_path):
+        with open(output_path, "r", encoding="utf-8") as f:
+            products.append(("output.json", json.load(f)))
+    return products
+
+
+def legacy_user_prompt(template, health_profile, **products):
+    """이전 방식(json.dumps indent=2, 전체 필드, 영양 계산 결과 없음)으로 만든 사용자 프롬프트"""
+    return template.format(
+        health_profile=json.dumps(health_profile, ensure_ascii=False, indent=2),
+        nutrition_facts="",
+        **{
+            name: json.dumps(value, ensure_ascii=False, indent=2)
+            for name, value in products.items()
+        },
+    )
+
+
+def _report_line(label, count_tokens, before, after):
+    before_tokens = count_tokens(before)
+    after_tokens = count_tokens(after)
+    print(
+        f"{label:>20}: {before_tokens:6d} → {after_tokens:6d} 토큰 "
+        f"({1 - after_tokens / before_tokens:.0%} 감소, "
+        f"{len(before):6d} → {len(after):6d}자)"
+    )
+    return before_tokens, after_tokens
+
+
+def main():
+    # 데이터 파일 경로는 프로젝트 루트 기준
+    os.chdir(BASE_DIR)
+    load_translation_data()
+
+    count_tokens = get_token_counter(DEFAULT_MODEL)
+    counter_name = "tiktoken" if tiktoken is not None else "글자 수 추정(4글자당 1토큰)"
+    with open("data/health_profile.json", "r", encoding="utf-8") as f:
+        health_profile = json.load(f)
+    products = load_products("data")
+
+    print(f"🚀 건강 분석 프롬프트 토큰 비교 ({DEFAULT_MODEL}, {counter_name})")
+    print("=" * 70)
+    for name, product_info in products:
+        request = _build_health_analysis_request(
+            project_product_info(product_info), health_profile
+        )
+        _report_line(
+            name,
+            count_tokens,
+            legacy_user_prompt(
+                HEALTH_PROFILE_ANALYSIS_PROMPT_TEMPLATE,
+                health_profile,
+                product_info=product_info,
+            ),
+            request["messages"][1]["content"],
+        )
+
+    products_info = [product_info for _, product_info in products]
+    request = _build_comprehensive_analysis_request(
+        [project_product_info(product) for product in products_info], health_profile
+    )
+    _report_line(
+        f"종합 분석 ({len(products_info)}개)",
+        count_tokens,
+        legacy_user_prompt(
+            COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE,
+            health_profile,
+            products_info=products_info,
+        ),
+        request["messages"][1]["content"],
+    )
+
+
+if __name__ == "__main__":
+    main()
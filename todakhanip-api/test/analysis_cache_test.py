@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+건강 분석 캐시 테스트 스크립트
+
+가짜 OpenAI 클라이언트를 사용하므로 네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import analysis_cache, health_analysis
+
+PRODUCT_INFO = {"code": "3017620422003", "product_name": "Nutella", "sugars_100g": 56.3}
+HEALTH_PROFILE = {"name": "홍길동", "age": 44, "has_diabetes": "예"}
+
+
+def _completion(text, finish_reason="stop"):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content=text), finish_reason=finish_reason
+            )
+        ]
+    )
+
+
+def _stream_chunk(text, finish_reason=None):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                delta=SimpleNamespace(content=text), finish_reason=finish_reason
+            )
+        ]
+    )
+
+
+class FakeCompletions:
+    """호출 횟수를 세는 chat.completions 대역"""
+
+    def __init__(self, fail=False, fail_mid_stream=False, finish_reason="stop"):
+        self.calls = 0
+        self.fail = fail
+        self.fail_mid_stream = fail_mid_stream
+        self.finish_reason = finish_reason
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("OpenAI 장애")
+        if kwargs.get("stream"):
+            if self.fail_mid_stream:
+                return self._broken_stream()
+            return iter(
+                [
+                    _stream_chunk("스트리밍 "),
+                    _stream_chunk("분석"),
+                    _stream_chunk(None, self.finish_reason),
+                ]
+            )
+        return _completion(f"분석 #{self.calls}", self.finish_reason)
+
+
+    def _broken_stream(self):
+        yield _stream_chunk("스트리밍 ")
+        raise RuntimeError("연결 끊김")
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        stream = super().create(**kwargs)
+        if kwargs.get("stream"):
+            return self._aiter(stream)
+        return stream
+
+    async def _aiter(self, stream):
+        for chunk in stream:
+            yield chunk
+
+
+def _with_fake_clients(fail=False, fail_mid_stream=False, finish_reason="stop"):
+    completions = FakeCompletions(fail, fail_mid_stream, finish_reason)
+    async_completions = FakeAsyncCompletions(fail, fail_mid_stream, finish_reason)
+    health_analysis.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+    health_analysis.async_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=async_completions)
+    )
+    analysis_cache.set_analysis_cache_backend("memory")
+    return completions, async_completions
+
+
+def test_cache_key_is_canonical():
+    """딕셔너리 키 순서가 달라도 같은 키, 내용이 다르면 다른 키"""
+    reordered = dict(reversed(list(HEALTH_PROFILE.items())))
+    key = analysis_cache.make_cache_key(model="m", inputs=HEALTH_PROFILE)
+    assert key == analysis_cache.make_cache_key(model="m", inputs=reordered)
+    assert key != analysis_cache.make_cache_key(model="other", inputs=HEALTH_PROFILE)
+    assert key != analysis_cache.make_cache_key(
+        model="m", inputs={**HEALTH_PROFILE, "age": 45}
+    )
+
+
+def test_repeat_scan_hits_cache():
+    """같은 프로필이 같은 제품을 다시 스캔하면 OpenAI를 호출하지 않음"""
+    completions, async_completions = _with_fake_clients()
+
+    first = health_analysis.get_health_analysis(PRODUCT_INFO, HEALTH_PROFILE)
+    second = health_analysis.get_health_analysis(
+        dict(PRODUCT_INFO), dict(reversed(list(HEALTH_PROFILE.items())))
+    )
+    assert first == second == "분석 #1"
+    assert completions.calls == 1
+
+    # 비동기 경로도 같은 캐시를 사용
+    third = asyncio.run(
+        health_analysis.get_health_analysis_async(PRODUCT_INFO, HEALTH_PROFILE)
+    )
+    assert third == first
+    assert async_completions.calls == 0
+
+    other_profile = {**HEALTH_PROFILE, "has_diabetes": "아니오"}
+    health_analysis.get_health_analysis(PRODUCT_INFO, other_profile)
+    assert completions.calls == 2
+
+    stats = analysis_cache.get_analysis_cache_stats()
+    print(f"📊 분석 캐시 통계: {stats}")
+    assert stats["backend"] == "memory"
+    assert stats["hits"] == 2
+    assert stats["misses"] == 2
+
+
+def test_stream_fills_and_uses_cache():
+    """스트리밍 결과도 캐시에 저장되고, 적중 시 한 번에 전달됨"""
+    completions, _ = _with_fake_clients()
+    products_info = [PRODUCT_INFO]
+
+    events = list(
+        health_analysis.get_comprehensive_health_analysis_stream(
+            products_info, HEALTH_PROFILE
+        )
+    )
+    assert events == [("token", {"text": "스트리밍 "}), ("token", {"text": "분석"})]
+
+    cached = health_analysis.get_comprehensive_health_analysis(
+        products_info, HEALTH_PROFILE
+    )
+    assert cached == "스트리밍 분석"
+    assert list(
+        health_analysis.get_comprehensive_health_analysis_stream(
+            products_info, HEALTH_PROFILE
+        )
+    ) == [("token", {"text": "스트리밍 분석"})]
+    assert completions.calls == 1
+
+
+def test_stream_error_is_separate_event_and_not_cached():
+    """스트림이 도중에 끊기면 error 이벤트로 끝나고 부분 텍스트는 캐시하지 않음"""
+    completions, async_completions = _with_fake_clients(fail_mid_stream=True)
+    error_event = ("error", {"error": health_analysis.HEALTH_ANALYSIS_ERROR_MESSAGE})
+
+    events = list(
+        health_analysis.get_health_analysis_stream(PRODUCT_INFO, HEALTH_PROFILE)
+    )
+    assert events == [("token", {"text": "스트리밍 "}), error_event]
+
+    async def collect():
+        return [
+            event
+            async for event in health_analysis.get_health_analysis_stream_async(
+                PRODUCT_INFO, HEALTH_PROFILE
+            )
+        ]
+
+    assert asyncio.run(collect()) == [("token", {"text": "스트리밍 "}), error_event]
+    assert len(analysis_cache._backend) == 0
+    assert completions.calls == 1 and async_completions.calls == 1
+
+
+def test_errors_are_not_cached():
+    """OpenAI 오류 메시지는 캐시하지 않음"""
+    completions, _ = _with_fake_clients(fail=True)
+    for _ in range(2):
+        result = health_analysis.get_health_analysis(PRODUCT_INFO, HEALTH_PROFILE)
+        assert result == health_analysis.HEALTH_ANALYSIS_ERROR_MESSAGE
+    assert completions.calls == 2
+    assert len(analysis_cache._backend) == 0
+
+
+def test_truncated_responses_are_not_cached():
+    """max_tokens로 잘린(finish_reason "length") 응답은 반환하되 캐시하지 않음"""
+    completions, async_completions = _with_fake_clients(finish_reason="length")
+    for _ in range(2):
+        result = health_analysis.get_health_analysis(PRODUCT_INFO, HEALTH_PROFILE)
+        assert result.startswith("분석 #")
+    asyncio.run(health_analysis.get_health_analysis_async(PRODUCT_INFO, HEALTH_PROFILE))
+    events = list(
+        health_analysis.get_comprehensive_health_analysis_stream(
+            [PRODUCT_INFO], HEALTH_PROFILE
+        )
+    )
+    assert events == [("token", {"text": "스트리밍 "}), ("token", {"text": "분석"})]
+    assert completions.calls == 3 and async_completions.calls == 1
+    assert len(analysis_cache._backend) == 0
+
+
+def test_disabled_backend():
+    """ANALYSIS_CACHE_BACKEND=none이면 매번 OpenAI 호출"""
+    completions, _ = _with_fake_clients()
+    analysis_cache.set_analysis_cache_backend("none")
+    health_analysis.get_health_analysis(PRODUCT_INFO, HEALTH_PROFILE)
+    health_analysis.get_health_analysis(PRODUCT_INFO, HEALTH_PROFILE)
+    assert completions.calls == 2
+    analysis_cache.set_analysis_cache_backend("memory")
+
+
+if __name__ == "__main__":
+    print("🚀 건강 분석 캐시 테스트 시작\n")
+    test_cache_key_is_canonical()
+    test_repeat_scan_hits_cache()
+    test_stream_fills_and_uses_cache()
+    test_stream_error_is_separate_event_and_not_cached()
+    test_errors_are_not_cached()
+    test_truncated_responses_are_not_cached()
+    test_disabled_backend()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+비동기(ASGI) 서빙 모드 테스트 스크립트
+
+로컬 OpenFoodFacts 스텁 서버와 가짜 비동기 LLM 함수를 사용하므로
+네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import time
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from fake_openfoodfacts_server import FakeOpenFoodFactsServer
+from utils import health_analysis, openfoodfacts_client, product_cache
+import app as flask_app
+import asgi
+
+SAMPLE_BARCODE = "3017620422003"
+HEALTH_PROFILE = {"name": "홍길동", "has_diabetes": "예"}
+LLM_LATENCY_SECONDS = 0.3
+
+
+async def fake_health_analysis(product_info, health_profile):
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    return f"{product_info['code']} 분석 결과"
+
+
+async def fake_translation(barcode, product_info):
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    return {"Sucre": "설탕"}
+
+
+async def fake_health_analysis_stream(product_info, health_profile):
+    for text in ["당류가 ", "높습니다."]:
+        await asyncio.sleep(0)
+        yield "token", {"text": text}
+
+
+async def fake_comprehensive_analysis(products_info, health_profile):
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    return f"{len(products_info)}개 제품 종합 분석"
+
+
+def _run_with_stub(coro_factory):
+    """스텁 서버와 가짜 LLM으로 교체한 상태에서 코루틴 실행"""
+    originals = (
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+        product_cache.PRODUCT_CACHE_PERSISTENT,
+        asgi.get_health_analysis_async,
+        asgi.run_ingredients_translation,
+        asgi.get_comprehensive_health_analysis_async,
+        asgi.get_health_analysis_stream_async,
+    )
+    with FakeOpenFoodFactsServer() as server:
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL = server.base_url
+        product_cache.PRODUCT_CACHE_PERSISTENT = False
+        product_cache.clear_product_cache()
+        asgi.get_health_analysis_async = fake_health_analysis
+        asgi.run_ingredients_translation = fake_translation
+        asgi.get_comprehensive_health_analysis_async = fake_comprehensive_analysis
+        asgi.get_health_analysis_stream_async = fake_health_analysis_stream
+        try:
+            return asyncio.run(coro_factory(server))
+        finally:
+            (
+                openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+                product_cache.PRODUCT_CACHE_PERSISTENT,
+                asgi.get_health_analysis_async,
+                asgi.run_ingredients_translation,
+                asgi.get_comprehensive_health_analysis_async,
+                asgi.get_health_analysis_stream_async,
+            ) = originals
+            product_cache.clear_product_cache()
+
+
+def test_barcode_get_and_post():
+    """GET/POST 응답 형식이 Flask 앱과 같은지 확인"""
+
+    async def scenario(server):
+        client = asgi.app.test_client()
+        response = await client.get(f"/barcode/{SAMPLE_BARCODE}")
+        assert response.status_code == 200
+        body = await response.get_json()
+        assert body["success"] is True
+        assert body["data"]["code"] == SAMPLE_BARCODE
+
+        response = await client.post(
+            f"/barcode/{SAMPLE_BARCODE}", json={"health_profile": HEALTH_PROFILE}
+        )
+        body = await response.get_json()
+        assert body["data"]["health_analysis"] == f"{SAMPLE_BARCODE} 분석 결과"
+        texts = [item["text"] for item in body["data"]["ingredients"]]
+        assert "설탕" in texts
+
+        response = await client.get("/barcode/0000000000000")
+        assert response.status_code == 404
+        assert (await response.get_json())["error"] == "Product not found"
+        await openfoodfacts_client.close_async_client()
+
+    _run_with_stub(scenario)
+
+
+def test_concurrent_llm_bound_requests():
+    """LLM 대기 중인 요청 수백 개를 한 이벤트 루프에서 동시에 처리하는지 확인"""
+    concurrency = 200
+
+    async def scenario(server):
+        client = asgi.app.test_client()
+        # 제품 캐시를 미리 채워 LLM 대기 시간만 측정
+        await client.get(f"/barcode/{SAMPLE_BARCODE}")
+        start = time.perf_counter()
+        responses = await asyncio.gather(
+            *[
+                client.post(
+                    f"/barcode/{SAMPLE_BARCODE}",
+                    json={"health_profile": HEALTH_PROFILE},
+                )
+                for _ in range(concurrency)
+            ]
+        )
+        elapsed = time.perf_counter() - start
+        await openfoodfacts_client.close_async_client()
+        return responses, elapsed
+
+    responses, elapsed = _run_with_stub(scenario)
+    print(f"📊 {concurrency}개 동시 요청 처리 시간: {elapsed:.2f}초")
+    assert all(response.status_code == 200 for response in responses)
+    # 순차 처리였다면 concurrency * LLM_LATENCY_SECONDS 초가 걸림
+    assert elapsed < concurrency * LLM_LATENCY_SECONDS / 10
+
+
+def test_comprehensive_analysis():
+    """종합 분석 응답 형식 확인"""
+
+    async def scenario(server):
+        client = asgi.app.test_client()
+        response = await client.post(
+            "/comprehensive-analysis",
+            json={
+                "products_data": [
+                    {"code": "1", "product_name": "A"},
+                    {"product_name": "바코드 없음"},
+                ],
+                "health_profile": HEALTH_PROFILE,
+            },
+        )
+        return response.status_code, await response.get_json()
+
+    status_code, body = _run_with_stub(scenario)
+    assert status_code == 200
+    assert body["data"]["comprehensive_analysis"] == "1개 제품 종합 분석"
+    assert body["data"]["analyzed_products"] == 1
+    assert body["data"]["total_requested"] == 2
+    assert body["data"]["products_summary"][0]["barcode"] == "1"
+
+
+def test_comprehensive_barcodes_analysis():
+    """바코드 목록으로 제품을 조회해 종합 분석하고 실패한 바코드를 알려주는지 확인"""
+
+    async def scenario(server):
+        client = asgi.app.test_client()
+        response = await client.post(
+            "/comprehensive-analysis/barcodes",
+            json={
+                "barcodes": [SAMPLE_BARCODE, "0000000000000"],
+                "health_profile": HEALTH_PROFILE,
+            },
+        )
+        return response.status_code, await response.get_json()
+
+    status_code, body = _run_with_stub(scenario)
+    assert status_code == 200
+    assert body["data"]["comprehensive_analysis"] == "1개 제품 종합 분석"
+    assert body["data"]["analyzed_products"] == 1
+    assert body["data"]["total_requested"] == 2
+    assert body["data"]["failed_products"] == ["0000000000000"]
+    assert body["data"]["products_summary"][0]["barcode"] == SAMPLE_BARCODE
+
+
+def test_barcode_stream():
+    """스트리밍 응답에서 제품 정보가 분석 토큰보다 먼저 오는지 확인"""
+
+    async def scenario(server):
+        client = asgi.app.test_client()
+        response = await client.post(
+            f"/barcode/{SAMPLE_BARCODE}/stream",
+            json={"health_profile": HEALTH_PROFILE},
+            headers={"Accept": "application/octet-stream"},
+        )
+        body = await response.get_data(as_text=True)
+        await openfoodfacts_client.close_async_client()
+        return response, body
+
+    response, body = _run_with_stub(scenario)
+    assert response.headers["Content-Type"].startswith("application/octet-stream")
+    events = [json.loads(line)["event"] for line in body.splitlines()]
+    assert events == ["product", "token", "token", "translations", "done"]
+
+
+def test_same_routes_and_errors_as_flask_app():
+    """Flask 앱과 같은 라우트를 제공하고 같은 검증 오류 응답을 반환하는지 확인"""
+
+    def routes(url_map):
+        return {
+            (rule.rule, method)
+            for rule in url_map.iter_rules()
+            if rule.endpoint != "static"
+            for method in rule.methods - {"HEAD", "OPTIONS"}
+        }
+
+    assert routes(asgi.app.url_map) == routes(flask_app.app.url_map)
+
+    requests = [
+        ("/barcode/1", {}),
+        ("/barcode/1/stream", {"health_profile": {}}),
+        ("/comprehensive-analysis", {"health_profile": HEALTH_PROFILE}),
+        ("/comprehensive-analysis/barcodes", {"barcodes": "1", "health_profile": {}}),
+        ("/comprehensive-analysis/stream", {"products_data": [{"code": "1"}] * 100}),
+    ]
+    flask_client = flask_app.app.test_client()
+    expected = []
+    for path, body in requests:
+        response = flask_client.post(path, json=body)
+        expected.append((response.status_code, response.get_json()))
+
+    async def scenario():
+        client = asgi.app.test_client()
+        actual = []
+        for path, body in requests:
+            response = await client.post(path, json=body)
+            actual.append((response.status_code, await response.get_json()))
+        response = await client.get("/health/cache")
+        return actual, response.status_code, await response.get_json()
+
+    actual, status_code, cache_body = asyncio.run(scenario())
+    assert actual == expected
+    assert all(status == 400 for status, _ in actual)
+    assert status_code == 200
+    assert set(cache_body["data"]) == {
+        "product_cache",
+        "analysis_cache",
+        "ingredient_dictionary",
+        "bulkheads",
+    }
+
+
+def test_stream_setup_errors():
+    """스트리밍 요청 준비 중 예외를 JSON 오류나 error 이벤트로 전달"""
+
+    def fail(*args):
+        raise ValueError("잘못된 제품 데이터")
+
+    async def scenario():
+        client = asgi.app.test_client()
+        bad_json = await client.post("/comprehensive-analysis/stream", json=[1])
+        original = health_analysis.aggregate_nutrients
+        health_analysis.aggregate_nutrients = fail
+        try:
+            response = await client.post(
+                "/comprehensive-analysis/stream",
+                json={
+                    "products_data": [{"code": "1", "product_name": "A"}],
+                    "health_profile": HEALTH_PROFILE,
+                },
+                headers={"Accept": "application/octet-stream"},
+            )
+            body = await response.get_data(as_text=True)
+        finally:
+            health_analysis.aggregate_nutrients = original
+        return bad_json.status_code, await bad_json.get_json(), body
+
+    status_code, error_body, body = asyncio.run(scenario())
+    assert status_code == 500 and error_body["success"] is False
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert [line["event"] for line in lines] == ["summary", "error"]
+    assert lines[-1]["data"] == {
+        "error": health_analysis.COMPREHENSIVE_ANALYSIS_ERROR_MESSAGE
+    }
+
+
+if __name__ == "__main__":
+    print("🚀 ASGI 앱 테스트 시작\n")
+    test_barcode_get_and_post()
+    test_concurrent_llm_bound_requests()
+    test_comprehensive_analysis()
+    test_comprehensive_barcodes_analysis()
+    test_barcode_stream()
+    test_same_routes_and_errors_as_flask_app()
+    test_stream_setup_errors()
+    print("🎉 모든 테스트 완료!")
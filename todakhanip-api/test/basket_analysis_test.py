@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+많은 제품의 종합 분석(map-reduce) 테스트 스크립트
+
+가짜 OpenAI 클라이언트를 사용하므로 네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from prompts.chat_prompts import PRODUCT_SUMMARY_SYSTEM_PROMPT
+from prompts.constants import PRODUCT_SUMMARY_CONCURRENCY
+from utils import analysis_cache, health_analysis
+
+HEALTH_PROFILE = {"name": "홍길동", "has_hypertension": "예"}
+LATENCY = 0.05
+
+with open(os.path.join(BASE_DIR, "data", "output.json"), "r", encoding="utf-8") as f:
+    SAMPLE_PRODUCT = json.load(f)
+
+
+def _basket(count, start=0):
+    return [
+        dict(SAMPLE_PRODUCT, code=str(index), product_name=f"제품-{index}")
+        for index in range(start, start + count)
+    ]
+
+
+def _completion(text, finish_reason="stop"):
+    return SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content=text), finish_reason=finish_reason
+            )
+        ]
+    )
+
+
+class FakeCompletions:
+    """요약/종합 요청 수와 최대 동시 요청 수를 세는 chat.completions 대역"""
+
+    def __init__(self, fail_codes=()):
+        self.summaries = 0
+        self.reduce_prompts = []
+        self.active = 0
+        self.peak_active = 0
+        self.fail_codes = fail_codes
+        self._lock = threading.Lock()
+
+    def _respond(self, kwargs):
+        system, user = (message["content"] for message in kwargs["messages"])
+        if system != PRODUCT_SUMMARY_SYSTEM_PROMPT:
+            self.reduce_prompts.append(user)
+            return _completion("종합 분석")
+        self.summaries += 1
+        code = json.loads(user.split("\n")[2])["code"]
+        if code in self.fail_codes:
+            raise RuntimeError("OpenAI 장애")
+        return _completion(f"요약-{code}")
+
+    def _enter(self):
+        with self._lock:
+            self.active += 1
+            self.peak_active = max(self.peak_active, self.active)
+
+    def _exit(self):
+        with self._lock:
+            self.active -= 1
+
+    def create(self, **kwargs):
+        self._enter()
+        try:
+            time.sleep(LATENCY)
+            return self._respond(kwargs)
+        finally:
+            self._exit()
+
+
+class FakeAsyncCompletions(FakeCompletions):
+    async def create(self, **kwargs):
+        self._enter()
+        try:
+            await asyncio.sleep(LATENCY)
+            return self._respond(kwargs)
+        finally:
+            self._exit()
+
+
+def _with_fake_clients(**kwargs):
+    completions = FakeCompletions(**kwargs)
+    async_completions = FakeAsyncCompletions(**kwargs)
+    health_analysis.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=completions)
+    )
+    health_analysis.async_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=async_completions)
+    )
+    analysis_cache.set_analysis_cache_backend("memory")
+    return completions, async_completions
+
+
+def test_small_basket_uses_single_prompt():
+    """COMPREHENSIVE_MAX_PRODUCTS개 이하는 기존처럼 한 번의 호출로 분석"""
+    completions, _ = _with_fake_clients()
+    health_analysis.get_comprehensive_health_analysis(_basket(3), HEALTH_PROFILE)
+    assert completions.summaries == 0
+    assert len(completions.reduce_prompts) == 1
+    assert '"code":"0"' in completions.reduce_prompts[0]
+
+
+def test_large_basket_is_summarized_in_parallel():
+    """50개 제품은 요약을 동시에 만든 뒤 요약만으로 종합 분석"""
+    completions, _ = _with_fake_clients()
+    products = _basket(50)
+
+    start = time.perf_counter()
+    analysis = health_analysis.get_comprehensive_health_analysis(
+        products, HEALTH_PROFILE
+    )
+    elapsed = time.perf_counter() - start
+    print(f"📊 50개 제품 map-reduce: {elapsed:.2f}초 (최대 동시 요청 {completions.peak_active})")
+
+    assert analysis == "종합 분석"
+    assert completions.summaries == 50
+    assert completions.peak_active == PRODUCT_SUMMARY_CONCURRENCY
+    # 순차 처리라면 51 * LATENCY 이상 걸림
+    assert elapsed < 51 * LATENCY / 2
+
+    prompt = completions.reduce_prompts[0]
+    assert "50. 제품-49: 요약-49" in prompt
+    assert "https://" not in prompt
+    full_prompt = json.dumps(products, ensure_ascii=False, indent=2)
+    assert len(prompt) < len(full_prompt) / 10
+
+
+def test_summaries_are_reused_across_profiles():
+    """다른 건강 프로필의 분석도 이미 만든 제품 요약을 재사용"""
+    completions, _ = _with_fake_clients()
+    health_analysis.get_comprehensive_health_analysis(_basket(20), HEALTH_PROFILE)
+    health_analysis.get_comprehensive_health_analysis(
+        _basket(25), {"name": "김철수", "has_diabetes": "예"}
+    )
+    assert completions.summaries == 25
+    assert len(completions.reduce_prompts) == 2
+
+
+def test_failed_summary_falls_back_to_facts():
+    """요약에 실패한 제품은 영양 수치만으로 종합 분석에 포함"""
+    completions, _ = _with_fake_clients(fail_codes={"3"})
+    health_analysis.get_comprehensive_health_analysis(_basket(12), HEALTH_PROFILE)
+    prompt = completions.reduce_prompts[0]
+    assert '4. 제품-3: {"allergens_tags"' in prompt
+    assert "요약-4" in prompt
+
+
+def test_async_large_basket():
+    """비동기 버전도 동시 요청 수를 제한하며 요약 후 종합 분석"""
+    _, async_completions = _with_fake_clients()
+    analysis = asyncio.run(
+        health_analysis.get_comprehensive_health_analysis_async(
+            _basket(30), HEALTH_PROFILE
+        )
+    )
+    assert analysis == "종합 분석"
+    assert async_completions.summaries == 30
+    assert async_completions.peak_active == PRODUCT_SUMMARY_CONCURRENCY
+    assert "30. 제품-29: 요약-29" in async_completions.reduce_prompts[0]
+
+
+if __name__ == "__main__":
+    print("🚀 종합 분석 map-reduce 테스트 시작\n")
+    test_small_basket_uses_single_prompt()
+    test_large_basket_is_summarized_in_parallel()
+    test_summaries_are_reused_across_profiles()
+    test_failed_summary_falls_back_to_facts()
+    test_async_large_basket()
+    print("🎉 모든 테스트 완료!")
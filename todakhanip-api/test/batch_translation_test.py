@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+배치 번역 엔진 테스트 스크립트
+
+로컬 OpenAI 스텁 서버를 사용하므로 네트워크, OpenAI 키 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import json
+import tempfile
+import threading
+import time
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import httpx
+from openai import OpenAI, RateLimitError
+from fake_openai_server import FakeOpenAIServer
+from utils.batch_translation import BatchTranslator, RateLimiter
+from utils.translation_journal import TranslationJournal
+
+ITEMS = [f"ingredient-{i}" for i in range(200)]
+
+
+def _translator(server, **kwargs):
+    client = OpenAI(api_key="test-key", base_url=server.base_url, max_retries=0)
+    return BatchTranslator(
+        client,
+        model="gpt-4o-mini",
+        system_prompt="번역해주세요.",
+        user_prompt="다음 식품 원료들을 한국어로 번역해주세요:\n\n{items}",
+        **kwargs,
+    )
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_parallel_translation():
+    """여러 배치를 동시에 요청하고 결과를 최종 JSON으로 합치는지 확인"""
+    latency = 0.2
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer(
+        latency=latency
+    ) as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        journal = TranslationJournal(output_file)
+
+        start = time.perf_counter()
+        stats = _translator(server, max_concurrency=5).run(
+            ITEMS, journal, batch_size=20
+        )
+        elapsed = time.perf_counter() - start
+
+        translations = _read_json(output_file)
+        assert {item["original"] for item in translations} == set(ITEMS)
+        assert translations[0]["korean"] == f"번역:{translations[0]['original']}"
+        assert not os.path.exists(journal.journal_file)
+
+        assert stats["batches"] == 10
+        assert stats["translated"] == 200
+        assert stats["total"] == 200
+        assert server.peak_active == 5
+        # 순차 처리라면 10 * latency 이상 걸림
+        assert elapsed < latency * 5
+
+
+def test_rate_limited_requests_are_retried():
+    """429 응답은 Retry-After만큼 기다린 뒤 재시도하는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer(
+        rate_limit_first=3, retry_after=0.1
+    ) as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        stats = _translator(server, max_concurrency=2).run(
+            ITEMS[:40], TranslationJournal(output_file), batch_size=10
+        )
+
+        assert stats["rate_limited"] == 3
+        assert stats["failed_batches"] == 0
+        assert len(_read_json(output_file)) == 40
+
+
+def test_resume_skips_translated_items():
+    """기존 번역과 저널에 있는 항목은 다시 요청하지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer() as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump(
+                [{"original": item, "korean": "기존"} for item in ITEMS[:50]], f
+            )
+        journal = TranslationJournal(output_file)
+        journal.append([{"original": item, "korean": "저널"} for item in ITEMS[50:80]])
+
+        stats = _translator(server).run(ITEMS, journal, batch_size=50)
+
+        assert stats["remaining"] == 120
+        assert sorted(server.translated_items) == sorted(ITEMS[80:])
+        translations = _read_json(output_file)
+        assert len(translations) == 200
+        assert translations[0]["korean"] == "기존"
+        assert translations[60]["korean"] == "저널"
+
+
+def test_failed_batch_does_not_stop_run():
+    """배치 하나가 예외로 끝나도 실패한 배치로 세고 나머지는 저널에 기록하는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer() as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        translator = _translator(server, max_concurrency=3)
+        translate_batch = translator.translate_batch
+
+        def flaky_translate_batch(batch):
+            if ITEMS[0] in batch:
+                raise ValueError("응답 처리 실패")
+            return translate_batch(batch)
+
+        translator.translate_batch = flaky_translate_batch
+        stats = translator.run(ITEMS[:50], TranslationJournal(output_file), batch_size=10)
+
+        assert stats["failed_batches"] == 1
+        assert stats["fatal_error"] is None
+        assert stats["translated"] == 40
+        assert len(_read_json(output_file)) == 40
+
+
+def test_insufficient_quota_cancels_pending_batches():
+    """크레딧 소진 오류가 나면 아직 시작하지 않은 배치를 취소하는지 확인"""
+    quota_error = RateLimitError(
+        "You exceeded your current quota",
+        response=httpx.Response(429, request=httpx.Request("POST", "http://test")),
+        body={"code": "insufficient_quota"},
+    )
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer() as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        translator = _translator(server, max_concurrency=2)
+        translate_batch = translator.translate_batch
+        started = []
+        lock = threading.Lock()
+
+        def quota_translate_batch(batch):
+            with lock:
+                started.append(batch)
+            if ITEMS[0] in batch:
+                raise quota_error
+            time.sleep(0.05)
+            return translate_batch(batch)
+
+        translator.translate_batch = quota_translate_batch
+        stats = translator.run(ITEMS, TranslationJournal(output_file), batch_size=10)
+
+        assert "quota" in stats["fatal_error"]
+        # 오류 전에 시작한 배치만 실행되고 나머지 18개 배치는 취소됨
+        assert len(started) <= 3
+        assert stats["failed_batches"] == 1
+        assert stats["translated"] == len(_read_json(output_file)) == 10 * (len(started) - 1)
+
+
+def test_rate_limiter_budget():
+    """분당 요청/토큰 한도를 넘는 요청은 버킷이 채워질 때까지 기다리는지 확인"""
+    limiter = RateLimiter(requests_per_minute=5, tokens_per_minute=1000, period=1.0)
+    start = time.perf_counter()
+    for _ in range(7):
+        limiter.acquire(10)
+    # 버킷 5개를 쓴 뒤 2개가 더 채워지는 데 약 0.4초
+    assert time.perf_counter() - start >= 0.3
+
+    limiter = RateLimiter(requests_per_minute=1000, tokens_per_minute=100, period=1.0)
+    start = time.perf_counter()
+    limiter.acquire(100)
+    limiter.release(50)
+    limiter.acquire(50)
+    # 반환된 토큰으로 바로 요청 가능
+    assert time.perf_counter() - start < 0.1
+    limiter.acquire(50)
+    assert time.perf_counter() - start >= 0.4
+
+
+def test_batch_api_job():
+    """Batch API 작업으로 남은 항목만 제출하고 결과를 최종 JSON에 합치는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer(
+        batch_polls_to_complete=3
+    ) as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        with open(output_file, "w", encoding="utf-8") as f:
+            json.dump([{"original": item, "korean": "기존"} for item in ITEMS[:50]], f)
+
+        stats = _translator(server).run_batch_job(
+            ITEMS, TranslationJournal(output_file), batch_size=40, poll_seconds=0.01
+        )
+
+        assert stats["remaining"] == 150
+        assert stats["requests"] == 4
+        assert stats["translated"] == 150
+        assert stats["failed_requests"] == 0
+        assert len(stats["batch_jobs"]) == 1
+        assert server.batches[stats["batch_jobs"][0]]["polls"] == 3
+        assert sorted(server.translated_items) == sorted(ITEMS[50:])
+
+        translations = _read_json(output_file)
+        assert len(translations) == 200
+        assert translations[0]["korean"] == "기존"
+        assert translations[-1]["korean"] == f"번역:{translations[-1]['original']}"
+        assert not os.path.exists(f"{output_file}.batch")
+
+
+def test_batch_api_resumes_submitted_job():
+    """제출된 작업이 기록되어 있으면 다시 제출하지 않고 결과를 기다리는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer() as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        translator = _translator(server)
+        job = translator._submit_batch_job(
+            translator._build_batch_job_lines([ITEMS[:30]], 0)
+        )
+        with open(f"{output_file}.batch", "w", encoding="utf-8") as f:
+            json.dump({"batch_ids": [job["id"]], "remaining": 30}, f)
+
+        stats = translator.run_batch_job(
+            ITEMS, TranslationJournal(output_file), poll_seconds=0.01
+        )
+
+        assert len(server.batches) == 1
+        assert stats["translated"] == 30
+        assert len(_read_json(output_file)) == 30
+
+
+if __name__ == "__main__":
+    print("🚀 배치 번역 엔진 테스트 시작\n")
+    test_parallel_translation()
+    test_rate_limited_requests_are_retried()
+    test_resume_skips_translated_items()
+    test_failed_batch_does_not_stop_run()
+    test_insufficient_quota_cancels_pending_batches()
+    test_rate_limiter_budget()
+    test_batch_api_job()
+    test_batch_api_resumes_submitted_job()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+오프라인 부하 테스트 도구(benchmarks/fakes.py, benchmarks/load_test.py) 테스트 스크립트
+
+짧은 시간 동안만 부하를 주므로 네트워크, OpenAI, MongoDB 없이 몇 초 안에 끝난다.
+"""
+
+import sys
+import os
+import random
+import time
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+sys.path.append(os.path.join(BASE_DIR, "benchmarks"))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from fakes import FakeMongo, Fakes, build_catalog
+from utils import analysis_cache, product_cache, translation_manager
+import load_test
+
+
+def test_catalog_clones_samples():
+    """카탈로그 제품은 바코드만 다르고 샘플 데이터를 재사용"""
+    catalog = build_catalog(50)
+    assert len(catalog) == 50
+    cloned = catalog["8800000000000"]
+    assert cloned["product"]["code"] == "8800000000000"
+    assert cloned["product"]["nutriments"]
+
+
+def test_fake_mongo_backs_app_caches():
+    """분석 캐시(mongodb 백엔드)와 제품 캐시 영속 계층이 메모리 MongoDB로 동작"""
+    fakes = Fakes(catalog_size=10, off_latency=0, llm_latency=0, mongo_latency=0).install()
+    try:
+        analysis_cache.store_analysis("key", "분석 결과")
+        assert analysis_cache.get_cached_analysis("key") == "분석 결과"
+        assert analysis_cache.get_analysis_cache_stats()["backend"] == "mongodb"
+
+        barcode = "8800000000001"
+        assert product_cache.get_product(barcode)["code"] == barcode
+        product_cache._memory_tier.clear()
+        assert product_cache.get_product(barcode)["code"] == barcode
+        stats = product_cache.get_product_cache_stats()
+        assert stats["persistent_hits"] == 1
+        assert fakes.origin_calls()["openfoodfacts"] == 1
+
+        translations = translation_manager.translate_ingredients_batch(
+            barcode, "poudre de test, arôme de test"
+        )
+        assert translations == {
+            "poudre de test": "번역:poudre de test",
+            "arôme de test": "번역:arôme de test",
+        }
+        docs = list(fakes.mongo.get_collection("ingredient_dictionary").find({}))
+        assert len(docs) == 2
+    finally:
+        fakes.stop()
+    # 대역을 걷어내면 원래 의존성으로 복원
+    assert product_cache.get_collection != fakes.mongo.get_collection
+    assert translation_manager.client.chat.completions is not fakes.completions
+
+
+def test_fake_mongo_filters():
+    """앱이 쓰는 필터($gt, $in)와 정렬/개수 제한"""
+    collection = FakeMongo().get_collection("test")
+    for index in range(5):
+        collection.replace_one(
+            {"_id": index}, {"_id": index, "created_at": 5 - index}, upsert=True
+        )
+    assert collection.find_one({"_id": 2, "created_at": {"$gt": 2}}) == {
+        "_id": 2,
+        "created_at": 3,
+    }
+    assert collection.find_one({"_id": 2, "created_at": {"$gt": 3}}) is None
+    oldest = collection.find({}, {"_id": 1}).sort("created_at", 1).limit(2)
+    collection.delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+    assert collection.estimated_document_count() == 3
+
+
+def test_open_loop_schedule():
+    """도착 시각은 응답과 무관하게 정해진 도착률을 따름"""
+    arrivals = load_test._schedule(200, 5, random.Random(1))
+    assert abs(len(arrivals) - 1000) < 100
+    assert arrivals == sorted(arrivals)
+
+
+def test_short_load_run_and_regression_check():
+    """짧은 부하로 엔드포인트별 지표를 만들고 기준 대비 회귀를 찾는지 확인"""
+    fakes = Fakes(
+        catalog_size=30, off_latency=0.01, llm_latency=0.05, mongo_latency=0
+    ).install()
+    try:
+        scenario = load_test.Scenario("long_tail", list(fakes.catalog))
+        start = time.perf_counter()
+        results = load_test.run_asgi(scenario, 40, 1.0, seed=3)
+        elapsed = time.perf_counter() - start
+    finally:
+        fakes.stop()
+
+    print(f"📊 부하 테스트 결과: {results}")
+    assert elapsed < 5
+    assert set(results) <= {"POST /barcode/<barcode>", "POST /barcode/<barcode>/stream"}
+    stats = results["POST /barcode/<barcode>"]
+    assert stats["errors"] == 0
+    assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+
+    slower = {
+        endpoint: dict(stats, requests=100, p95_ms=stats["p95_ms"] / 2)
+        for endpoint, stats in results.items()
+    }
+    regressions = load_test.find_regressions(
+        {"long_tail": results}, {"long_tail": slower}, 0.25
+    )
+    assert any("p95" in regression for regression in regressions)
+    assert not load_test.find_regressions(
+        {"long_tail": results}, {"long_tail": results}, 0.25
+    )
+
+
+if __name__ == "__main__":
+    print("🚀 오프라인 부하 테스트 도구 테스트 시작\n")
+    test_catalog_clones_samples()
+    test_fake_mongo_backs_app_caches()
+    test_fake_mongo_filters()
+    test_open_loop_schedule()
+    test_short_load_run_and_regression_check()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+작업 종류별 스레드 풀(bulkhead) 테스트 스크립트
+
+네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import bulkheads, health_analysis
+from utils.bulkheads import Bulkhead, BulkheadFullError
+from utils.metrics import render_metrics
+from prompts.api_prompts import API_MESSAGES
+import app
+
+
+def test_bounded_queue_rejects():
+    """워커와 대기열이 모두 차면 기다리지 않고 거절하는지 확인"""
+    bulkhead = Bulkhead("test", max_workers=2, max_queue=1)
+    release = threading.Event()
+    try:
+        futures = [bulkhead.submit(release.wait) for _ in range(3)]
+        start = time.perf_counter()
+        try:
+            bulkhead.submit(release.wait)
+            raise AssertionError("가득 찬 풀이 작업을 받음")
+        except BulkheadFullError as e:
+            assert e.name == "test"
+        assert time.perf_counter() - start < 0.1
+
+        time.sleep(0.05)
+        stats = bulkhead.stats()
+        assert stats["active"] == 2
+        assert stats["queued"] == 1
+        assert stats["rejected"] == 1
+
+        release.set()
+        for future in futures:
+            future.result(timeout=1)
+        # 슬롯이 반환되면 다시 받음
+        assert bulkhead.submit(lambda: "ok").result(timeout=1) == "ok"
+        assert bulkhead.stats()["completed"] == 4
+    finally:
+        release.set()
+        bulkhead.shutdown()
+
+
+def test_threads_are_reused():
+    """요청마다 스레드를 새로 만들지 않고 같은 워커를 재사용하는지 확인"""
+    bulkhead = Bulkhead("reuse", max_workers=4, max_queue=100)
+    try:
+        names = set()
+        for _ in range(50):
+            names.add(bulkhead.submit(lambda: threading.current_thread().name).result())
+        assert len(names) <= 4
+        assert all(name.startswith("bulkhead-reuse") for name in names)
+    finally:
+        bulkhead.shutdown()
+
+
+def test_map_limits_concurrency_and_keeps_order():
+    """map은 요청당 동시 실행 수를 제한하고 입력 순서대로 결과(또는 예외)를 반환"""
+    bulkhead = Bulkhead("map", max_workers=8, max_queue=0)
+    running = 0
+    peak = 0
+    lock = threading.Lock()
+
+    def work(value):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.01)
+        with lock:
+            running -= 1
+        if value == 3:
+            raise ValueError("실패")
+        return value * 10
+
+    try:
+        results = bulkhead.map(work, range(10), max_concurrency=2)
+    finally:
+        bulkhead.shutdown()
+    assert peak == 2
+    assert isinstance(results[3], ValueError)
+    assert [result for index, result in enumerate(results) if index != 3] == [
+        0, 10, 20, 40, 50, 60, 70, 80, 90
+    ]
+
+
+def test_slow_llm_does_not_starve_off_pool():
+    """LLM 풀이 가득 차도 OpenFoodFacts 풀 작업은 바로 실행되는지 확인"""
+    bulkheads.shutdown_bulkheads()
+    original_config = dict(bulkheads.BULKHEAD_CONFIG)
+    bulkheads.BULKHEAD_CONFIG[bulkheads.LLM_POOL] = (2, 0)
+    release = threading.Event()
+    try:
+        for _ in range(2):
+            bulkheads.submit(bulkheads.LLM_POOL, release.wait)
+        try:
+            bulkheads.submit(bulkheads.LLM_POOL, release.wait)
+            raise AssertionError("가득 찬 LLM 풀이 작업을 받음")
+        except BulkheadFullError:
+            pass
+
+        start = time.perf_counter()
+        assert bulkheads.submit(bulkheads.OFF_POOL, lambda: "제품").result(timeout=1) == "제품"
+        assert time.perf_counter() - start < 0.1
+
+        async def load():
+            return await bulkheads.run_async(bulkheads.MONGO_POOL, lambda: "문서")
+
+        assert asyncio.run(load()) == "문서"
+
+        text = render_metrics()
+        assert 'todakhanip_bulkhead_active{pool="llm"} 2' in text
+        assert 'todakhanip_bulkhead_rejected_total{pool="llm"} 1' in text
+        assert 'todakhanip_bulkhead_completed_total{pool="off"} 1' in text
+        assert "# TYPE todakhanip_bulkhead_queue_depth gauge" in text
+    finally:
+        release.set()
+        bulkheads.BULKHEAD_CONFIG.update(original_config)
+        bulkheads.shutdown_bulkheads()
+
+
+def test_busy_llm_pool_returns_503():
+    """LLM 풀이 가득 차면 바코드 분석 요청이 503으로 거절되는지 확인"""
+    bulkheads.shutdown_bulkheads()
+    original_config = dict(bulkheads.BULKHEAD_CONFIG)
+    original_get_product = app.get_product
+    bulkheads.BULKHEAD_CONFIG[bulkheads.LLM_POOL] = (1, 0)
+    release = threading.Event()
+    app.get_product = lambda barcode: {"code": barcode, "product_name": "테스트"}
+    try:
+        bulkheads.submit(bulkheads.LLM_POOL, release.wait)
+        response = app.app.test_client().post(
+            "/barcode/3017620422003", json={"health_profile": {"name": "홍길동"}}
+        )
+    finally:
+        release.set()
+        app.get_product = original_get_product
+        bulkheads.BULKHEAD_CONFIG.update(original_config)
+        bulkheads.shutdown_bulkheads()
+    assert response.status_code == 503
+    assert response.get_json()["error"] == API_MESSAGES["SERVICE_BUSY"]
+
+
+def test_rejected_summaries_become_none():
+    """LLM 풀이 가득 차 거절된 제품 요약은 None으로 처리"""
+    bulkheads.shutdown_bulkheads()
+    original_config = dict(bulkheads.BULKHEAD_CONFIG)
+    original_summarize = health_analysis.summarize_product
+    bulkheads.BULKHEAD_CONFIG[bulkheads.LLM_POOL] = (1, 0)
+    release = threading.Event()
+    health_analysis.summarize_product = lambda product_info: product_info["name"]
+    try:
+        bulkheads.submit(bulkheads.LLM_POOL, release.wait)
+        summaries = health_analysis.summarize_products([{"name": "A"}, {"name": "B"}])
+        assert summaries == [None, None]
+        release.set()
+        time.sleep(0.05)
+        # 슬롯이 하나뿐이어도 자기 작업이 끝나기를 기다렸다가 이어서 넣음
+        summaries = health_analysis.summarize_products([{"name": "A"}, {"name": "B"}])
+        assert summaries == ["A", "B"]
+    finally:
+        release.set()
+        health_analysis.summarize_product = original_summarize
+        bulkheads.BULKHEAD_CONFIG.update(original_config)
+        bulkheads.shutdown_bulkheads()
+
+
+if __name__ == "__main__":
+    print("🚀 작업 종류별 스레드 풀 테스트 시작\n")
+    test_bounded_queue_rejects()
+    test_threads_are_reused()
+    test_map_limits_concurrency_and_keeps_order()
+    test_slow_llm_does_not_starve_off_pool()
+    test_busy_llm_pool_returns_503()
+    test_rejected_summaries_become_none()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+로컬 OpenAI 스텁 서버
+
+/v1/chat/completions 요청의 마지막 사용자 메시지에서 번호를 붙인 번역 항목을 꺼내
+{"t": [{"i": 번호, "k": "번역:<원문>"}]} 형식으로 응답하며, 요청 수와 최대 동시 요청 수를 집계한다.
+응답이 요청의 max_tokens(4글자당 1토큰)를 넘으면 잘라서 finish_reason "length"로 반환한다.
+Batch API(/v1/files, /v1/batches)도 흉내 내어, 작업 상태를 batch_polls_to_complete번
+조회하면 입력 파일의 요청을 모두 처리한 출력 파일을 만든다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from email.parser import BytesParser
+from email.policy import HTTP
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.translation_output import parse_numbered_items
+
+
+class FakeOpenAIServer:
+    """
+    배치 번역 스크립트 테스트용 OpenAI 스텁 서버
+
+    Args:
+        latency (float): 응답 지연 시간(초)
+        rate_limit_first (int): 처음 N개 요청에 429를 반환
+        max_answer_items (int): 응답에 담을 최대 항목 수 (넘으면 max_tokens에서 잘린 것처럼 응답)
+        retry_after (float): 429 응답의 Retry-After 헤더 값(초)
+        batch_polls_to_complete (int): Batch 작업이 완료되기까지 필요한 상태 조회 수
+    """
+
+    def __init__(
+        self,
+        latency=0.0,
+        rate_limit_first=0,
+        max_answer_items=None,
+        retry_after=0.1,
+        batch_polls_to_complete=2,
+    ):
+        self.latency = latency
+        self.rate_limit_first = rate_limit_first
+        self.max_answer_items = max_answer_items
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.rate_limited_count = 0
+        self.translated_items = []
+        self.active = 0
+        self.peak_active = 0
+        self.batch_polls_to_complete = batch_polls_to_complete
+        self.files = {}
+        self.batches = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/v1"
+
+    def translate(self, items):
+        """가짜 번역 결과"""
+        return [
+            {"i": index, "k": f"번역:{item}"} for index, item in enumerate(items, 1)
+        ]
+
+    def _completion(self, request):
+        items = parse_numbered_items(request["messages"][-1]["content"])
+        with self._lock:
+            self.translated_items.extend(items)
+
+        answer = json.dumps({"t": self.translate(items)}, ensure_ascii=False)
+        finish_reason = "stop"
+        if self.max_answer_items is not None and len(items) > self.max_answer_items:
+            # 마지막 항목 중간에서 잘린 응답
+            answer = json.dumps(
+                {"t": self.translate(items)[: self.max_answer_items + 1]},
+                ensure_ascii=False,
+            )[:-6]
+            finish_reason = "length"
+        max_tokens = request.get("max_tokens")
+        if max_tokens is not None and len(answer) // 4 > max_tokens:
+            answer = answer[: max_tokens * 4]
+            finish_reason = "length"
+        prompt_tokens = sum(len(m["content"]) for m in request["messages"]) // 4
+        completion_tokens = len(answer) // 4
+        return {
+            "id": f"chatcmpl-{self.request_count}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request["model"],
+            "choices": [
+                {
+                    "index": 0,
+                    "message": {"role": "assistant", "content": answer},
+                    "finish_reason": finish_reason,
+                }
+            ],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    def _upload_file(self, content_type, body):
+        """multipart/form-data로 올라온 파일 저장"""
+        message = BytesParser(policy=HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode() + body
+        )
+        fields = {
+            part.get_param("name", header="content-disposition"): part.get_payload(
+                decode=True
+            )
+            for part in message.iter_parts()
+        }
+        return {
+            "id": self._store_file(fields["file"]),
+            "object": "file",
+            "bytes": len(fields["file"]),
+            "created_at": int(time.time()),
+            "filename": "input.jsonl",
+            "purpose": fields["purpose"].decode(),
+            "status": "processed",
+        }
+
+    def _store_file(self, content):
+        with self._lock:
+            file_id = f"file-{len(self.files) + 1}"
+            self.files[file_id] = content
+        return file_id
+
+    def _create_batch(self, request):
+        lines = self.files[request["input_file_id"]].decode("utf-8").splitlines()
+        with self._lock:
+            batch_id = f"batch_{len(self.batches) + 1}"
+            self.batches[batch_id] = {
+                "id": batch_id,
+                "object": "batch",
+                "endpoint": request["endpoint"],
+                "input_file_id": request["input_file_id"],
+                "completion_window": request["completion_window"],
+                "status": "validating",
+                "output_file_id": None,
+                "error_file_id": None,
+                "request_counts": {"total": len(lines), "completed": 0, "failed": 0},
+                "polls": 0,
+            }
+            return dict(self.batches[batch_id])
+
+    def _poll_batch(self, batch_id):
+        """조회할 때마다 상태를 진행시키고, 마지막 조회에서 입력 요청을 모두 처리"""
+        with self._lock:
+            batch = self.batches[batch_id]
+            batch["polls"] += 1
+            if batch["status"] in ("completed", "failed", "expired", "cancelled"):
+                return dict(batch)
+            if batch["polls"] < self.batch_polls_to_complete:
+                batch["status"] = "in_progress"
+                return dict(batch)
+            input_lines = self.files[batch["input_file_id"]].decode("utf-8").splitlines()
+
+        output = []
+        for line in input_lines:
+            request = json.loads(line)
+            output.append(
+                json.dumps(
+                    {
+                        "id": f"batch_req_{request['custom_id']}",
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "request_id": request["custom_id"],
+                            "body": self._completion(request["body"]),
+                        },
+                        "error": None,
+                    },
+                    ensure_ascii=False,
+                )
+            )
+        output_file_id = self._store_file(("\n".join(output) + "\n").encode("utf-8"))
+        with self._lock:
+            batch["status"] = "completed"
+            batch["output_file_id"] = output_file_id
+            batch["request_counts"]["completed"] = len(output)
+            return dict(batch)
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send_json(self, status, payload, headers=None):
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                path = self.path.split("?")[0]
+                if path.startswith("/v1/batches/"):
+                    batch_id = path.rsplit("/", 1)[-1]
+                    self._send_json(200, stub._poll_batch(batch_id))
+                elif path.startswith("/v1/files/") and path.endswith("/content"):
+                    content = stub.files[path.split("/")[3]]
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/octet-stream")
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                else:
+                    self._send_json(404, {"error": {"message": "not found"}})
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                path = self.path.split("?")[0]
+                if path == "/v1/files":
+                    self._send_json(
+                        200, stub._upload_file(self.headers["Content-Type"], body)
+                    )
+                    return
+                if path == "/v1/batches":
+                    self._send_json(200, stub._create_batch(json.loads(body)))
+                    return
+                request = json.loads(body)
+
+                with stub._lock:
+                    stub.request_count += 1
+                    rate_limited = stub.request_count <= stub.rate_limit_first
+                    if rate_limited:
+                        stub.rate_limited_count += 1
+                    else:
+                        stub.active += 1
+                        stub.peak_active = max(stub.peak_active, stub.active)
+
+                if rate_limited:
+                    self._send_json(
+                        429,
+                        {
+                            "error": {
+                                "message": "Rate limit reached",
+                                "type": "requests",
+                                "code": "rate_limit_exceeded",
+                            }
+                        },
+                        {"Retry-After": str(stub.retry_after)},
+                    )
+                    return
+
+                try:
+                    time.sleep(stub.latency)
+                    self._send_json(200, stub._completion(request))
+                finally:
+                    with stub._lock:
+                        stub.active -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with FakeOpenAIServer() as server:
+        print(f"🚀 OpenAI 스텁 서버 실행 중: {server.base_url}")
+        threading.Event().wait()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+로컬 OpenFoodFacts 스텁 서버
+
+data/sample-data-*.json을 /api/v2/product/<barcode>.json 경로로 재생하며,
+요청 수, 새로 맺어진 TCP 커넥션 수, 보낸 응답 본문 크기를 집계한다.
+OpenFoodFacts처럼 fields 쿼리 파라미터가 있으면 해당 제품 필드만 응답한다.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qs, urlsplit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+SAMPLE_FILES = ["sample-data-1.json", "sample-data-2.json", "sample-data-3.json"]
+
+
+def load_sample_products():
+    """샘플 데이터를 {바코드: OFF 응답 JSON} 형태로 로드"""
+    products = {}
+    for file_name in SAMPLE_FILES:
+        with open(os.path.join(DATA_DIR, file_name), "r", encoding="utf-8") as f:
+            data = json.load(f)
+        products[str(data["code"])] = data
+    return products
+
+
+class FakeOpenFoodFactsServer:
+    """
+    keep-alive(HTTP/1.1)를 지원하는 OpenFoodFacts 스텁 서버
+
+    Args:
+        products (dict): {바코드: OFF 응답 JSON} (기본값: 샘플 데이터)
+        fail_first (int): 처음 N개 요청에 503을 반환 (재시도 테스트용)
+        ignore_fields (bool): fields 파라미터를 무시하고 전체 문서를 응답 (미러 서버 흉내)
+        latency (float): 응답 지연 시간(초)
+    """
+
+    def __init__(self, products=None, fail_first=0, ignore_fields=False, latency=0.0):
+        self.products = products if products is not None else load_sample_products()
+        self.fail_first = fail_first
+        self.ignore_fields = ignore_fields
+        self.latency = latency
+        self.requested_fields = []
+        self.bytes_sent = 0
+        self.request_count = 0
+        self.connection_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}/api/v2/product"
+
+    def _make_handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connection_count += 1
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.request_count += 1
+                    should_fail = stub.request_count <= stub.fail_first
+
+                url = urlsplit(self.path)
+                barcode = url.path.rsplit("/", 1)[-1].removesuffix(".json")
+                fields = parse_qs(url.query).get("fields")
+                if fields:
+                    fields = fields[0].split(",")
+                    with stub._lock:
+                        stub.requested_fields.append(fields)
+
+                if should_fail:
+                    status, payload = 503, {"status": 0}
+                elif barcode in stub.products:
+                    status, payload = 200, stub.products[barcode]
+                    if fields and not stub.ignore_fields:
+                        product = payload["product"]
+                        payload = dict(
+                            payload,
+                            product={f: product[f] for f in fields if f in product},
+                        )
+                else:
+                    status, payload = 404, {
+                        "code": barcode,
+                        "status": 0,
+                        "status_verbose": "product not found",
+                    }
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+                body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                with stub._lock:
+                    stub.bytes_sent += len(body)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    with FakeOpenFoodFactsServer() as server:
+        print(f"🚀 스텁 서버 실행 중: {server.base_url}")
+        threading.Event().wait()
@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+원료 사전 기반 번역 테스트 스크립트
+
+가짜 OpenAI 클라이언트와 가짜 MongoDB 컬렉션을 사용하므로
+네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import asyncio
+import json
+import tempfile
+from contextlib import contextmanager
+from types import SimpleNamespace
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import translation_manager, translation_store
+from utils.translation_output import parse_numbered_items
+
+KOREAN = {
+    "Sucre": "설탕",
+    "huile de palme": "팜유",
+    "noisettes": "헤이즐넛",
+    "lait écrémé en poudre": "탈지분유",
+    "cacao maigre": "저지방 코코아",
+}
+
+
+class FakeCollection:
+    """원료 사전/바코드별 번역 문서 컬렉션 대역"""
+
+    def __init__(self, legacy=None):
+        self.legacy = legacy or {}
+        self.saved = []
+        self.probed = []
+
+    def find_one(self, query):
+        self.probed.append(query["_id"])
+        translations = self.legacy.get(query["_id"])
+        return {"_id": query["_id"], "translations": translations} if translations else None
+
+    def find(self, query, projection=None):
+        return []
+
+    def bulk_write(self, requests, ordered=True):
+        self.saved.extend(requests)
+
+
+class FakeTranslator:
+    """요청받은 원료만 번역해 주는 대역 (모르는 원료는 빠뜨림)"""
+
+    def __init__(self):
+        self.requested = []
+
+    def _respond(self, kwargs):
+        ingredients = parse_numbered_items(kwargs["messages"][1]["content"])
+        self.requested.append(ingredients)
+        content = json.dumps(
+            {
+                "t": [
+                    {"i": index, "k": KOREAN[item]}
+                    for index, item in enumerate(ingredients, 1)
+                    if item in KOREAN
+                ]
+            },
+            ensure_ascii=False,
+        )
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+
+    def create(self, **kwargs):
+        return self._respond(kwargs)
+
+
+class FakeAsyncTranslator(FakeTranslator):
+    async def create(self, **kwargs):
+        return self._respond(kwargs)
+
+
+@contextmanager
+def _patched(legacy=None):
+    """원료 사전과 번역 저장소를 비우고 OpenAI/MongoDB를 가짜로 교체"""
+    collection = FakeCollection(legacy)
+    store_path = translation_store._store_path
+    translation_store.close_translation_store()
+    translator = FakeTranslator()
+    async_translator = FakeAsyncTranslator()
+    original = (
+        translation_manager.get_collection,
+        translation_manager.client,
+        translation_manager.async_client,
+    )
+    translation_manager.get_collection = lambda name: collection
+    translation_manager.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=translator)
+    )
+    translation_manager.async_client = SimpleNamespace(
+        chat=SimpleNamespace(completions=async_translator)
+    )
+    translation_manager.clear_ingredient_dictionary()
+    try:
+        yield collection, translator, async_translator
+    finally:
+        (
+            translation_manager.get_collection,
+            translation_manager.client,
+            translation_manager.async_client,
+        ) = original
+        translation_manager.clear_ingredient_dictionary()
+        translation_store.open_translation_store(store_path)
+
+
+def test_normalize_ingredient():
+    """대소문자, 공백, 하이픈 표기가 달라도 같은 원료로 취급"""
+    normalize = translation_manager.normalize_ingredient
+    assert normalize("Huile de  palme") == normalize("huile-de-palme")
+    assert normalize(" SUCRE ") == normalize("sucre")
+
+
+def test_only_missing_ingredients_are_sent():
+    """사전에 없는 원료만 한 번의 LLM 호출로 번역하고, 이후 제품은 사전으로 처리"""
+    with _patched() as (collection, translator, _):
+        first = translation_manager.translate_ingredients_batch(
+            "1", "Sucre, huile de palme, noisettes"
+        )
+        assert first == {"Sucre": "설탕", "huile de palme": "팜유", "noisettes": "헤이즐넛"}
+        assert translator.requested == [["Sucre", "huile de palme", "noisettes"]]
+        assert len(collection.saved) == 3
+
+        # 원료가 겹치는 다른 제품은 새 원료만 요청
+        second = translation_manager.translate_ingredients_batch(
+            "2", "sucre, Huile de palme, cacao maigre"
+        )
+        assert second["sucre"] == "설탕"
+        assert second["cacao maigre"] == "저지방 코코아"
+        assert translator.requested[-1] == ["cacao maigre"]
+
+        # 사전에 모두 있는 제품은 LLM을 호출하지 않음
+        translation_manager.translate_ingredients_batch("3", "noisettes, sucre")
+        assert len(translator.requested) == 2
+
+        stats = translation_manager.get_ingredient_dictionary_stats()
+        print(f"📊 원료 사전 통계: {stats}")
+        assert stats["llm_calls"] == 2
+        assert stats["llm_ingredients"] == 4
+        assert stats["size"] == 4
+
+
+def test_async_uses_same_dictionary():
+    """비동기 경로도 같은 원료 사전을 사용"""
+    with _patched() as (_, translator, async_translator):
+        translation_manager.translate_ingredients_batch("1", "Sucre, noisettes")
+        result = asyncio.run(
+            translation_manager.translate_ingredients_batch_async(
+                "2", "Sucre, lait écrémé en poudre"
+            )
+        )
+        assert result == {"Sucre": "설탕", "lait écrémé en poudre": "탈지분유"}
+        assert async_translator.requested == [["lait écrémé en poudre"]]
+
+
+def test_warm_from_file_and_legacy_documents():
+    """번역 파일과 이전 바코드별 문서로 사전을 채우면 LLM 호출이 없음"""
+    with tempfile.NamedTemporaryFile(
+        "w", suffix=".json", delete=False, encoding="utf-8"
+    ) as f:
+        json.dump([{"original": "sugar", "korean": "설탕"}], f, ensure_ascii=False)
+        file_path = f.name
+
+    original_files = translation_manager.INGREDIENT_DICTIONARY_FILES
+    translation_manager.INGREDIENT_DICTIONARY_FILES = [file_path, "없는-파일.json"]
+    try:
+        with _patched(legacy={"9": {"noisettes": "헤이즐넛"}}) as (
+            collection,
+            translator,
+            _,
+        ):
+            translation_manager.load_ingredient_dictionary()
+            assert translation_manager.translate_ingredients_batch("8", "Sugar") == {
+                "Sugar": "설탕"
+            }
+            assert translation_manager.translate_ingredients_batch(
+                "9", "noisettes"
+            ) == {"noisettes": "헤이즐넛"}
+            assert translator.requested == []
+            # 이전 문서의 번역은 원료 사전으로 옮겨 저장
+            assert len(collection.saved) == 1
+    finally:
+        translation_manager.INGREDIENT_DICTIONARY_FILES = original_files
+        os.remove(file_path)
+
+
+def test_untranslated_ingredients_are_not_requested_again():
+    """LLM이 빠뜨린 원료와 이미 조회한 기존 문서는 다시 요청하지 않음"""
+    with _patched() as (collection, translator, async_translator):
+        first = translation_manager.translate_ingredients_batch("1", "Sucre, E999")
+        assert first == {"Sucre": "설탕"}
+        assert translator.requested == [["Sucre", "E999"]]
+        assert collection.probed == ["1"]
+
+        # 같은 바코드를 다시 스캔하면 MongoDB 조회와 LLM 호출이 없음
+        assert translation_manager.translate_ingredients_batch("1", "Sucre, E999") == {
+            "Sucre": "설탕"
+        }
+        # 다른 제품도 번역하지 못한 원료는 다시 요청하지 않음
+        translation_manager.translate_ingredients_batch("2", "e999")
+        result = asyncio.run(
+            translation_manager.translate_ingredients_batch_async(
+                "3", "E999, noisettes"
+            )
+        )
+        assert result == {"noisettes": "헤이즐넛"}
+        assert translator.requested == [["Sucre", "E999"]]
+        assert async_translator.requested == [["noisettes"]]
+        assert collection.probed == ["1", "2", "3"]
+        stats = translation_manager.get_ingredient_dictionary_stats()
+        assert stats["untranslated"] == 1
+
+
+if __name__ == "__main__":
+    print("🚀 원료 사전 테스트 시작\n")
+    test_normalize_ingredient()
+    test_only_missing_ingredients_are_sent()
+    test_async_uses_same_dictionary()
+    test_warm_from_file_and_legacy_documents()
+    test_untranslated_ingredients_are_not_requested_again()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+OpenFoodFacts 덤프 가져오기 및 로컬 제품 인덱스 테스트 스크립트 (네트워크/MongoDB 없이 실행 가능)
+"""
+
+import sys
+import os
+import gzip
+import json
+import tempfile
+import time
+from contextlib import contextmanager
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+# 제품 파서가 임포트하는 번역 모듈이 OpenAI 클라이언트를 만들므로 테스트용 키 설정
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import local_product_store, product_cache
+from utils.product_parser import extract_product_info
+
+SAMPLE_FILE = os.path.join(BASE_DIR, "data", "sample-data-1.json")
+
+CSV_HEADER = [
+    "code",
+    "product_name",
+    "brands",
+    "countries_tags",
+    "allergens_tags",
+    "nutrient_levels_tags",
+    "nutriscore_grade",
+    "sugars_100g",
+    "salt_100g",
+    "ingredients_text",
+    "last_modified_t",
+]
+
+
+def _sample_product():
+    with open(SAMPLE_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)["product"]
+
+
+def _write_csv(path, rows):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\t".join(CSV_HEADER) + "\n")
+        for row in rows:
+            f.write("\t".join(str(row.get(column, "")) for column in CSV_HEADER) + "\n")
+
+
+@contextmanager
+def _store():
+    """임시 디렉토리의 로컬 제품 인덱스를 사용하도록 설정"""
+    original = local_product_store.LOCAL_PRODUCT_STORE_FILE
+    with tempfile.TemporaryDirectory() as temp_dir:
+        local_product_store.close_local_store()
+        local_product_store.LOCAL_PRODUCT_STORE_FILE = os.path.join(
+            temp_dir, "products.sqlite"
+        )
+        try:
+            yield temp_dir
+        finally:
+            local_product_store.close_local_store()
+            local_product_store.LOCAL_PRODUCT_STORE_FILE = original
+
+
+def test_import_jsonl_projects_fields():
+    """JSONL 덤프에서 extract_product_info가 쓰는 필드만 저장되는지 확인"""
+    sample = _sample_product()
+    with _store() as temp_dir:
+        dump_file = os.path.join(temp_dir, "products.jsonl.gz")
+        with gzip.open(dump_file, "wt", encoding="utf-8") as f:
+            f.write(json.dumps(sample) + "\n")
+            f.write("not json\n")
+
+        result = local_product_store.import_products(
+            local_product_store.iter_dump_products(dump_file)
+        )
+        assert result["read"] == 1
+        assert result["written"] == 1
+
+        product = local_product_store.get_local_product(sample["code"])
+        assert set(product) <= set(local_product_store.OPENFOODFACTS_PRODUCT_FIELDS)
+        assert len(product) < len(sample)
+        assert extract_product_info(product, sample["code"]) == extract_product_info(
+            sample, sample["code"]
+        )
+        assert local_product_store.get_local_product("0000000000000") is None
+
+
+def test_import_csv():
+    """CSV 덤프 행이 API 응답과 같은 형태로 변환되는지 확인"""
+    with _store() as temp_dir:
+        dump_file = os.path.join(temp_dir, "products.csv")
+        _write_csv(
+            dump_file,
+            [
+                {
+                    "code": "1234567890123",
+                    "product_name": "Choco",
+                    "countries_tags": "en:france,en:germany",
+                    "allergens_tags": "en:milk",
+                    "nutrient_levels_tags": "en:sugars-in-high-quantity,en:salt-in-low-quantity",
+                    "sugars_100g": "56.3",
+                    "salt_100g": "0",
+                    "ingredients_text": "sugar, cocoa (20%, fair trade), milk",
+                    "last_modified_t": "1700000000",
+                }
+            ],
+        )
+        local_product_store.import_products(
+            local_product_store.iter_dump_products(dump_file)
+        )
+
+        product = local_product_store.get_local_product("1234567890123")
+        assert product["countries_tags"] == ["en:france", "en:germany"]
+        assert product["nutrient_levels"] == {"sugars": "high", "salt": "low"}
+        assert product["nutriments"] == {"sugars_100g": 56.3, "salt_100g": 0}
+        assert [item["text"] for item in product["ingredients"]] == [
+            "sugar",
+            "cocoa (20%, fair trade)",
+            "milk",
+        ]
+
+
+def test_delta_refresh():
+    """변경분은 더 최근에 수정된 제품만 교체하는지 확인"""
+    with _store():
+        local_product_store.import_products(
+            [
+                {"code": "1", "product_name": "v2", "last_modified_t": 200},
+                {"code": "2", "product_name": "v2", "last_modified_t": 200},
+            ]
+        )
+        result = local_product_store.import_products(
+            [
+                {"code": "1", "product_name": "v1", "last_modified_t": 100},
+                {"code": "2", "product_name": "v3", "last_modified_t": 300},
+                {"code": "3", "product_name": "v1", "last_modified_t": 300},
+            ]
+        )
+        assert result["written"] == 2
+        assert local_product_store.get_local_product("1")["product_name"] == "v2"
+        assert local_product_store.get_local_product("2")["product_name"] == "v3"
+
+        stats = local_product_store.get_local_store_stats()
+        assert stats["products"] == 3
+        assert stats["last_modified_t"] == 300
+
+
+def test_product_cache_resolves_locally():
+    """로컬 인덱스에 있는 제품은 OpenFoodFacts를 호출하지 않는지 확인"""
+    calls = []
+    original = (product_cache.PRODUCT_CACHE_PERSISTENT, product_cache.fetch_product)
+    product_cache.PRODUCT_CACHE_PERSISTENT = False
+    product_cache.fetch_product = lambda barcode: calls.append(barcode)
+    product_cache.clear_product_cache()
+    try:
+        with _store():
+            local_product_store.import_products(
+                [{"code": "1234567890123", "product_name": "local"}]
+            )
+            product = product_cache.get_product("1234567890123")
+            assert product["product_name"] == "local"
+            assert calls == []
+            assert product_cache.get_product_cache_stats()["local_hits"] == 1
+
+            assert product_cache.get_product("0000000000000") is None
+            assert calls == ["0000000000000"]
+    finally:
+        product_cache.PRODUCT_CACHE_PERSISTENT, product_cache.fetch_product = original
+        product_cache.clear_product_cache()
+
+
+def test_lookup_latency():
+    """로컬 인덱스 조회 p99가 1ms 미만인지 확인"""
+    sample = _sample_product()
+    with _store():
+        local_product_store.import_products(
+            dict(local_product_store.project_product(sample), code=str(code))
+            for code in range(10000)
+        )
+        local_product_store.get_local_product("0")
+
+        samples = []
+        for code in range(0, 10000, 5):
+            start = time.perf_counter()
+            assert local_product_store.get_local_product(str(code)) is not None
+            samples.append(time.perf_counter() - start)
+        samples.sort()
+        p99_us = samples[int(len(samples) * 0.99)] * 1_000_000
+        print(f"📊 로컬 제품 조회 p99: {p99_us:.1f}µs")
+        assert p99_us < 1000
+
+
+if __name__ == "__main__":
+    print("🚀 로컬 제품 인덱스 테스트 시작\n")
+    test_import_jsonl_projects_fields()
+    test_import_csv()
+    test_delta_refresh()
+    test_product_cache_resolves_locally()
+    test_lookup_latency()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+단계별 처리 시간 지표(/metrics) 테스트 스크립트
+
+로컬 OpenFoodFacts 스텁 서버와 가짜 OpenAI 클라이언트를 사용하므로
+네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from fake_openfoodfacts_server import FakeOpenFoodFactsServer
+from utils import analysis_cache, health_analysis, metrics, openfoodfacts_client, product_cache
+from utils.metrics import (
+    CACHE_HIT,
+    CACHE_MISS,
+    observe_stage,
+    render_metrics,
+    reset_metrics,
+    stage_timer,
+)
+import app
+
+SAMPLE_BARCODE = "3017620422003"
+
+
+def _sample_value(text, name, **labels):
+    """Prometheus 텍스트에서 이름과 레이블이 일치하는 샘플 값"""
+    for line in text.splitlines():
+        if line.startswith("#") or not line.startswith(name + "{"):
+            continue
+        series, value = line.rsplit(" ", 1)
+        if all(f'{key}="{label}"' in series for key, label in labels.items()):
+            return float(value)
+    return None
+
+
+def test_histogram_format():
+    """버킷은 누적 개수로, 합계와 개수는 같은 레이블로 출력되는지 확인"""
+    reset_metrics()
+    observe_stage("json_decode", 0.0007)
+    observe_stage("json_decode", 0.003)
+    observe_stage("json_decode", 100.0)
+
+    text = render_metrics()
+    name = "todakhanip_stage_duration_seconds"
+    assert "# TYPE todakhanip_stage_duration_seconds histogram" in text
+    assert _sample_value(text, name + "_bucket", stage="json_decode", le="0.0005") == 0
+    assert _sample_value(text, name + "_bucket", stage="json_decode", le="0.001") == 1
+    assert _sample_value(text, name + "_bucket", stage="json_decode", le="0.005") == 2
+    assert _sample_value(text, name + "_bucket", stage="json_decode", le="60.0") == 2
+    assert _sample_value(text, name + "_bucket", stage="json_decode", le="+Inf") == 3
+    assert _sample_value(text, name + "_count", stage="json_decode", cache="none") == 3
+    assert round(_sample_value(text, name + "_sum", stage="json_decode"), 4) == 100.0037
+
+
+def test_stage_timer_labels_and_errors():
+    """블록 안에서 정한 캐시 레이블과 예외 횟수를 기록하는지 확인"""
+    reset_metrics()
+    with stage_timer("mongo_lookup") as timer:
+        timer.cache = CACHE_HIT
+    try:
+        with stage_timer("mongo_lookup", CACHE_MISS):
+            raise RuntimeError("MongoDB 장애")
+    except RuntimeError:
+        pass
+
+    text = render_metrics()
+    name = "todakhanip_stage_duration_seconds_count"
+    assert _sample_value(text, name, stage="mongo_lookup", cache="hit") == 1
+    assert _sample_value(text, name, stage="mongo_lookup", cache="miss") == 1
+    assert _sample_value(text, "todakhanip_stage_errors_total", stage="mongo_lookup") == 1
+
+
+def test_observe_overhead():
+    """스크레이프하지 않을 때 측정 비용이 요청 처리 시간에 비해 무시할 만한지 확인"""
+    reset_metrics()
+    count = 100000
+    start = time.perf_counter()
+    for _ in range(count):
+        observe_stage("extract_product_info", 0.0002)
+    per_call_us = (time.perf_counter() - start) / count * 1e6
+    print(f"📊 observe_stage 1회 비용: {per_call_us:.2f}µs")
+    assert per_call_us < 20
+
+    metrics.METRICS_ENABLED = False
+    try:
+        observe_stage("extract_product_info", 0.0002)
+    finally:
+        metrics.METRICS_ENABLED = True
+    assert _sample_value(
+        render_metrics(), "todakhanip_stage_duration_seconds_count", stage="extract_product_info"
+    ) == count
+
+
+def test_metrics_endpoint_after_requests():
+    """바코드 조회와 건강 분석 후 /metrics에 단계별 지표가 나오는지 확인"""
+    completion = SimpleNamespace(
+        choices=[
+            SimpleNamespace(
+                message=SimpleNamespace(content="분석 결과"), finish_reason="stop"
+            )
+        ]
+    )
+    originals = (
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+        product_cache.PRODUCT_CACHE_PERSISTENT,
+        health_analysis.client,
+        app.run_ingredients_translation,
+    )
+    with FakeOpenFoodFactsServer() as server:
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL = server.base_url
+        product_cache.PRODUCT_CACHE_PERSISTENT = False
+        product_cache.clear_product_cache()
+        analysis_cache.set_analysis_cache_backend("memory")
+        health_analysis.client = SimpleNamespace(
+            chat=SimpleNamespace(
+                completions=SimpleNamespace(create=lambda **kwargs: completion)
+            )
+        )
+        app.run_ingredients_translation = lambda barcode, product_info, load_legacy=None: {}
+        reset_metrics()
+        try:
+            client = app.app.test_client()
+            for _ in range(2):
+                response = client.post(
+                    f"/barcode/{SAMPLE_BARCODE}",
+                    json={"health_profile": {"name": "홍길동"}},
+                )
+                assert response.get_json()["data"]["health_analysis"] == "분석 결과"
+
+            response = client.get("/metrics")
+        finally:
+            (
+                openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+                product_cache.PRODUCT_CACHE_PERSISTENT,
+                health_analysis.client,
+                app.run_ingredients_translation,
+            ) = originals
+            product_cache.clear_product_cache()
+
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    text = response.get_data(as_text=True)
+    name = "todakhanip_stage_duration_seconds_count"
+    assert _sample_value(text, name, stage="product_lookup", cache="miss") == 1
+    assert _sample_value(text, name, stage="product_lookup", cache="hit") == 1
+    assert _sample_value(text, name, stage="off_fetch") == 1
+    assert _sample_value(text, name, stage="json_decode") == 1
+    assert _sample_value(text, name, stage="extract_product_info") == 2
+    assert _sample_value(text, name, stage="health_analysis", cache="miss") == 1
+    assert _sample_value(text, name, stage="health_analysis", cache="hit") == 1
+
+
+if __name__ == "__main__":
+    print("🚀 단계별 처리 시간 지표 테스트 시작\n")
+    test_histogram_format()
+    test_stage_timer_labels_and_errors()
+    test_observe_overhead()
+    test_metrics_endpoint_after_requests()
+    print("🎉 모든 테스트 완료!")
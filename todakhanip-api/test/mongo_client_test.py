@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+mongo_client 공유 커넥션 풀 테스트 스크립트 (MongoDB 서버 없이 실행 가능)
+"""
+
+import sys
+import os
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import mongo_client
+
+
+def test_shared_client_is_reused():
+    """같은 프로세스에서는 동일한 클라이언트를 재사용하는지 확인"""
+    mongo_client.close_mongo_client()
+    try:
+        first = mongo_client.get_mongo_client()
+        second = mongo_client.get_mongo_client()
+        assert first is second
+        assert mongo_client.get_collection("ingredients").database.client is first
+        assert first.options.pool_options.max_pool_size == (
+            mongo_client.MONGODB_POOL_OPTIONS["maxPoolSize"]
+        )
+    finally:
+        mongo_client.close_mongo_client()
+
+
+def test_new_client_after_fork():
+    """fork 이후(pid 변경)에는 새 클라이언트를 만드는지 확인"""
+    mongo_client.close_mongo_client()
+    try:
+        parent = mongo_client.get_mongo_client()
+        mongo_client._reset_after_fork()
+        child = mongo_client.get_mongo_client()
+        assert child is not parent
+        parent.close()
+    finally:
+        mongo_client.close_mongo_client()
+
+
+def test_pool_stats_counts_events():
+    """풀 리스너가 체크아웃/체크인 이벤트를 집계하는지 확인"""
+    listener = mongo_client.PoolMetricsListener()
+    listener.connection_created(None)
+    listener.connection_checked_out(None)
+    listener.connection_checked_in(None)
+    listener.connection_checked_out(None)
+
+    stats = listener.snapshot()
+    assert stats["connections_created"] == 1
+    assert stats["checkouts"] == 2
+    assert stats["checked_out"] == 1
+    assert stats["open_connections"] == 1
+
+    pool_stats = mongo_client.get_pool_stats()
+    assert "max_pool_size" in pool_stats
+    assert "checkouts" in pool_stats
+
+
+if __name__ == "__main__":
+    print("🚀 MongoDB 클라이언트 테스트 시작\n")
+    test_shared_client_is_reused()
+    test_new_client_after_fork()
+    test_pool_stats_counts_events()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+종합 분석용 영양소 계산 엔진 테스트 스크립트
+"""
+
+import sys
+import os
+import datetime
+import json
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import health_analysis
+from utils.nutrient_engine import (
+    aggregate_nutrients,
+    daily_targets,
+    parse_amount_grams,
+    serving_grams,
+)
+from utils.product_parser import parse_products_data
+
+TODAY = datetime.date(2025, 6, 1)
+
+
+def _load(name):
+    with open(os.path.join(BASE_DIR, "data", name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_parse_amounts():
+    """중량/용량 표기를 g으로 변환"""
+    assert parse_amount_grams("15 g") == 15
+    assert parse_amount_grams("1 portion (30 g)") == 30
+    assert parse_amount_grams("2 x 125g") == 250
+    assert parse_amount_grams("33 cl") == 330
+    assert parse_amount_grams("1,5 kg") == 1500
+    assert parse_amount_grams("150.0g") == 150
+    assert parse_amount_grams("1회 섭취량 표기 정보 없음") is None
+    assert serving_grams({"serving_quantity": "15", "serving_quantity_unit": "g"}) == 15
+    assert serving_grams({"serving_quantity": "", "serving_size": "30 g"}) == 30
+
+
+def test_daily_targets_from_profile():
+    """건강 프로필(체중, 키, 출생 연도, 활동량)로 하루 목표를 계산"""
+    targets = daily_targets(_load("health_profile.json"), TODAY)
+    # (10 * 93 + 6.25 * 183 - 5 * 43 + 5) * 1.55
+    assert round(targets["kcal"], 2) == 2888.81
+    assert round(targets["sugars_g"], 2) == round(2888.8125 * 0.1 / 4, 2)
+    assert targets["salt_g"] == 5.0
+
+    diabetic = daily_targets({"has_diabetes": "예"}, TODAY)
+    assert diabetic["kcal"] == 2000
+    assert diabetic["sugars_g"] == 25
+
+
+def test_aggregate_basket():
+    """1회 섭취량 기준 영양소와 합계, 하루 목표 대비 비율을 정확히 계산"""
+    nutella = _load("output.json")
+    almonds = {
+        "product_name": "Almonds",
+        "nutriments": {"energy-kcal_100g": 621, "fat_100g": 53.3, "salt_100g": "0.01"},
+        "serving_size": "30 g",
+    }
+    unknown = {"product_name": "Unknown", "nutriments": {"sugars_100g": 10}}
+    facts = aggregate_nutrients(
+        [nutella, almonds, unknown], _load("health_profile.json"), TODAY
+    )
+    print(f"📊 영양 계산 결과: {json.dumps(facts, ensure_ascii=False)}")
+
+    assert facts["products"][0]["serving_g"] == 15
+    assert facts["products"][0]["sugars_g"] == round(56.3 * 0.15, 2)
+    assert facts["products"][1]["kcal"] == round(621 * 0.3, 2)
+    assert facts["products"][2] == {
+        "name": "Unknown",
+        "serving_g": 100,
+        "serving_assumed": True,
+        "sugars_g": 10,
+    }
+    assert facts["total"]["sugars_g"] == round(56.3 * 0.15 + 10, 2)
+    assert facts["total"]["fat_g"] == round(30.9 * 0.15 + 53.3 * 0.3, 2)
+    assert facts["total"]["kcal"] == round(621 * 0.3, 2)
+    assert facts["percent_of_target"]["salt_g"] == round(
+        (0.107 * 0.15 + 0.01 * 0.3) * 100 / 5, 2
+    )
+
+
+def test_facts_are_in_comprehensive_prompt():
+    """종합 분석 프롬프트에 계산 결과가 들어가는지 확인"""
+    request, _ = health_analysis._comprehensive_analysis_request_and_key(
+        [_load("output.json")], _load("health_profile.json")
+    )
+    prompt = request["messages"][1]["content"]
+    assert '"percent_of_target":' in prompt
+    assert '"serving_g":15' in prompt
+
+
+def test_malformed_nutriments_and_profile():
+    """nutriments나 건강 프로필이 dict가 아니면 빈 값으로 보고 계산"""
+    products_info, _ = parse_products_data(
+        [
+            {"code": "1", "nutriments": ["sugars_100g"], "serving_size": "30 g"},
+            {"code": "2", "nutriments": "10g", "product_name": "Text"},
+        ]
+    )
+    for health_profile in (["당뇨"], "당뇨", 1):
+        assert daily_targets(health_profile, TODAY)["kcal"] == 2000
+        facts = aggregate_nutrients(products_info, health_profile, TODAY)
+        assert facts["total"] == {}
+        assert facts["products"][0] == {"name": "1", "serving_g": 30}
+
+        # 기존처럼 LLM 요청까지 만들어짐
+        request, _ = health_analysis._comprehensive_analysis_request_and_key(
+            products_info, health_profile
+        )
+        assert '"percent_of_target":{}' in request["messages"][1]["content"]
+
+
+if __name__ == "__main__":
+    print("🚀 영양소 계산 엔진 테스트 시작\n")
+    test_parse_amounts()
+    test_daily_targets_from_profile()
+    test_aggregate_basket()
+    test_facts_are_in_comprehensive_prompt()
+    test_malformed_nutriments_and_profile()
+    print("🎉 모든 테스트 완료!")
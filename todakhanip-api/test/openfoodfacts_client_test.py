@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+openfoodfacts_client 공유 HTTP 세션 테스트 스크립트 (로컬 스텁 서버 사용)
+"""
+
+import sys
+import os
+import json
+from contextlib import contextmanager
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from fake_openfoodfacts_server import FakeOpenFoodFactsServer
+from prompts.constants import OPENFOODFACTS_PRODUCT_FIELDS
+from utils import openfoodfacts_client
+from utils.product_parser import extract_product_info
+
+SAMPLE_BARCODE = "3017620422003"
+
+
+@contextmanager
+def _stub_server(**kwargs):
+    """스텁 서버를 띄우고 클라이언트가 그 주소를 사용하도록 설정"""
+    original = openfoodfacts_client.OPENFOODFACTS_API_BASE_URL
+    with FakeOpenFoodFactsServer(**kwargs) as server:
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL = server.base_url
+        openfoodfacts_client.close_session()
+        try:
+            yield server
+        finally:
+            openfoodfacts_client.OPENFOODFACTS_API_BASE_URL = original
+            openfoodfacts_client.close_session()
+
+
+def test_connections_are_reused():
+    """여러 번 조회해도 하나의 keep-alive 커넥션을 재사용하는지 확인"""
+    with _stub_server() as server:
+        barcodes = list(server.products)
+        for i in range(30):
+            product = openfoodfacts_client.fetch_product(barcodes[i % len(barcodes)])
+            assert product is not None
+
+        stats = openfoodfacts_client.get_session_stats()
+        print(f"📊 세션 통계: {stats}")
+        assert server.request_count == 30
+        assert server.connection_count == 1
+        assert stats["new_connections"] == 1
+        assert stats["connection_reuse_ratio"] > 0.9
+        assert stats["latency_ms"]["p99"] is not None
+
+
+def test_retries_transient_errors():
+    """503 응답은 재시도 후 성공하는지 확인"""
+    with _stub_server(fail_first=2) as server:
+        product = openfoodfacts_client.fetch_product(SAMPLE_BARCODE)
+        assert product["code"] == SAMPLE_BARCODE
+        assert server.request_count == 3
+
+
+def test_gives_up_after_max_retries():
+    """재시도 횟수를 넘으면 OpenFoodFactsError를 발생시키는지 확인"""
+    with _stub_server(fail_first=100):
+        try:
+            openfoodfacts_client.fetch_product(SAMPLE_BARCODE)
+            assert False, "OpenFoodFactsError가 발생해야 합니다."
+        except openfoodfacts_client.OpenFoodFactsError as e:
+            assert e.status_code == 503
+
+
+def test_missing_product_returns_none():
+    """없는 바코드는 None을 반환하는지 확인"""
+    with _stub_server():
+        assert openfoodfacts_client.fetch_product("0000000000000") is None
+
+
+def test_requests_only_parser_fields():
+    """fields 파라미터로 필요한 필드만 받아 전체 문서보다 훨씬 적게 전송받는지 확인"""
+    with _stub_server() as server:
+        full = server.products[SAMPLE_BARCODE]
+        product = openfoodfacts_client.fetch_product(SAMPLE_BARCODE)
+        stats = openfoodfacts_client.get_session_stats()
+
+        print(f"📊 응답 크기: {stats['response_bytes']} bytes")
+        assert server.requested_fields == [list(OPENFOODFACTS_PRODUCT_FIELDS)]
+        assert stats["response_bytes"] == server.bytes_sent
+        assert server.bytes_sent < len(json.dumps(full, ensure_ascii=False)) / 5
+        assert extract_product_info(product, SAMPLE_BARCODE) == extract_product_info(
+            full["product"], SAMPLE_BARCODE
+        )
+
+
+def test_projects_full_document_fallback():
+    """fields를 무시하고 전체 문서를 보내는 서버도 같은 필드만 남기는지 확인"""
+    with _stub_server() as projected_server:
+        projected = openfoodfacts_client.fetch_product(SAMPLE_BARCODE)
+    with _stub_server(ignore_fields=True) as server:
+        product = openfoodfacts_client.fetch_product(SAMPLE_BARCODE)
+        assert server.bytes_sent > projected_server.bytes_sent * 5
+    assert set(product) <= set(OPENFOODFACTS_PRODUCT_FIELDS)
+    assert product == projected
+
+
+if __name__ == "__main__":
+    print("🚀 OpenFoodFacts 클라이언트 테스트 시작\n")
+    test_connections_are_reused()
+    test_retries_transient_errors()
+    test_gives_up_after_max_retries()
+    test_missing_product_returns_none()
+    test_requests_only_parser_fields()
+    test_projects_full_document_fallback()
+    print("🎉 모든 테스트 완료!")
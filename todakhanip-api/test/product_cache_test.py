@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+product_cache 계층형 제품 캐시 테스트 스크립트 (네트워크/MongoDB 없이 실행 가능)
+"""
+
+import sys
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from utils import product_cache
+
+TEST_BARCODE = "3017620422003"
+
+
+class FakeOpenFoodFacts:
+    """fetch_product를 대신하는 가짜 OpenFoodFacts"""
+
+    def __init__(self, product=None, error=None):
+        self.product = product
+        self.error = error
+        self.calls = 0
+
+    def __call__(self, barcode):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.product
+
+
+@contextmanager
+def _patched(fake):
+    """영속 계층을 끄고 fetch_product를 가짜로 교체"""
+    original = (product_cache.PRODUCT_CACHE_PERSISTENT, product_cache.fetch_product)
+    product_cache.PRODUCT_CACHE_PERSISTENT = False
+    product_cache.fetch_product = fake
+    product_cache.clear_product_cache()
+    try:
+        yield fake
+    finally:
+        product_cache.PRODUCT_CACHE_PERSISTENT, product_cache.fetch_product = original
+        product_cache.clear_product_cache()
+
+
+def _age_entry(barcode, seconds):
+    """메모리 캐시 항목의 조회 시각을 과거로 이동"""
+    entry = product_cache._memory_tier.get(barcode)
+    entry["fetched_at"] -= seconds
+
+
+def test_memory_hit_skips_origin():
+    """두 번째 조회부터는 OpenFoodFacts를 호출하지 않는지 확인"""
+    fake = FakeOpenFoodFacts(product={"product_name": "Nutella"})
+    with _patched(fake):
+        assert product_cache.get_product(TEST_BARCODE)["product_name"] == "Nutella"
+        assert product_cache.get_product(TEST_BARCODE)["product_name"] == "Nutella"
+        assert fake.calls == 1
+        assert product_cache.get_product_cache_stats()["memory_hits"] == 1
+
+
+def test_negative_caching():
+    """없는 제품 결과도 캐시되는지 확인"""
+    fake = FakeOpenFoodFacts(product=None)
+    with _patched(fake):
+        assert product_cache.get_product("0000000000000") is None
+        assert product_cache.get_product("0000000000000") is None
+        assert fake.calls == 1
+        assert product_cache.get_product_cache_stats()["negative_hits"] == 1
+
+
+def test_is_product_cached():
+    """메모리 캐시 확인은 제품이 있을 때만 참이고 적중 통계를 바꾸지 않음"""
+    fake = FakeOpenFoodFacts(product={"product_name": "Nutella"})
+    with _patched(fake):
+        assert not product_cache.is_product_cached(TEST_BARCODE)
+        product_cache.get_product(TEST_BARCODE)
+        assert product_cache.is_product_cached(TEST_BARCODE)
+        assert product_cache.get_product_cache_stats()["memory_hits"] == 0
+
+        fake.product = None
+        product_cache.get_product("0000000000000")
+        assert not product_cache.is_product_cached("0000000000000")
+
+
+def test_stale_while_revalidate():
+    """TTL이 지난 항목은 즉시 응답하고 백그라운드로 갱신하는지 확인"""
+    fake = FakeOpenFoodFacts(product={"product_name": "old"})
+    with _patched(fake):
+        product_cache.get_product(TEST_BARCODE)
+        _age_entry(TEST_BARCODE, product_cache.PRODUCT_CACHE_TTL_SECONDS + 1)
+
+        fake.product = {"product_name": "new"}
+        assert product_cache.get_product(TEST_BARCODE)["product_name"] == "old"
+
+        deadline = time.time() + 2
+        while fake.calls < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        time.sleep(0.05)
+        assert product_cache.get_product(TEST_BARCODE)["product_name"] == "new"
+        assert product_cache.get_product_cache_stats()["stale_served"] == 1
+
+
+def test_stale_on_origin_error():
+    """OpenFoodFacts 장애 시 만료된 항목으로 응답하는지 확인"""
+    fake = FakeOpenFoodFacts(product={"product_name": "cached"})
+    with _patched(fake):
+        product_cache.get_product(TEST_BARCODE)
+        _age_entry(
+            TEST_BARCODE,
+            product_cache.PRODUCT_CACHE_TTL_SECONDS
+            + product_cache.PRODUCT_CACHE_STALE_SECONDS
+            + 1,
+        )
+
+        fake.error = requests.exceptions.ConnectionError("OFF down")
+        assert product_cache.get_product(TEST_BARCODE)["product_name"] == "cached"
+        assert product_cache.get_product_cache_stats()["stale_on_error"] == 1
+
+
+def test_get_products_in_parallel():
+    """여러 바코드를 동시에 조회하고 실패한 바코드를 따로 알려주는지 확인"""
+    delay = 0.2
+
+    def fake(barcode):
+        time.sleep(delay)
+        if barcode == "500":
+            raise requests.exceptions.ConnectionError("OFF down")
+        if barcode == "404":
+            return None
+        return {"product_name": barcode}
+
+    with _patched(fake):
+        start = time.perf_counter()
+        products, failed_products = product_cache.get_products(
+            ["1", "2", "404", "3", "500", "1"]
+        )
+        elapsed = time.perf_counter() - start
+
+    assert list(products) == ["1", "2", "3"]
+    assert products["2"]["product_name"] == "2"
+    assert failed_products == ["404", "500"]
+    # 순차 조회였다면 5 * delay 이상 걸림
+    assert elapsed < delay * 2
+
+
+def test_get_products_concurrency_limit():
+    """동시 조회 수가 max_concurrency를 넘지 않는지 확인"""
+    lock = threading.Lock()
+    state = {"active": 0, "peak": 0}
+
+    def fake(barcode):
+        with lock:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+        time.sleep(0.05)
+        with lock:
+            state["active"] -= 1
+        return {"product_name": barcode}
+
+    with _patched(fake):
+        products, failed_products = product_cache.get_products(
+            [str(code) for code in range(10)], max_concurrency=3
+        )
+    assert len(products) == 10
+    assert failed_products == []
+    assert state["peak"] == 3
+
+
+if __name__ == "__main__":
+    print("🚀 제품 캐시 테스트 시작\n")
+    test_memory_hit_skips_origin()
+    test_negative_caching()
+    test_is_product_cached()
+    test_stale_while_revalidate()
+    test_stale_on_origin_error()
+    test_get_products_in_parallel()
+    test_get_products_concurrency_limit()
+    print("🎉 모든 테스트 완료!")
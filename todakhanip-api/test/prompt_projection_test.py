@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+건강 분석 프롬프트용 제품 정보 정리 테스트 스크립트
+"""
+
+import sys
+import os
+import copy
+import json
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import health_analysis
+from utils.prompt_projection import project_product_info, serialize_for_prompt
+from utils.token_budget import estimate_tokens
+
+
+def _load(name):
+    with open(os.path.join(BASE_DIR, "data", name), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_projection_drops_images_and_placeholders():
+    """이미지 URL, 안내 문구, 빈 값을 제거하고 원본은 바꾸지 않는지 확인"""
+    product_info = _load("output.json")
+    product_info["product_name_en"] = "영문 상품명 정보 없음"
+    product_info["food_groups_tags"] = []
+    original = copy.deepcopy(product_info)
+
+    projected = project_product_info(product_info)
+    assert product_info == original
+    assert not any(key.startswith("image_") for key in projected)
+    assert "product_name_en" not in projected
+    assert "food_groups_tags" not in projected
+
+    emulsifier = projected["ingredients"][6]
+    assert emulsifier == {"percent_estimate": 3.3, "text": "émulsifiants"}
+    assert projected["ingredients"][7]["percent_estimate"] == 3.3
+    assert projected["ingredients"][0]["vegan"] == "yes"
+    assert projected["nutriments"]["salt_100g"] == 0.107
+
+
+def test_serialization_is_deterministic():
+    """키 순서가 달라도 같은 문자열로 변환되는지 확인"""
+    product_info = _load("output.json")
+    reordered = dict(reversed(list(product_info.items())))
+    assert serialize_for_prompt(project_product_info(product_info)) == (
+        serialize_for_prompt(project_product_info(reordered))
+    )
+
+
+def test_prompt_size_reduction():
+    """샘플 제품의 분석 프롬프트가 이전 방식보다 작아졌는지 측정"""
+    health_profile = _load("health_profile.json")
+    product_info = _load("output.json")
+    before = json.dumps(product_info, ensure_ascii=False, indent=2) + json.dumps(
+        health_profile, ensure_ascii=False, indent=2
+    )
+    request, _ = health_analysis._health_analysis_request_and_key(
+        product_info, health_profile
+    )
+    after = request["messages"][1]["content"]
+    saved = 1 - estimate_tokens(after) / estimate_tokens(before)
+    print(
+        f"📊 프롬프트 토큰 추정: {estimate_tokens(before)} → {estimate_tokens(after)} "
+        f"({saved:.0%} 감소)"
+    )
+    assert "https://" not in after
+    assert "정보 없음" not in after
+    # 한글은 음절마다 1토큰으로 추정하므로 한국어 템플릿이 차지하는 몫이 큼
+    assert saved > 0.25
+
+
+def test_cache_key_ignores_dropped_fields():
+    """이미지 URL만 다른 제품은 같은 분석 캐시를 사용"""
+    health_profile = _load("health_profile.json")
+    product_info = _load("output.json")
+    other = dict(product_info, image_url="https://example.com/other.jpg")
+    _, key = health_analysis._health_analysis_request_and_key(
+        product_info, health_profile
+    )
+    _, other_key = health_analysis._health_analysis_request_and_key(
+        other, health_profile
+    )
+    assert key == other_key
+
+
+if __name__ == "__main__":
+    print("🚀 프롬프트 제품 정보 정리 테스트 시작\n")
+    test_projection_drops_images_and_placeholders()
+    test_serialization_is_deterministic()
+    test_prompt_size_reduction()
+    test_cache_key_ignores_dropped_fields()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+single-flight 요청 합치기 테스트 스크립트 (thundering herd 시나리오)
+
+로컬 OpenFoodFacts 스텁 서버와 가짜 OpenAI/MongoDB를 사용하므로
+네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from fake_openfoodfacts_server import FakeOpenFoodFactsServer
+from utils import (
+    analysis_cache,
+    health_analysis,
+    openfoodfacts_client,
+    product_cache,
+    translation_manager,
+    translation_store,
+)
+from utils.single_flight import SingleFlight
+
+HERD_SIZE = 50
+WORK_SECONDS = 0.2
+SAMPLE_BARCODE = "3017620422003"
+HEALTH_PROFILE = {"name": "홍길동", "has_diabetes": "예"}
+
+
+def _herd(fn, *args):
+    """HERD_SIZE개 스레드가 동시에 fn을 호출하고 결과 목록을 반환"""
+    barrier = threading.Barrier(HERD_SIZE)
+
+    def call():
+        barrier.wait()
+        return fn(*args)
+
+    with ThreadPoolExecutor(max_workers=HERD_SIZE) as executor:
+        futures = [executor.submit(call) for _ in range(HERD_SIZE)]
+        return [future.result() for future in futures]
+
+
+class SlowCounter:
+    """호출 횟수를 세고 일정 시간 동안 작업하는 함수 대역"""
+
+    def __init__(self, result=None, error=None):
+        self.calls = 0
+        self.result = result
+        self.error = error
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        time.sleep(WORK_SECONDS)
+        if self.error:
+            raise self.error
+        return self.result
+
+
+def test_single_flight_shares_result_and_error():
+    """동시 호출은 한 번만 실행되고, 결과와 예외를 모두 공유"""
+    flight = SingleFlight()
+    work = SlowCounter(result={"ok": True})
+    results = _herd(flight.do, "key", work)
+    assert work.calls == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats()["coalesced"] == HERD_SIZE - 1
+    assert flight.stats()["in_flight"] == 0
+
+    failing = SlowCounter(error=ValueError("실패"))
+    errors = []
+
+    def call():
+        try:
+            flight.do("key", failing)
+        except ValueError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=call) for _ in range(10)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert failing.calls == 1
+    assert len(errors) == 10
+
+    # 작업이 끝나면 키가 비워져 다음 호출은 다시 실행
+    flight.do("key", work)
+    assert work.calls == 2
+
+
+def test_product_fetch_herd():
+    """캐시에 없는 바코드를 여러 스레드가 동시에 조회해도 OFF 요청은 한 번"""
+    fake_fetch = SlowCounter(result={"product_name": "Nutella"})
+    original = (product_cache.PRODUCT_CACHE_PERSISTENT, product_cache.fetch_product)
+    product_cache.PRODUCT_CACHE_PERSISTENT = False
+    product_cache.fetch_product = fake_fetch
+    product_cache.clear_product_cache()
+    try:
+        results = _herd(product_cache.get_product, SAMPLE_BARCODE)
+    finally:
+        product_cache.PRODUCT_CACHE_PERSISTENT, product_cache.fetch_product = original
+        product_cache.clear_product_cache()
+
+    assert fake_fetch.calls == 1
+    assert all(result["product_name"] == "Nutella" for result in results)
+
+
+def test_async_product_fetch_herd():
+    """비동기 경로에서도 동시 조회가 OFF 요청 하나로 합쳐지는지 확인"""
+
+    async def scenario():
+        results = await asyncio.gather(
+            *[product_cache.get_product_async(SAMPLE_BARCODE) for _ in range(100)]
+        )
+        await openfoodfacts_client.close_async_client()
+        return results
+
+    original = (
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+        product_cache.PRODUCT_CACHE_PERSISTENT,
+    )
+    with FakeOpenFoodFactsServer() as server:
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL = server.base_url
+        product_cache.PRODUCT_CACHE_PERSISTENT = False
+        product_cache.clear_product_cache()
+        try:
+            results = asyncio.run(scenario())
+        finally:
+            (
+                openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+                product_cache.PRODUCT_CACHE_PERSISTENT,
+            ) = original
+            product_cache.clear_product_cache()
+
+        print(f"📊 동시 조회 100건 → OFF 요청 {server.request_count}건")
+        assert server.request_count == 1
+    assert all(result["code"] == SAMPLE_BARCODE for result in results)
+
+
+class FakeTranslationCollection:
+    """번역 문서를 저장하지 않은 상태의 MongoDB 컬렉션 대역"""
+
+    def __init__(self):
+        self.saved = []
+
+    def find_one(self, query):
+        return None
+
+    def bulk_write(self, requests, ordered=True):
+        self.saved.extend(requests)
+
+
+def test_translation_herd():
+    """같은 바코드의 동시 번역은 OpenAI 호출 하나로 합쳐지고 upsert로 저장"""
+    translation_manager.clear_ingredient_dictionary()
+    store_path = translation_store._store_path
+    translation_store.close_translation_store()
+    collection = FakeTranslationCollection()
+    content = '[{"original": "Sucre", "korean": "설탕"}]'
+    completions = SlowCounter(
+        result=SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))]
+        )
+    )
+    original = (translation_manager.get_collection, translation_manager.client)
+    translation_manager.get_collection = lambda name: collection
+    translation_manager.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=completions))
+    )
+    try:
+        results = _herd(
+            translation_manager.translate_ingredients_batch, SAMPLE_BARCODE, "Sucre"
+        )
+    finally:
+        translation_manager.get_collection, translation_manager.client = original
+        translation_manager.clear_ingredient_dictionary()
+        translation_store.open_translation_store(store_path)
+
+    assert completions.calls == 1
+    assert len(collection.saved) == 1
+    assert all(result == {"Sucre": "설탕"} for result in results)
+
+
+def test_analysis_herd():
+    """캐시가 꺼져 있어도 같은 입력의 동시 분석은 OpenAI 호출 하나로 합쳐짐"""
+    completions = SlowCounter(
+        result=SimpleNamespace(
+            choices=[
+                SimpleNamespace(
+                    message=SimpleNamespace(content="분석 결과"), finish_reason="stop"
+                )
+            ]
+        )
+    )
+    original = health_analysis.client
+    health_analysis.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=completions))
+    )
+    analysis_cache.set_analysis_cache_backend("none")
+    try:
+        results = _herd(
+            health_analysis.get_health_analysis,
+            {"code": SAMPLE_BARCODE},
+            HEALTH_PROFILE,
+        )
+    finally:
+        health_analysis.client = original
+        analysis_cache.set_analysis_cache_backend("memory")
+
+    assert completions.calls == 1
+    assert results == ["분석 결과"] * HERD_SIZE
+
+
+if __name__ == "__main__":
+    print("🚀 single-flight 테스트 시작\n")
+    test_single_flight_shares_result_and_error()
+    test_product_fetch_herd()
+    test_async_product_fetch_herd()
+    test_translation_herd()
+    test_analysis_herd()
+    print("🎉 모든 테스트 완료!")
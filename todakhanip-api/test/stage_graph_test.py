@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+처리 단계 그래프(StageGraph)와 POST /barcode 단계 스케줄링 테스트 스크립트
+
+단계 함수를 sleep으로 대신하므로 네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import threading
+import time
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import bulkheads
+from utils.bulkheads import LLM_POOL, MONGO_POOL, OFF_POOL, BulkheadFullError
+from utils.stage_graph import StageGraph
+import app
+
+SAMPLE_BARCODE = "3017620422003"
+
+
+def _sleep_then(seconds, value):
+    def stage(*args):
+        time.sleep(seconds)
+        return value
+
+    return stage
+
+
+def test_independent_stages_overlap():
+    """입력이 준비된 단계는 바로 시작하고 서로 의존하지 않는 단계는 겹쳐서 실행"""
+    graph = StageGraph()
+    graph.add("fetch", _sleep_then(0.1, "제품"), pool=OFF_POOL)
+    graph.add("probe", _sleep_then(0.05, "사전"), pool=MONGO_POOL)
+    graph.add("parse", lambda product: product + " 정보", deps=("fetch",))
+    graph.add(
+        "analysis",
+        lambda info, probe: info + " 분석",
+        deps=("parse", "probe"),
+        pool=LLM_POOL,
+    )
+
+    start = time.perf_counter()
+    run = graph.run()
+    elapsed = time.perf_counter() - start
+
+    assert run.results["analysis"] == "제품 정보 분석"
+    assert elapsed < 0.18
+    # 임계 경로의 합은 전체 소요 시간과 같음
+    assert [name for name, _ in run.critical_path] == ["fetch", "parse", "analysis"]
+    assert abs(sum(seconds for _, seconds in run.critical_path) - run.total_seconds) < 1e-9
+    assert "analysis;dur=" in run.server_timing()
+
+
+def test_none_result_skips_dependents():
+    """의존 단계의 결과가 None이면 뒤따르는 단계를 실행하지 않음"""
+    calls = []
+    graph = StageGraph()
+    graph.add("fetch", lambda: None, pool=OFF_POOL)
+    graph.add("parse", lambda product: calls.append("parse"), deps=("fetch",))
+    graph.add("analysis", lambda info: calls.append("analysis"), deps=("parse",))
+    run = graph.run()
+    assert run.results == {"fetch": None, "parse": None, "analysis": None}
+    assert calls == []
+
+
+def test_lazy_dependency_is_awaited_only_when_used():
+    """lazy_deps 결과는 단계가 요청할 때만 기다리고, 쓰지 않으면 응답을 붙잡지 않음"""
+    graph = StageGraph()
+    graph.add("probe", _sleep_then(0.3, {"sucre": "설탕"}), pool=MONGO_POOL)
+    graph.add("fetch", _sleep_then(0.05, "제품"), pool=OFF_POOL)
+    graph.add(
+        "translate",
+        lambda product, load_probe: product,
+        deps=("fetch",),
+        lazy_deps=("probe",),
+        pool=LLM_POOL,
+    )
+    start = time.perf_counter()
+    run = graph.run()
+    assert time.perf_counter() - start < 0.2
+    assert run.results["translate"] == "제품"
+    assert run.results["probe"] is None
+
+    graph = StageGraph()
+    graph.add("probe", _sleep_then(0.2, {"sucre": "설탕"}), pool=MONGO_POOL)
+    graph.add("fetch", _sleep_then(0.05, "제품"), pool=OFF_POOL)
+    graph.add(
+        "translate",
+        lambda product, load_probe: load_probe()["sucre"],
+        deps=("fetch",),
+        lazy_deps=("probe",),
+        pool=LLM_POOL,
+    )
+    run = graph.run()
+    assert run.results["translate"] == "설탕"
+    # 번역은 조회를 기다렸으므로 임계 경로는 probe에서 시작
+    assert [name for name, _ in run.critical_path] == ["probe", "translate"]
+
+
+def test_stage_error_propagates():
+    """단계에서 발생한 예외는 run을 호출한 쪽으로 전달"""
+    graph = StageGraph()
+    graph.add("fetch", _sleep_then(0.01, "제품"), pool=OFF_POOL)
+
+    def fail(product):
+        raise RuntimeError("분석 실패")
+
+    graph.add("analysis", fail, deps=("fetch",), pool=LLM_POOL)
+    try:
+        graph.run()
+        raise AssertionError("예외가 전달되지 않음")
+    except RuntimeError as e:
+        assert str(e) == "분석 실패"
+
+    try:
+        StageGraph().add("parse", len, deps=("fetch",))
+        raise AssertionError("등록되지 않은 의존 단계를 허용함")
+    except ValueError:
+        pass
+
+
+def test_barcode_post_overlaps_fetch_and_probe():
+    """POST /barcode는 제품 조회와 번역 문서 조회를 겹치고 임계 경로를 헤더로 알려줌"""
+    originals = (
+        app.get_product,
+        app.load_legacy_translations,
+        app.get_health_analysis,
+        app.run_ingredients_translation,
+    )
+    seen = {}
+
+    def fake_translation(barcode, product_info, load_legacy=None):
+        seen["legacy"] = load_legacy()
+        return {}
+
+    app.get_product = _sleep_then(0.2, {"code": SAMPLE_BARCODE, "product_name": "테스트"})
+    app.load_legacy_translations = _sleep_then(0.15, {"sucre": "설탕"})
+    app.get_health_analysis = lambda product_info, health_profile: "분석 결과"
+    app.run_ingredients_translation = fake_translation
+    try:
+        client = app.app.test_client()
+        start = time.perf_counter()
+        response = client.post(
+            f"/barcode/{SAMPLE_BARCODE}", json={"health_profile": {"name": "홍길동"}}
+        )
+        elapsed = time.perf_counter() - start
+
+        app.get_product = lambda barcode: None
+        missing = client.post(
+            f"/barcode/{SAMPLE_BARCODE}", json={"health_profile": {"name": "홍길동"}}
+        )
+    finally:
+        (
+            app.get_product,
+            app.load_legacy_translations,
+            app.get_health_analysis,
+            app.run_ingredients_translation,
+        ) = originals
+
+    print(f"📊 Server-Timing: {response.headers['Server-Timing']} ({elapsed * 1000:.0f}ms)")
+    assert response.status_code == 200
+    assert response.get_json()["data"]["health_analysis"] == "분석 결과"
+    assert seen["legacy"] == {"sucre": "설탕"}
+    # 순서대로 실행하면 0.35초
+    assert elapsed < 0.3
+    assert response.headers["Server-Timing"].startswith("product;dur=")
+    assert missing.status_code == 404
+
+
+def test_rejected_optional_stage_does_not_fail_run():
+    """lazy_deps로만 쓰이는 단계가 풀에서 거절되면 그 결과를 기다린 단계가 예외를 받음"""
+    bulkheads.shutdown_bulkheads()
+    original_config = dict(bulkheads.BULKHEAD_CONFIG)
+    bulkheads.BULKHEAD_CONFIG[MONGO_POOL] = (1, 0)
+    release = threading.Event()
+
+    def translate(product, load_probe):
+        try:
+            return load_probe()
+        except BulkheadFullError:
+            return "직접 조회"
+
+    try:
+        bulkheads.submit(MONGO_POOL, release.wait)
+        graph = StageGraph()
+        graph.add("probe", _sleep_then(0, "미리 조회"), pool=MONGO_POOL)
+        graph.add("fetch", _sleep_then(0.01, "제품"), pool=OFF_POOL)
+        graph.add(
+            "translate", translate, deps=("fetch",), lazy_deps=("probe",), pool=LLM_POOL
+        )
+        run = graph.run()
+    finally:
+        release.set()
+        bulkheads.BULKHEAD_CONFIG.update(original_config)
+        bulkheads.shutdown_bulkheads()
+    assert run.results["translate"] == "직접 조회"
+    assert run.results["probe"] is None
+
+
+def _post_with_fakes(barcode, cached):
+    """가짜 단계 함수로 POST /barcode를 보내고 (응답, 기존 번역 문서 조회 횟수)를 반환"""
+    originals = (
+        app.get_product,
+        app.is_product_cached,
+        app.load_legacy_translations,
+        app.get_health_analysis,
+        app.run_ingredients_translation,
+    )
+    probes = []
+
+    def load_legacy_translations(barcode):
+        probes.append(threading.current_thread().name)
+        return {"sucre": "설탕"}
+
+    def fake_translation(barcode, product_info, load_legacy=None):
+        return load_legacy() if load_legacy else {}
+
+    app.get_product = lambda barcode: {"code": barcode, "product_name": "테스트"}
+    app.is_product_cached = lambda barcode: cached
+    app.load_legacy_translations = load_legacy_translations
+    app.get_health_analysis = lambda product_info, health_profile: "분석 결과"
+    app.run_ingredients_translation = fake_translation
+    try:
+        response = app.app.test_client().post(
+            f"/barcode/{barcode}", json={"health_profile": {"name": "홍길동"}}
+        )
+    finally:
+        (
+            app.get_product,
+            app.is_product_cached,
+            app.load_legacy_translations,
+            app.get_health_analysis,
+            app.run_ingredients_translation,
+        ) = originals
+    return response, probes
+
+
+def test_barcode_post_survives_full_mongo_pool():
+    """MongoDB 풀이 가득 차도 번역 단계가 직접 조회해 요청이 성공"""
+    bulkheads.shutdown_bulkheads()
+    original_config = dict(bulkheads.BULKHEAD_CONFIG)
+    bulkheads.BULKHEAD_CONFIG[MONGO_POOL] = (1, 0)
+    release = threading.Event()
+    try:
+        bulkheads.submit(MONGO_POOL, release.wait)
+        response, probes = _post_with_fakes("8809999000001", cached=False)
+    finally:
+        release.set()
+        bulkheads.BULKHEAD_CONFIG.update(original_config)
+        bulkheads.shutdown_bulkheads()
+    assert response.status_code == 200
+    assert response.get_json()["data"]["health_analysis"] == "분석 결과"
+    # 미리 조회는 거절되고 번역 단계(LLM 풀)에서 한 번 조회
+    assert len(probes) == 1 and probes[0].startswith("bulkhead-llm")
+
+
+def test_barcode_post_skips_probe_when_product_cached():
+    """제품이 메모리 캐시에 있으면 기존 번역 문서를 미리 조회하지 않음"""
+    response, probes = _post_with_fakes("8809999000002", cached=True)
+    assert response.status_code == 200
+    assert "translation_probe" not in response.headers["Server-Timing"]
+    assert probes == []
+
+
+if __name__ == "__main__":
+    print("🚀 처리 단계 그래프 테스트 시작\n")
+    test_independent_stages_overlap()
+    test_none_result_skips_dependents()
+    test_lazy_dependency_is_awaited_only_when_used()
+    test_stage_error_propagates()
+    test_barcode_post_overlaps_fetch_and_probe()
+    test_rejected_optional_stage_does_not_fail_run()
+    test_barcode_post_survives_full_mongo_pool()
+    test_barcode_post_skips_probe_when_product_cached()
+    print("🎉 모든 테스트 완료!")
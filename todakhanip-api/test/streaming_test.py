@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+건강 분석 스트리밍 API 테스트 스크립트
+
+로컬 OpenFoodFacts 스텁 서버와 가짜 LLM 스트림을 사용하므로
+네트워크, OpenAI, MongoDB 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import json
+import time
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from fake_openfoodfacts_server import FakeOpenFoodFactsServer
+from utils import health_analysis, openfoodfacts_client, product_cache
+import app as flask_app
+
+SAMPLE_BARCODE = "3017620422003"
+HEALTH_PROFILE = {"name": "홍길동", "has_diabetes": "예"}
+TOKEN_DELAY_SECONDS = 0.05
+TRANSLATION_LATENCY_SECONDS = 0.3
+
+
+def fake_health_analysis_stream(product_info, health_profile):
+    for text in ["당류가 ", "높아 ", "주의가 필요합니다."]:
+        time.sleep(TOKEN_DELAY_SECONDS)
+        yield "token", {"text": text}
+
+
+def fake_comprehensive_analysis_stream(products_info, health_profile):
+    for text in [f"{len(products_info)}개 제품 ", "종합 분석"]:
+        yield "token", {"text": text}
+
+
+def failing_health_analysis_stream(product_info, health_profile):
+    yield "token", {"text": "당류가 "}
+    yield "error", {"error": "건강 분석을 수행하는 중 오류가 발생했습니다."}
+
+
+def fake_translation(barcode, product_info):
+    time.sleep(TRANSLATION_LATENCY_SECONDS)
+    return {"Sucre": "설탕"}
+
+
+def _parse_sse(body):
+    """SSE 응답 본문을 (이벤트, 데이터) 목록으로 변환"""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def _run_with_stub(scenario):
+    """스텁 서버와 가짜 LLM으로 교체한 상태에서 시나리오 실행"""
+    originals = (
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+        product_cache.PRODUCT_CACHE_PERSISTENT,
+        flask_app.get_health_analysis_stream,
+        flask_app.get_comprehensive_health_analysis_stream,
+        flask_app.run_ingredients_translation,
+    )
+    with FakeOpenFoodFactsServer() as server:
+        openfoodfacts_client.OPENFOODFACTS_API_BASE_URL = server.base_url
+        product_cache.PRODUCT_CACHE_PERSISTENT = False
+        product_cache.clear_product_cache()
+        flask_app.get_health_analysis_stream = fake_health_analysis_stream
+        flask_app.get_comprehensive_health_analysis_stream = (
+            fake_comprehensive_analysis_stream
+        )
+        flask_app.run_ingredients_translation = fake_translation
+        try:
+            return scenario(flask_app.app.test_client())
+        finally:
+            (
+                openfoodfacts_client.OPENFOODFACTS_API_BASE_URL,
+                product_cache.PRODUCT_CACHE_PERSISTENT,
+                flask_app.get_health_analysis_stream,
+                flask_app.get_comprehensive_health_analysis_stream,
+                flask_app.run_ingredients_translation,
+            ) = originals
+            product_cache.clear_product_cache()
+
+
+def test_barcode_stream_sse():
+    """제품 정보가 첫 토큰보다 먼저 도착하고, 번역은 분석과 동시에 진행되는지 확인"""
+
+    def scenario(client):
+        start = time.perf_counter()
+        response = client.post(
+            f"/barcode/{SAMPLE_BARCODE}/stream",
+            json={"health_profile": HEALTH_PROFILE},
+            buffered=False,
+        )
+        chunks = iter(response.response)
+        first_event = next(chunks)
+        first_event_elapsed = time.perf_counter() - start
+        body = first_event + b"".join(chunks)
+        total_elapsed = time.perf_counter() - start
+        return response, body.decode("utf-8"), first_event_elapsed, total_elapsed
+
+    response, body, first_event_elapsed, total_elapsed = _run_with_stub(scenario)
+    print(f"📊 첫 이벤트 {first_event_elapsed:.3f}초, 전체 {total_elapsed:.3f}초")
+    assert response.headers["Content-Type"].startswith("text/event-stream")
+    assert response.headers["Cache-Control"] == "no-cache"
+
+    events = _parse_sse(body)
+    names = [name for name, _ in events]
+    assert names == ["product", "token", "token", "token", "translations", "done"]
+    assert events[0][1]["code"] == SAMPLE_BARCODE
+    assert events[-1][1]["health_analysis"] == "당류가 높아 주의가 필요합니다."
+    texts = [item["text"] for item in events[-2][1]["ingredients"]]
+    assert "설탕" in texts
+
+    # 제품 정보는 LLM 토큰을 기다리지 않고 바로 전송됨
+    assert first_event_elapsed < TOKEN_DELAY_SECONDS * 3
+    # 번역과 분석이 순차 실행이었다면 두 지연 시간의 합보다 오래 걸림
+    assert total_elapsed < TRANSLATION_LATENCY_SECONDS + TOKEN_DELAY_SECONDS * 3
+
+
+def test_barcode_stream_ndjson_and_errors():
+    """Accept: application/octet-stream 이면 줄 단위 JSON으로 응답하는지 확인"""
+
+    def scenario(client):
+        response = client.post(
+            f"/barcode/{SAMPLE_BARCODE}/stream",
+            json={"health_profile": HEALTH_PROFILE},
+            headers={"Accept": "application/octet-stream"},
+        )
+        missing_profile = client.post(f"/barcode/{SAMPLE_BARCODE}/stream", json={})
+        not_found = client.post(
+            "/barcode/0000000000000/stream", json={"health_profile": HEALTH_PROFILE}
+        )
+        return response, response.get_data(as_text=True), missing_profile, not_found
+
+    response, body, missing_profile, not_found = _run_with_stub(scenario)
+    assert response.headers["Content-Type"].startswith("application/octet-stream")
+    lines = [json.loads(line) for line in body.splitlines()]
+    assert lines[0]["event"] == "product"
+    assert lines[-1]["event"] == "done"
+
+    assert missing_profile.status_code == 400
+    assert not_found.status_code == 404
+    assert not_found.get_json()["error"] == "Product not found"
+
+
+def test_comprehensive_stream():
+    """종합 분석 스트리밍 이벤트 순서 확인"""
+
+    def scenario(client):
+        response = client.post(
+            "/comprehensive-analysis/stream",
+            json={
+                "products_data": [
+                    {"code": "1", "product_name": "A"},
+                    {"product_name": "바코드 없음"},
+                ],
+                "health_profile": HEALTH_PROFILE,
+            },
+        )
+        return response.get_data(as_text=True)
+
+    events = _parse_sse(_run_with_stub(scenario))
+    assert [name for name, _ in events] == ["summary", "token", "token", "done"]
+    assert events[0][1]["analyzed_products"] == 1
+    assert events[0][1]["total_requested"] == 2
+    assert events[-1][1]["comprehensive_analysis"] == "1개 제품 종합 분석"
+
+
+def test_stream_error_event_replaces_done():
+    """분석이 스트림 도중 실패하면 error 이벤트로 끝나고 done을 보내지 않음"""
+
+    def scenario(client):
+        flask_app.get_health_analysis_stream = failing_health_analysis_stream
+        response = client.post(
+            f"/barcode/{SAMPLE_BARCODE}/stream",
+            json={"health_profile": HEALTH_PROFILE},
+        )
+        return response.get_data(as_text=True)
+
+    events = _parse_sse(_run_with_stub(scenario))
+    assert [name for name, _ in events] == ["product", "token", "error"]
+    assert events[-1][1]["error"] == "건강 분석을 수행하는 중 오류가 발생했습니다."
+
+
+def _raise(*args):
+    raise ValueError("잘못된 제품 데이터")
+
+
+def test_setup_errors_are_json_or_error_events():
+    """스트리밍 요청 준비 중 예외를 JSON 오류나 error 이벤트로 전달"""
+    products_request = {
+        "products_data": [{"code": "1", "product_name": "A"}],
+        "health_profile": HEALTH_PROFILE,
+    }
+
+    def scenario(client):
+        results = [
+            client.post("/comprehensive-analysis/stream", json=[1]),
+            client.post(f"/barcode/{SAMPLE_BARCODE}/stream", json=[1]),
+        ]
+        # 분석 요청(영양소 계산)을 만들다 실패하면 분석 오류 이벤트
+        originals = (
+            flask_app.get_comprehensive_health_analysis_stream,
+            health_analysis.aggregate_nutrients,
+            flask_app.comprehensive_summary,
+        )
+        flask_app.get_comprehensive_health_analysis_stream = (
+            health_analysis.get_comprehensive_health_analysis_stream
+        )
+        health_analysis.aggregate_nutrients = _raise
+        try:
+            response = client.post(
+                "/comprehensive-analysis/stream", json=products_request
+            )
+            results.append(response.get_data(as_text=True))
+            # 요약을 만들다 실패하면 예상하지 못한 오류 이벤트
+            flask_app.comprehensive_summary = _raise
+            response = client.post(
+                "/comprehensive-analysis/stream", json=products_request
+            )
+            results.append(response.get_data(as_text=True))
+        finally:
+            (
+                flask_app.get_comprehensive_health_analysis_stream,
+                health_analysis.aggregate_nutrients,
+                flask_app.comprehensive_summary,
+            ) = originals
+        return results
+
+    bad_comprehensive, bad_barcode, bad_request, bad_summary = _run_with_stub(scenario)
+    for response in (bad_comprehensive, bad_barcode):
+        assert response.status_code == 500
+        assert response.get_json()["success"] is False
+
+    events = _parse_sse(bad_request)
+    assert events == [
+        ("summary", events[0][1]),
+        ("error", {"error": health_analysis.COMPREHENSIVE_ANALYSIS_ERROR_MESSAGE}),
+    ]
+    assert _parse_sse(bad_summary) == [
+        ("error", {"error": "Unexpected error: 잘못된 제품 데이터"})
+    ]
+
+
+if __name__ == "__main__":
+    print("🚀 스트리밍 API 테스트 시작\n")
+    test_barcode_stream_sse()
+    test_barcode_stream_ndjson_and_errors()
+    test_comprehensive_stream()
+    test_stream_error_event_replaces_done()
+    test_setup_errors_are_json_or_error_events()
+    print("🎉 모든 테스트 완료!")
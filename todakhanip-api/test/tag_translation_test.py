@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+태그 번역(translate_tags, translate_tags_batch) 테스트 스크립트
+"""
+
+import sys
+import os
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import translation_manager
+from utils.product_parser import parse_products_data
+
+
+def _with_translations(translations, test_fn):
+    """번역 저장소 대신 주어진 번역 데이터로 교체한 상태에서 실행"""
+    translation_manager.clear_translation_cache()
+    translation_manager._translation_cache = translations
+    try:
+        test_fn()
+    finally:
+        translation_manager.clear_translation_cache()
+        translation_manager.load_translation_data()
+
+
+TRANSLATIONS = {
+    "allergens": {"milk": "우유", "nuts": "견과류", "e:322": "레시틴"},
+    "food_groups": {"sweets": "단 음식"},
+}
+
+
+def test_translate_tags():
+    """언어 접두사만 떼고, 번역이 없으면 접두사 없는 값으로 대체"""
+
+    def scenario():
+        tags = ["en:milk", "fr:e:322", "en:unknown", "접두사없음"]
+        assert translation_manager.translate_tags(tags, "allergens") == [
+            "우유",
+            "레시틴",
+            "unknown",
+            "접두사없음",
+        ]
+        assert translation_manager.translate_tags([], "allergens") == []
+        assert translation_manager.translate_tags(None, "allergens") == []
+
+    _with_translations(TRANSLATIONS, scenario)
+
+
+def test_translate_tags_batch():
+    """배치 번역 결과가 태그 배열별 번역과 같은지 확인"""
+
+    def scenario():
+        tag_lists = [
+            ["en:milk", "en:nuts"],
+            [],
+            None,
+            ["en:milk"],
+            ["en:x:y"],
+            ["en:nuts", {"en": "milk"}, ["en:milk"], 3],
+        ]
+        expected = [
+            translation_manager.translate_tags(tags, "allergens") for tags in tag_lists
+        ]
+        assert translation_manager.translate_tags_batch(tag_lists, "allergens") == expected
+        assert expected[-1] == ["견과류"]
+
+    _with_translations(TRANSLATIONS, scenario)
+
+
+def test_memoized_tags_follow_reload():
+    """번역 데이터를 다시 로드하면 메모이즈된 결과도 비워짐"""
+
+    def scenario():
+        assert translation_manager.translate_tags(["en:milk"], "allergens") == ["우유"]
+        translation_manager.clear_translation_cache()
+        translation_manager._translation_cache = {"allergens": {"milk": "MILK"}}
+        assert translation_manager.translate_tags(["en:milk"], "allergens") == ["MILK"]
+
+    _with_translations(TRANSLATIONS, scenario)
+
+
+def test_comprehensive_products_tags():
+    """종합 분석 제품 목록의 태그를 한 번에 번역"""
+
+    def scenario():
+        products_info, _ = parse_products_data(
+            [
+                {"code": "1", "allergens_tags": ["en:milk"], "food_groups_tags": ["en:sweets"]},
+                {"code": "2", "allergens_tags": ["en:milk", "en:nuts"]},
+                {"code": "3", "allergens_tags": "이미 번역된 문자열"},
+            ]
+        )
+        assert products_info[0]["allergens_tags"] == ["우유"]
+        assert products_info[0]["food_groups_tags"] == ["단 음식"]
+        assert products_info[1]["allergens_tags"] == ["우유", "견과류"]
+        assert products_info[2]["allergens_tags"] == "이미 번역된 문자열"
+
+    _with_translations(TRANSLATIONS, scenario)
+
+
+def test_invalid_tags_do_not_fail_request():
+    """클라이언트가 보낸 태그에 dict/list가 섞여 있어도 해당 태그만 빼고 처리"""
+
+    def scenario():
+        products_info, failed_products = parse_products_data(
+            [
+                {"code": "1", "allergens_tags": [{"en": "milk"}, "en:milk"]},
+                {"code": "2", "food_groups_tags": [["en:sweets"], "en:sweets"]},
+            ]
+        )
+        assert failed_products == []
+        assert products_info[0]["allergens_tags"] == ["우유"]
+        assert products_info[1]["food_groups_tags"] == ["단 음식"]
+
+    _with_translations(TRANSLATIONS, scenario)
+
+    # 번역 중 예외가 나면 그 제품만 실패로 기록
+    original = translation_manager.translate_text
+
+    def failing_translate(text, translation_type):
+        if text == "boom":
+            raise RuntimeError("번역 실패")
+        return text
+
+    translation_manager.translate_text = failing_translate
+    translation_manager._translate_tag_tuple.cache_clear()
+    try:
+        products_info, failed_products = parse_products_data(
+            [
+                {"code": "1", "allergens_tags": ["en:boom"]},
+                {"code": "2", "allergens_tags": ["en:ok"]},
+            ]
+        )
+    finally:
+        translation_manager.translate_text = original
+    assert failed_products == ["1"]
+    assert [product["code"] for product in products_info] == ["2"]
+
+
+if __name__ == "__main__":
+    print("🚀 태그 번역 테스트 시작\n")
+    test_translate_tags()
+    test_translate_tags_batch()
+    test_memoized_tags_follow_reload()
+    test_comprehensive_products_tags()
+    test_invalid_tags_do_not_fail_request()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+토큰 예산 기반 배치 planner 테스트 스크립트
+
+로컬 OpenAI 스텁 서버를 사용하므로 네트워크, OpenAI 키 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import math
+import tempfile
+from types import SimpleNamespace
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from openai import OpenAI
+from fake_openai_server import FakeOpenAIServer
+from utils.batch_translation import BatchTranslator
+from utils import token_budget
+from utils.token_budget import TranslationBatchPlanner, estimate_tokens
+from utils.translation_journal import TranslationJournal
+
+SYSTEM_PROMPT = "번역해주세요."
+USER_PROMPT = "다음 식품 원료들을 한국어로 번역해주세요:\n\n{items}"
+SHORT_ITEMS = [f"sel-{i}" for i in range(300)]
+LONG_ITEMS = [
+    f"préparation à base de lait écrémé en poudre et de matières grasses végétales n°{i}"
+    for i in range(300)
+]
+
+
+def _translator(server, **kwargs):
+    client = OpenAI(api_key="test-key", base_url=server.base_url, max_retries=0)
+    return BatchTranslator(
+        client,
+        model="gpt-4o-mini",
+        system_prompt=SYSTEM_PROMPT,
+        user_prompt=USER_PROMPT,
+        **kwargs,
+    )
+
+
+def test_batches_fit_the_budget():
+    """긴 항목은 배치에 적게 담고, 모든 배치가 응답 예산을 넘지 않는지 확인"""
+    planner = TranslationBatchPlanner("gpt-4o-mini", SYSTEM_PROMPT, USER_PROMPT, 4000)
+    short_batches = planner.plan(SHORT_ITEMS)
+    long_batches = planner.plan(LONG_ITEMS)
+    print(
+        f"📊 배치당 항목 수: 짧은 원료 {len(short_batches[0])}개, "
+        f"긴 원료 {len(long_batches[0])}개"
+    )
+
+    assert len(short_batches[0]) > len(long_batches[0])
+    for batches, items in ((short_batches, SHORT_ITEMS), (long_batches, LONG_ITEMS)):
+        assert [item for batch in batches for item in batch] == items
+        for batch in batches:
+            assert planner.estimate(batch)[1] <= planner.completion_budget
+
+    # 최대 항목 수 제한과 예산을 넘는 단독 항목
+    assert max(len(batch) for batch in planner.plan(SHORT_ITEMS, max_items=50)) == 50
+    huge = "x" * 40000
+    assert planner.plan(["a", huge, "b"]) == [["a"], [huge], ["b"]]
+
+
+def test_planned_batches_are_not_truncated():
+    """planner가 나눈 배치는 응답 한도 안에서 끝나고, 항목당 토큰 수를 보고하는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer() as server:
+        output_file = os.path.join(temp_dir, "translated.json")
+        stats = _translator(server, max_tokens=600).run(
+            LONG_ITEMS, TranslationJournal(output_file)
+        )
+        print(
+            f"📊 배치 {stats['batches']}개 (배치당 {stats['items_per_batch']:.1f}개), "
+            f"{stats['items_per_second']:.0f}개/초, 항목당 {stats['tokens_per_item']:.1f}토큰"
+        )
+        assert stats["translated"] == len(LONG_ITEMS)
+        assert stats["truncated_responses"] == 0
+        assert stats["tokens_per_item"] > 0
+
+
+def test_oversized_batch_is_split():
+    """예산보다 큰 배치는 잘린 응답을 보고 나눠서 다시 요청하는지 확인"""
+    with FakeOpenAIServer() as server:
+        translator = _translator(server, max_tokens=600)
+        translations = translator.translate_batch(LONG_ITEMS[:100])
+        stats = translator._snapshot_stats(len(translations))
+
+        assert {item["original"] for item in translations} == set(LONG_ITEMS[:100])
+        assert stats["truncated_responses"] >= 1
+        assert stats["split_batches"] >= 1
+        assert stats["failed_batches"] == 0
+
+
+def test_unsalvageable_response_is_halved():
+    """살린 항목이 없는 잘린 응답은 항목 하나가 될 때까지 반으로 나눠 요청"""
+    with FakeOpenAIServer(max_answer_items=0) as server:
+        translator = _translator(server)
+        assert translator.translate_batch(SHORT_ITEMS[:4]) == []
+        stats = translator._snapshot_stats(0)
+
+        # 4개 → 2개 x 2 → 1개 x 4
+        assert stats["requests"] == 7
+        assert stats["split_batches"] == 6
+        assert stats["failed_batches"] == 1
+
+
+def test_fallback_counts_korean_and_french():
+    """토크나이저가 없을 때 한국어와 프랑스어를 글자 수 / 4보다 넉넉하게 추정하는지 확인"""
+    korean = "정제수, 설탕, 코코아버터, 전지분유"
+    french = "préparation à base de lait écrémé en poudre"
+    english = "skimmed milk powder"
+
+    # 한글 음절 14개는 음절마다 1토큰, 쉼표와 공백 6글자는 4글자당 1토큰
+    assert estimate_tokens(korean) == math.ceil(14 + 6 / 4)
+    assert estimate_tokens(korean) > 2 * math.ceil(len(korean) / 4)
+    # 악센트 문자 5개는 2글자마다 1토큰, 나머지 38글자는 4글자당 1토큰
+    assert estimate_tokens(french) == math.ceil(38 / 4 + 5 / 2)
+    assert estimate_tokens(french) > math.ceil(len(french) / 4)
+    # ASCII만 있는 텍스트는 기존과 같음
+    assert estimate_tokens(english) == math.ceil(len(english) / 4)
+
+    # 같은 글자 수라도 한국어 원료는 배치에 적게 담김
+    planner = TranslationBatchPlanner("gpt-4o-mini", SYSTEM_PROMPT, USER_PROMPT, 4000)
+    planner.count_tokens = estimate_tokens
+    korean_batch = planner.plan([korean] * 300)[0]
+    ascii_batch = planner.plan(["x" * len(korean)] * 300)[0]
+    assert len(korean_batch) < len(ascii_batch)
+
+
+def test_fallback_when_encoding_cannot_load():
+    """tiktoken 인코딩 파일을 받을 수 없으면(오프라인) 글자 수 추정으로 대체"""
+
+    def fail(name):
+        raise OSError("인코딩 파일 다운로드 실패")
+
+    original = token_budget.tiktoken
+    token_budget.tiktoken = SimpleNamespace(encoding_for_model=fail, get_encoding=fail)
+    token_budget.get_token_counter.cache_clear()
+    try:
+        assert token_budget.get_token_counter("gpt-4o-mini") is estimate_tokens
+    finally:
+        token_budget.tiktoken = original
+        token_budget.get_token_counter.cache_clear()
+
+
+if __name__ == "__main__":
+    print("🚀 토큰 예산 planner 테스트 시작\n")
+    test_batches_fit_the_budget()
+    test_planned_batches_are_not_truncated()
+    test_oversized_batch_is_split()
+    test_unsalvageable_response_is_halved()
+    test_fallback_counts_korean_and_french()
+    test_fallback_when_encoding_cannot_load()
+    print("🎉 모든 테스트 완료!")
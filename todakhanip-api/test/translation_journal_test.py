@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+배치 번역 체크포인트 저널 테스트 스크립트
+"""
+
+import sys
+import os
+import json
+import signal
+import subprocess
+import tempfile
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+
+from utils.translation_journal import TranslationJournal
+
+# 배치를 기록하다가 스스로 kill -9로 종료하는 프로세스
+CRASHING_WRITER = """
+import os, signal, sys
+from utils.translation_journal import TranslationJournal
+
+journal = TranslationJournal(sys.argv[1], compact_every=250)
+for batch in range(10):
+    journal.append(
+        [{"original": f"item-{batch}-{i}", "korean": "번역"} for i in range(100)]
+    )
+    if batch == 6:
+        # 다음 배치를 쓰던 도중 중단된 것처럼 잘린 줄을 남김
+        with open(journal.journal_file, "a", encoding="utf-8") as f:
+            f.write('{"original": "item-7-0", "kor')
+        os.kill(os.getpid(), signal.SIGKILL)
+"""
+
+
+def _items(prefix, count):
+    return [{"original": f"{prefix}-{i}", "korean": f"번역-{i}"} for i in range(count)]
+
+
+def _read_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def test_periodic_compaction():
+    """저널이 compact_every개 쌓일 때마다 최종 JSON으로 합쳐지는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file = os.path.join(temp_dir, "translated.json")
+        journal = TranslationJournal(output_file, compact_every=100)
+        for batch in range(7):
+            journal.append(_items(f"batch{batch}", 50))
+
+        assert journal.compactions == 3
+        assert len(_read_json(output_file)) == 300
+        with open(journal.journal_file, "r", encoding="utf-8") as f:
+            assert len(f.readlines()) == 50
+
+        assert journal.compact() == 350
+        assert not os.path.exists(journal.journal_file)
+        assert len(_read_json(output_file)) == 350
+
+
+def test_duplicates_are_not_journaled():
+    """이미 기록된 원문은 저널에 다시 쓰지 않는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file = os.path.join(temp_dir, "translated.json")
+        journal = TranslationJournal(output_file)
+        journal.append(_items("a", 10))
+        journal.append(_items("a", 20))
+        with open(journal.journal_file, "r", encoding="utf-8") as f:
+            assert len(f.readlines()) == 20
+
+
+def test_torn_tail_is_repaired():
+    """잘린 마지막 줄을 버리고 그 뒤에 정상적으로 이어 쓰는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file = os.path.join(temp_dir, "translated.json")
+        journal_file = f"{output_file}.journal"
+        with open(journal_file, "w", encoding="utf-8") as f:
+            for item in _items("a", 3):
+                f.write(json.dumps(item, ensure_ascii=False) + "\n")
+            f.write('{"original": "a-3", "kore')
+
+        journal = TranslationJournal(output_file)
+        assert journal.translated_originals() == {"a-0", "a-1", "a-2"}
+        journal.append(_items("b", 2))
+
+        with open(journal_file, "r", encoding="utf-8") as f:
+            lines = [json.loads(line) for line in f]
+        assert [item["original"] for item in lines] == ["a-0", "a-1", "a-2", "b-0", "b-1"]
+
+
+def test_resume_after_kill():
+    """kill -9로 중단된 뒤에도 기록이 끝난 배치는 모두 남아 있는지 확인"""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file = os.path.join(temp_dir, "translated.json")
+        result = subprocess.run(
+            [sys.executable, "-c", CRASHING_WRITER, output_file], cwd=BASE_DIR
+        )
+        assert result.returncode == -signal.SIGKILL
+
+        # 250개 이상 쌓일 때마다 compaction되므로 최종 JSON에 600개, 저널에 100개가 남아 있음
+        assert len(_read_json(output_file)) == 600
+
+        journal = TranslationJournal(output_file)
+        originals = journal.translated_originals()
+        assert len(originals) == 700
+        assert "item-6-99" in originals
+        assert "item-7-0" not in originals
+
+        journal.append(_items("item-7", 100))
+        assert journal.compact() == 800
+
+
+if __name__ == "__main__":
+    print("🚀 번역 저널 테스트 시작\n")
+    test_periodic_compaction()
+    test_duplicates_are_not_journaled()
+    test_torn_tail_is_repaired()
+    test_resume_after_kill()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+번역 응답 형식(structured outputs)과 잘린 응답 복구 테스트 스크립트
+
+로컬 OpenAI 스텁 서버를 사용하므로 네트워크, OpenAI 키 없이 실행 가능하다.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 상위 디렉토리를 Python 경로에 추가
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from openai import OpenAI
+from fake_openai_server import FakeOpenAIServer
+from utils.batch_translation import BatchTranslator
+from utils.token_budget import estimate_tokens
+from utils.translation_journal import TranslationJournal
+from utils.translation_output import (
+    IncrementalArrayParser,
+    format_numbered_items,
+    parse_numbered_items,
+    parse_translations,
+)
+
+ITEMS = ["Sucre", "huile de palme", "noisettes", "lait écrémé en poudre"]
+COMPACT = '{"t": [{"i": 1, "k": "설탕"}, {"i": 2, "k": "팜유"}, {"i": 3, "k": "헤이즐넛"}, {"i": 4, "k": "탈지분유"}]}'
+
+
+def test_numbered_items_round_trip():
+    """번호를 붙인 항목 목록을 다시 항목 리스트로 복원"""
+    items = ITEMS + ["a, b", "1. 숫자로 시작"]
+    text = "다음 식품 원료들을 한국어로 번역해주세요:\n\n" + format_numbered_items(items)
+    assert parse_numbered_items(text) == items
+
+
+def test_complete_response():
+    """완성된 응답은 번호로 원문을 찾아 모두 반환"""
+    translations, complete = parse_translations(COMPACT, ITEMS)
+    assert complete
+    assert translations[1] == {"original": "huile de palme", "korean": "팜유"}
+    assert len(translations) == 4
+
+
+def test_truncated_response_is_salvaged():
+    """max_tokens에서 잘린 응답도 완성된 항목은 살림"""
+    truncated = COMPACT[: COMPACT.index('"헤이즐') + 4]
+    translations, complete = parse_translations(truncated, ITEMS)
+    assert not complete
+    assert [item["original"] for item in translations] == ["Sucre", "huile de palme"]
+
+    # JSON이 아예 없거나 빈 응답이어도 예외 없이 빈 결과
+    assert parse_translations("죄송합니다", ITEMS) == ([], False)
+    assert parse_translations(None, ITEMS) == ([], False)
+
+
+def test_streaming_chunks():
+    """스트리밍 조각을 넘길 때마다 완성된 원소만 꺼냄"""
+    parser = IncrementalArrayParser()
+    elements = []
+    for start in range(0, len(COMPACT), 7):
+        elements.extend(parser.feed(COMPACT[start : start + 7]))
+        assert len(elements) <= 4
+    assert parser.finished
+    assert [element["i"] for element in elements] == [1, 2, 3, 4]
+
+
+def test_legacy_format():
+    """이전 형식(```json 펜스, original/korean 배열) 응답도 파싱"""
+    content = '```json\n[{"original": "Sucre", "korean": "설탕"}]\n```'
+    translations, complete = parse_translations(content)
+    assert complete
+    assert translations == [{"original": "Sucre", "korean": "설탕"}]
+
+
+def test_compact_format_is_smaller():
+    """원문을 다시 쓰지 않는 응답이 이전 형식보다 작은지 측정"""
+    items = [f"ingredient name number {i}" for i in range(100)]
+    legacy = json.dumps(
+        [{"original": item, "korean": f"원료 {i}"} for i, item in enumerate(items)],
+        ensure_ascii=False,
+    )
+    compact = json.dumps(
+        {"t": [{"i": i + 1, "k": f"원료 {i}"} for i in range(len(items))]},
+        ensure_ascii=False,
+    )
+    saved = 1 - estimate_tokens(compact) / estimate_tokens(legacy)
+    print(
+        f"📊 응답 토큰 추정: 이전 {estimate_tokens(legacy)} → "
+        f"압축 {estimate_tokens(compact)} ({saved:.0%} 절감)"
+    )
+    assert saved > 0.4
+
+
+def test_truncated_batch_is_requested_again():
+    """잘린 응답에서 살린 항목은 저장하고 나머지만 나눠서 다시 요청"""
+    items = [f"ingredient-{i}" for i in range(25)]
+    with tempfile.TemporaryDirectory() as temp_dir, FakeOpenAIServer(
+        max_answer_items=10
+    ) as server:
+        client = OpenAI(api_key="test-key", base_url=server.base_url, max_retries=0)
+        translator = BatchTranslator(
+            client,
+            model="gpt-4o-mini",
+            system_prompt="번역해주세요.",
+            user_prompt="다음 식품 원료들을 한국어로 번역해주세요:\n\n{items}",
+        )
+        output_file = os.path.join(temp_dir, "translated.json")
+        stats = translator.run(items, TranslationJournal(output_file), batch_size=25)
+
+        with open(output_file, "r", encoding="utf-8") as f:
+            translations = json.load(f)
+        assert {item["original"]: item["korean"] for item in translations} == {
+            item: f"번역:{item}" for item in items
+        }
+        # 25개 → 10개 살림, 나머지 15개는 10개, 5개로 나눠 요청
+        assert stats["requests"] == 3
+        assert stats["truncated_responses"] == 1
+        assert stats["salvaged_items"] == 10
+        assert stats["split_batches"] == 2
+        assert stats["failed_batches"] == 0
+
+
+if __name__ == "__main__":
+    print("🚀 번역 응답 형식 테스트 시작\n")
+    test_numbered_items_round_trip()
+    test_complete_response()
+    test_truncated_response_is_salvaged()
+    test_streaming_chunks()
+    test_legacy_format()
+    test_compact_format_is_smaller()
+    test_truncated_batch_is_requested_again()
+    print("🎉 모든 테스트 완료!")
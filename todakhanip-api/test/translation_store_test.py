@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+번역 저장소(sqlite) 테스트 스크립트
+
+data/translated의 JSON 번역 파일로 임시 저장소를 만들어
+JSON 로드 방식과 같은 번역 결과가 나오는지 확인한다.
+"""
+
+import sys
+import os
+import json
+import tempfile
+
+# 상위 디렉토리를 Python 경로에 추가
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BASE_DIR)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+
+from utils import translation_manager, translation_store
+
+TRANSLATION_FILES = {
+    name: os.path.join(BASE_DIR, path)
+    for name, path in translation_store.TRANSLATION_FILES.items()
+}
+
+
+def _with_store(test_fn):
+    """임시 저장소를 빌드해 translation_manager가 사용하도록 설정"""
+    original = (
+        translation_manager.TRANSLATION_STORE_FILE,
+        translation_manager.TRANSLATION_FILES,
+    )
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store_file = os.path.join(temp_dir, "translations.sqlite")
+        counts = translation_store.build_translation_store(
+            store_file, TRANSLATION_FILES, [TRANSLATION_FILES["allergens"]]
+        )
+        translation_manager.TRANSLATION_FILES = TRANSLATION_FILES
+        try:
+            return test_fn(store_file, counts)
+        finally:
+            (
+                translation_manager.TRANSLATION_STORE_FILE,
+                translation_manager.TRANSLATION_FILES,
+            ) = original
+            translation_manager.clear_translation_cache()
+            translation_manager.load_translation_data()
+
+
+def _load(store_file):
+    translation_manager.clear_translation_cache()
+    translation_manager.TRANSLATION_STORE_FILE = store_file
+    translation_manager.load_translation_data()
+
+
+def test_store_matches_json():
+    """저장소 조회 결과가 JSON 로드 방식과 같은지 확인"""
+
+    def scenario(store_file, counts):
+        with open(TRANSLATION_FILES["allergens"], "r", encoding="utf-8") as f:
+            tags = [f"en:{item['original']}" for item in json.load(f)]
+        tags += ["en:없는-태그", "태그형식아님", "fr:a:b"]
+
+        _load("")
+        assert not translation_store.is_store_open()
+        from_json = translation_manager.translate_tags(tags, "allergens")
+        product_type = translation_manager.translate_text("food", "product")
+
+        _load(store_file)
+        assert translation_store.is_store_open()
+        assert translation_manager.translate_tags(tags, "allergens") == from_json
+        assert translation_manager.translate_text("food", "product") == product_type
+        assert translation_manager.translate_text("없는 값", "product") == "없는 값"
+        assert translation_store.get_store_counts() == counts
+
+    _with_store(scenario)
+
+
+def test_store_serves_ingredient_dictionary():
+    """원료 사전 항목을 메모리에 올리지 않고 저장소에서 조회"""
+
+    def scenario(store_file, counts):
+        _load(store_file)
+        translation_manager.clear_ingredient_dictionary()
+        translations, missing = translation_manager._lookup_ingredients(
+            ["Milk", "gluten", "처음 보는 원료"]
+        )
+        assert translations == {"Milk": "우유", "gluten": "글루텐"}
+        assert missing == ["처음 보는 원료"]
+        assert counts["ingredient_dictionary"] > 0
+        assert translation_manager.get_ingredient_dictionary_stats()["size"] == 0
+        translation_manager.clear_ingredient_dictionary()
+
+    _with_store(scenario)
+
+
+if __name__ == "__main__":
+    print("🚀 번역 저장소 테스트 시작\n")
+    test_store_matches_json()
+    test_store_serves_ingredient_dictionary()
+    print("🎉 모든 테스트 완료!")
@@ -0,0 +1,245 @@
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from dotenv import load_dotenv
+from utils.cache import TTLCache
+from utils.mongo_client import get_collection
+from utils.bulkheads import MONGO_POOL, BulkheadFullError, run_async
+
+# 환경 변수 로드
+load_dotenv()
+
+# 분석 캐시 설정 (환경 변수로 조정 가능)
+# memory: 프로세스 내 LRU, mongodb: 워커/인스턴스 간 공유, none: 캐시 사용 안 함
+ANALYSIS_CACHE_BACKEND = os.getenv("ANALYSIS_CACHE_BACKEND", "memory")
+ANALYSIS_CACHE_MAX_SIZE = int(os.getenv("ANALYSIS_CACHE_MAX_SIZE", "5000"))
+ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv("ANALYSIS_CACHE_TTL_SECONDS", "604800"))
+ANALYSIS_COLLECTION_NAME = os.getenv(
+    "MONGODB_ANALYSIS_COLLECTION_NAME", "health_analyses"
+)
+# 프롬프트 외의 후처리 방식이 바뀌면 올려서 기존 캐시를 무효화
+ANALYSIS_CACHE_VERSION = 1
+# MongoDB 백엔드에서 최대 크기를 확인하는 주기 (저장 횟수 기준)
+MONGO_TRIM_INTERVAL = 100
+
+
+def make_cache_key(**parts):
+    """
+    분석 요청 구성 요소를 정규화된 JSON으로 만든 뒤
+    sha256 해시를 반환하는 함수
+
+    딕셔너리 키 순서나 공백이 달라도 내용이 같으면 같은 키가 나온다.
+
+    Args:
+        **parts: 모델, 프롬프트 템플릿, 제품 정보, 건강 프로필 등
+
+    Returns:
+        str: 16진수 해시 키
+    """
+    canonical = json.dumps(
+        {"version": ANALYSIS_CACHE_VERSION, **parts},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class MongoTTLCache:
+    """
+    MongoDB 컬렉션을 사용하는 TTL 캐시 (TTLCache와 같은 인터페이스)
+
+    만료는 expires_at TTL 인덱스로 MongoDB가 처리하고, 최대 크기는
+    일정 횟수 저장마다 오래된 항목을 지워 맞춘다.
+    MongoDB 오류는 캐시 미스로 취급한다.
+    """
+
+    def __init__(self, collection_name, maxsize, ttl):
+        self.collection_name = collection_name
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._indexes_ready = False
+        self._stores_since_trim = 0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _collection(self):
+        collection = get_collection(self.collection_name)
+        if not self._indexes_ready:
+            collection.create_index("expires_at", expireAfterSeconds=0)
+            collection.create_index("created_at")
+            self._indexes_ready = True
+        return collection
+
+    def _count(self, key):
+        with self._lock:
+            setattr(self, key, getattr(self, key) + 1)
+
+    def get(self, key, default=None):
+        """키에 해당하는 값을 반환 (없거나 만료되면 default)"""
+        try:
+            doc = self._collection().find_one(
+                {"_id": key, "expires_at": {"$gt": datetime.now(timezone.utc)}}
+            )
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ 분석 캐시 조회 오류 - {e}")
+            doc = None
+        if doc is None:
+            self._count("misses")
+            return default
+        self._count("hits")
+        return doc["value"]
+
+    def set(self, key, value, ttl=None):
+        """값을 저장 (ttl 미지정 시 기본 TTL 사용)"""
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl if ttl is None else ttl)
+        try:
+            collection = self._collection()
+            collection.replace_one(
+                {"_id": key},
+                {"_id": key, "value": value, "created_at": now, "expires_at": expires_at},
+                upsert=True,
+            )
+            self._trim_if_needed(collection)
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ 분석 캐시 저장 오류 - {e}")
+
+    def _trim_if_needed(self, collection):
+        """최대 크기를 넘으면 가장 오래된 항목부터 삭제"""
+        with self._lock:
+            self._stores_since_trim += 1
+            if self._stores_since_trim < MONGO_TRIM_INTERVAL:
+                return
+            self._stores_since_trim = 0
+
+        excess = collection.estimated_document_count() - self.maxsize
+        if excess <= 0:
+            return
+        oldest = collection.find({}, {"_id": 1}).sort("created_at", 1).limit(excess)
+        collection.delete_many({"_id": {"$in": [doc["_id"] for doc in oldest]}})
+
+    def delete(self, key):
+        """키 삭제"""
+        try:
+            self._collection().delete_one({"_id": key})
+        except Exception as e:
+            self._count("errors")
+            print(f"⚠️ 분석 캐시 삭제 오류 - {e}")
+
+    def clear(self):
+        """전체 삭제 및 통계 초기화"""
+        try:
+            self._collection().delete_many({})
+        except Exception as e:
+            print(f"⚠️ 분석 캐시 초기화 오류 - {e}")
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+            self.errors = 0
+
+    def __len__(self):
+        try:
+            return self._collection().estimated_document_count()
+        except Exception:
+            return 0
+
+    def stats(self):
+        """캐시 크기와 적중률 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            stats = {
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
+        stats["size"] = len(self)
+        return stats
+
+
+def _create_backend(backend):
+    if backend == "mongodb":
+        return MongoTTLCache(
+            ANALYSIS_COLLECTION_NAME, ANALYSIS_CACHE_MAX_SIZE, ANALYSIS_CACHE_TTL_SECONDS
+        )
+    if backend == "memory":
+        return TTLCache(ANALYSIS_CACHE_MAX_SIZE, ANALYSIS_CACHE_TTL_SECONDS)
+    return None
+
+
+_backend = _create_backend(ANALYSIS_CACHE_BACKEND)
+
+
+def set_analysis_cache_backend(backend):
+    """
+    분석 캐시 백엔드를 교체하는 함수
+
+    Args:
+        backend (str): "memory", "mongodb", "none" 중 하나
+    """
+    global _backend, ANALYSIS_CACHE_BACKEND
+    ANALYSIS_CACHE_BACKEND = backend
+    _backend = _create_backend(backend)
+
+
+def get_cached_analysis(key):
+    """캐시된 분석 결과를 반환 (없으면 None)"""
+    if _backend is None:
+        return None
+    return _backend.get(key)
+
+
+def store_analysis(key, analysis):
+    """분석 결과를 캐시에 저장 (빈 결과는 저장하지 않음)"""
+    if _backend is None or not analysis:
+        return
+    _backend.set(key, analysis)
+
+
+async def get_cached_analysis_async(key):
+    """
+    get_cached_analysis의 비동기 버전
+    (MongoDB 백엔드는 MongoDB 스레드 풀에서 조회)
+
+    풀이 가득 차면 캐시 미스로 처리한다.
+    """
+    if isinstance(_backend, MongoTTLCache):
+        try:
+            return await run_async(MONGO_POOL, get_cached_analysis, key)
+        except BulkheadFullError:
+            return None
+    return get_cached_analysis(key)
+
+
+async def store_analysis_async(key, analysis):
+    """store_analysis의 비동기 버전 (MongoDB 백엔드는 MongoDB 풀에서 저장)"""
+    if isinstance(_backend, MongoTTLCache):
+        try:
+            await run_async(MONGO_POOL, store_analysis, key, analysis)
+        except BulkheadFullError:
+            pass
+    else:
+        store_analysis(key, analysis)
+
+
+def clear_analysis_cache():
+    """분석 캐시와 통계 초기화"""
+    if _backend is not None:
+        _backend.clear()
+
+
+def get_analysis_cache_stats():
+    """분석 캐시 백엔드와 적중률 통계 반환"""
+    stats = {"backend": ANALYSIS_CACHE_BACKEND}
+    if _backend is not None:
+        stats.update(_backend.stats())
+    return stats
@@ -0,0 +1,170 @@
+import json
+import httpx
+import requests
+from utils.product_parser import build_products_summary
+from utils.openfoodfacts_client import OpenFoodFactsError
+from utils.bulkheads import BulkheadFullError, get_bulkhead_stats
+from utils.product_cache import get_product_cache_stats
+from utils.analysis_cache import get_analysis_cache_stats
+from utils.translation_manager import get_ingredient_dictionary_stats
+from prompts.api_prompts import API_MESSAGES, HTTP_STATUS_CODES, RESPONSE_KEYS
+from prompts.constants import COMPREHENSIVE_BASKET_MAX_PRODUCTS
+
+# app.py(Flask)와 asgi.py(Quart)가 함께 쓰는 요청 검증과 응답 구성
+# 두 앱은 라우트 본문의 I/O(동기/비동기)만 다르고 응답 형식은 여기서 정한다.
+
+
+def success_response(data):
+    """성공 응답 본문"""
+    return {RESPONSE_KEYS["SUCCESS"]: True, RESPONSE_KEYS["DATA"]: data}
+
+
+def error_response(message, status_code, **extra):
+    """(오류 응답 본문, 상태 코드) - extra는 본문에 그대로 추가"""
+    return {
+        RESPONSE_KEYS["SUCCESS"]: False,
+        RESPONSE_KEYS["ERROR"]: message,
+        **extra,
+    }, status_code
+
+
+def invalid_json_error():
+    return error_response(API_MESSAGES["INVALID_JSON"], HTTP_STATUS_CODES["BAD_REQUEST"])
+
+
+def product_not_found_error():
+    return error_response(
+        API_MESSAGES["PRODUCT_NOT_FOUND"], HTTP_STATUS_CODES["NOT_FOUND"]
+    )
+
+
+def no_valid_products_error(**extra):
+    return error_response(
+        API_MESSAGES["NO_VALID_PRODUCTS"], HTTP_STATUS_CODES["NOT_FOUND"], **extra
+    )
+
+
+def unexpected_error(e):
+    return error_response(
+        API_MESSAGES["UNEXPECTED_ERROR"].format(error=str(e)),
+        HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"],
+    )
+
+
+def unexpected_error_event(e):
+    """스트리밍 도중 발생한 예외를 error 이벤트로 변환"""
+    return "error", {
+        RESPONSE_KEYS["ERROR"]: API_MESSAGES["UNEXPECTED_ERROR"].format(error=str(e))
+    }
+
+
+def health_profile_request_error(request_json):
+    """바코드 분석 요청을 검증하여 오류 응답을 반환 (문제가 없으면 None)"""
+    if not request_json:
+        return invalid_json_error()
+    if not request_json.get("health_profile"):
+        return error_response(
+            API_MESSAGES["HEALTH_PROFILE_REQUIRED"], HTTP_STATUS_CODES["BAD_REQUEST"]
+        )
+    return None
+
+
+def comprehensive_request_error(products_data, health_profile):
+    """종합 분석 요청을 검증하여 오류 응답을 반환 (문제가 없으면 None)"""
+    if not products_data:
+        return error_response(
+            API_MESSAGES["PRODUCTS_DATA_REQUIRED"], HTTP_STATUS_CODES["BAD_REQUEST"]
+        )
+
+    if not health_profile:
+        return error_response(
+            API_MESSAGES["HEALTH_PROFILE_REQUIRED"], HTTP_STATUS_CODES["BAD_REQUEST"]
+        )
+
+    # 제품 개수 제한 (많은 제품은 제품별 요약 후 종합 분석)
+    if len(products_data) > COMPREHENSIVE_BASKET_MAX_PRODUCTS:
+        return error_response(
+            API_MESSAGES["TOO_MANY_PRODUCTS"].format(
+                max_products=COMPREHENSIVE_BASKET_MAX_PRODUCTS
+            ),
+            HTTP_STATUS_CODES["BAD_REQUEST"],
+        )
+
+    return None
+
+
+def request_barcodes(data):
+    """요청 본문의 barcodes를 빈 값을 뺀 문자열 목록으로 정리"""
+    barcodes = data.get("barcodes", [])
+    if not isinstance(barcodes, list):
+        return []
+    return [str(barcode) for barcode in barcodes if barcode]
+
+
+def product_lookup_error(e):
+    """제품 조회 중 발생한 예외를 API 오류 응답으로 변환"""
+    if isinstance(e, BulkheadFullError):
+        return error_response(
+            API_MESSAGES["SERVICE_BUSY"], HTTP_STATUS_CODES["SERVICE_UNAVAILABLE"]
+        )
+    if isinstance(e, OpenFoodFactsError):
+        return error_response(
+            API_MESSAGES["API_REQUEST_FAILED"].format(status_code=e.status_code),
+            e.status_code,
+        )
+    if isinstance(e, (requests.exceptions.RequestException, httpx.HTTPError)):
+        return error_response(
+            API_MESSAGES["REQUEST_ERROR"].format(error=str(e)),
+            HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"],
+        )
+    if isinstance(e, json.JSONDecodeError):
+        return error_response(
+            API_MESSAGES["JSON_DECODE_ERROR"].format(error=str(e)),
+            HTTP_STATUS_CODES["INTERNAL_SERVER_ERROR"],
+        )
+    return unexpected_error(e)
+
+
+def comprehensive_summary(products_info, total_requested, failed_products):
+    """종합 분석 응답과 스트리밍 summary 이벤트에 들어가는 제품 요약"""
+    return {
+        "analyzed_products": len(products_info),
+        "total_requested": total_requested,
+        "failed_products": failed_products,
+        "products_summary": build_products_summary(products_info),
+    }
+
+
+def comprehensive_response(
+    comprehensive_analysis, products_info, total_requested, failed_products
+):
+    """종합 분석 성공 응답 본문"""
+    return success_response(
+        {
+            "comprehensive_analysis": comprehensive_analysis,
+            **comprehensive_summary(products_info, total_requested, failed_products),
+        }
+    )
+
+
+def mongo_health_response(health):
+    """get_mongo_health 결과를 응답으로 변환 (연결 실패 시 503)"""
+    if health["ok"]:
+        return success_response(health), 200
+    return error_response(
+        health.get("error"),
+        HTTP_STATUS_CODES["SERVICE_UNAVAILABLE"],
+        **{RESPONSE_KEYS["DATA"]: health},
+    )
+
+
+def cache_health_response():
+    """제품 캐시, 건강 분석 캐시, 원료 사전, 스레드 풀 통계 응답"""
+    return success_response(
+        {
+            "product_cache": get_product_cache_stats(),
+            "analysis_cache": get_analysis_cache_stats(),
+            "ingredient_dictionary": get_ingredient_dictionary_stats(),
+            "bulkheads": get_bulkhead_stats(),
+        }
+    )
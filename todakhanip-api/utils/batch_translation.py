@@ -0,0 +1,598 @@
+import io
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import CancelledError, ThreadPoolExecutor, as_completed
+from dotenv import load_dotenv
+from openai import (
+    RateLimitError,
+    APIConnectionError,
+    APITimeoutError,
+    AuthenticationError,
+    InternalServerError,
+    PermissionDeniedError,
+)
+from tqdm import tqdm
+from utils.token_budget import TranslationBatchPlanner
+from utils.translation_output import (
+    TRANSLATION_RESPONSE_FORMAT,
+    format_numbered_items,
+    parse_numbered_items,
+    parse_translations,
+)
+
+# 환경 변수 로드
+load_dotenv()
+
+# 동시에 진행할 번역 요청 수
+TRANSLATION_MAX_CONCURRENCY = int(os.getenv("TRANSLATION_MAX_CONCURRENCY", "8"))
+# 계정의 분당 요청/토큰 한도 (OpenAI 대시보드의 Rate limits 값에 맞춰 조정)
+OPENAI_RPM_LIMIT = int(os.getenv("OPENAI_RPM_LIMIT", "500"))
+OPENAI_TPM_LIMIT = int(os.getenv("OPENAI_TPM_LIMIT", "200000"))
+# 배치 하나를 포기하기 전까지 재시도 횟수와 기본 대기 시간(지수 증가)
+TRANSLATION_MAX_RETRIES = 6
+TRANSLATION_RETRY_BACKOFF_SECONDS = 1.0
+TRANSLATION_RETRY_BACKOFF_MAX_SECONDS = 60.0
+
+# Batch API 설정 (실시간 응답이 필요 없는 전체 분류 번역용)
+BATCH_API_MAX_REQUESTS = 50000  # 작업 하나에 담을 수 있는 최대 요청 수
+BATCH_API_POLL_SECONDS = 30
+BATCH_API_COMPLETION_WINDOW = "24h"
+BATCH_API_TERMINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+class RateLimiter:
+    """
+    분당 요청 수와 토큰 수를 함께 지키는 토큰 버킷
+
+    두 버킷 모두 period 동안 한도만큼 채워지며, 요청 전에 acquire로 예약하고
+    응답의 실제 사용량이 예약보다 적으면 release로 돌려받는다.
+    429 응답을 받으면 pause로 모든 요청을 잠시 멈춘다.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute, period=60.0):
+        self._condition = threading.Condition()
+        self._capacity = {
+            "requests": float(requests_per_minute),
+            "tokens": float(tokens_per_minute),
+        }
+        self._available = dict(self._capacity)
+        self._period = period
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def _refill(self, now):
+        elapsed = now - self._updated
+        self._updated = now
+        for key, capacity in self._capacity.items():
+            self._available[key] = min(
+                capacity, self._available[key] + elapsed * capacity / self._period
+            )
+
+    def _wait_seconds(self, tokens, now):
+        """요청 하나와 tokens개의 토큰을 쓸 수 있을 때까지 남은 시간"""
+        if self._paused_until > now:
+            return self._paused_until - now
+        wait = 0.0
+        for key, needed in (("requests", 1.0), ("tokens", tokens)):
+            missing = needed - self._available[key]
+            if missing > 0:
+                wait = max(wait, missing * self._period / self._capacity[key])
+        return wait
+
+    def acquire(self, tokens):
+        """
+        요청 하나와 tokens개의 토큰을 예약
+        (한도를 넘으면 채워질 때까지 대기)
+        """
+        tokens = min(float(tokens), self._capacity["tokens"])
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                self._refill(now)
+                wait = self._wait_seconds(tokens, now)
+                if wait <= 0:
+                    self._available["requests"] -= 1
+                    self._available["tokens"] -= tokens
+                    return
+                self._condition.wait(wait)
+
+    def release(self, tokens):
+        """예약했지만 쓰지 않은 토큰 반환"""
+        if tokens <= 0:
+            return
+        with self._condition:
+            self._refill(time.monotonic())
+            self._available["tokens"] = min(
+                self._capacity["tokens"], self._available["tokens"] + tokens
+            )
+            self._condition.notify_all()
+
+    def pause(self, seconds):
+        """seconds 동안 새 요청을 보내지 않음"""
+        with self._condition:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+
+def _retry_after_seconds(error):
+    """429 응답의 Retry-After 헤더 값(초) 반환 (없으면 None)"""
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_fatal_error(error):
+    """
+    다시 요청해도 모든 배치가 실패할 오류인지
+    (크레딧 소진, 잘못된 키, 권한 없음)
+    """
+    if isinstance(error, (AuthenticationError, PermissionDeniedError)):
+        return True
+    return (
+        isinstance(error, RateLimitError)
+        and getattr(error, "code", None) == "insufficient_quota"
+    )
+
+
+class BatchTranslator:
+    """
+    번역 스크립트들이 함께 쓰는 배치 번역 엔진
+
+    항목은 TranslationBatchPlanner로 토큰 예산에 맞춰 배치로 나누고,
+    여러 배치를 동시에 요청하되 RateLimiter로 분당 요청/토큰 한도를 지키며,
+    429 응답은 Retry-After(없으면 지수 백오프)만큼 전체 요청을 멈춘 뒤
+    재시도한다. 결과는 TranslationJournal에 배치 단위로 덧붙여 저장한다.
+
+    Args:
+        client (OpenAI): OpenAI 클라이언트
+            (재시도는 엔진이 하므로 max_retries=0 권장)
+        model (str): 사용할 모델
+        system_prompt (str): 시스템 프롬프트
+            (응답 형식은 TRANSLATION_OUTPUT_INSTRUCTION 참고)
+        user_prompt (str): 사용자 프롬프트
+            ("{items}" 자리에 번호를 붙인 번역 항목이 들어감)
+        max_tokens (int): 요청당 최대 응답 토큰 수
+    """
+
+    def __init__(
+        self,
+        client,
+        model,
+        system_prompt,
+        user_prompt,
+        max_tokens=4000,
+        temperature=0.1,
+        max_concurrency=TRANSLATION_MAX_CONCURRENCY,
+        requests_per_minute=OPENAI_RPM_LIMIT,
+        tokens_per_minute=OPENAI_TPM_LIMIT,
+        max_retries=TRANSLATION_MAX_RETRIES,
+        retry_backoff_seconds=TRANSLATION_RETRY_BACKOFF_SECONDS,
+    ):
+        self.client = client
+        self.model = model
+        self.system_prompt = system_prompt
+        self.user_prompt = user_prompt
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.planner = TranslationBatchPlanner(
+            model, system_prompt, user_prompt, max_tokens
+        )
+
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "retries": 0,
+            "failed_batches": 0,
+            "truncated_responses": 0,
+            "salvaged_items": 0,
+            "split_batches": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    def _count(self, key, amount=1):
+        with self._stats_lock:
+            self._stats[key] += amount
+
+    def _snapshot_stats(self, translated):
+        """현재 통계에 번역 항목당 토큰 수를 더해 반환"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        tokens = stats["prompt_tokens"] + stats["completion_tokens"]
+        stats["tokens_per_item"] = tokens / translated if translated else 0.0
+        return stats
+
+    def _backoff_seconds(self, attempt):
+        """지수 백오프 + 지터"""
+        delay = min(
+            TRANSLATION_RETRY_BACKOFF_MAX_SECONDS,
+            self.retry_backoff_seconds * (2**attempt),
+        )
+        return delay * (1 + random.random() * 0.2)
+
+    def build_request(self, batch):
+        """배치 하나의 chat completion 요청 인자 생성"""
+        return {
+            "model": self.model,
+            "messages": [
+                {"role": "system", "content": self.system_prompt},
+                {
+                    "role": "user",
+                    "content": self.user_prompt.format(
+                        items=format_numbered_items(batch)
+                    ),
+                },
+            ],
+            "response_format": TRANSLATION_RESPONSE_FORMAT,
+            "temperature": self.temperature,
+            "max_tokens": self.max_tokens,
+        }
+
+    def _complete(self, request):
+        """
+        chat completion 요청 하나를 보냄 (한도 초과, 연결 오류, 5xx는 재시도)
+
+        Returns:
+            str | None: 응답 텍스트 (재시도 후에도 실패하거나 빈 응답이면 None)
+        """
+        reserved = self.max_tokens + sum(
+            self.planner.count_tokens(message["content"])
+            for message in request["messages"]
+        )
+
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire(reserved)
+            self._count("requests")
+            try:
+                response = self.client.chat.completions.create(**request)
+            except RateLimitError as e:
+                # 거절된 요청은 한도에 포함되지 않으므로 예약 반환
+                self.limiter.release(reserved)
+                if getattr(e, "code", None) == "insufficient_quota":
+                    raise
+                self._count("rate_limited")
+                delay = _retry_after_seconds(e) or self._backoff_seconds(attempt)
+                self.limiter.pause(delay)
+                continue
+            except (APIConnectionError, APITimeoutError, InternalServerError) as e:
+                self.limiter.release(reserved)
+                self._count("retries")
+                print(f"⚠️ 번역 요청 오류, 재시도 ({attempt + 1}) - {e}")
+                time.sleep(self._backoff_seconds(attempt))
+                continue
+
+            usage = response.usage
+            if usage is not None:
+                self._count("prompt_tokens", usage.prompt_tokens)
+                self._count("completion_tokens", usage.completion_tokens)
+                self.limiter.release(reserved - usage.total_tokens)
+
+            content = response.choices[0].message.content
+            if content is None:
+                print("❌ 빈 응답 받음")
+            return content
+        return None
+
+    def translate_batch(self, batch):
+        """
+        배치 하나를 번역
+
+        응답이 max_tokens에서 잘리면 완성된 항목은 살리고,
+        나머지 항목은 잘린 응답에 들어간 항목 수만큼씩 나눠
+        다시 요청한다.
+        살린 항목이 없으면 배치를 반으로 나눠 요청한다.
+
+        Returns:
+            list: 번역 항목 리스트
+                (실패 시 빈 리스트, 다음 실행에서 다시 번역됨)
+        """
+        translations = self._translate_pending(batch)
+        if not translations:
+            self._count("failed_batches")
+        return translations
+
+    def _translate_pending(self, batch):
+        content = self._complete(self.build_request(batch))
+        if content is None:
+            return []
+        translations, complete = parse_translations(content, batch)
+        if complete:
+            return translations
+
+        self._count("truncated_responses")
+        if translations:
+            # 살린 항목을 빼고, 응답에 들어간 만큼씩 나눠 나머지를 요청
+            self._count("salvaged_items", len(translations))
+            done = {item["original"] for item in translations}
+            remaining = [item for item in batch if item not in done]
+            size = len(translations)
+        elif len(batch) > 1:
+            remaining = batch
+            size = (len(batch) + 1) // 2
+        else:
+            print(f"❌ 항목 하나도 응답 한도를 넘음: {batch[0][:50]}")
+            return []
+
+        for start in range(0, len(remaining), size):
+            self._count("split_batches")
+            translations.extend(self._translate_pending(remaining[start : start + size]))
+        return translations
+
+    def run(self, items, journal, batch_size=None):
+        """
+        아직 번역되지 않은 항목을 배치로 나눠 동시에 번역하고
+        저널에 기록하는 함수
+
+        Args:
+            items (list): 번역할 원문 리스트
+            journal (TranslationJournal): 결과를 기록할 저널
+                (이미 번역된 항목은 건너뜀)
+            batch_size (int): 요청 하나에 담을 최대 항목 수
+                (기본값: 토큰 예산으로만 결정)
+
+        배치 하나가 예외로 끝나도 실패한 배치로 세고
+        나머지 결과는 계속 저널에 기록한다.
+        크레딧 소진(insufficient_quota)처럼 모든 배치가 실패할 오류면
+        아직 시작하지 않은 배치를 취소하고,
+        그 오류를 통계의 fatal_error로 알려준다.
+
+        Returns:
+            dict: 번역 통계 (항목 수, 요청 수, 429 횟수, 소요 시간,
+                초당 항목 수, 항목당 토큰 수 등)
+        """
+        translated_originals = journal.translated_originals()
+        remaining = [
+            item
+            for item in dict.fromkeys(items)
+            if item not in translated_originals
+        ]
+        batches = self.planner.plan(remaining, batch_size)
+
+        translated = 0
+        fatal_error = None
+        start = time.perf_counter()
+        if batches:
+            with ThreadPoolExecutor(
+                max_workers=self.max_concurrency
+            ) as executor, tqdm(total=len(batches), desc="번역 진행률", unit="배치") as pbar:
+                futures = [
+                    executor.submit(self.translate_batch, batch) for batch in batches
+                ]
+                # 저널 쓰기는 이 스레드에서만 수행
+                for future in as_completed(futures):
+                    pbar.update(1)
+                    try:
+                        translations = future.result()
+                    except CancelledError:
+                        continue
+                    except Exception as e:
+                        self._count("failed_batches")
+                        print(f"❌ 배치 번역 실패 - {e}")
+                        if fatal_error is None and _is_fatal_error(e):
+                            fatal_error = e
+                            print("⛔ 남은 배치를 취소합니다.")
+                            for pending in futures:
+                                pending.cancel()
+                        continue
+                    journal.append(translations)
+                    translated += len(translations)
+                    pbar.set_postfix({"총번역": translated})
+        elapsed = time.perf_counter() - start
+
+        stats = self._snapshot_stats(translated)
+        stats.update(
+            {
+                "remaining": len(remaining),
+                "batches": len(batches),
+                "items_per_batch": len(remaining) / len(batches) if batches else 0.0,
+                "translated": translated,
+                "total": journal.compact(),
+                "elapsed_seconds": elapsed,
+                "items_per_second": translated / elapsed if elapsed > 0 else 0.0,
+                "fatal_error": str(fatal_error) if fatal_error else None,
+            }
+        )
+        return stats
+
+    def _build_batch_job_lines(self, batches, offset):
+        """배치 목록을 Batch API 입력 JSONL 줄 목록으로 변환"""
+        return [
+            json.dumps(
+                {
+                    "custom_id": f"batch-{offset + index}",
+                    "method": "POST",
+                    "url": "/v1/chat/completions",
+                    "body": self.build_request(batch),
+                },
+                ensure_ascii=False,
+            )
+            for index, batch in enumerate(batches)
+        ]
+
+    def _submit_batch_job(self, lines):
+        """입력 파일을 올리고 Batch API 작업 생성"""
+        uploaded = self.client.files.create(
+            file=("translation_batch.jsonl", ("\n".join(lines) + "\n").encode("utf-8")),
+            purpose="batch",
+        )
+        # 고정된 openai 버전에는 client.batches가 없으므로
+        # 엔드포인트를 직접 호출
+        return self.client.post(
+            "/batches",
+            cast_to=object,
+            body={
+                "input_file_id": uploaded.id,
+                "endpoint": "/v1/chat/completions",
+                "completion_window": BATCH_API_COMPLETION_WINDOW,
+            },
+        )
+
+    def _wait_batch_job(self, batch_id, poll_seconds):
+        """작업이 끝날 때까지 상태를 조회"""
+        while True:
+            job = self.client.get(f"/batches/{batch_id}", cast_to=object)
+            counts = job.get("request_counts") or {}
+            print(
+                f"⏳ Batch 작업 {batch_id}: {job['status']} "
+                f"({counts.get('completed', 0)}/{counts.get('total', 0)})"
+            )
+            if job["status"] in BATCH_API_TERMINAL_STATUSES:
+                return job
+            time.sleep(poll_seconds)
+
+    def _load_batch_items(self, input_file_id):
+        """작업 입력 파일에서 {custom_id: 보낸 원문 리스트} 복원"""
+        content = self.client.files.content(input_file_id).text
+        batch_items = {}
+        for line in io.StringIO(content):
+            if not line.strip():
+                continue
+            request = json.loads(line)
+            user_content = request["body"]["messages"][-1]["content"]
+            batch_items[request["custom_id"]] = parse_numbered_items(user_content)
+        return batch_items
+
+    def _collect_batch_results(self, job):
+        """
+        완료된 작업의 출력 파일에서 번역 결과를 추출
+
+        만료/취소된 작업도 끝난 요청의 결과는 출력 파일에 남아 있으므로
+        함께 가져온다.
+
+        Returns:
+            tuple: (번역 항목 리스트, 실패한 요청 수)
+        """
+        translations = []
+        failed = 0
+        batch_items = self._load_batch_items(job["input_file_id"])
+        if job.get("output_file_id"):
+            content = self.client.files.content(job["output_file_id"]).text
+            for line in io.StringIO(content):
+                if not line.strip():
+                    continue
+                result = json.loads(line)
+                response = result.get("response") or {}
+                if result.get("error") or response.get("status_code") != 200:
+                    failed += 1
+                    continue
+                body = response["body"]
+                usage = body.get("usage") or {}
+                self._count("prompt_tokens", usage.get("prompt_tokens", 0))
+                self._count("completion_tokens", usage.get("completion_tokens", 0))
+                found, complete = parse_translations(
+                    body["choices"][0]["message"]["content"],
+                    batch_items.get(result["custom_id"], []),
+                )
+                translations.extend(found)
+                if not complete:
+                    # 잘린 응답의 나머지 항목은 다음 실행에서 다시 번역됨
+                    self._count("truncated_responses")
+                    failed += 1
+        if job.get("error_file_id"):
+            content = self.client.files.content(job["error_file_id"]).text
+            failed += sum(1 for line in io.StringIO(content) if line.strip())
+        return translations, failed
+
+    def run_batch_job(
+        self,
+        items,
+        journal,
+        batch_size=None,
+        poll_seconds=BATCH_API_POLL_SECONDS,
+    ):
+        """
+        아직 번역되지 않은 항목을 Batch API 작업으로 번역하고
+        저널에 기록하는 함수
+
+        실시간 요청보다 저렴하고 분당 한도와 무관하게 처리되지만
+        결과는 최대 24시간 뒤에 나온다.
+        제출한 작업 ID는 "<출력 파일>.batch"에 기록하므로,
+        대기 중에 중단되어도 다시 실행하면
+        새로 제출하지 않고 같은 작업의 결과를 기다린다.
+
+        Args:
+            items (list): 번역할 원문 리스트
+            journal (TranslationJournal): 결과를 기록할 저널
+                (이미 번역된 항목은 건너뜀)
+            batch_size (int): 요청 하나에 담을 최대 항목 수
+                (기본값: 토큰 예산으로만 결정)
+            poll_seconds (float): 작업 상태 조회 간격(초)
+
+        Returns:
+            dict: 번역 통계 (항목 수, 작업 수, 실패한 요청 수, 소요 시간 등)
+        """
+        state_file = f"{journal.output_file}.batch"
+        start = time.perf_counter()
+        translated = 0
+        failed_requests = 0
+        job_ids = []
+
+        if os.path.exists(state_file):
+            with open(state_file, "r", encoding="utf-8") as f:
+                state = json.load(f)
+            pending_ids = state["batch_ids"]
+            remaining_count = state["remaining"]
+            print(f"📋 제출된 Batch 작업 {len(pending_ids)}개 이어서 대기")
+        else:
+            translated_originals = journal.translated_originals()
+            remaining = [
+                item
+                for item in dict.fromkeys(items)
+                if item not in translated_originals
+            ]
+            batches = self.planner.plan(remaining, batch_size)
+            remaining_count = len(remaining)
+            pending_ids = []
+            for offset in range(0, len(batches), BATCH_API_MAX_REQUESTS):
+                lines = self._build_batch_job_lines(
+                    batches[offset : offset + BATCH_API_MAX_REQUESTS], offset
+                )
+                job = self._submit_batch_job(lines)
+                self._count("requests", len(lines))
+                pending_ids.append(job["id"])
+                print(f"📤 Batch 작업 제출: {job['id']} (요청 {len(lines)}개)")
+            if pending_ids:
+                with open(state_file, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"batch_ids": pending_ids, "remaining": remaining_count}, f
+                    )
+
+        for batch_id in pending_ids:
+            job = self._wait_batch_job(batch_id, poll_seconds)
+            translations, failed = self._collect_batch_results(job)
+            journal.append(translations)
+            translated += len(translations)
+            failed_requests += failed
+            job_ids.append(batch_id)
+            if job["status"] != "completed":
+                print(f"⚠️ Batch 작업 {batch_id}이(가) {job['status']} 상태로 끝남")
+
+        total = journal.compact()
+        if os.path.exists(state_file):
+            os.remove(state_file)
+        elapsed = time.perf_counter() - start
+
+        stats = self._snapshot_stats(translated)
+        stats.update(
+            {
+                "remaining": remaining_count,
+                "batch_jobs": job_ids,
+                "failed_requests": failed_requests,
+                "translated": translated,
+                "total": total,
+                "elapsed_seconds": elapsed,
+                "items_per_second": translated / elapsed if elapsed > 0 else 0.0,
+            }
+        )
+        return stats
@@ -0,0 +1,254 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dotenv import load_dotenv
+from utils.metrics import register_collector
+
+# 환경 변수 로드
+load_dotenv()
+
+# 작업 종류별 스레드 풀 이름
+# 느린 OpenAI 응답이 LLM 풀을 채워도 OpenFoodFacts/MongoDB 조회는 자기 풀에서 계속 처리된다.
+OFF_POOL = "off"
+MONGO_POOL = "mongo"
+LLM_POOL = "llm"
+
+# 풀별 (워커 수, 대기열 길이) - 대기열까지 차면 새 작업은 바로 거절
+BULKHEAD_CONFIG = {
+    OFF_POOL: (
+        int(os.getenv("BULKHEAD_OFF_WORKERS", "32")),
+        int(os.getenv("BULKHEAD_OFF_QUEUE", "256")),
+    ),
+    MONGO_POOL: (
+        int(os.getenv("BULKHEAD_MONGO_WORKERS", "16")),
+        int(os.getenv("BULKHEAD_MONGO_QUEUE", "256")),
+    ),
+    LLM_POOL: (
+        int(os.getenv("BULKHEAD_LLM_WORKERS", "64")),
+        int(os.getenv("BULKHEAD_LLM_QUEUE", "256")),
+    ),
+}
+
+
+class BulkheadFullError(Exception):
+    """스레드 풀의 워커와 대기열이 모두 차서 작업을 받을 수 없을 때 발생하는 예외"""
+
+    def __init__(self, name):
+        self.name = name
+        super().__init__(f"{name} 작업 대기열이 가득 찼습니다.")
+
+
+class Bulkhead:
+    """
+    대기열 길이가 제한된 장수(long-lived) 스레드 풀
+
+    요청마다 ThreadPoolExecutor를 만들고 닫는 대신 프로세스 전역에서 재사용한다.
+    실행 중 작업과 대기 중 작업의 합이 max_workers + max_queue를 넘으면
+    기다리지 않고 BulkheadFullError를 발생시킨다.
+
+    풀 안에서 실행되는 작업이 같은 풀에 작업을 넣고 결과를 기다리면
+    워커가 모두 막힐 수 있으므로, 결과를 기다리는 쪽은 항상 풀 바깥 스레드여야 한다.
+    """
+
+    def __init__(self, name, max_workers, max_queue):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"bulkhead-{name}"
+        )
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._stats_lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._rejected = 0
+        self._completed = 0
+        self._wait_seconds = 0.0
+
+    def _run(self, submitted_at, fn, args, kwargs):
+        started_at = time.perf_counter()
+        with self._stats_lock:
+            self._queued -= 1
+            self._active += 1
+            self._wait_seconds += started_at - submitted_at
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with self._stats_lock:
+                self._active -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def submit(self, fn, *args, **kwargs):
+        """
+        작업을 풀에 넣고 Future를 반환하는 함수
+
+        Raises:
+            BulkheadFullError: 워커와 대기열이 모두 찬 경우
+        """
+        if not self._slots.acquire(blocking=False):
+            with self._stats_lock:
+                self._rejected += 1
+            raise BulkheadFullError(self.name)
+        with self._stats_lock:
+            self._queued += 1
+        try:
+            return self._executor.submit(
+                self._run, time.perf_counter(), fn, args, kwargs
+            )
+        except BaseException:
+            with self._stats_lock:
+                self._queued -= 1
+            self._slots.release()
+            raise
+
+    def map(self, fn, items, max_concurrency):
+        """
+        items 각각에 fn을 실행하되 요청 하나가 동시에 쓰는 슬롯은 max_concurrency개로 제한
+
+        한 요청의 큰 배치가 대기열을 혼자 채우지 않도록 슬롯이 빌 때마다 다음 항목을 넣는다.
+        풀이 가득 차면 이 호출이 넣은 작업이 끝나기를 기다렸다가 다시 넣고,
+        넣어 둔 작업이 하나도 없을 때만 그 항목을 거절된 것으로 처리한다.
+
+        Returns:
+            list: items 순서대로의 결과 (예외가 발생했거나 거절된 항목은 그 예외 객체)
+        """
+        items = list(items)
+        results = [None] * len(items)
+        pending = {}
+        next_index = 0
+        while next_index < len(items) or pending:
+            while next_index < len(items) and len(pending) < max_concurrency:
+                try:
+                    pending[self.submit(fn, items[next_index])] = next_index
+                except BulkheadFullError as e:
+                    if pending:
+                        break
+                    results[next_index] = e
+                next_index += 1
+            if not pending:
+                continue
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    results[index] = future.result()
+                except Exception as e:
+                    results[index] = e
+        return results
+
+    def stats(self):
+        """대기 중/실행 중 작업 수와 누적 거절/완료 수, 누적 대기 시간"""
+        with self._stats_lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "queued": self._queued,
+                "active": self._active,
+                "rejected": self._rejected,
+                "completed": self._completed,
+                "wait_seconds": self._wait_seconds,
+            }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+# 현재 프로세스의 풀 (fork된 워커 프로세스는 자기 풀을 새로 만듦)
+_bulkheads = {}
+_bulkheads_pid = None
+_bulkheads_lock = threading.Lock()
+
+
+def get_bulkhead(name):
+    """
+    이름에 해당하는 프로세스 전역 스레드 풀을 반환하는 함수
+
+    처음 호출될 때 BULKHEAD_CONFIG의 크기로 만들고 이후에는 재사용한다.
+    """
+    global _bulkheads_pid
+    pid = os.getpid()
+    if _bulkheads_pid == pid:
+        bulkhead = _bulkheads.get(name)
+        if bulkhead is not None:
+            return bulkhead
+
+    with _bulkheads_lock:
+        if _bulkheads_pid != pid:
+            # 부모 프로세스의 스레드는 fork 후 존재하지 않으므로 풀을 버림
+            _bulkheads.clear()
+            _bulkheads_pid = pid
+        bulkhead = _bulkheads.get(name)
+        if bulkhead is None:
+            max_workers, max_queue = BULKHEAD_CONFIG[name]
+            bulkhead = _bulkheads[name] = Bulkhead(name, max_workers, max_queue)
+    return bulkhead
+
+
+def submit(name, fn, *args, **kwargs):
+    """name 풀에 작업을 넣고 Future를 반환 (가득 차면 BulkheadFullError)"""
+    return get_bulkhead(name).submit(fn, *args, **kwargs)
+
+
+async def run_async(name, fn, *args):
+    """
+    이벤트 루프를 막지 않고 name 풀에서 fn을 실행하는 함수
+
+    asyncio.to_thread와 달리 기본 executor가 아니라 작업 종류별 풀을 사용한다.
+    """
+    return await asyncio.wrap_future(get_bulkhead(name).submit(fn, *args))
+
+
+def get_bulkhead_stats():
+    """현재 프로세스에 만들어진 풀별 통계"""
+    with _bulkheads_lock:
+        if _bulkheads_pid != os.getpid():
+            return {}
+        bulkheads = list(_bulkheads.values())
+    return {bulkhead.name: bulkhead.stats() for bulkhead in bulkheads}
+
+
+def shutdown_bulkheads(wait=True):
+    """모든 풀을 닫음 (테스트와 설정 변경용, 다음 호출 때 다시 만들어짐)"""
+    with _bulkheads_lock:
+        bulkheads = list(_bulkheads.values())
+        _bulkheads.clear()
+    for bulkhead in bulkheads:
+        bulkhead.shutdown(wait=wait)
+
+
+# (지표 이름, stats 키, 유형, 설명)
+_BULKHEAD_METRICS = (
+    ("todakhanip_bulkhead_queue_depth", "queued", "gauge", "워커를 기다리는 작업 수"),
+    ("todakhanip_bulkhead_active", "active", "gauge", "실행 중인 작업 수"),
+    (
+        "todakhanip_bulkhead_rejected_total",
+        "rejected",
+        "counter",
+        "대기열이 가득 차 거절된 작업 수",
+    ),
+    ("todakhanip_bulkhead_completed_total", "completed", "counter", "완료된 작업 수"),
+    (
+        "todakhanip_bulkhead_wait_seconds_total",
+        "wait_seconds",
+        "counter",
+        "작업이 대기열에서 기다린 누적 시간",
+    ),
+)
+
+
+def _render_bulkhead_metrics():
+    """/metrics에 붙일 풀별 대기열 길이, 실행 중 작업 수, 거절 수"""
+    stats = get_bulkhead_stats()
+    lines = []
+    for metric, key, metric_type, description in _BULKHEAD_METRICS:
+        lines.append(f"# HELP {metric} {description}")
+        lines.append(f"# TYPE {metric} {metric_type}")
+        for name, pool_stats in sorted(stats.items()):
+            lines.append(f'{metric}{{pool="{name}"}} {pool_stats[key]}')
+    return lines
+
+
+register_collector(_render_bulkhead_metrics)
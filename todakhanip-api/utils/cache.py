@@ -0,0 +1,81 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    스레드 안전한 LRU + TTL 인메모리 캐시
+
+    최대 크기를 넘으면 가장 오래 사용되지 않은 항목부터 제거하고,
+    TTL이 지난 항목은 조회 시점에 만료 처리한다.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """키에 해당하는 값을 반환 (없거나 만료되면 default)"""
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return default
+            value, expires_at = item
+            if expires_at <= now:
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key, default=None):
+        """통계와 LRU 순서를 바꾸지 않고 값을 확인 (없거나 만료되면 default)"""
+        with self._lock:
+            item = self._data.get(key)
+        if item is None or item[1] <= time.monotonic():
+            return default
+        return item[0]
+
+    def set(self, key, value, ttl=None):
+        """값을 저장 (ttl 미지정 시 기본 TTL 사용)"""
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """키 삭제"""
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        """전체 삭제 및 통계 초기화"""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """캐시 크기와 적중률 반환"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+            }
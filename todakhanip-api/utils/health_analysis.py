@@ -1,28 +1,408 @@
-import json
-from openai import OpenAI
+import asyncio
+import time
+from openai import OpenAI, AsyncOpenAI
 import os
 from dotenv import load_dotenv
+from utils.analysis_cache import (
+    make_cache_key,
+    get_cached_analysis,
+    store_analysis,
+    get_cached_analysis_async,
+    store_analysis_async,
+)
+from utils.single_flight import SingleFlight, AsyncSingleFlight
+from utils.prompt_projection import project_product_info, serialize_for_prompt
+from utils.nutrient_engine import aggregate_nutrients
+from utils.bulkheads import LLM_POOL, get_bulkhead
+from utils.metrics import (
+    CACHE_HIT,
+    CACHE_MISS,
+    count_stage_error,
+    observe_stage,
+    stage_timer,
+)
 from prompts.chat_prompts import (
     HEALTH_EXPERT_SYSTEM_PROMPT,
     HEALTH_PROFILE_ANALYSIS_PROMPT_TEMPLATE,
     COMPREHENSIVE_HEALTH_EXPERT_SYSTEM_PROMPT,
     COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE,
+    PRODUCT_SUMMARY_SYSTEM_PROMPT,
+    PRODUCT_SUMMARY_PROMPT_TEMPLATE,
+    BASKET_HEALTH_ANALYSIS_PROMPT_TEMPLATE,
     DEFAULT_MODEL,
     DEFAULT_MAX_TOKENS,
     COMPREHENSIVE_MAX_TOKENS,
+    PRODUCT_SUMMARY_MAX_TOKENS,
 )
+from prompts.constants import COMPREHENSIVE_MAX_PRODUCTS, PRODUCT_SUMMARY_CONCURRENCY
 
 # Load environment variables
 load_dotenv()
 
 # OpenAI 클라이언트 초기화
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+HEALTH_ANALYSIS_ERROR_MESSAGE = "건강 분석을 수행하는 중 오류가 발생했습니다."
+COMPREHENSIVE_ANALYSIS_ERROR_MESSAGE = "종합 건강 분석을 수행하는 중 오류가 발생했습니다."
+
+# 끝까지 생성된 응답만 캐시 (max_tokens로 잘렸거나 콘텐츠 필터로 멈춘 응답은 제외)
+CACHEABLE_FINISH_REASON = "stop"
+
+# 캐시 키가 같은 동시 분석 요청을 OpenAI 호출 하나로 합침
+_analysis_flight = SingleFlight()
+_async_analysis_flight = AsyncSingleFlight()
+
+
+def _build_health_analysis_request(product_info, health_profile):
+    """
+    단일 제품 건강 분석용 chat completion 요청 인자 생성
+
+    product_info는 project_product_info로 정리된 제품 정보
+    """
+    # 제품 정보를 문자열로 변환
+    product_info_str = serialize_for_prompt(product_info)
+    health_profile_str = serialize_for_prompt(health_profile)
+
+    return {
+        "model": DEFAULT_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": HEALTH_EXPERT_SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": HEALTH_PROFILE_ANALYSIS_PROMPT_TEMPLATE.format(
+                    health_profile=health_profile_str, product_info=product_info_str
+                ),
+            },
+        ],
+        "max_tokens": DEFAULT_MAX_TOKENS,
+    }
+
+
+def _build_comprehensive_analysis_request(products_info, health_profile):
+    """
+    종합 건강 분석용 chat completion 요청 인자 생성
+
+    products_info는 project_product_info로 정리된 제품 정보 리스트
+    """
+    # 제품 정보를 문자열로 변환
+    products_info_str = serialize_for_prompt(products_info)
+    health_profile_str = serialize_for_prompt(health_profile)
+    # 영양소 합계와 하루 목표 대비 비율은 미리 계산해서 전달
+    nutrition_facts_str = serialize_for_prompt(
+        aggregate_nutrients(products_info, health_profile)
+    )
+
+    return {
+        "model": DEFAULT_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": COMPREHENSIVE_HEALTH_EXPERT_SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE.format(
+                    health_profile=health_profile_str,
+                    products_info=products_info_str,
+                    nutrition_facts=nutrition_facts_str,
+                ),
+            },
+        ],
+        "max_tokens": COMPREHENSIVE_MAX_TOKENS,
+        "temperature": 0.3,  # 더 일관된 답변을 위해 낮은 temperature 설정
+    }
+
+
+def _build_product_summary_request(product_info):
+    """
+    제품 요약(map 단계)용 chat completion 요청 인자 생성
+
+    product_info는 project_product_info로 정리된 제품 정보
+    """
+    return {
+        "model": DEFAULT_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": PRODUCT_SUMMARY_SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": PRODUCT_SUMMARY_PROMPT_TEMPLATE.format(
+                    product_info=serialize_for_prompt(product_info)
+                ),
+            },
+        ],
+        "max_tokens": PRODUCT_SUMMARY_MAX_TOKENS,
+        "temperature": 0.2,
+    }
+
+
+def _format_product_summaries(products_info, summaries):
+    """제품 요약을 "번호. 제품명: 요약" 줄 목록으로 변환"""
+    return "\n".join(
+        f"{number}. {product.get('product_name') or product.get('code')}: {summary}"
+        for number, (product, summary) in enumerate(
+            zip(products_info, summaries), 1
+        )
+    )
+
+
+def _build_basket_analysis_request(products_info, summaries, health_profile):
+    """제품 요약 기반 종합 건강 분석(reduce 단계)용 chat completion 요청 인자 생성"""
+    health_profile_str = serialize_for_prompt(health_profile)
+    nutrition_facts_str = serialize_for_prompt(
+        aggregate_nutrients(products_info, health_profile)
+    )
+
+    return {
+        "model": DEFAULT_MODEL,
+        "messages": [
+            {
+                "role": "system",
+                "content": COMPREHENSIVE_HEALTH_EXPERT_SYSTEM_PROMPT,
+            },
+            {
+                "role": "user",
+                "content": BASKET_HEALTH_ANALYSIS_PROMPT_TEMPLATE.format(
+                    health_profile=health_profile_str,
+                    product_count=len(products_info),
+                    product_summaries=_format_product_summaries(
+                        products_info, summaries
+                    ),
+                    nutrition_facts=nutrition_facts_str,
+                ),
+            },
+        ],
+        "max_tokens": COMPREHENSIVE_MAX_TOKENS,
+        "temperature": 0.3,  # 더 일관된 답변을 위해 낮은 temperature 설정
+    }
+
+
+def _analysis_cache_key(request_kwargs, prompt_template, **inputs):
+    """모델, 프롬프트 템플릿, 입력 데이터로 분석 캐시 키 생성"""
+    return make_cache_key(
+        model=request_kwargs["model"],
+        system_prompt=request_kwargs["messages"][0]["content"],
+        prompt_template=prompt_template,
+        max_tokens=request_kwargs.get("max_tokens"),
+        temperature=request_kwargs.get("temperature"),
+        inputs=inputs,
+    )
+
+
+def _health_analysis_request_and_key(product_info, health_profile):
+    # 이미지 URL, 안내 문구 등 분석에 쓰이지 않는 값은 프롬프트와 캐시 키에서 제외
+    product_info = project_product_info(product_info)
+    request_kwargs = _build_health_analysis_request(product_info, health_profile)
+    key = _analysis_cache_key(
+        request_kwargs,
+        HEALTH_PROFILE_ANALYSIS_PROMPT_TEMPLATE,
+        product_info=product_info,
+        health_profile=health_profile,
+    )
+    return request_kwargs, key
+
+
+def _product_summary_request_and_key(product_info):
+    product_info = project_product_info(product_info)
+    request_kwargs = _build_product_summary_request(product_info)
+    key = _analysis_cache_key(
+        request_kwargs, PRODUCT_SUMMARY_PROMPT_TEMPLATE, product_info=product_info
+    )
+    return request_kwargs, key
+
+
+def _fallback_summary(product_info):
+    """요약 생성에 실패한 제품은 정리된 제품 정보의 영양 관련 값을 그대로 사용"""
+    projected = project_product_info(product_info)
+    return serialize_for_prompt(
+        {
+            key: projected[key]
+            for key in (
+                "nutriments",
+                "nutrient_levels",
+                "nutriscore_grade",
+                "allergens_tags",
+            )
+            if key in projected
+        }
+    )
+
+
+def _basket_analysis_request_and_key(products_info, summaries, health_profile):
+    summaries = [
+        summary or _fallback_summary(product)
+        for product, summary in zip(products_info, summaries)
+    ]
+    request_kwargs = _build_basket_analysis_request(
+        products_info, summaries, health_profile
+    )
+    key = _analysis_cache_key(
+        request_kwargs,
+        BASKET_HEALTH_ANALYSIS_PROMPT_TEMPLATE,
+        user_prompt=request_kwargs["messages"][1]["content"],
+    )
+    return request_kwargs, key
+
+
+def _comprehensive_analysis_request_and_key(products_info, health_profile):
+    # 제품이 많으면 제품별 요약을 동시에 만든 뒤 요약만으로 종합 분석
+    if len(products_info) > COMPREHENSIVE_MAX_PRODUCTS:
+        return _basket_analysis_request_and_key(
+            products_info, summarize_products(products_info), health_profile
+        )
+
+    products_info = [project_product_info(product) for product in products_info]
+    request_kwargs = _build_comprehensive_analysis_request(
+        products_info, health_profile
+    )
+    key = _analysis_cache_key(
+        request_kwargs,
+        COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE,
+        products_info=products_info,
+        health_profile=health_profile,
+    )
+    return request_kwargs, key
+
+
+async def _comprehensive_analysis_request_and_key_async(products_info, health_profile):
+    """_comprehensive_analysis_request_and_key의 비동기 버전"""
+    if len(products_info) > COMPREHENSIVE_MAX_PRODUCTS:
+        return _basket_analysis_request_and_key(
+            products_info,
+            await summarize_products_async(products_info),
+            health_profile,
+        )
+    return _comprehensive_analysis_request_and_key(products_info, health_profile)
+
+
+def _cached_or_create(request_kwargs, key, stage, task_name, error_message):
+    """
+    캐시에 있으면 바로 반환하고, 없으면 OpenAI로 생성한 뒤 캐시에 저장
+    (finish_reason이 "stop"인 응답만 저장)
+
+    처리 시간은 stage 이름과 캐시 적중 여부로 단계 히스토그램에 기록한다.
+    """
+    with stage_timer(stage, CACHE_HIT) as timer:
+        cached = get_cached_analysis(key)
+        if cached is not None:
+            return cached
+
+        timer.cache = CACHE_MISS
+        try:
+            # OpenAI API 호출
+            response = client.chat.completions.create(**request_kwargs)
+
+            choice = response.choices[0]
+            analysis = choice.message.content
+            if choice.finish_reason == CACHEABLE_FINISH_REASON:
+                store_analysis(key, analysis)
+            return analysis
+
+        except Exception as e:
+            print(f"{task_name} 중 오류 발생: {str(e)}")
+            count_stage_error(stage)
+            return error_message
+
+
+async def _cached_or_create_async(request_kwargs, key, stage, task_name, error_message):
+    """_cached_or_create의 비동기 버전 (AsyncOpenAI 사용)"""
+    with stage_timer(stage, CACHE_HIT) as timer:
+        cached = await get_cached_analysis_async(key)
+        if cached is not None:
+            return cached
+
+        timer.cache = CACHE_MISS
+        try:
+            response = await async_client.chat.completions.create(**request_kwargs)
+
+            choice = response.choices[0]
+            analysis = choice.message.content
+            if choice.finish_reason == CACHEABLE_FINISH_REASON:
+                await store_analysis_async(key, analysis)
+            return analysis
+
+        except Exception as e:
+            print(f"{task_name} 중 오류 발생: {str(e)}")
+            count_stage_error(stage)
+            return error_message
+
+
+def summarize_product(product_info):
+    """
+    종합 분석(map-reduce)에 쓸 제품 요약을 생성하는 함수
+
+    요약은 건강 프로필과 무관하므로 같은 제품의 요약은 모든 사용자가 캐시에서 재사용한다.
+
+    Args:
+        product_info (dict): 제품 정보
+
+    Returns:
+        str | None: 제품 요약 (실패 시 None)
+    """
+    request_kwargs, key = _product_summary_request_and_key(product_info)
+    return _analysis_flight.do(
+        key,
+        _cached_or_create,
+        request_kwargs,
+        key,
+        "product_summary",
+        "제품 요약",
+        None,
+    )
+
+
+def summarize_products(products_info, max_concurrency=PRODUCT_SUMMARY_CONCURRENCY):
+    """
+    여러 제품의 요약을 LLM 스레드 풀에서 동시에 생성하는 함수
+
+    Returns:
+        list: products_info 순서대로의 제품 요약 (실패하거나 풀이 가득 차 거절된 제품은 None)
+    """
+    results = get_bulkhead(LLM_POOL).map(summarize_product, products_info, max_concurrency)
+    return [None if isinstance(result, Exception) else result for result in results]
+
+
+async def summarize_product_async(product_info):
+    """summarize_product의 비동기 버전 (AsyncOpenAI 사용)"""
+    request_kwargs, key = _product_summary_request_and_key(product_info)
+    return await _async_analysis_flight.do(
+        key,
+        _cached_or_create_async,
+        request_kwargs,
+        key,
+        "product_summary",
+        "제품 요약",
+        None,
+    )
+
+
+async def summarize_products_async(
+    products_info, max_concurrency=PRODUCT_SUMMARY_CONCURRENCY
+):
+    """summarize_products의 비동기 버전"""
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def summarize(product_info):
+        async with semaphore:
+            return await summarize_product_async(product_info)
+
+    return list(
+        await asyncio.gather(*(summarize(product) for product in products_info))
+    )
 
 
 def get_health_analysis(product_info, health_profile):
     """
     제품 정보와 건강 프로필을 기반으로 건강 분석을 수행하는 함수
 
+    같은 입력의 동시 요청은 OpenAI를 한 번만 호출하고 결과를 나눠 갖는다.
+
     Args:
         product_info (dict): 제품 정보
         health_profile (dict): 건강 프로필 정보
@@ -30,40 +410,25 @@ def get_health_analysis(product_info, health_profile):
     Returns:
         str: 건강 분석 결과
     """
-    try:
-        # 제품 정보를 문자열로 변환
-        product_info_str = json.dumps(product_info, ensure_ascii=False, indent=2)
-        health_profile_str = json.dumps(health_profile, ensure_ascii=False, indent=2)
-
-        # OpenAI API 호출
-        response = client.chat.completions.create(
-            model=DEFAULT_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": HEALTH_EXPERT_SYSTEM_PROMPT,
-                },
-                {
-                    "role": "user",
-                    "content": HEALTH_PROFILE_ANALYSIS_PROMPT_TEMPLATE.format(
-                        health_profile=health_profile_str, product_info=product_info_str
-                    ),
-                },
-            ],
-            max_tokens=DEFAULT_MAX_TOKENS,
-        )
-
-        return response.choices[0].message.content
-
-    except Exception as e:
-        print(f"건강 분석 중 오류 발생: {str(e)}")
-        return "건강 분석을 수행하는 중 오류가 발생했습니다."
+    request_kwargs, key = _health_analysis_request_and_key(product_info, health_profile)
+    return _analysis_flight.do(
+        key,
+        _cached_or_create,
+        request_kwargs,
+        key,
+        "health_analysis",
+        "건강 분석",
+        HEALTH_ANALYSIS_ERROR_MESSAGE,
+    )
 
 
 def get_comprehensive_health_analysis(products_info, health_profile):
     """
     여러 제품 정보와 건강 프로필을 기반으로 종합적인 건강 분석을 수행하는 함수
 
+    제품이 COMPREHENSIVE_MAX_PRODUCTS개를 넘으면 제품별 요약을 동시에 만들고(캐시 재사용)
+    요약만으로 종합 분석하므로 프롬프트 크기와 지연 시간이 제품 수에 비례해 늘지 않는다.
+
     Args:
         products_info (list): 제품 정보 리스트
         health_profile (dict): 건강 프로필 정보
@@ -71,33 +436,206 @@ def get_comprehensive_health_analysis(products_info, health_profile):
     Returns:
         str: 종합 건강 분석 결과
     """
+    request_kwargs, key = _comprehensive_analysis_request_and_key(
+        products_info, health_profile
+    )
+    return _analysis_flight.do(
+        key,
+        _cached_or_create,
+        request_kwargs,
+        key,
+        "comprehensive_analysis",
+        "종합 건강 분석",
+        COMPREHENSIVE_ANALYSIS_ERROR_MESSAGE,
+    )
+
+
+async def get_health_analysis_async(product_info, health_profile):
+    """get_health_analysis의 비동기 버전 (AsyncOpenAI 사용)"""
+    request_kwargs, key = _health_analysis_request_and_key(product_info, health_profile)
+    return await _async_analysis_flight.do(
+        key,
+        _cached_or_create_async,
+        request_kwargs,
+        key,
+        "health_analysis",
+        "건강 분석",
+        HEALTH_ANALYSIS_ERROR_MESSAGE,
+    )
+
+
+async def get_comprehensive_health_analysis_async(products_info, health_profile):
+    """get_comprehensive_health_analysis의 비동기 버전 (AsyncOpenAI 사용)"""
+    request_kwargs, key = await _comprehensive_analysis_request_and_key_async(
+        products_info, health_profile
+    )
+    return await _async_analysis_flight.do(
+        key,
+        _cached_or_create_async,
+        request_kwargs,
+        key,
+        "comprehensive_analysis",
+        "종합 건강 분석",
+        COMPREHENSIVE_ANALYSIS_ERROR_MESSAGE,
+    )
+
+
+class _AnalysisStream:
+    """
+    스트리밍 분석 한 번의 진행 상태 (동기/비동기 스트리밍 함수가 함께 사용)
+
+    모델 응답 조각을 ("token", {"text": ...}) 이벤트로 바꾸고, 오류가 나면
+    ("error", {"error": ...}) 이벤트 하나로 끝낸다. 스트림이 오류 없이 끝나고
+    finish_reason이 "stop"인 경우에만 전체 텍스트를 캐시에 저장한다.
+    """
+
+    def __init__(self, stage, task_name, error_message):
+        self.stage = stage
+        self.task_name = task_name
+        self.error_message = error_message
+        self.chunks = []
+        self.finish_reason = None
+        self.start = time.perf_counter()
+
+    def cached(self, analysis):
+        """캐시된 분석 결과 전체를 token 이벤트 하나로 변환"""
+        observe_stage(self.stage, time.perf_counter() - self.start, CACHE_HIT)
+        return "token", {"text": analysis}
+
+    def token(self, chunk):
+        """chat completion 스트림 조각을 token 이벤트로 변환 (텍스트가 없으면 None)"""
+        if not chunk.choices:
+            return None
+        choice = chunk.choices[0]
+        if choice.finish_reason:
+            self.finish_reason = choice.finish_reason
+        text = choice.delta.content
+        if not text:
+            return None
+        self.chunks.append(text)
+        return "token", {"text": text}
+
+    def complete(self):
+        """완료된 스트림의 전체 텍스트 (끝까지 생성되지 않았으면 None - 캐시하지 않음)"""
+        observe_stage(self.stage, time.perf_counter() - self.start, CACHE_MISS)
+        if self.finish_reason != CACHEABLE_FINISH_REASON:
+            return None
+        return "".join(self.chunks)
+
+    def error(self, e):
+        """오류를 기록하고 error 이벤트로 변환"""
+        print(f"{self.task_name} 중 오류 발생: {str(e)}")
+        count_stage_error(self.stage)
+        return "error", {"error": self.error_message}
+
+
+def _stream_analysis(request_and_key, stage, task_name, error_message):
+    """
+    캐시를 거쳐 OpenAI 스트리밍 응답을 이벤트로 전달
+
+    request_and_key()로 요청 인자와 캐시 키를 만드는 중의 오류도
+    error 이벤트로 전달한다.
+    """
+    state = _AnalysisStream(stage, task_name, error_message)
     try:
-        # 제품 정보를 문자열로 변환
-        products_info_str = json.dumps(products_info, ensure_ascii=False, indent=2)
-        health_profile_str = json.dumps(health_profile, ensure_ascii=False, indent=2)
-
-        # OpenAI API 호출
-        response = client.chat.completions.create(
-            model=DEFAULT_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": COMPREHENSIVE_HEALTH_EXPERT_SYSTEM_PROMPT,
-                },
-                {
-                    "role": "user",
-                    "content": COMPREHENSIVE_HEALTH_ANALYSIS_PROMPT_TEMPLATE.format(
-                        health_profile=health_profile_str,
-                        products_info=products_info_str,
-                    ),
-                },
-            ],
-            max_tokens=COMPREHENSIVE_MAX_TOKENS,
-            temperature=0.3,  # 더 일관된 답변을 위해 낮은 temperature 설정
-        )
+        request_kwargs, key = request_and_key()
+        cached = get_cached_analysis(key)
+        if cached is not None:
+            yield state.cached(cached)
+            return
+
+        stream = client.chat.completions.create(**request_kwargs, stream=True)
+        for chunk in stream:
+            event = state.token(chunk)
+            if event:
+                yield event
+        analysis = state.complete()
+        if analysis is not None:
+            store_analysis(key, analysis)
+
+    except Exception as e:
+        yield state.error(e)
 
-        return response.choices[0].message.content
+
+async def _stream_analysis_async(request_and_key, stage, task_name, error_message):
+    """_stream_analysis의 비동기 버전 (request_and_key는 코루틴 함수)"""
+    state = _AnalysisStream(stage, task_name, error_message)
+    try:
+        request_kwargs, key = await request_and_key()
+        cached = await get_cached_analysis_async(key)
+        if cached is not None:
+            yield state.cached(cached)
+            return
+
+        stream = await async_client.chat.completions.create(
+            **request_kwargs, stream=True
+        )
+        async for chunk in stream:
+            event = state.token(chunk)
+            if event:
+                yield event
+        analysis = state.complete()
+        if analysis is not None:
+            await store_analysis_async(key, analysis)
 
     except Exception as e:
-        print(f"종합 건강 분석 중 오류 발생: {str(e)}")
-        return "종합 건강 분석을 수행하는 중 오류가 발생했습니다."
+        yield state.error(e)
+
+
+def get_health_analysis_stream(product_info, health_profile):
+    """
+    get_health_analysis의 스트리밍 버전
+
+    Yields:
+        tuple: (이벤트 이름, 데이터) - 생성되는 대로 ("token", {"text": 조각}),
+            실패하면 마지막으로 ("error", {"error": 메시지})
+    """
+    return _stream_analysis(
+        lambda: _health_analysis_request_and_key(product_info, health_profile),
+        "health_analysis",
+        "건강 분석",
+        HEALTH_ANALYSIS_ERROR_MESSAGE,
+    )
+
+
+def get_comprehensive_health_analysis_stream(products_info, health_profile):
+    """
+    get_comprehensive_health_analysis의 스트리밍 버전
+
+    Yields:
+        tuple: get_health_analysis_stream과 같은 (이벤트 이름, 데이터)
+    """
+    return _stream_analysis(
+        lambda: _comprehensive_analysis_request_and_key(products_info, health_profile),
+        "comprehensive_analysis",
+        "종합 건강 분석",
+        COMPREHENSIVE_ANALYSIS_ERROR_MESSAGE,
+    )
+
+
+async def get_health_analysis_stream_async(product_info, health_profile):
+    """get_health_analysis_stream의 비동기 버전"""
+
+    async def request_and_key():
+        return _health_analysis_request_and_key(product_info, health_profile)
+
+    async for event in _stream_analysis_async(
+        request_and_key,
+        "health_analysis",
+        "건강 분석",
+        HEALTH_ANALYSIS_ERROR_MESSAGE,
+    ):
+        yield event
+
+
+async def get_comprehensive_health_analysis_stream_async(products_info, health_profile):
+    """get_comprehensive_health_analysis_stream의 비동기 버전"""
+    async for event in _stream_analysis_async(
+        lambda: _comprehensive_analysis_request_and_key_async(
+            products_info, health_profile
+        ),
+        "comprehensive_analysis",
+        "종합 건강 분석",
+        COMPREHENSIVE_ANALYSIS_ERROR_MESSAGE,
+    ):
+        yield event
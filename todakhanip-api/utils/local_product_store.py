@@ -0,0 +1,368 @@
+import csv
+import gzip
+import json
+import os
+import sqlite3
+import sys
+import threading
+from dotenv import load_dotenv
+from prompts.constants import (
+    OPENFOODFACTS_PRODUCT_FIELDS,
+    OPENFOODFACTS_NUTRIMENT_FIELDS,
+    OPENFOODFACTS_INGREDIENT_FIELDS,
+)
+
+# 환경 변수 로드
+load_dotenv()
+
+# scripts/import_openfoodfacts_dump.py로 만든 로컬 제품 인덱스
+LOCAL_PRODUCT_STORE_FILE = os.getenv(
+    "LOCAL_PRODUCT_STORE_FILE", "data/openfoodfacts/products.sqlite"
+)
+# 한 번에 저장할 제품 수 (가져오기 중 메모리 사용량 상한)
+IMPORT_CHUNK_SIZE = 5000
+
+# CSV 덤프에서 값 그대로 가져오는 필드
+CSV_SCALAR_FIELDS = (
+    "code",
+    "brands",
+    "product_name",
+    "product_name_en",
+    "product_type",
+    "product_quantity",
+    "product_quantity_unit",
+    "quantity",
+    "nutriscore_grade",
+    "serving_quantity",
+    "serving_quantity_unit",
+    "serving_size",
+    "image_front_url",
+    "image_ingredients_url",
+    "image_nutrition_url",
+    "image_packaging_url",
+    "image_url",
+    "image_thumb_url",
+)
+# CSV 덤프에서 쉼표로 구분된 태그 필드 {제품 필드: CSV 컬럼 후보}
+CSV_TAG_FIELDS = {
+    "countries_tags": ("countries_tags",),
+    "allergens_tags": ("allergens_tags", "allergens"),
+    "food_groups_tags": ("food_groups_tags",),
+}
+
+_local = threading.local()
+
+
+def project_product(product):
+    """
+    OFF 제품 데이터에서 extract_product_info가 사용하는 필드만 남기는 함수
+
+    Args:
+        product (dict): OFF API/JSONL 덤프의 제품 데이터
+
+    Returns:
+        dict: 투영된 제품 데이터
+    """
+    projected = {
+        field: product[field]
+        for field in OPENFOODFACTS_PRODUCT_FIELDS
+        if product.get(field) not in (None, "")
+    }
+    if isinstance(projected.get("nutriments"), dict):
+        projected["nutriments"] = {
+            field: projected["nutriments"][field]
+            for field in OPENFOODFACTS_NUTRIMENT_FIELDS
+            if field in projected["nutriments"]
+        }
+    if isinstance(projected.get("ingredients"), list):
+        projected["ingredients"] = [
+            {
+                field: ingredient[field]
+                for field in OPENFOODFACTS_INGREDIENT_FIELDS
+                if field in ingredient
+            }
+            for ingredient in projected["ingredients"]
+            if isinstance(ingredient, dict)
+        ]
+    return projected
+
+
+def _split_ingredients_text(ingredients_text):
+    """괄호 밖의 쉼표를 기준으로 원재료 문자열을 나눔"""
+    items = []
+    depth = 0
+    current = []
+    for char in ingredients_text:
+        if char in "([":
+            depth += 1
+        elif char in ")]" and depth:
+            depth -= 1
+        if char == "," and depth == 0:
+            items.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+    items.append("".join(current).strip())
+    return [item for item in items if item]
+
+
+def _parse_nutrient_levels_tags(tags):
+    """"en:fat-in-high-quantity" 형식의 태그를 {"fat": "high"}로 변환"""
+    levels = {}
+    for tag in tags:
+        value = tag.partition(":")[2] or tag
+        nutrient, separator, level = value.partition("-in-")
+        if separator and level.endswith("-quantity"):
+            levels[nutrient] = level[: -len("-quantity")]
+    return levels
+
+
+def _to_number(value):
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    return int(number) if number.is_integer() else number
+
+
+def product_from_csv_row(row):
+    """
+    OFF CSV 덤프의 한 행을 API 응답과 같은 형태의 투영된 제품 데이터로 변환하는 함수
+
+    CSV에는 구조화된 원재료 목록이 없으므로 ingredients_text를 나눠 원재료 text만 채운다.
+    """
+    product = {
+        field: row[field] for field in CSV_SCALAR_FIELDS if row.get(field)
+    }
+    if "nutriscore_grade" not in product and row.get("nutrition_grade_fr"):
+        product["nutriscore_grade"] = row["nutrition_grade_fr"]
+
+    for field, columns in CSV_TAG_FIELDS.items():
+        for column in columns:
+            if row.get(column):
+                product[field] = [tag for tag in row[column].split(",") if tag]
+                break
+
+    if row.get("nutrient_levels_tags"):
+        product["nutrient_levels"] = _parse_nutrient_levels_tags(
+            row["nutrient_levels_tags"].split(",")
+        )
+
+    nutriments = {}
+    for field in OPENFOODFACTS_NUTRIMENT_FIELDS:
+        value = _to_number(row.get(field))
+        if value is not None:
+            nutriments[field] = value
+    if nutriments:
+        product["nutriments"] = nutriments
+
+    if row.get("ingredients_text"):
+        product["ingredients"] = [
+            {"text": text} for text in _split_ingredients_text(row["ingredients_text"])
+        ]
+
+    last_modified_t = _to_number(row.get("last_modified_t"))
+    if last_modified_t is not None:
+        product["last_modified_t"] = int(last_modified_t)
+    return product
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt", encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def iter_dump_products(path):
+    """
+    OFF 덤프 파일(CSV/JSONL, .gz 가능)을 한 줄씩 읽어 투영된 제품 데이터를 내보내는 함수
+
+    파일 전체를 메모리에 올리지 않으므로 수 GB 덤프도 일정한 메모리로 처리한다.
+    """
+    is_jsonl = ".json" in os.path.basename(path)
+    with _open_text(path) as f:
+        if is_jsonl:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    product = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if product.get("code"):
+                    yield project_product(product)
+        else:
+            # 원재료 문자열 등 긴 필드가 있어 기본 필드 크기 제한을 늘림
+            csv.field_size_limit(min(sys.maxsize, 2**31 - 1))
+            for row in csv.DictReader(f, delimiter="\t", quoting=csv.QUOTE_NONE):
+                if row.get("code"):
+                    yield product_from_csv_row(row)
+
+
+def _create_schema(conn):
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS products (
+            code TEXT PRIMARY KEY,
+            last_modified_t INTEGER NOT NULL DEFAULT 0,
+            product TEXT NOT NULL
+        ) WITHOUT ROWID;
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        ) WITHOUT ROWID;
+        """
+    )
+
+
+def _upsert_chunk(conn, chunk):
+    """
+    제품 묶음을 저장 (이미 있는 제품은 더 최근에 수정된 경우에만 교체)
+
+    Returns:
+        int: 새로 추가되거나 갱신된 제품 수
+    """
+    before = conn.total_changes
+    conn.executemany(
+        """
+        INSERT INTO products (code, last_modified_t, product) VALUES (?, ?, ?)
+        ON CONFLICT(code) DO UPDATE SET
+            last_modified_t = excluded.last_modified_t,
+            product = excluded.product
+        WHERE excluded.last_modified_t >= products.last_modified_t
+        """,
+        chunk,
+    )
+    conn.commit()
+    return conn.total_changes - before
+
+
+def import_products(products, store_file=None, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    제품 데이터를 로컬 제품 인덱스에 가져오는 함수
+
+    전체 덤프와 OFF가 매일 배포하는 변경분(delta) 파일 모두 같은 방식으로 가져오며,
+    저장된 제품보다 오래된 데이터는 무시한다.
+
+    Args:
+        products (iterable): 투영된 제품 데이터 (iter_dump_products 결과 등)
+        store_file (str): sqlite 파일 경로 (기본값: LOCAL_PRODUCT_STORE_FILE)
+        chunk_size (int): 한 번에 저장할 제품 수
+
+    Returns:
+        dict: 읽은 제품 수와 저장된 제품 수, 가장 최근 수정 시각
+    """
+    store_file = store_file or LOCAL_PRODUCT_STORE_FILE
+    os.makedirs(os.path.dirname(os.path.abspath(store_file)), exist_ok=True)
+
+    read_count = 0
+    written = 0
+    max_modified_t = 0
+    conn = sqlite3.connect(store_file)
+    try:
+        _create_schema(conn)
+        chunk = []
+        for product in products:
+            code = str(product["code"])
+            modified_t = int(product.get("last_modified_t") or 0)
+            max_modified_t = max(max_modified_t, modified_t)
+            chunk.append(
+                (
+                    code,
+                    modified_t,
+                    json.dumps(product, ensure_ascii=False, separators=(",", ":")),
+                )
+            )
+            read_count += 1
+            if len(chunk) >= chunk_size:
+                written += _upsert_chunk(conn, chunk)
+                chunk = []
+        if chunk:
+            written += _upsert_chunk(conn, chunk)
+
+        conn.execute(
+            """
+            INSERT INTO meta (key, value) VALUES ('last_modified_t', ?)
+            ON CONFLICT(key) DO UPDATE SET value = MAX(CAST(value AS INTEGER), excluded.value)
+            """,
+            (max_modified_t,),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "read": read_count,
+        "written": written,
+        "last_modified_t": max_modified_t,
+    }
+
+
+def _connection():
+    """
+    스레드별 읽기 전용 연결을 반환 (인덱스 파일이 없으면 None)
+
+    WAL 모드이므로 가져오기가 진행 중이어도 조회가 막히지 않는다.
+    fork 이후에는 부모의 연결을 쓰지 않고 새로 연다.
+    """
+    conn = getattr(_local, "conn", None)
+    if (
+        conn is not None
+        and _local.pid == os.getpid()
+        and _local.path == LOCAL_PRODUCT_STORE_FILE
+    ):
+        return conn
+    if not os.path.exists(LOCAL_PRODUCT_STORE_FILE):
+        return None
+
+    conn = sqlite3.connect(
+        f"file:{LOCAL_PRODUCT_STORE_FILE}?mode=ro", uri=True, check_same_thread=False
+    )
+    _local.conn, _local.pid, _local.path = conn, os.getpid(), LOCAL_PRODUCT_STORE_FILE
+    return conn
+
+
+def get_local_product(barcode):
+    """
+    로컬 제품 인덱스에서 바코드로 제품 데이터를 조회하는 함수
+
+    Returns:
+        dict | None: 투영된 제품 데이터 (인덱스가 없거나 제품이 없으면 None)
+    """
+    conn = _connection()
+    if conn is None:
+        return None
+    try:
+        row = conn.execute(
+            "SELECT product FROM products WHERE code = ?", (barcode,)
+        ).fetchone()
+    except sqlite3.Error as e:
+        print(f"⚠️ 로컬 제품 인덱스 조회 오류 - {e}")
+        return None
+    return json.loads(row[0]) if row else None
+
+
+def get_local_store_stats():
+    """로컬 제품 인덱스의 제품 수와 마지막 수정 시각 반환"""
+    conn = _connection()
+    if conn is None:
+        return {"enabled": False}
+    count = conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+    row = conn.execute(
+        "SELECT value FROM meta WHERE key = 'last_modified_t'"
+    ).fetchone()
+    return {
+        "enabled": True,
+        "products": count,
+        "last_modified_t": int(row[0]) if row else None,
+    }
+
+
+def close_local_store():
+    """현재 스레드의 로컬 제품 인덱스 연결 종료"""
+    conn = getattr(_local, "conn", None)
+    if conn is not None and _local.pid == os.getpid():
+        conn.close()
+    _local.conn = None
@@ -0,0 +1,192 @@
+import os
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# false이면 측정을 건너뜀 (/metrics는 빈 지표를 응답)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "true") == "true"
+
+# 단계별 처리 시간 히스토그램 버킷 (초)
+# JSON 디코딩/파싱(ms 미만)부터 LLM 호출(수십 초)까지 한 버킷 집합으로 표현
+STAGE_LATENCY_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+# Prometheus 텍스트 형식 Content-Type
+METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# cache 레이블 값: hit(캐시로 응답), miss(원본 작업 수행), none(앞에 캐시가 없는 단계)
+CACHE_HIT = "hit"
+CACHE_MISS = "miss"
+CACHE_NONE = "none"
+
+_metrics_lock = threading.Lock()
+# (stage, cache) -> [버킷별 개수..., +Inf 개수, 합계]
+_stage_histograms = {}
+# stage -> 예외로 끝난 횟수
+_stage_errors = {}
+# 스크레이프할 때 호출해 Prometheus 텍스트 줄을 받는 함수 목록
+_collectors = []
+
+
+def observe_stage(stage, seconds, cache=CACHE_NONE):
+    """
+    단계 하나의 처리 시간을 기록하는 함수
+
+    스크레이프될 때까지는 버킷 개수와 합계만 더하고, 텍스트 변환은 render_metrics에서 한다.
+
+    Args:
+        stage (str): 단계 이름 (off_fetch, json_decode, extract_product_info 등)
+        seconds (float): 처리 시간(초)
+        cache (str): 캐시 적중 여부 (hit, miss, none)
+    """
+    if not METRICS_ENABLED:
+        return
+    index = bisect_left(STAGE_LATENCY_BUCKETS, seconds)
+    key = (stage, cache)
+    with _metrics_lock:
+        histogram = _stage_histograms.get(key)
+        if histogram is None:
+            histogram = _stage_histograms[key] = [0] * (len(STAGE_LATENCY_BUCKETS) + 1) + [0.0]
+        histogram[index] += 1
+        histogram[-1] += seconds
+
+
+def count_stage_error(stage):
+    """단계가 예외로 끝난 횟수를 1 늘림"""
+    if not METRICS_ENABLED:
+        return
+    with _metrics_lock:
+        _stage_errors[stage] = _stage_errors.get(stage, 0) + 1
+
+
+class stage_timer:
+    """
+    with 블록의 처리 시간을 단계 히스토그램에 기록하는 컨텍스트 매니저
+
+    블록 안에서 캐시 적중 여부를 알게 되면 timer.cache에 넣는다.
+    예외로 끝나면 처리 시간과 함께 오류 횟수도 기록한다.
+
+    사용 예:
+        with stage_timer("mongo_lookup") as timer:
+            doc = collection.find_one(...)
+            timer.cache = CACHE_HIT if doc else CACHE_MISS
+    """
+
+    __slots__ = ("stage", "cache", "_start")
+
+    def __init__(self, stage, cache=CACHE_NONE):
+        self.stage = stage
+        self.cache = cache
+        self._start = None
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        observe_stage(self.stage, time.perf_counter() - self._start, self.cache)
+        if exc_type is not None:
+            count_stage_error(self.stage)
+        return False
+
+
+def timed_stage(stage):
+    """함수 실행 시간을 단계 히스토그램에 기록하는 데코레이터 (동기 함수용)"""
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with stage_timer(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def register_collector(collector):
+    """
+    /metrics를 만들 때 호출할 함수를 등록하는 함수
+
+    다른 모듈이 이미 들고 있는 통계(스레드 풀 대기열 길이 등)를 스크레이프 시점에만 읽어
+    내보낼 때 사용한다.
+
+    Args:
+        collector (callable): 인자 없이 호출하면 Prometheus 텍스트 줄 리스트를 반환
+    """
+    if collector not in _collectors:
+        _collectors.append(collector)
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_metrics():
+    """
+    수집한 지표를 Prometheus 텍스트 형식으로 변환하는 함수
+
+    Returns:
+        str: todakhanip_stage_duration_seconds 히스토그램,
+            todakhanip_stage_errors_total 카운터와 등록된 collector의 지표
+    """
+    with _metrics_lock:
+        histograms = {key: list(values) for key, values in _stage_histograms.items()}
+        errors = dict(_stage_errors)
+
+    lines = [
+        "# HELP todakhanip_stage_duration_seconds 요청 처리 단계별 소요 시간",
+        "# TYPE todakhanip_stage_duration_seconds histogram",
+    ]
+    for (stage, cache), values in sorted(histograms.items()):
+        labels = f'stage="{stage}",cache="{cache}"'
+        cumulative = 0
+        for bound, count in zip(STAGE_LATENCY_BUCKETS, values):
+            cumulative += count
+            lines.append(
+                f'todakhanip_stage_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}'
+            )
+        cumulative += values[len(STAGE_LATENCY_BUCKETS)]
+        lines.append(
+            f'todakhanip_stage_duration_seconds_bucket{{{labels},le="+Inf"}} {cumulative}'
+        )
+        lines.append(
+            f"todakhanip_stage_duration_seconds_sum{{{labels}}} {_format_value(values[-1])}"
+        )
+        lines.append(f"todakhanip_stage_duration_seconds_count{{{labels}}} {cumulative}")
+
+    lines.append("# HELP todakhanip_stage_errors_total 예외로 끝난 처리 단계 수")
+    lines.append("# TYPE todakhanip_stage_errors_total counter")
+    for stage, count in sorted(errors.items()):
+        lines.append(f'todakhanip_stage_errors_total{{stage="{stage}"}} {count}')
+    for collector in list(_collectors):
+        lines.extend(collector())
+    return "\n".join(lines) + "\n"
+
+
+def reset_metrics():
+    """수집한 지표 초기화 (테스트용)"""
+    with _metrics_lock:
+        _stage_histograms.clear()
+        _stage_errors.clear()
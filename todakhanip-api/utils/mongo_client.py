@@ -0,0 +1,195 @@
+import os
+import threading
+import time
+from dotenv import load_dotenv
+from pymongo import MongoClient
+from pymongo import monitoring
+
+# 환경 변수 로드
+load_dotenv()
+
+# 환경 변수에서 설정 로드
+MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
+DB_NAME = os.getenv("MONGODB_DB_NAME", "label-safe")
+
+# 커넥션 풀 설정 (환경 변수로 조정 가능)
+MONGODB_POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGODB_MAX_POOL_SIZE", "50")),
+    "minPoolSize": int(os.getenv("MONGODB_MIN_POOL_SIZE", "0")),
+    "maxIdleTimeMS": int(os.getenv("MONGODB_MAX_IDLE_TIME_MS", "60000")),
+    "waitQueueTimeoutMS": int(os.getenv("MONGODB_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+    "serverSelectionTimeoutMS": int(
+        os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "3000")
+    ),
+    "connectTimeoutMS": int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "3000")),
+}
+
+
+class PoolMetricsListener(monitoring.ConnectionPoolListener):
+    """커넥션 풀 이벤트를 집계하는 리스너"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """집계 값 초기화"""
+        with self._lock:
+            self.counters = {
+                "pools_created": 0,
+                "pools_cleared": 0,
+                "connections_created": 0,
+                "connections_closed": 0,
+                "checkouts": 0,
+                "checkout_failures": 0,
+                "checkins": 0,
+            }
+            self.checked_out = 0
+
+    def _incr(self, key, checked_out_delta=0):
+        with self._lock:
+            self.counters[key] += 1
+            self.checked_out += checked_out_delta
+
+    def snapshot(self):
+        """현재 집계 값 복사본 반환"""
+        with self._lock:
+            stats = dict(self.counters)
+            stats["checked_out"] = self.checked_out
+            stats["open_connections"] = (
+                stats["connections_created"] - stats["connections_closed"]
+            )
+            return stats
+
+    def pool_created(self, event):
+        self._incr("pools_created")
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        self._incr("pools_cleared")
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_created(self, event):
+        self._incr("connections_created")
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        self._incr("connections_closed")
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_check_out_failed(self, event):
+        self._incr("checkout_failures")
+
+    def connection_checked_out(self, event):
+        self._incr("checkouts", 1)
+
+    def connection_checked_in(self, event):
+        self._incr("checkins", -1)
+
+
+# 프로세스 전역 MongoDB 클라이언트 (지연 생성)
+_mongo_client = None
+_mongo_client_pid = None
+_mongo_client_lock = threading.Lock()
+_pool_listener = PoolMetricsListener()
+
+
+def get_mongo_client():
+    """
+    프로세스 전역에서 공유하는 MongoDB 클라이언트를 반환하는 함수
+
+    처음 호출될 때 커넥션 풀과 함께 생성되며, fork 이후 자식 프로세스에서는
+    부모의 소켓을 공유하지 않도록 새 클라이언트를 만든다.
+
+    Returns:
+        MongoClient: 공유 MongoDB 클라이언트
+    """
+    global _mongo_client, _mongo_client_pid
+    pid = os.getpid()
+    if _mongo_client is not None and _mongo_client_pid == pid:
+        return _mongo_client
+
+    with _mongo_client_lock:
+        if _mongo_client is None or _mongo_client_pid != pid:
+            if _mongo_client_pid != pid:
+                # fork로 물려받은 클라이언트는 닫지 않고 버림 (부모 소켓 보호)
+                _pool_listener.reset()
+            _mongo_client = MongoClient(
+                MONGODB_URI,
+                event_listeners=[_pool_listener],
+                **MONGODB_POOL_OPTIONS,
+            )
+            _mongo_client_pid = pid
+            print(f"✅ MongoDB 클라이언트 생성 (pid={pid})")
+    return _mongo_client
+
+
+def get_collection(collection_name):
+    """공유 클라이언트에서 컬렉션을 가져오는 함수"""
+    return get_mongo_client()[DB_NAME][collection_name]
+
+
+def close_mongo_client():
+    """공유 MongoDB 클라이언트를 종료하는 함수"""
+    global _mongo_client, _mongo_client_pid
+    with _mongo_client_lock:
+        if _mongo_client is not None and _mongo_client_pid == os.getpid():
+            _mongo_client.close()
+        _mongo_client = None
+        _mongo_client_pid = None
+
+
+def _reset_after_fork():
+    """fork 직후 자식 프로세스에서 클라이언트 참조를 초기화"""
+    global _mongo_client, _mongo_client_pid, _mongo_client_lock
+    _mongo_client = None
+    _mongo_client_pid = None
+    _mongo_client_lock = threading.Lock()
+    _pool_listener.reset()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def get_pool_stats():
+    """
+    커넥션 풀 상태를 반환하는 함수
+
+    Returns:
+        dict: 풀 설정값과 이벤트 집계 값
+    """
+    return {
+        "initialized": _mongo_client is not None and _mongo_client_pid == os.getpid(),
+        "pid": os.getpid(),
+        "max_pool_size": MONGODB_POOL_OPTIONS["maxPoolSize"],
+        "min_pool_size": MONGODB_POOL_OPTIONS["minPoolSize"],
+        **_pool_listener.snapshot(),
+    }
+
+
+def get_mongo_health():
+    """
+    MongoDB ping 결과와 커넥션 풀 상태를 반환하는 함수
+
+    Returns:
+        dict: {"ok": bool, "ping_ms": float, "pool": dict, "error": str(선택)}
+    """
+    health = {"ok": False, "ping_ms": None}
+    try:
+        start = time.perf_counter()
+        get_mongo_client().admin.command("ping")
+        health["ping_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        health["ok"] = True
+    except Exception as e:
+        health["error"] = str(e)
+    health["pool"] = get_pool_stats()
+    return health
@@ -0,0 +1,219 @@
+import datetime
+import re
+
+# (nutriments 필드, 계산 결과 키) - 계산 결과는 1회 섭취량 기준 g 또는 kcal
+NUTRIENT_KEYS = (
+    ("energy-kcal_100g", "kcal"),
+    ("fat_100g", "fat_g"),
+    ("saturated-fat_100g", "saturated_fat_g"),
+    ("sugars_100g", "sugars_g"),
+    ("salt_100g", "salt_g"),
+)
+
+# 중량/용량 단위별 g 환산 (액체는 1ml = 1g으로 계산)
+UNIT_GRAMS = {
+    "mg": 0.001,
+    "g": 1.0,
+    "gr": 1.0,
+    "kg": 1000.0,
+    "ml": 1.0,
+    "cl": 10.0,
+    "dl": 100.0,
+    "l": 1000.0,
+    "oz": 28.35,
+    "lb": 453.6,
+}
+_AMOUNT = re.compile(
+    r"(?:(\d+)\s*[x×*]\s*)?(\d+(?:[.,]\d+)?)\s*(mg|gr|g|kg|ml|cl|dl|l|oz|lb)\b",
+    re.IGNORECASE,
+)
+
+# 1회 섭취량을 알 수 없는 제품은 100g을 먹는다고 가정
+DEFAULT_SERVING_GRAMS = 100.0
+
+# 하루 에너지 필요량 계산 (Mifflin-St Jeor 기초대사량 x 활동 계수)
+ACTIVITY_FACTORS = {"낮음": 1.375, "보통": 1.55, "높음": 1.725, "매우 높음": 1.9}
+DEFAULT_ACTIVITY_FACTOR = 1.55
+DEFAULT_DAILY_KCAL = 2000.0
+
+# 하루 섭취 상한 (WHO 권고: 지방 30%, 포화지방 10%, 당류 10% 에너지, 소금 5g)
+FAT_ENERGY_RATIO = 0.30
+SATURATED_FAT_ENERGY_RATIO = 0.10
+SUGARS_ENERGY_RATIO = 0.10
+SUGARS_ENERGY_RATIO_DIABETES = 0.05
+SALT_LIMIT_GRAMS = 5.0
+
+
+def _to_float(value):
+    """숫자 또는 "93", "1,5" 같은 문자열을 float로 변환 (변환할 수 없으면 None)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.strip().replace(",", "."))
+        except ValueError:
+            return None
+    return None
+
+
+def _as_dict(value):
+    """클라이언트가 보낸 값이 dict가 아니면 빈 dict로 취급"""
+    return value if isinstance(value, dict) else {}
+
+
+def parse_amount_grams(text):
+    """
+    "15 g", "1 portion (30 g)", "2 x 125g", "33 cl" 같은 표기를 g으로 변환
+
+    Returns:
+        float | None: g 단위 양 (해석할 수 없으면 None)
+    """
+    if not isinstance(text, str):
+        return None
+    match = _AMOUNT.search(text)
+    if not match:
+        return None
+    count, amount, unit = match.groups()
+    grams = float(amount.replace(",", ".")) * UNIT_GRAMS[unit.lower()]
+    return grams * int(count) if count else grams
+
+
+def _quantity_grams(quantity, unit, label):
+    """숫자 필드(serving_quantity 등)와 단위로 g을 구하고, 없으면 표기 문자열을 해석"""
+    value = _to_float(quantity)
+    if value is not None and value > 0:
+        factor = UNIT_GRAMS.get(str(unit or "g").strip().lower())
+        if factor is not None:
+            return value * factor
+    return parse_amount_grams(label)
+
+
+def serving_grams(product_info):
+    """제품 정보의 1회 섭취량(g) (알 수 없으면 None)"""
+    return _quantity_grams(
+        product_info.get("serving_quantity"),
+        product_info.get("serving_quantity_unit"),
+        product_info.get("serving_size"),
+    )
+
+
+def package_grams(product_info):
+    """제품 정보의 전체 중량(g) (알 수 없으면 None)"""
+    return _quantity_grams(
+        product_info.get("product_quantity"),
+        product_info.get("product_quantity_unit"),
+        product_info.get("quantity"),
+    )
+
+
+def daily_targets(health_profile, today=None):
+    """
+    건강 프로필로 하루 열량 필요량과 지방/포화지방/당류/소금 섭취 상한을 계산
+
+    체중, 키, 출생 연도가 없으면 하루 2000kcal을 기준으로 한다.
+
+    Returns:
+        dict: {"kcal", "fat_g", "saturated_fat_g", "sugars_g", "salt_g"}
+    """
+    health_profile = _as_dict(health_profile)
+    today = today or datetime.date.today()
+    weight = _to_float(health_profile.get("weight"))
+    height = _to_float(health_profile.get("height"))
+    birth_year = _to_float(health_profile.get("birth_year"))
+
+    kcal = DEFAULT_DAILY_KCAL
+    if weight and height and birth_year:
+        age = today.year - birth_year
+        bmr = 10 * weight + 6.25 * height - 5 * age
+        bmr += -161 if health_profile.get("gender") in ("여", "여성", "female") else 5
+        factor = ACTIVITY_FACTORS.get(
+            health_profile.get("activity_level"), DEFAULT_ACTIVITY_FACTOR
+        )
+        kcal = bmr * factor
+
+    sugars_ratio = (
+        SUGARS_ENERGY_RATIO_DIABETES
+        if health_profile.get("has_diabetes") == "예"
+        else SUGARS_ENERGY_RATIO
+    )
+    return {
+        "kcal": kcal,
+        "fat_g": kcal * FAT_ENERGY_RATIO / 9,
+        "saturated_fat_g": kcal * SATURATED_FAT_ENERGY_RATIO / 9,
+        "sugars_g": kcal * sugars_ratio / 4,
+        "salt_g": SALT_LIMIT_GRAMS,
+    }
+
+
+def _round(values):
+    return {key: round(value, 2) for key, value in values.items()}
+
+
+def aggregate_nutrients(products_info, health_profile, today=None):
+    """
+    여러 제품의 1회 섭취량 기준 영양소와 합계, 하루 목표 대비 비율을 계산하는 함수
+
+    제품마다 1회 섭취량을 하루 한 번 먹는다고 가정하며, LLM이 직접 계산하지 않도록
+    프롬프트에 그대로 넣을 수 있는 값을 만든다.
+
+    Args:
+        products_info (list): 제품 정보 리스트 (nutriments, serving_size, quantity 사용)
+        health_profile (dict): 건강 프로필 (weight, height, birth_year, gender, activity_level)
+
+    Returns:
+        dict: {"products", "total", "daily_target", "percent_of_target"}
+    """
+    # 제품 x 영양소 행렬 (100g당 값, 없으면 None)
+    per_100g = [
+        [
+            _to_float(_as_dict(product.get("nutriments")).get(field))
+            for field, _ in NUTRIENT_KEYS
+        ]
+        for product in products_info
+    ]
+    servings = [serving_grams(product) for product in products_info]
+    scales = [(grams or DEFAULT_SERVING_GRAMS) / 100 for grams in servings]
+
+    per_serving = [
+        [None if value is None else value * scale for value in row]
+        for row, scale in zip(per_100g, scales)
+    ]
+    # 값이 있는 제품만 더하고, 어떤 제품에도 없는 영양소는 합계에서 제외
+    columns = list(zip(*per_serving)) if per_serving else []
+    total = {
+        key: sum(value for value in column if value is not None)
+        for (_, key), column in zip(NUTRIENT_KEYS, columns)
+        if any(value is not None for value in column)
+    }
+
+    targets = daily_targets(health_profile, today)
+    products = []
+    for product, grams, row in zip(products_info, servings, per_serving):
+        entry = {"name": product.get("product_name") or product.get("code")}
+        entry["serving_g"] = round(grams or DEFAULT_SERVING_GRAMS, 2)
+        if grams is None:
+            entry["serving_assumed"] = True
+        package = package_grams(product)
+        if package is not None:
+            entry["package_g"] = round(package, 2)
+        entry.update(
+            _round(
+                {
+                    key: value
+                    for (_, key), value in zip(NUTRIENT_KEYS, row)
+                    if value is not None
+                }
+            )
+        )
+        products.append(entry)
+
+    return {
+        "products": products,
+        "total": _round(total),
+        "daily_target": _round(targets),
+        "percent_of_target": _round(
+            {key: value * 100 / targets[key] for key, value in total.items()}
+        ),
+    }
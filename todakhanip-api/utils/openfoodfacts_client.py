@@ -0,0 +1,299 @@
+import asyncio
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from utils.local_product_store import project_product
+from utils.metrics import observe_stage, stage_timer
+from prompts.constants import (
+    OPENFOODFACTS_API_BASE_URL,
+    OPENFOODFACTS_PRODUCT_FIELDS,
+    API_CONNECT_TIMEOUT,
+    API_READ_TIMEOUT,
+    API_MAX_RETRIES,
+    API_RETRY_BACKOFF_FACTOR,
+    API_RETRY_BACKOFF_JITTER,
+    API_RETRY_STATUS_CODES,
+    API_POOL_CONNECTIONS,
+    API_POOL_MAXSIZE,
+    OPENFOODFACTS_USER_AGENT,
+)
+
+# 지연 시간 통계에 보관할 최근 요청 수
+LATENCY_SAMPLE_SIZE = 1000
+
+# extract_product_info가 쓰는 필드만 요청 (전체 문서는 제품당 100KB 이상)
+OPENFOODFACTS_FIELDS_PARAM = ",".join(OPENFOODFACTS_PRODUCT_FIELDS)
+
+
+class OpenFoodFactsError(Exception):
+    """OpenFoodFacts API가 200 이외의 상태 코드를 반환한 경우"""
+
+    def __init__(self, status_code):
+        super().__init__(f"OpenFoodFacts API status {status_code}")
+        self.status_code = status_code
+
+
+# 프로세스 전역 HTTP 세션 (지연 생성)
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+# 이벤트 루프별 비동기 HTTP 클라이언트
+_async_clients = weakref.WeakKeyDictionary()
+
+_stats_lock = threading.Lock()
+_request_count = 0
+_response_bytes = 0
+_latencies_ms = deque(maxlen=LATENCY_SAMPLE_SIZE)
+
+
+def _create_session():
+    """keep-alive 커넥션 풀과 재시도 정책을 가진 세션 생성"""
+    retry = Retry(
+        total=API_MAX_RETRIES,
+        connect=API_MAX_RETRIES,
+        read=API_MAX_RETRIES,
+        status=API_MAX_RETRIES,
+        backoff_factor=API_RETRY_BACKOFF_FACTOR,
+        backoff_jitter=API_RETRY_BACKOFF_JITTER,
+        status_forcelist=API_RETRY_STATUS_CODES,
+        allowed_methods=frozenset(["GET"]),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=API_POOL_CONNECTIONS,
+        pool_maxsize=API_POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"User-Agent": OPENFOODFACTS_USER_AGENT})
+    return session
+
+
+def get_session():
+    """
+    프로세스 전역에서 공유하는 OpenFoodFacts HTTP 세션을 반환하는 함수
+
+    fork 이후 자식 프로세스에서는 새 세션을 만들어 부모의 소켓을 공유하지 않는다.
+
+    Returns:
+        requests.Session: 공유 세션
+    """
+    global _session, _session_pid
+    pid = os.getpid()
+    if _session is not None and _session_pid == pid:
+        return _session
+
+    with _session_lock:
+        if _session is None or _session_pid != pid:
+            _session = _create_session()
+            _session_pid = pid
+    return _session
+
+
+def get_async_client():
+    """
+    현재 이벤트 루프에서 공유하는 비동기 HTTP 클라이언트를 반환하는 함수
+
+    Returns:
+        httpx.AsyncClient: keep-alive 커넥션 풀을 가진 비동기 클라이언트
+    """
+    loop = asyncio.get_running_loop()
+    async_client = _async_clients.get(loop)
+    if async_client is None or async_client.is_closed:
+        async_client = httpx.AsyncClient(
+            headers={"User-Agent": OPENFOODFACTS_USER_AGENT},
+            timeout=httpx.Timeout(API_READ_TIMEOUT, connect=API_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=API_POOL_MAXSIZE,
+                max_keepalive_connections=API_POOL_MAXSIZE,
+            ),
+        )
+        _async_clients[loop] = async_client
+    return async_client
+
+
+async def close_async_client():
+    """현재 이벤트 루프의 비동기 HTTP 클라이언트 종료"""
+    async_client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if async_client is not None:
+        await async_client.aclose()
+
+
+def close_session():
+    """공유 세션 종료 및 통계 초기화"""
+    global _session, _session_pid, _request_count, _response_bytes
+    with _session_lock:
+        if _session is not None and _session_pid == os.getpid():
+            _session.close()
+        _session = None
+        _session_pid = None
+    with _stats_lock:
+        _request_count = 0
+        _response_bytes = 0
+        _latencies_ms.clear()
+
+
+def _record_latency(elapsed_ms):
+    global _request_count
+    with _stats_lock:
+        _request_count += 1
+        _latencies_ms.append(elapsed_ms)
+
+
+def _record_response_bytes(size):
+    global _response_bytes
+    with _stats_lock:
+        _response_bytes += size
+
+
+def _percentile(sorted_values, percent):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * percent / 100))
+    return round(sorted_values[index], 3)
+
+
+def get_session_stats():
+    """
+    커넥션 재사용률과 지연 시간 분포를 반환하는 함수
+
+    Returns:
+        dict: 요청 수, 받은 응답 본문 크기(byte), 새로 연결한 커넥션 수, 재사용률,
+            p50/p95/p99 지연 시간(ms)
+    """
+    new_connections = 0
+    pool_requests = 0
+    session = _session if _session_pid == os.getpid() else None
+    if session is not None:
+        for adapter in set(session.adapters.values()):
+            for pool in list(adapter.poolmanager.pools._container.values()):
+                new_connections += pool.num_connections
+                pool_requests += pool.num_requests
+
+    with _stats_lock:
+        request_count = _request_count
+        response_bytes = _response_bytes
+        latencies = sorted(_latencies_ms)
+
+    return {
+        "requests": request_count,
+        "response_bytes": response_bytes,
+        "http_attempts": pool_requests,
+        "new_connections": new_connections,
+        "connection_reuse_ratio": (
+            round(1 - new_connections / pool_requests, 4) if pool_requests else 0.0
+        ),
+        "latency_ms": {
+            "p50": _percentile(latencies, 50),
+            "p95": _percentile(latencies, 95),
+            "p99": _percentile(latencies, 99),
+        },
+    }
+
+
+def _parse_product_response(status_code, load_json):
+    """
+    OpenFoodFacts 응답에서 제품 데이터를 꺼냄 (동기/비동기 공용)
+
+    fields 파라미터를 무시하고 전체 문서를 보내는 서버(미러, 구버전 API)도 있으므로
+    디코딩 후 다시 투영해 캐시와 MongoDB에는 사용하는 필드만 저장한다.
+    """
+    # OpenFoodFacts v2는 없는 제품에 대해 404를 반환
+    if status_code == 404:
+        return None
+    if status_code != 200:
+        raise OpenFoodFactsError(status_code)
+
+    with stage_timer("json_decode"):
+        data = load_json()
+        if data.get("status") == 1 and data.get("product"):
+            return project_product(data["product"])
+    return None
+
+
+def _retry_delay(attempt):
+    """지수 백오프 + 지터 대기 시간 (urllib3 Retry와 같은 정책)"""
+    backoff = API_RETRY_BACKOFF_FACTOR * (2 ** (attempt - 1))
+    return backoff + random.uniform(0, API_RETRY_BACKOFF_JITTER)
+
+
+def fetch_product(barcode):
+    """
+    OpenFoodFacts API에서 바코드에 해당하는 제품 데이터를 가져오는 함수
+
+    Args:
+        barcode (str): 제품 바코드
+
+    Returns:
+        dict | None: extract_product_info가 사용하는 필드만 남긴 제품 데이터 (제품이 없으면 None)
+
+    Raises:
+        OpenFoodFactsError: 200/404 이외의 응답을 받은 경우
+        requests.exceptions.RequestException: 네트워크 오류
+        json.JSONDecodeError: 응답 JSON 파싱 오류
+    """
+    url = f"{OPENFOODFACTS_API_BASE_URL}/{barcode}.json"
+    start = time.perf_counter()
+    try:
+        response = get_session().get(
+            url,
+            params={"fields": OPENFOODFACTS_FIELDS_PARAM},
+            timeout=(API_CONNECT_TIMEOUT, API_READ_TIMEOUT),
+        )
+    finally:
+        elapsed = time.perf_counter() - start
+        _record_latency(elapsed * 1000)
+        observe_stage("off_fetch", elapsed)
+    _record_response_bytes(len(response.content))
+
+    return _parse_product_response(response.status_code, response.json)
+
+
+async def fetch_product_async(barcode):
+    """
+    fetch_product의 비동기 버전 (httpx.AsyncClient 사용)
+
+    재시도 횟수, 백오프, 시도별 타임아웃은 동기 세션과 같은 상수를 따른다.
+
+    Raises:
+        OpenFoodFactsError: 200/404 이외의 응답을 받은 경우
+        httpx.HTTPError: 네트워크 오류
+        json.JSONDecodeError: 응답 JSON 파싱 오류
+    """
+    url = f"{OPENFOODFACTS_API_BASE_URL}/{barcode}.json"
+    async_client = get_async_client()
+    start = time.perf_counter()
+    try:
+        for attempt in range(API_MAX_RETRIES + 1):
+            try:
+                response = await async_client.get(
+                    url, params={"fields": OPENFOODFACTS_FIELDS_PARAM}
+                )
+            except httpx.TransportError:
+                if attempt == API_MAX_RETRIES:
+                    raise
+            else:
+                if (
+                    response.status_code not in API_RETRY_STATUS_CODES
+                    or attempt == API_MAX_RETRIES
+                ):
+                    break
+            await asyncio.sleep(_retry_delay(attempt + 1))
+    finally:
+        elapsed = time.perf_counter() - start
+        _record_latency(elapsed * 1000)
+        observe_stage("off_fetch", elapsed)
+    _record_response_bytes(len(response.content))
+
+    return _parse_product_response(response.status_code, response.json)
@@ -0,0 +1,422 @@
+import asyncio
+import os
+import threading
+import time
+import httpx
+import requests
+from dotenv import load_dotenv
+from utils.cache import TTLCache
+from utils.single_flight import SingleFlight, AsyncSingleFlight
+from utils.mongo_client import get_collection
+from utils.metrics import CACHE_HIT, CACHE_MISS, stage_timer
+from utils.bulkheads import (
+    MONGO_POOL,
+    OFF_POOL,
+    BulkheadFullError,
+    get_bulkhead,
+    run_async,
+    submit,
+)
+from utils.local_product_store import get_local_product, get_local_store_stats
+from utils.openfoodfacts_client import (
+    fetch_product,
+    fetch_product_async,
+    OpenFoodFactsError,
+)
+from prompts.constants import PRODUCT_BATCH_CONCURRENCY
+
+# 환경 변수 로드
+load_dotenv()
+
+# 제품 캐시 설정 (환경 변수로 조정 가능)
+PRODUCT_CACHE_MAX_SIZE = int(os.getenv("PRODUCT_CACHE_MAX_SIZE", "2000"))
+# 이 시간 동안은 OpenFoodFacts를 다시 조회하지 않음
+PRODUCT_CACHE_TTL_SECONDS = int(os.getenv("PRODUCT_CACHE_TTL_SECONDS", "21600"))
+# TTL 이후 이 시간 동안은 오래된 데이터를 응답하면서 백그라운드로 갱신
+PRODUCT_CACHE_STALE_SECONDS = int(os.getenv("PRODUCT_CACHE_STALE_SECONDS", "604800"))
+# "Product not found" 결과를 캐시하는 시간
+PRODUCT_CACHE_NEGATIVE_TTL_SECONDS = int(
+    os.getenv("PRODUCT_CACHE_NEGATIVE_TTL_SECONDS", "600")
+)
+PRODUCT_CACHE_PERSISTENT = os.getenv("PRODUCT_CACHE_PERSISTENT", "true") == "true"
+PRODUCT_COLLECTION_NAME = os.getenv("MONGODB_PRODUCT_COLLECTION_NAME", "products")
+# MongoDB 장애 시 영속 계층을 건너뛰는 시간
+PERSISTENT_TIER_BACKOFF_SECONDS = 30
+
+# 1차 캐시: 프로세스 내 LRU (오래된 데이터 제공 구간까지 보관)
+_memory_tier = TTLCache(
+    PRODUCT_CACHE_MAX_SIZE, PRODUCT_CACHE_TTL_SECONDS + PRODUCT_CACHE_STALE_SECONDS
+)
+
+_stats_lock = threading.Lock()
+_stats = {
+    "memory_hits": 0,
+    "local_hits": 0,
+    "persistent_hits": 0,
+    "negative_hits": 0,
+    "stale_served": 0,
+    "stale_on_error": 0,
+    "origin_fetches": 0,
+    "revalidations": 0,
+    "persistent_errors": 0,
+}
+
+# 같은 바코드의 동시 조회를 OpenFoodFacts 요청 하나로 합침
+_product_flight = SingleFlight()
+_async_product_flight = AsyncSingleFlight()
+
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+_persistent_disabled_until = 0.0
+
+
+def _count(key):
+    with _stats_lock:
+        _stats[key] += 1
+
+
+def _is_fresh(entry, now):
+    """항목이 TTL 이내인지 확인 (부정 캐시는 별도 TTL 적용)"""
+    ttl = (
+        PRODUCT_CACHE_NEGATIVE_TTL_SECONDS
+        if entry["product"] is None
+        else PRODUCT_CACHE_TTL_SECONDS
+    )
+    return now - entry["fetched_at"] < ttl
+
+
+def _is_servable_stale(entry, now):
+    """TTL은 지났지만 갱신 중에 응답해도 되는 항목인지 확인"""
+    if entry["product"] is None:
+        return False
+    return now - entry["fetched_at"] < (
+        PRODUCT_CACHE_TTL_SECONDS + PRODUCT_CACHE_STALE_SECONDS
+    )
+
+
+def _persistent_available():
+    return PRODUCT_CACHE_PERSISTENT and time.monotonic() >= _persistent_disabled_until
+
+
+def _persistent_failed(e):
+    """영속 계층 오류 시 잠시 동안 MongoDB 조회를 건너뜀"""
+    global _persistent_disabled_until
+    _count("persistent_errors")
+    _persistent_disabled_until = time.monotonic() + PERSISTENT_TIER_BACKOFF_SECONDS
+    print(f"⚠️ 제품 캐시 영속 계층 오류 - {e}")
+
+
+def _load_persistent(barcode):
+    """MongoDB에서 캐시 항목 조회"""
+    if not _persistent_available():
+        return None
+    try:
+        with stage_timer("mongo_lookup") as timer:
+            doc = get_collection(PRODUCT_COLLECTION_NAME).find_one({"_id": barcode})
+            timer.cache = CACHE_HIT if doc else CACHE_MISS
+    except Exception as e:
+        _persistent_failed(e)
+        return None
+    if not doc:
+        return None
+    return {"product": doc.get("product"), "fetched_at": doc["fetched_at"]}
+
+
+def _store(barcode, entry):
+    """두 계층 모두에 캐시 항목 저장"""
+    _memory_tier.set(barcode, entry)
+    _store_persistent(barcode, entry)
+
+
+def _store_persistent(barcode, entry):
+    """MongoDB에 캐시 항목 저장"""
+    if not _persistent_available():
+        return
+    try:
+        get_collection(PRODUCT_COLLECTION_NAME).replace_one(
+            {"_id": barcode}, {"_id": barcode, **entry}, upsert=True
+        )
+    except Exception as e:
+        _persistent_failed(e)
+
+
+def _fetch_and_store(barcode):
+    """OpenFoodFacts에서 조회 후 캐시에 저장"""
+    _count("origin_fetches")
+    product = fetch_product(barcode)
+    entry = {"product": product, "fetched_at": time.time()}
+    _store(barcode, entry)
+    return entry
+
+
+def _revalidate(barcode):
+    """백그라운드에서 캐시 항목 갱신"""
+    try:
+        _count("revalidations")
+        _fetch_and_store(barcode)
+    except Exception as e:
+        print(f"⚠️ 바코드 {barcode} 백그라운드 갱신 실패 - {e}")
+    finally:
+        with _revalidating_lock:
+            _revalidating.discard(barcode)
+
+
+def _schedule_revalidation(barcode):
+    """같은 바코드에 대해 갱신 작업이 하나만 돌도록 예약"""
+    with _revalidating_lock:
+        if barcode in _revalidating:
+            return
+        _revalidating.add(barcode)
+    try:
+        submit(OFF_POOL, _revalidate, barcode)
+    except BulkheadFullError:
+        # 갱신은 다음 요청에서 다시 시도 (그동안 오래된 데이터로 응답)
+        with _revalidating_lock:
+            _revalidating.discard(barcode)
+
+
+def _serve_cached(barcode, entry, tier):
+    """
+    캐시 항목으로 바로 응답할 수 있는지 판단
+
+    Returns:
+        tuple: (응답 가능 여부, 제품 데이터)
+    """
+    if entry is None:
+        return False, None
+
+    now = time.time()
+    if _is_fresh(entry, now):
+        _count(tier)
+        if entry["product"] is None:
+            _count("negative_hits")
+        return True, entry["product"]
+    if _is_servable_stale(entry, now):
+        _count("stale_served")
+        _schedule_revalidation(barcode)
+        return True, entry["product"]
+    return False, None
+
+
+def _has_fallback(entry):
+    """OpenFoodFacts 장애 시 남아 있는 데이터로 응답 가능한지 확인 (stale-if-error)"""
+    if entry is not None and entry["product"] is not None:
+        _count("stale_on_error")
+        return True
+    return False
+
+
+def _get_local_product(barcode):
+    """
+    덤프로 만든 로컬 제품 인덱스에서 조회 (인덱스가 없거나 제품이 없으면 None)
+
+    로컬 인덱스는 덤프 변경분으로 갱신되므로 메모리 계층에 따로 담지 않는다.
+    """
+    product = get_local_product(barcode)
+    if product is not None:
+        _count("local_hits")
+    return product
+
+
+def is_product_cached(barcode):
+    """메모리 계층에서 바로 응답할 수 있는 제품인지 확인 (통계와 LRU 순서는 바꾸지 않음)"""
+    entry = _memory_tier.peek(barcode)
+    return (
+        entry is not None
+        and entry["product"] is not None
+        and _is_servable_stale(entry, time.time())
+    )
+
+
+def _load_or_fetch(barcode, entry):
+    """메모리 계층에서 응답하지 못한 요청을 MongoDB → OpenFoodFacts 순으로 처리"""
+    persistent_entry = _load_persistent(barcode)
+    if persistent_entry is not None:
+        _memory_tier.set(barcode, persistent_entry)
+        entry = persistent_entry
+
+    served, product = _serve_cached(barcode, persistent_entry, "persistent_hits")
+    if served:
+        return product
+
+    try:
+        return _fetch_and_store(barcode)["product"]
+    except (OpenFoodFactsError, requests.exceptions.RequestException):
+        if _has_fallback(entry):
+            return entry["product"]
+        raise
+
+
+def get_product(barcode):
+    """
+    캐시 계층(메모리 → 로컬 제품 인덱스 → MongoDB → OpenFoodFacts)을 거쳐 제품 데이터를 반환하는 함수
+
+    TTL이 지난 항목은 그대로 응답하면서 백그라운드로 갱신하고(stale-while-revalidate),
+    OpenFoodFacts 장애 시에는 남아 있는 오래된 항목으로 응답한다.
+    메모리 계층에 없는 바코드를 여러 요청이 동시에 조회하면 한 번만 조회하고 결과를 나눠 갖는다.
+
+    Args:
+        barcode (str): 제품 바코드
+
+    Returns:
+        dict | None: 제품 데이터 (제품이 없으면 None)
+
+    Raises:
+        OpenFoodFactsError, requests.exceptions.RequestException:
+            OpenFoodFacts 조회 실패 시 응답할 캐시 항목이 없는 경우
+    """
+    with stage_timer("product_lookup", CACHE_HIT) as timer:
+        entry = _memory_tier.get(barcode)
+        served, product = _serve_cached(barcode, entry, "memory_hits")
+        if served:
+            return product
+
+        product = _get_local_product(barcode)
+        if product is not None:
+            return product
+
+        timer.cache = CACHE_MISS
+        return _product_flight.do(barcode, _load_or_fetch, barcode, entry)
+
+
+async def _load_or_fetch_async(barcode, entry):
+    """_load_or_fetch의 비동기 버전"""
+    try:
+        persistent_entry = await run_async(MONGO_POOL, _load_persistent, barcode)
+    except BulkheadFullError:
+        # MongoDB 풀이 가득 차면 영속 계층을 건너뜀
+        persistent_entry = None
+    if persistent_entry is not None:
+        _memory_tier.set(barcode, persistent_entry)
+        entry = persistent_entry
+
+    served, product = _serve_cached(barcode, persistent_entry, "persistent_hits")
+    if served:
+        return product
+
+    try:
+        _count("origin_fetches")
+        product = await fetch_product_async(barcode)
+    except (OpenFoodFactsError, httpx.HTTPError):
+        if _has_fallback(entry):
+            return entry["product"]
+        raise
+
+    new_entry = {"product": product, "fetched_at": time.time()}
+    _memory_tier.set(barcode, new_entry)
+    try:
+        await run_async(MONGO_POOL, _store_persistent, barcode, new_entry)
+    except BulkheadFullError:
+        pass
+    return product
+
+
+async def get_product_async(barcode):
+    """
+    get_product의 비동기 버전
+
+    메모리 계층은 바로 조회하고, MongoDB 계층은 MongoDB 스레드 풀에서,
+    OpenFoodFacts 조회는 httpx 비동기 클라이언트로 수행한다.
+    """
+    with stage_timer("product_lookup", CACHE_HIT) as timer:
+        entry = _memory_tier.get(barcode)
+        served, product = _serve_cached(barcode, entry, "memory_hits")
+        if served:
+            return product
+
+        product = _get_local_product(barcode)
+        if product is not None:
+            return product
+
+        timer.cache = CACHE_MISS
+        return await _async_product_flight.do(
+            barcode, _load_or_fetch_async, barcode, entry
+        )
+
+
+def _split_batch_results(barcodes, results):
+    """
+    바코드별 조회 결과를 (찾은 제품, 실패한 바코드)로 나눔
+
+    제품이 없거나 조회 중 예외가 발생한 바코드는 실패로 기록한다.
+    """
+    products = {}
+    failed_products = []
+    for barcode, result in zip(barcodes, results):
+        if isinstance(result, Exception):
+            print(f"⚠️ 제품 조회 실패 ({barcode}) - {result}")
+            failed_products.append(barcode)
+        elif result is None:
+            failed_products.append(barcode)
+        else:
+            products[barcode] = result
+    return products, failed_products
+
+
+def get_products(barcodes, max_concurrency=PRODUCT_BATCH_CONCURRENCY):
+    """
+    여러 바코드의 제품 데이터를 동시에 조회하는 함수
+
+    제품마다 get_product와 같은 캐시 계층을 OpenFoodFacts 스레드 풀에서 거치며,
+    전체 소요 시간은 각 조회 시간의 합이 아니라 가장 느린 조회 시간에 가깝다.
+    풀이 가득 차서 거절된 바코드는 조회 실패로 기록한다.
+
+    Args:
+        barcodes (list): 제품 바코드 목록 (중복은 한 번만 조회)
+        max_concurrency (int): 동시에 조회할 최대 제품 수
+
+    Returns:
+        tuple: ({바코드: 제품 데이터}, 조회에 실패한 바코드 리스트)
+    """
+    barcodes = list(dict.fromkeys(barcodes))
+    if not barcodes:
+        return {}, []
+
+    results = get_bulkhead(OFF_POOL).map(get_product, barcodes, max_concurrency)
+    return _split_batch_results(barcodes, results)
+
+
+async def get_products_async(barcodes, max_concurrency=PRODUCT_BATCH_CONCURRENCY):
+    """get_products의 비동기 버전"""
+    barcodes = list(dict.fromkeys(barcodes))
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def lookup(barcode):
+        async with semaphore:
+            return await get_product_async(barcode)
+
+    results = await asyncio.gather(
+        *(lookup(barcode) for barcode in barcodes), return_exceptions=True
+    )
+    return _split_batch_results(barcodes, results)
+
+
+def invalidate_product(barcode):
+    """두 계층에서 바코드 캐시 항목 삭제"""
+    _memory_tier.delete(barcode)
+    if not _persistent_available():
+        return
+    try:
+        get_collection(PRODUCT_COLLECTION_NAME).delete_one({"_id": barcode})
+    except Exception as e:
+        _persistent_failed(e)
+
+
+def clear_product_cache():
+    """메모리 캐시와 통계 초기화"""
+    _memory_tier.clear()
+    with _stats_lock:
+        for key in _stats:
+            _stats[key] = 0
+
+
+def get_product_cache_stats():
+    """제품 캐시 통계 반환"""
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["memory"] = _memory_tier.stats()
+    stats["single_flight"] = _product_flight.stats()
+    stats["async_single_flight"] = _async_product_flight.stats()
+    stats["persistent_enabled"] = _persistent_available()
+    stats["local_store"] = get_local_store_stats()
+    return stats
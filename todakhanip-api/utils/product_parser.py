@@ -1,6 +1,12 @@
-from utils.translation_manager import translate_text, translate_tags
+from utils.translation_manager import (
+    translate_text,
+    translate_tags,
+    translate_tags_batch,
+)
+from utils.metrics import timed_stage
 
 
+@timed_stage("extract_product_info")
 def extract_product_info(product, barcode):
     """
     OpenFoodFacts API 응답에서 제품 정보를 추출하는 함수
@@ -39,12 +45,18 @@ def extract_product_info(product, barcode):
     def process_nutriments(nutriments_data):
         """nutriments 데이터를 안전하게 처리"""
         if isinstance(nutriments_data, dict):
-            return {
+            processed_nutriments = {
                 "fat_100g": nutriments_data.get("fat_100g", 0),
                 "saturated-fat_100g": nutriments_data.get("saturated-fat_100g", 0),
                 "sugars_100g": nutriments_data.get("sugars_100g", 0),
                 "salt_100g": nutriments_data.get("salt_100g", 0),
             }
+            # 열량은 값이 있을 때만 포함 (0으로 채우면 열량 계산이 틀어짐)
+            if "energy-kcal_100g" in nutriments_data:
+                processed_nutriments["energy-kcal_100g"] = nutriments_data[
+                    "energy-kcal_100g"
+                ]
+            return processed_nutriments
         else:
             return {
                 "fat_100g": 0,
@@ -120,3 +132,127 @@ def extract_product_info(product, barcode):
     }
 
     return product_info
+
+
+def get_ingredients_string(product_info):
+    """
+    제품 정보의 원료 텍스트를 쉼표로 구분된 문자열로 변환하는 함수
+
+    Args:
+        product_info (dict): extract_product_info로 추출한 제품 정보
+
+    Returns:
+        str: 쉼표로 구분된 원료 문자열 (원료가 없으면 빈 문자열)
+    """
+    ingredients_texts = []
+    for ingredient in product_info.get("ingredients", []):
+        if isinstance(ingredient, dict) and "text" in ingredient:
+            ingredients_texts.append(ingredient["text"])
+        elif isinstance(ingredient, str):
+            ingredients_texts.append(ingredient)
+    return ",".join(ingredients_texts)
+
+
+def apply_ingredient_translations(product_info, translations):
+    """번역 결과로 product_info의 ingredients.text를 대체하는 함수"""
+    if not translations or not product_info.get("ingredients"):
+        return
+    for ingredient in product_info["ingredients"]:
+        if isinstance(ingredient, dict) and "text" in ingredient:
+            original_text = ingredient["text"]
+            if original_text in translations:
+                ingredient["text"] = translations[original_text]
+
+
+def parse_products_data(products_data):
+    """
+    종합 분석 요청의 products_data를 분석용 제품 정보 목록으로 정리하는 함수
+
+    Args:
+        products_data (list): 클라이언트가 보낸 제품 데이터 배열
+
+    Returns:
+        tuple: (제품 정보 리스트, 처리에 실패한 바코드 리스트)
+    """
+    products_info = []
+    failed_products = []
+
+    for product_data in products_data:
+        try:
+            # 바코드 필드 확인 (code 또는 barcode)
+            barcode = product_data.get("code") or product_data.get("barcode")
+            if not barcode:
+                print(f"제품 데이터에 바코드가 없습니다: {product_data}")
+                continue
+
+            # 영양 정보 필드 확인 (nutriments 또는 nutrition_data)
+            nutrition_data = product_data.get("nutriments") or product_data.get(
+                "nutrition_data", {}
+            )
+
+            # 제품 정보 추출 및 정리
+            product_info = {
+                "code": barcode,
+                "product_name": product_data.get("product_name", ""),
+                "brands": product_data.get("brands", ""),
+                "nutriments": nutrition_data,
+                "allergens_tags": product_data.get("allergens_tags", []),
+                "food_groups_tags": product_data.get("food_groups_tags", []),
+                "nutriscore_grade": product_data.get("nutriscore_grade", ""),
+                "nutrient_levels": product_data.get("nutrient_levels", {}),
+                "ingredients": product_data.get("ingredients", []),
+                "serving_size": product_data.get("serving_size", ""),
+                "quantity": product_data.get("quantity", ""),
+                "image_url": product_data.get("image_url", ""),
+            }
+            products_info.append(product_info)
+
+        except Exception as e:
+            print(f"제품 데이터 처리 중 오류: {str(e)}")
+            barcode = product_data.get("code") or product_data.get("barcode")
+            if barcode:
+                failed_products.append(barcode)
+
+    try:
+        translate_products_tags(products_info)
+    except Exception as e:
+        # 일괄 번역이 실패하면 제품별로 번역해 실패한 제품만 제외
+        print(f"태그 일괄 번역 중 오류: {str(e)}")
+        translated_info = []
+        for product_info in products_info:
+            try:
+                translate_products_tags([product_info])
+                translated_info.append(product_info)
+            except Exception as e:
+                print(f"제품 데이터 처리 중 오류: {str(e)}")
+                failed_products.append(product_info["code"])
+        products_info = translated_info
+    return products_info, failed_products
+
+
+def translate_products_tags(products_info):
+    """여러 제품의 알레르기/식품군 태그를 한 번에 번역하는 함수 (중복 태그는 한 번만 번역)"""
+    for field, translation_type in [
+        ("allergens_tags", "allergens"),
+        ("food_groups_tags", "food_groups"),
+    ]:
+        products = [
+            product for product in products_info if isinstance(product.get(field), list)
+        ]
+        translated = translate_tags_batch(
+            [product[field] for product in products], translation_type
+        )
+        for product, tags in zip(products, translated):
+            product[field] = tags
+
+
+def build_products_summary(products_info):
+    """종합 분석 응답에 포함할 제품 요약 목록을 만드는 함수"""
+    return [
+        {
+            "barcode": product.get("code"),
+            "name": product.get("product_name"),
+            "brands": product.get("brands"),
+        }
+        for product in products_info
+    ]
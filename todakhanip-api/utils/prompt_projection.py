@@ -0,0 +1,69 @@
+import json
+from prompts.constants import (
+    PROMPT_EXCLUDED_PRODUCT_FIELDS,
+    PROMPT_PLACEHOLDER_SUFFIX,
+    PROMPT_FLOAT_DIGITS,
+)
+
+
+def _is_empty(value):
+    """프롬프트에 넣을 필요가 없는 값인지 확인 (None, 빈 값, "... 정보 없음" 안내 문구)"""
+    if value is None:
+        return True
+    if isinstance(value, str):
+        value = value.strip()
+        return not value or value.endswith(PROMPT_PLACEHOLDER_SUFFIX)
+    if isinstance(value, (list, dict)):
+        return not value
+    return False
+
+
+def _project_value(value):
+    """하위 값까지 빈 값을 제거하고 실수는 반올림"""
+    if isinstance(value, dict):
+        projected = {}
+        for key, item in value.items():
+            item = _project_value(item)
+            if not _is_empty(item):
+                projected[key] = item
+        return projected
+    if isinstance(value, list):
+        return [item for item in map(_project_value, value) if not _is_empty(item)]
+    if isinstance(value, float):
+        # 3.30000000000001 같은 부동소수점 오차 제거
+        return round(value, PROMPT_FLOAT_DIGITS)
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+def project_product_info(product_info):
+    """
+    건강 분석 프롬프트에 넣을 제품 정보만 남기는 함수
+
+    이미지 URL과 빈 값, "영문 상품명 정보 없음" 같은 안내 문구를 제거한다.
+    원본 product_info는 바꾸지 않는다.
+
+    Args:
+        product_info (dict): extract_product_info 또는 parse_products_data로 만든 제품 정보
+
+    Returns:
+        dict: 프롬프트용 제품 정보
+    """
+    return _project_value(
+        {
+            key: value
+            for key, value in product_info.items()
+            if key not in PROMPT_EXCLUDED_PRODUCT_FIELDS
+        }
+    )
+
+
+def serialize_for_prompt(value):
+    """
+    프롬프트에 넣을 값을 공백 없는 JSON 문자열로 변환
+
+    키를 정렬하므로 같은 입력은 항상 같은 문자열이 된다.
+    """
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+
@@ -0,0 +1,102 @@
+import asyncio
+import threading
+
+
+class _Call:
+    """진행 중인 작업 하나와 그 결과"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    같은 키로 동시에 들어온 작업을 한 번만 실행하고 결과를 공유하는 스레드용 도우미
+
+    먼저 도착한 스레드가 작업을 실행하고, 그동안 같은 키로 들어온 스레드는
+    완료를 기다렸다가 같은 결과(또는 같은 예외)를 받는다. 작업이 끝나면 키를 지우므로
+    결과를 캐시하지는 않는다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        """키에 대해 진행 중인 작업이 있으면 기다려 결과를 공유하고, 없으면 fn 실행"""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                self.coalesced += 1
+                leader = False
+            else:
+                call = _Call()
+                self._calls[key] = call
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.result
+
+    def stats(self):
+        """실행 횟수와 합쳐진 요청 수 반환"""
+        with self._lock:
+            return {
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight의 asyncio 버전
+
+    작업은 별도 태스크로 실행되므로, 기다리던 요청 하나가 취소되어도
+    같은 작업을 기다리는 다른 요청에는 영향이 없다.
+    """
+
+    def __init__(self):
+        self._tasks = {}
+        self.executions = 0
+        self.coalesced = 0
+
+    async def do(self, key, coro_fn, *args, **kwargs):
+        """키에 대해 진행 중인 작업이 있으면 기다려 결과를 공유하고, 없으면 coro_fn 실행"""
+        # 태스크는 이벤트 루프에 묶이므로 루프별로 키를 구분
+        flight_key = (asyncio.get_running_loop(), key)
+        task = self._tasks.get(flight_key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            task = asyncio.ensure_future(coro_fn(*args, **kwargs))
+            self._tasks[flight_key] = task
+            self.executions += 1
+            task.add_done_callback(lambda _: self._tasks.pop(flight_key, None))
+        return await asyncio.shield(task)
+
+    def stats(self):
+        """실행 횟수와 합쳐진 요청 수 반환"""
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "in_flight": len(self._tasks),
+        }
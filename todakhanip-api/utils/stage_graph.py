@@ -0,0 +1,210 @@
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from utils.bulkheads import BulkheadFullError, submit
+
+
+class _Stage:
+    """그래프에 등록된 처리 단계 하나"""
+
+    __slots__ = ("name", "fn", "deps", "lazy_deps", "pool")
+
+    def __init__(self, name, fn, deps, lazy_deps, pool):
+        self.name = name
+        self.fn = fn
+        self.deps = tuple(deps)
+        self.lazy_deps = tuple(lazy_deps)
+        self.pool = pool
+
+
+class StageRun:
+    """
+    StageGraph.run 한 번의 결과
+
+    Attributes:
+        results (dict): 단계 이름 -> 결과 (건너뛴 단계는 None)
+        durations (dict): 단계 이름 -> 시작부터 끝까지 걸린 시간(초, 풀 대기 포함)
+        critical_path (list): 응답 시간을 결정한 단계 순서대로의 (단계 이름, 초)
+        total_seconds (float): 그래프 실행 시작부터 마지막 단계 종료까지의 시간
+    """
+
+    def __init__(self, results, durations, critical_path, total_seconds):
+        self.results = results
+        self.durations = durations
+        self.critical_path = critical_path
+        self.total_seconds = total_seconds
+
+    def server_timing(self):
+        """임계 경로를 Server-Timing 헤더 값으로 변환 (밀리초)"""
+        return ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.critical_path
+        )
+
+
+class StageGraph:
+    """
+    의존성이 있는 처리 단계를 입력이 준비되는 대로 실행하는 스케줄러
+
+    단계는 의존하는 단계의 결과를 인자로 받는다. pool을 지정한 단계는 해당 스레드 풀에서,
+    지정하지 않은 단계(파싱처럼 짧은 작업)는 run을 호출한 스레드에서 바로 실행한다.
+    의존 단계의 결과가 None이면(제품 없음 등) 그 단계와 뒤따르는 단계는 건너뛴다.
+
+    lazy_deps로 등록한 단계는 시작 조건이 아니다. 단계 함수는 그 결과를 기다리는
+    인자 없는 함수를 받아 필요할 때만 호출한다. (예: 원료 사전에 없는 원료가 있을 때만
+    미리 시작해 둔 MongoDB 조회 결과를 기다림) lazy_deps로만 쓰이는 단계는 나머지
+    단계가 모두 끝나면 기다리지 않고, 결과는 None이 된다. 이런 단계는 풀이 가득 차
+    거절되어도 요청을 실패시키지 않고, 결과를 기다린 단계가 BulkheadFullError를 받는다.
+
+    사용 예:
+        graph = StageGraph()
+        graph.add("product", lambda: get_product(barcode), pool=OFF_POOL)
+        graph.add("product_info", parse, deps=("product",))
+        run = graph.run()
+        run.results["product_info"], run.critical_path
+    """
+
+    def __init__(self):
+        self._stages = {}
+
+    def add(self, name, fn, deps=(), lazy_deps=(), pool=None):
+        """
+        단계를 등록하는 함수 (의존하는 단계를 먼저 등록해야 하므로 순환이 생기지 않음)
+
+        Args:
+            name (str): 단계 이름
+            fn (callable): deps 결과를 순서대로, 이어서 lazy_deps 결과를 기다리는 함수를 받음
+            deps (tuple): 끝나야 시작할 수 있는 단계 이름
+            lazy_deps (tuple): 필요할 때만 기다리는 단계 이름
+            pool (str): 실행할 스레드 풀 이름 (None이면 run을 호출한 스레드에서 실행)
+        """
+        if name in self._stages:
+            raise ValueError(f"이미 등록된 단계입니다: {name}")
+        for dep in (*deps, *lazy_deps):
+            if dep not in self._stages:
+                raise ValueError(f"{name} 단계보다 먼저 등록해야 하는 단계입니다: {dep}")
+        self._stages[name] = _Stage(name, fn, deps, lazy_deps, pool)
+        return self
+
+    def run(self):
+        """
+        모든 단계를 실행하고 결과와 임계 경로를 반환하는 함수
+
+        단계에서 발생한 예외(풀이 가득 찬 경우의 BulkheadFullError 포함)는 그대로 전달한다.
+        이때 이미 풀에서 실행 중인 단계는 멈추지 않는다.
+
+        Returns:
+            StageRun: 단계별 결과, 소요 시간, 임계 경로
+        """
+        start = time.perf_counter()
+        required = set()
+        for stage in self._stages.values():
+            required.update(stage.deps)
+        optional = {
+            dep
+            for stage in self._stages.values()
+            for dep in stage.lazy_deps
+            if dep not in required
+        }
+        futures = {name: Future() for name in self._stages}
+        started = {}
+        finished = {}
+        waited = {name: set() for name in self._stages}
+        waiting = list(self._stages.values())
+        running = {}
+
+        def lazy_result(stage_name, dep):
+            def get():
+                waited[stage_name].add(dep)
+                return futures[dep].result()
+
+            return get
+
+        def finish(name, result):
+            finished[name] = time.perf_counter() - start
+            futures[name].set_result(result)
+
+        try:
+            while waiting or any(name not in optional for name in running.values()):
+                # 입력이 준비된 단계를 모두 시작 (바로 실행한 단계가 다른 단계를 준비시킬 수 있음)
+                progressed = True
+                while progressed:
+                    progressed = False
+                    for stage in list(waiting):
+                        if not all(futures[dep].done() for dep in stage.deps):
+                            continue
+                        waiting.remove(stage)
+                        progressed = True
+                        args = [futures[dep].result() for dep in stage.deps]
+                        if any(arg is None for arg in args):
+                            futures[stage.name].set_result(None)
+                            continue
+                        args.extend(
+                            lazy_result(stage.name, dep) for dep in stage.lazy_deps
+                        )
+                        started[stage.name] = time.perf_counter() - start
+                        if stage.pool is None:
+                            finish(stage.name, stage.fn(*args))
+                            continue
+                        try:
+                            future = submit(stage.pool, stage.fn, *args)
+                        except BulkheadFullError as e:
+                            if stage.name not in optional:
+                                raise
+                            futures[stage.name].set_exception(e)
+                            continue
+                        running[future] = stage.name
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        finish(name, future.result())
+                    elif name in optional:
+                        # 필요할 때만 기다리는 단계의 오류는 그 결과를 기다린 단계에 전달
+                        futures[name].set_exception(error)
+                    else:
+                        raise error
+        except BaseException as e:
+            # 실행 중인 단계가 끝나지 않을 결과를 기다리며 워커를 붙잡지 않도록 함
+            for future in futures.values():
+                if not future.done():
+                    future.set_exception(e)
+            raise
+
+        results = {
+            name: future.result() if future.done() and not future.exception() else None
+            for name, future in futures.items()
+        }
+        durations = {name: finished[name] - started[name] for name in finished}
+        critical_path = self._critical_path(started, finished, waited)
+        total_seconds = max(finished.values(), default=0.0)
+        return StageRun(results, durations, critical_path, total_seconds)
+
+    def _critical_path(self, started, finished, waited):
+        """
+        마지막으로 끝난 단계부터 가장 늦게 끝난 입력 단계를 거슬러 올라가며 임계 경로를 구함
+
+        각 단계의 몫은 가장 늦은 입력이 준비된 뒤부터 그 단계가 끝날 때까지의 시간이므로
+        경로의 합은 전체 소요 시간과 같다. 필요할 때만 기다린 단계(lazy_deps)는
+        실제로 기다렸을 때만 입력으로 본다.
+        """
+        if not finished:
+            return []
+        path = []
+        name = max(finished, key=finished.get)
+        while name is not None:
+            stage = self._stages[name]
+            inputs = [dep for dep in stage.deps if dep in finished]
+            inputs.extend(
+                dep
+                for dep in waited[name]
+                if dep in finished and finished[dep] > started[name]
+            )
+            previous = max(inputs, key=finished.get, default=None)
+            ready_at = finished[previous] if previous is not None else 0.0
+            path.append((name, finished[name] - ready_at))
+            name = previous
+        path.reverse()
+        return path
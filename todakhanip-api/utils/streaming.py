@@ -0,0 +1,36 @@
+import json
+from prompts.constants import STREAM_CONTENT_TYPE, SSE_CONTENT_TYPE, UTF8_ENCODING
+
+# 프록시 버퍼링 없이 바로 전달되도록 하는 응답 헤더
+STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def select_stream_content_type(accept_header):
+    """
+    Accept 헤더에 따라 스트리밍 형식을 선택하는 함수
+
+    application/octet-stream을 요청하면 줄 단위 JSON(chunked), 그 외에는 SSE를 사용한다.
+    """
+    if accept_header and STREAM_CONTENT_TYPE in accept_header:
+        return STREAM_CONTENT_TYPE
+    return SSE_CONTENT_TYPE
+
+
+def format_stream_event(event, data, content_type):
+    """
+    스트리밍 이벤트 하나를 전송용 바이트로 변환하는 함수
+
+    Args:
+        event (str): 이벤트 이름 (product, token, translations, done, error 등)
+        data: JSON으로 직렬화할 데이터
+        content_type (str): SSE_CONTENT_TYPE 또는 STREAM_CONTENT_TYPE
+
+    Returns:
+        bytes: 인코딩된 이벤트
+    """
+    if content_type == SSE_CONTENT_TYPE:
+        payload = json.dumps(data, ensure_ascii=False)
+        message = f"event: {event}\ndata: {payload}\n\n"
+    else:
+        message = json.dumps({"event": event, "data": data}, ensure_ascii=False) + "\n"
+    return message.encode(UTF8_ENCODING)
@@ -0,0 +1,192 @@
+import functools
+import math
+
+try:
+    import tiktoken
+except ImportError:  # 없으면 문자 종류별 글자 수로 토큰 수를 추정
+    tiktoken = None
+
+# 모델별 컨텍스트 길이 (목록에 없는 모델은 보수적으로 DEFAULT_CONTEXT_TOKENS 사용)
+MODEL_CONTEXT_TOKENS = {
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+}
+DEFAULT_CONTEXT_TOKENS = 8192
+
+# 채팅 메시지 하나에 붙는 역할/구분자 토큰 수와 응답 시작 토큰 수
+CHAT_MESSAGE_OVERHEAD_TOKENS = 4
+CHAT_REPLY_OVERHEAD_TOKENS = 3
+
+# 번역 응답 추정치: {"i": 번호, "k": ""}, 한 원소의 고정 토큰 수와 원문 대비 한국어 번역 토큰 비율
+TRANSLATION_ELEMENT_OVERHEAD_TOKENS = 10
+TRANSLATION_OUTPUT_TOKEN_RATIO = 1.5
+# 추정 오차를 감안해 max_tokens의 이 비율까지만 응답을 채움
+TRANSLATION_COMPLETION_BUDGET_RATIO = 0.8
+# 토큰 예산과 무관하게 요청 하나에 담을 최대 항목 수 (실패 시 다시 번역할 양을 제한)
+TRANSLATION_MAX_BATCH_ITEMS = 500
+
+# 토크나이저가 없을 때 문자 종류별 토큰 추정치
+# 적게 추정하면 응답이 max_tokens에서 잘리므로 실제 토크나이저보다 넉넉하게 잡는다.
+FALLBACK_ASCII_CHARS_PER_TOKEN = 4
+FALLBACK_TOKENS_PER_ACCENTED_LATIN = 0.5  # é, à, ç 등 (프랑스어 원료명)
+FALLBACK_TOKENS_PER_HANGUL = 1.0  # 한글 음절/자모
+FALLBACK_TOKENS_PER_OTHER = 1.0  # 그 밖의 비ASCII 문자 (한자, 기호 등)
+
+
+def _is_hangul(code):
+    return 0xAC00 <= code <= 0xD7A3 or 0x1100 <= code <= 0x11FF or 0x3130 <= code <= 0x318F
+
+
+def estimate_tokens(text):
+    """
+    토크나이저 없이 문자 종류별로 토큰 수를 추정
+
+    영문/숫자는 4글자당 1토큰이지만 한글은 음절마다, 악센트 문자는 2글자마다
+    1토큰으로 센다. (글자 수 / 4로 세면 한국어와 프랑스어를 크게 적게 추정함)
+    """
+    if text.isascii():
+        return math.ceil(len(text) / FALLBACK_ASCII_CHARS_PER_TOKEN)
+    ascii_chars = accented = hangul = other = 0
+    for char in text:
+        code = ord(char)
+        if code < 128:
+            ascii_chars += 1
+        elif _is_hangul(code):
+            hangul += 1
+        elif 0xC0 <= code <= 0x24F:
+            accented += 1
+        else:
+            other += 1
+    return math.ceil(
+        ascii_chars / FALLBACK_ASCII_CHARS_PER_TOKEN
+        + accented * FALLBACK_TOKENS_PER_ACCENTED_LATIN
+        + hangul * FALLBACK_TOKENS_PER_HANGUL
+        + other * FALLBACK_TOKENS_PER_OTHER
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def get_token_counter(model):
+    """
+    모델의 토크나이저로 토큰 수를 세는 함수 반환
+
+    tiktoken이 설치되어 있지 않거나 인코딩 파일을 받을 수 없으면(오프라인)
+    estimate_tokens를 반환한다.
+    """
+    if tiktoken is None:
+        return estimate_tokens
+    try:
+        try:
+            encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        print(f"⚠️ tiktoken 인코딩을 불러오지 못해 글자 수로 토큰을 추정합니다 - {e}")
+        return estimate_tokens
+    return lambda text: len(encoding.encode(text))
+
+
+class TranslationBatchPlanner:
+    """
+    항목별 프롬프트/응답 토큰을 추정해 요청 하나에 담을 배치를 나누는 planner
+
+    응답 추정치가 max_tokens의 TRANSLATION_COMPLETION_BUDGET_RATIO에 닿거나
+    프롬프트가 모델 컨텍스트를 넘기 직전까지 항목을 채운다.
+    긴 원료명은 배치에 적게, 짧은 원료명은 많이 담긴다.
+
+    Args:
+        model (str): 사용할 모델 (토크나이저와 컨텍스트 길이 결정)
+        system_prompt (str): 시스템 프롬프트
+        user_prompt (str): "{items}" 자리에 번호를 붙인 번역 항목이 들어가는 사용자 프롬프트
+        max_tokens (int): 요청당 최대 응답 토큰 수
+        max_items (int): 요청 하나에 담을 최대 항목 수
+    """
+
+    def __init__(
+        self,
+        model,
+        system_prompt,
+        user_prompt,
+        max_tokens,
+        max_items=TRANSLATION_MAX_BATCH_ITEMS,
+    ):
+        self.count_tokens = get_token_counter(model)
+        self.max_items = max_items
+        self.prompt_overhead = (
+            self.count_tokens(system_prompt)
+            + self.count_tokens(user_prompt.format(items=""))
+            + 2 * CHAT_MESSAGE_OVERHEAD_TOKENS
+            + CHAT_REPLY_OVERHEAD_TOKENS
+        )
+        self.prompt_budget = (
+            MODEL_CONTEXT_TOKENS.get(model, DEFAULT_CONTEXT_TOKENS)
+            - max_tokens
+            - self.prompt_overhead
+        )
+        # estimate()의 응답 토큰과 같은 기준 ({"t": [ ... ]} 감싸는 토큰 포함)
+        self.completion_budget = int(max_tokens * TRANSLATION_COMPLETION_BUDGET_RATIO)
+
+    def item_tokens(self, number, item):
+        """
+        번호가 number인 항목 하나의 (프롬프트 토큰, 응답 토큰) 추정치
+
+        Returns:
+            tuple: (프롬프트 토큰 수, 응답 토큰 수)
+        """
+        prompt = self.count_tokens(f"{number}. {item}\n")
+        completion = TRANSLATION_ELEMENT_OVERHEAD_TOKENS + math.ceil(
+            self.count_tokens(item) * TRANSLATION_OUTPUT_TOKEN_RATIO
+        )
+        return prompt, completion
+
+    def estimate(self, batch):
+        """
+        배치 하나의 (프롬프트 토큰, 응답 토큰) 추정치
+
+        Returns:
+            tuple: (프롬프트 토큰 수, 응답 토큰 수)
+        """
+        prompt = self.prompt_overhead
+        completion = CHAT_REPLY_OVERHEAD_TOKENS
+        for number, item in enumerate(batch, 1):
+            item_prompt, item_completion = self.item_tokens(number, item)
+            prompt += item_prompt
+            completion += item_completion
+        return prompt, completion
+
+    def plan(self, items, max_items=None):
+        """
+        항목을 순서대로 토큰 예산에 맞춰 배치로 나누는 함수
+
+        혼자서도 예산을 넘는 항목은 단독 배치가 되며, 잘린 응답은 번역 엔진이 나눠서 다시 요청한다.
+
+        Args:
+            items (list): 번역할 원문 리스트
+            max_items (int): 요청 하나에 담을 최대 항목 수 (기본값: 생성 시 max_items)
+
+        Returns:
+            list: 배치(원문 리스트)의 리스트
+        """
+        max_items = min(max_items or self.max_items, self.max_items)
+        batches = []
+        batch = []
+        prompt = 0
+        completion = CHAT_REPLY_OVERHEAD_TOKENS
+        for item in items:
+            item_prompt, item_completion = self.item_tokens(len(batch) + 1, item)
+            if batch and (
+                len(batch) >= max_items
+                or prompt + item_prompt > self.prompt_budget
+                or completion + item_completion > self.completion_budget
+            ):
+                batches.append(batch)
+                batch = []
+                prompt = 0
+                completion = CHAT_REPLY_OVERHEAD_TOKENS
+                item_prompt, item_completion = self.item_tokens(1, item)
+            batch.append(item)
+            prompt += item_prompt
+            completion += item_completion
+        if batch:
+            batches.append(batch)
+        return batches
@@ -0,0 +1,179 @@
+import json
+import os
+
+# 저널에 이만큼 쌓이면 최종 JSON 파일로 합침
+JOURNAL_COMPACT_EVERY = 5000
+
+
+def _fsync_directory(path):
+    """파일 교체(rename)가 디스크에 반영되도록 디렉토리 fsync (지원하지 않는 OS는 건너뜀)"""
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class TranslationJournal:
+    """
+    배치 번역 결과를 줄 단위로 덧붙여 저장하는 체크포인트 저널
+
+    배치가 끝날 때마다 전체 번역 JSON을 다시 쓰지 않고 새 결과만 저널 파일 끝에 추가(fsync)하며,
+    compact_every개가 쌓이거나 작업이 끝나면 저널을 최종 JSON 파일로 합치고 비운다.
+    따라서 재시작 시에는 최종 JSON과 마지막 compaction 이후의 저널만 읽으면 된다.
+
+    kill -9 등으로 쓰기 도중 중단되어 저널 마지막 줄이 잘렸으면 그 줄만 버리고 이어서 쓴다.
+
+    Args:
+        output_file (str): 최종 번역 JSON 파일 경로 ([{"original", "korean"}, ...])
+        journal_file (str): 저널 파일 경로 (기본값: output_file + ".journal")
+        compact_every (int): 저널을 최종 JSON으로 합칠 항목 수
+    """
+
+    def __init__(self, output_file, journal_file=None, compact_every=JOURNAL_COMPACT_EVERY):
+        self.output_file = output_file
+        self.journal_file = journal_file or f"{output_file}.journal"
+        self.compact_every = compact_every
+        self.compactions = 0
+        self._translations = None
+        self._originals = set()
+        self._pending = 0
+
+    def _read_output(self):
+        if not os.path.exists(self.output_file):
+            return []
+        try:
+            with open(self.output_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"⚠️ 기존 번역 파일 로드 실패 ({self.output_file}) - {e}")
+            return []
+
+    def _repair_journal_tail(self):
+        """줄바꿈으로 끝나지 않은(쓰기 도중 중단된) 마지막 줄을 잘라냄"""
+        if not os.path.exists(self.journal_file):
+            return
+        with open(self.journal_file, "rb+") as f:
+            size = f.seek(0, os.SEEK_END)
+            if size == 0:
+                return
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+
+            # 마지막 줄바꿈 위치를 뒤에서부터 찾음
+            position = size
+            while position > 0:
+                start = max(0, position - 4096)
+                f.seek(start)
+                newline = f.read(position - start).rfind(b"\n")
+                if newline != -1:
+                    position = start + newline + 1
+                    break
+                position = start
+            f.truncate(position)
+            f.flush()
+            os.fsync(f.fileno())
+        print(f"⚠️ 저널의 잘린 마지막 줄 제거 ({size - position}바이트)")
+
+    def _read_journal(self):
+        self._repair_journal_tail()
+        if not os.path.exists(self.journal_file):
+            return []
+        translations = []
+        with open(self.journal_file, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    translations.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return translations
+
+    def _remember(self, item):
+        """처음 보는 원문이면 기억하고 True 반환"""
+        if not isinstance(item, dict) or "original" not in item:
+            return False
+        if item["original"] in self._originals:
+            return False
+        self._originals.add(item["original"])
+        self._translations.append(item)
+        return True
+
+    def load(self):
+        """
+        최종 JSON과 마지막 compaction 이후의 저널을 합쳐 반환 (처음 한 번만 파일을 읽음)
+
+        Returns:
+            list: 번역 항목 리스트 (같은 원문은 처음 기록된 것만 유지)
+        """
+        if self._translations is None:
+            self._translations = []
+            self._originals = set()
+            for item in self._read_output():
+                self._remember(item)
+            journal_items = self._read_journal()
+            for item in journal_items:
+                self._remember(item)
+            self._pending = len(journal_items)
+            if journal_items:
+                print(f"📋 저널에서 {len(journal_items)}개 번역 복구")
+        return self._translations
+
+    def translated_originals(self):
+        """이미 번역된 원문 집합 반환"""
+        self.load()
+        return set(self._originals)
+
+    def append(self, translations):
+        """
+        새 번역 결과를 저널 끝에 추가하고 디스크에 기록(fsync)
+
+        저널에 compact_every개 이상 쌓이면 최종 JSON 파일로 합친다.
+        """
+        self.load()
+        new_items = [item for item in translations if self._remember(item)]
+        if not new_items:
+            return
+        with open(self.journal_file, "a", encoding="utf-8") as f:
+            f.write(
+                "".join(
+                    json.dumps(item, ensure_ascii=False) + "\n" for item in new_items
+                )
+            )
+            f.flush()
+            os.fsync(f.fileno())
+
+        self._pending += len(new_items)
+        if self._pending >= self.compact_every:
+            self.compact()
+
+    def compact(self):
+        """
+        저널을 최종 JSON 파일로 합치고 저널 삭제
+
+        임시 파일에 쓰고 fsync한 뒤 교체하므로 도중에 중단되어도 기존 파일이 깨지지 않는다.
+        교체 후 저널을 지우기 전에 중단되면 다음 실행에서 중복 항목이 걸러진다.
+
+        Returns:
+            int: 최종 파일의 번역 항목 수
+        """
+        translations = self.load()
+        temp_file = f"{self.output_file}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(translations, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, self.output_file)
+        _fsync_directory(self.output_file)
+
+        if os.path.exists(self.journal_file):
+            os.remove(self.journal_file)
+            _fsync_directory(self.journal_file)
+        self._pending = 0
+        self.compactions += 1
+        return len(translations)
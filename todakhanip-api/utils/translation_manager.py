@@ -1,40 +1,117 @@
+import asyncio
 import json
 import os
 import datetime
-from openai import OpenAI
+import functools
+import threading
+import time
+from openai import OpenAI, AsyncOpenAI
 from dotenv import load_dotenv
+from pymongo import UpdateOne
+from utils.cache import TTLCache
+from utils.mongo_client import get_collection
+from utils.single_flight import SingleFlight, AsyncSingleFlight
+from utils.translation_store import (
+    TRANSLATION_FILES,
+    TRANSLATION_STORE_FILE,
+    INGREDIENT_DICTIONARY_FILES,
+    normalize_ingredient,
+    open_translation_store,
+    close_translation_store,
+    is_store_open,
+    lookup_translation,
+    lookup_ingredient,
+)
+from utils.token_budget import TranslationBatchPlanner
+from utils.metrics import CACHE_HIT, CACHE_MISS, count_stage_error, observe_stage
+from utils.bulkheads import MONGO_POOL, run_async
+from utils.translation_output import (
+    TRANSLATION_OUTPUT_INSTRUCTION,
+    TRANSLATION_RESPONSE_FORMAT,
+    format_numbered_items,
+    parse_translations,
+)
 
 # 환경 변수 로드
 load_dotenv()
 
 # OpenAI 클라이언트 초기화
 client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+async_client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"))
 
 # 환경 변수에서 설정 로드
-MONGODB_URI = os.getenv("MONGODB_URI", "mongodb://localhost:27017")
-DB_NAME = os.getenv("MONGODB_DB_NAME", "label-safe")
+# 이전 버전의 바코드별 번역 문서 컬렉션
+# (읽기 전용, 원료 사전으로 옮겨짐)
 COLLECTION_NAME = os.getenv("MONGODB_COLLECTION_NAME", "ingredients")
-
-# 번역 파일 경로 전역변수 (환경 변수에서 로드)
-TRANSLATION_FILES = {
-    "product": os.getenv(
-        "TRANSLATION_PRODUCT_FILE", "data/translated/product_translated.json"
-    ),
-    "food_groups": os.getenv(
-        "TRANSLATION_FOOD_GROUPS_FILE", "data/translated/food_groups_translated.json"
-    ),
-    "allergens": os.getenv(
-        "TRANSLATION_ALLERGENS_FILE", "data/translated/allergens_translated.json"
-    ),
-}
+INGREDIENT_COLLECTION_NAME = os.getenv(
+    "MONGODB_INGREDIENT_DICTIONARY_COLLECTION_NAME", "ingredient_dictionary"
+)
+
+# 태그 번역 결과를 메모이즈할 항목 수
+TAG_CACHE_SIZE = 8192
+# 기존 번역 문서를 조회했다고 기억할 바코드 수와 시간
+LEGACY_CHECKED_CACHE_SIZE = 10000
+LEGACY_CHECKED_TTL_SECONDS = 86400
+# 번역하지 못한 원료(LLM이 빠뜨렸거나 응답이 버려짐)를
+# 다시 요청하지 않을 원료 수와 시간
+UNTRANSLATED_CACHE_SIZE = 10000
+UNTRANSLATED_TTL_SECONDS = 86400
+
+# 원료 번역 요청 설정
+INGREDIENT_TRANSLATION_MODEL = "gpt-4o-mini"  # 비용 효율적인 모델 사용
+INGREDIENT_TRANSLATION_MAX_TOKENS = 4000
+INGREDIENT_TRANSLATION_SYSTEM_PROMPT = (
+    "당신은 전문 번역가입니다. "
+    "주어진 식품 원료 목록을 한국어로 정확하게 번역해주세요. "
+    + TRANSLATION_OUTPUT_INSTRUCTION
+)
+INGREDIENT_TRANSLATION_USER_PROMPT = (
+    "다음 식품 원료들을 한국어로 번역해주세요:\n\n{items}"
+)
+
+# 원료가 많거나 긴 제품은 응답이 max_tokens에서 잘리지 않도록
+# 여러 요청으로 나눔
+_ingredient_planner = TranslationBatchPlanner(
+    INGREDIENT_TRANSLATION_MODEL,
+    INGREDIENT_TRANSLATION_SYSTEM_PROMPT,
+    INGREDIENT_TRANSLATION_USER_PROMPT,
+    INGREDIENT_TRANSLATION_MAX_TOKENS,
+)
 
 # 번역 데이터를 메모리에 로드
 _translation_cache = {}
 
+# 원료 사전 {정규화된 원료명: 한국어 번역}
+_ingredient_dictionary = {}
+_ingredient_dictionary_lock = threading.Lock()
+_ingredient_stats_lock = threading.Lock()
+_ingredient_stats = {"hits": 0, "misses": 0, "llm_calls": 0, "llm_ingredients": 0}
+# 기존 번역 문서를 이미 조회한 바코드
+# (찾은 번역은 원료 사전에 합쳐져 있음)
+_legacy_checked = TTLCache(LEGACY_CHECKED_CACHE_SIZE, LEGACY_CHECKED_TTL_SECONDS)
+# LLM에 요청했지만 번역을 얻지 못한 원료 (정규화된 원료명)
+_untranslated = TTLCache(UNTRANSLATED_CACHE_SIZE, UNTRANSLATED_TTL_SECONDS)
+
+# 같은 바코드의 동시 번역 요청을 OpenAI 호출 하나로 합침
+_translation_flight = SingleFlight()
+_async_translation_flight = AsyncSingleFlight()
+
 
 def load_translation_data():
-    """번역 데이터를 메모리에 로드하는 함수"""
+    """
+    번역 데이터를 로드하는 함수
+
+    컴파일된 번역 저장소가 있으면 그것을 열고
+    (파싱 없음, 워커 간 페이지 공유), 없으면 JSON 번역 파일을
+    메모리에 로드한다.
+    """
     global _translation_cache
+    if is_store_open():
+        return
+    _clear_tag_cache()
+    if open_translation_store(TRANSLATION_STORE_FILE):
+        print(f"✅ 번역 저장소 사용: {TRANSLATION_STORE_FILE}")
+        return
     if not _translation_cache:
         try:
             # 각 번역 파일 로드
@@ -57,32 +134,79 @@ def load_translation_data():
 def translate_text(text, translation_type):
     """텍스트를 한글로 번역하는 함수"""
     global _translation_cache
+    if is_store_open():
+        translated = lookup_translation(translation_type, text)
+        return text if translated is None else translated
     if translation_type in _translation_cache:
         return _translation_cache[translation_type].get(text, text)
     return text
 
 
+@functools.lru_cache(maxsize=TAG_CACHE_SIZE)
+def _translate_tag(tag, translation_type):
+    """
+    태그 하나를 번역 (결과는 메모이즈)
+
+    "en:milk"처럼 언어 접두사가 있으면 첫 ":" 뒤의 값 전체를 번역하고,
+    번역이 없으면 접두사를 뗀 값을 그대로 사용한다.
+    ":"가 없는 태그는 그대로 둔다.
+    """
+    prefix, separator, original_text = tag.partition(":")
+    if not separator:
+        return tag
+    return translate_text(original_text, translation_type)
+
+
+@functools.lru_cache(maxsize=TAG_CACHE_SIZE)
+def _translate_tag_tuple(tags, translation_type):
+    """태그 튜플 전체를 번역 (반복되는 태그 조합을 통째로 메모이즈)"""
+    return tuple(_translate_tag(tag, translation_type) for tag in tags)
+
+
 def translate_tags(tags, translation_type):
-    """태그 배열을 한글로 번역하는 함수"""
+    """태그 배열을 한글로 번역하는 함수 (문자열이 아닌 태그는 제외)"""
     if not tags:
         return []
+    tags = tuple(tag for tag in tags if isinstance(tag, str))
+    return list(_translate_tag_tuple(tags, translation_type))
+
+
+def translate_tags_batch(tag_lists, translation_type):
+    """
+    여러 태그 배열을 한 번에 번역하는 함수
 
-    translated_tags = []
-    for tag in tags:
-        if ":" in tag:
-            # ":" 분리하여 [1] 값 사용
-            parts = tag.split(":")
-            if len(parts) > 1:
-                original_text = parts[1]
-                translated_text = translate_text(original_text, translation_type)
-                translated_tags.append(translated_text)
-            else:
-                translated_tags.append(tag)
-        else:
-            # ":" 없는 경우 그대로 사용
-            translated_tags.append(tag)
+    OFF 검색 결과 한 페이지나 종합 분석 요청의 전체 제품처럼
+    여러 제품의 태그를 번역할 때 중복 태그는 한 번만 번역한다.
 
-    return translated_tags
+    Args:
+        tag_lists (list): 태그 배열의 리스트
+        translation_type (str): 번역 타입 (allergens, food_groups 등)
+
+    Returns:
+        list: 입력 순서대로 번역된 태그 배열의 리스트
+            (문자열이 아닌 태그는 제외)
+    """
+    translated = {}
+    results = []
+    for tags in tag_lists:
+        if not tags:
+            results.append([])
+            continue
+        translated_tags = []
+        for tag in tags:
+            if not isinstance(tag, str):
+                continue
+            korean = translated.get(tag)
+            if korean is None:
+                korean = translated[tag] = _translate_tag(tag, translation_type)
+            translated_tags.append(korean)
+        results.append(translated_tags)
+    return results
+
+
+def _clear_tag_cache():
+    _translate_tag.cache_clear()
+    _translate_tag_tuple.cache_clear()
 
 
 def get_translation_cache():
@@ -94,121 +218,411 @@ def clear_translation_cache():
     """번역 캐시 초기화 함수"""
     global _translation_cache
     _translation_cache = {}
+    close_translation_store()
+    _clear_tag_cache()
     print("🗑️ 번역 캐시 초기화 완료")
 
 
-def translate_ingredients_batch(barcode, ingredients_string):
+def _split_ingredients(ingredients_string):
+    """쉼표로 구분된 문자열을 원료 리스트로 변환"""
+    return [item.strip() for item in ingredients_string.split(",") if item.strip()]
+
+
+def _build_translation_request(ingredients_list):
+    """원료 번역용 chat completion 요청 인자 생성"""
+    return {
+        "model": INGREDIENT_TRANSLATION_MODEL,
+        "messages": [
+            {"role": "system", "content": INGREDIENT_TRANSLATION_SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": INGREDIENT_TRANSLATION_USER_PROMPT.format(
+                    items=format_numbered_items(ingredients_list)
+                ),
+            },
+        ],
+        "response_format": TRANSLATION_RESPONSE_FORMAT,
+        "temperature": 0.1,
+        "max_tokens": INGREDIENT_TRANSLATION_MAX_TOKENS,
+    }
+
+
+def _parse_translation_content(barcode, content, ingredients_list):
+    """
+    LLM 응답에서 {원본: 번역} 딕셔너리를 추출
+
+    응답이 잘렸으면 완성된 항목만 반환하며,
+    빠진 원료는 다음 요청에서 다시 번역된다.
+    """
+    translated_data, complete = parse_translations(content, ingredients_list)
+    if not complete:
+        print(
+            f"⚠️ 바코드 {barcode}: 잘린 응답에서 "
+            f"{len(translated_data)}/{len(ingredients_list)}개 원료만 복구"
+        )
+    return {item["original"]: item["korean"] for item in translated_data}
+
+
+def _request_translations(barcode, ingredients_list):
+    """원료 목록 하나를 LLM으로 번역해 {원본: 번역} 반환"""
+    _count_llm_call(len(ingredients_list))
+    response = client.chat.completions.create(
+        **_build_translation_request(ingredients_list)
+    )
+
+    # 응답에서 JSON 추출
+    content = response.choices[0].message.content
+    if content is None:
+        print(f"❌ 바코드 {barcode}: 빈 응답 받음")
+        return {}
+    return _parse_translation_content(barcode, content, ingredients_list)
+
+
+async def _request_translations_async(barcode, ingredients_list):
+    """_request_translations의 비동기 버전"""
+    _count_llm_call(len(ingredients_list))
+    response = await async_client.chat.completions.create(
+        **_build_translation_request(ingredients_list)
+    )
+    content = response.choices[0].message.content
+    if content is None:
+        print(f"❌ 바코드 {barcode}: 빈 응답 받음")
+        return {}
+    return _parse_translation_content(barcode, content, ingredients_list)
+
+
+def _remember_translations(translations):
+    """
+    {원본: 번역} 항목을 메모리 원료 사전에 추가
+
+    Returns:
+        list: 새로 추가된 (정규화 키, 원본, 번역) 목록
+    """
+    learned = []
+    with _ingredient_dictionary_lock:
+        for original, korean in translations.items():
+            if not original or not korean:
+                continue
+            key = normalize_ingredient(original)
+            if key and key not in _ingredient_dictionary:
+                _ingredient_dictionary[key] = korean
+                learned.append((key, original, korean))
+    return learned
+
+
+def _lookup_ingredients(ingredients_list):
+    """
+    원료 사전에서 번역을 찾음
+
+    Returns:
+        tuple: ({원본: 번역}, 사전에 없는 원료 목록)
+    """
+    translations = {}
+    missing = []
+    for ingredient in ingredients_list:
+        key = normalize_ingredient(ingredient)
+        korean = _ingredient_dictionary.get(key)
+        if korean is None:
+            korean = lookup_ingredient(key)
+        if korean is not None:
+            translations[ingredient] = korean
+        elif ingredient not in missing:
+            missing.append(ingredient)
+    with _ingredient_stats_lock:
+        _ingredient_stats["hits"] += len(translations)
+        _ingredient_stats["misses"] += len(missing)
+    return translations, missing
+
+
+def _skip_untranslated(missing):
+    """최근에 LLM으로 번역하지 못한 원료를 빼고 번역할 원료 목록 반환"""
+    return [
+        ingredient
+        for ingredient in missing
+        if not _untranslated.peek(normalize_ingredient(ingredient), False)
+    ]
+
+
+def _remember_untranslated(requested):
+    """
+    LLM에 요청했지만 원료 사전에 들어가지 않은 원료를 기억
+
+    UNTRANSLATED_TTL_SECONDS 동안은 같은 원료를 다시 요청하지 않는다.
+    """
+    with _ingredient_dictionary_lock:
+        keys = [
+            key
+            for key in map(normalize_ingredient, requested)
+            if key not in _ingredient_dictionary
+        ]
+    for key in keys:
+        _untranslated.set(key, True)
+    return len(keys)
+
+
+def _count_llm_call(ingredients_count):
+    with _ingredient_stats_lock:
+        _ingredient_stats["llm_calls"] += 1
+        _ingredient_stats["llm_ingredients"] += ingredients_count
+
+
+def load_ingredient_dictionary():
+    """
+    원료 사전을 메모리에 로드하는 함수
+
+    data/translated의 번역 파일(없는 파일은 건너뜀)과
+    MongoDB 원료 사전 컬렉션을 합친다. 번역 저장소를 사용 중이면
+    번역 파일 항목은 저장소에서 바로 조회하므로 로드하지 않는다.
+    """
+    dictionary_files = [] if is_store_open() else INGREDIENT_DICTIONARY_FILES
+    for file_path in dictionary_files:
+        if not os.path.exists(file_path):
+            continue
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                items = json.load(f)
+            _remember_translations(
+                {
+                    item["original"]: item["korean"]
+                    for item in items
+                    if "original" in item and "korean" in item
+                }
+            )
+        except Exception as e:
+            print(f"⚠️ 원료 사전 파일 로드 오류 ({file_path}): {e}")
+
+    try:
+        collection = get_collection(INGREDIENT_COLLECTION_NAME)
+        persisted = {
+            doc["original"]: doc["korean"]
+            for doc in collection.find({}, {"original": 1, "korean": 1})
+        }
+        _remember_translations(persisted)
+    except Exception as e:
+        print(f"⚠️ MongoDB 원료 사전 로드 오류: {e}")
+
+    print(f"✅ 원료 사전 로드 완료: {len(_ingredient_dictionary)}개")
+
+
+def load_legacy_translations(barcode):
+    """이전 버전의 바코드별 번역 문서 조회 (없거나 오류 시 빈 딕셔너리)"""
+    try:
+        doc = get_collection(COLLECTION_NAME).find_one({"_id": barcode})
+    except Exception as e:
+        print(f"⚠️ 바코드 {barcode}: 기존 번역 문서 조회 오류 - {e}")
+        return {}
+    _legacy_checked.set(barcode, True)
+    return doc.get("translations", {}) if doc else {}
+
+
+def legacy_translations_checked(barcode):
+    """최근에 기존 번역 문서를 조회한 바코드인지 확인"""
+    return _legacy_checked.peek(barcode, False)
+
+
+def _pending_legacy_translations(barcode, load_legacy=None):
+    """
+    아직 원료 사전에 합치지 않은 기존 번역 문서 반환
+
+    미리 시작해 둔 조회(load_legacy)가 없고 최근에 이미 조회한 바코드면
+    찾은 번역이 사전에 합쳐져 있으므로 MongoDB를 다시 조회하지 않는다.
+    """
+    if load_legacy:
+        return load_legacy()
+    if legacy_translations_checked(barcode):
+        return {}
+    return load_legacy_translations(barcode)
+
+
+def _save_dictionary_entries(learned):
+    """
+    새로 배운 원료 번역을 MongoDB 원료 사전에 저장
+
+    여러 요청이 같은 원료를 동시에 저장해도
+    중복 키 오류가 나지 않도록 upsert한다.
+    """
+    if not learned:
+        return
+    now = datetime.datetime.now()
+    get_collection(INGREDIENT_COLLECTION_NAME).bulk_write(
+        [
+            UpdateOne(
+                {"_id": key},
+                {
+                    "$setOnInsert": {
+                        "original": original,
+                        "korean": korean,
+                        "created_at": now,
+                    }
+                },
+                upsert=True,
+            )
+            for key, original, korean in learned
+        ],
+        ordered=False,
+    )
+
+
+def _save_dictionary_entries_safely(barcode, learned):
+    """원료 사전 저장 (실패해도 메모리 사전과 번역 결과는 유지)"""
+    try:
+        _save_dictionary_entries(learned)
+    except Exception as e:
+        print(f"⚠️ 바코드 {barcode}: 원료 사전 저장 오류 - {e}")
+
+
+def translate_ingredients_batch(barcode, ingredients_string, load_legacy=None):
     """
     바코드와 쉼표로 구분된 원료 문자열을 받아 번역하는 함수
 
+    사전에 없는 원료만 LLM으로 번역 (같은 바코드 동시 요청은 한 번만)
+
     Args:
         barcode (str): 바코드 값
         ingredients_string (str): 쉼표로 구분된 원료 문자열
+        load_legacy (callable): 기존 번역 문서를 반환하는 인자 없는 함수
+            (미리 시작해 둔 조회 결과를 쓸 때 전달,
+            기본값: 필요할 때 MongoDB에서 조회)
 
     Returns:
         dict: {원본: 번역} 형태의 딕셔너리
     """
-    try:
-        # MongoDB 연결
-        from pymongo import MongoClient
-
-        client_mongo = MongoClient(MONGODB_URI)
-        db = client_mongo[DB_NAME]
-        collection = db[COLLECTION_NAME]
-
-        # 1. MongoDB에서 기존 번역 데이터 확인
-        existing_data = collection.find_one({"_id": barcode})
-        if existing_data:
-            print(f"✅ 바코드 {barcode}의 기존 번역 데이터 사용")
-            return existing_data.get("translations", {})
+    return _translation_flight.do(
+        barcode, _translate_ingredients_batch, barcode, ingredients_string, load_legacy
+    )
 
-        # 2. 기존 데이터가 없으면 번역 수행
-        print(f"🔄 바코드 {barcode}의 원료 번역 시작")
 
+def _translate_ingredients_batch(barcode, ingredients_string, load_legacy=None):
+    """translate_ingredients_batch의 실제 처리 (single-flight 안에서 실행)"""
+    start = time.perf_counter()
+    try:
         # 쉼표로 구분된 문자열을 리스트로 변환
-        ingredients_list = [
-            item.strip() for item in ingredients_string.split(",") if item.strip()
-        ]
-
+        ingredients_list = _split_ingredients(ingredients_string)
         if not ingredients_list:
             print(f"⚠️ 바코드 {barcode}: 번역할 원료가 없습니다.")
             return {}
 
-        # OpenAI API로 번역 요청
-        ingredients_text = ",".join(ingredients_list)
+        # 1. 원료 사전에서 번역 조회
+        translations, missing = _lookup_ingredients(ingredients_list)
+        if missing:
+            # 이전 버전의 바코드별 번역 문서가 있으면 사전으로 옮김
+            legacy = _pending_legacy_translations(barcode, load_legacy)
+            learned = _remember_translations(legacy)
+            if learned:
+                _save_dictionary_entries_safely(barcode, learned)
+                translations, missing = _lookup_ingredients(ingredients_list)
+            missing = _skip_untranslated(missing)
+
+        if not missing:
+            print(f"✅ 바코드 {barcode}: 원료 사전으로 번역 완료")
+            observe_stage(
+                "ingredient_translation", time.perf_counter() - start, CACHE_HIT
+            )
+            return translations
+
+        # 2. 사전에 없는 원료만 번역
+        print(f"🔄 바코드 {barcode}: 사전에 없는 원료 {len(missing)}개 번역 시작")
+        new_translations = {}
+        for chunk in _ingredient_planner.plan(missing):
+            new_translations.update(_request_translations(barcode, chunk))
+
+        # 3. 원료 사전에 추가하고 MongoDB에 저장
+        learned = _remember_translations(new_translations)
+        _save_dictionary_entries_safely(barcode, learned)
+        untranslated = _remember_untranslated(missing)
+        translations, _ = _lookup_ingredients(ingredients_list)
+        print(f"✅ 바코드 {barcode}: {len(learned)}개 원료 번역 완료 및 사전 저장")
+        if untranslated:
+            print(f"⚠️ 바코드 {barcode}: 번역하지 못한 원료 {untranslated}개")
+        observe_stage("ingredient_translation", time.perf_counter() - start, CACHE_MISS)
+        return translations
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",  # 비용 효율적인 모델 사용
-            messages=[
-                {
-                    "role": "system",
-                    "content": "당신은 전문 번역가입니다. 주어진 식품 원료 목록을 한국어로 정확하게 번역해주세요. 각 항목을 'original: 원본텍스트, korean: 한국어번역' 형식으로 JSON 배열로 반환해주세요.",
-                },
-                {
-                    "role": "user",
-                    "content": f"다음 식품 원료들을 한국어로 번역해주세요:\n\n{ingredients_text}",
-                },
-            ],
-            temperature=0.1,
-            max_tokens=4000,
-        )
+    except Exception as e:
+        print(f"❌ 바코드 {barcode}: 전체 처리 오류 - {e}")
+        count_stage_error("ingredient_translation")
+        return {}
 
-        # 응답에서 JSON 추출
-        content = response.choices[0].message.content
-        if content is None:
-            print(f"❌ 바코드 {barcode}: 빈 응답 받음")
-            return {}
 
-        content = content.strip()
+async def translate_ingredients_batch_async(barcode, ingredients_string):
+    """
+    translate_ingredients_batch의 비동기 버전
 
-        # JSON 파싱
-        try:
-            # JSON 부분만 추출
-            if "```json" in content:
-                json_start = content.find("```json") + 7
-                json_end = content.find("```", json_start)
-                json_content = content[json_start:json_end].strip()
-            elif "```" in content:
-                json_start = content.find("```") + 3
-                json_end = content.find("```", json_start)
-                json_content = content[json_start:json_end].strip()
-            else:
-                json_content = content
-
-            translated_data = json.loads(json_content)
-
-            # 딕셔너리 형태로 변환
-            translations_dict = {}
-            for item in translated_data:
-                if "original" in item and "korean" in item:
-                    translations_dict[item["original"]] = item["korean"]
-
-            # 3. MongoDB에 번역 결과 저장
-            collection.insert_one(
-                {
-                    "_id": barcode,
-                    "translations": translations_dict,
-                    "ingredients_count": len(ingredients_list),
-                    "created_at": datetime.datetime.now(),
-                }
-            )
+    MongoDB 조회/저장은 공유 커넥션 풀을 쓰는 워커 스레드에서,
+    번역은 AsyncOpenAI로 수행한다.
+    """
+    return await _async_translation_flight.do(
+        barcode, _translate_ingredients_batch_async, barcode, ingredients_string
+    )
 
-            print(
-                f"✅ 바코드 {barcode}: {len(translations_dict)}개 원료 번역 완료 및 저장"
-            )
-            return translations_dict
 
-        except json.JSONDecodeError as e:
-            print(f"❌ 바코드 {barcode}: JSON 파싱 오류 - {e}")
-            return {}
-        except Exception as e:
-            print(f"❌ 바코드 {barcode}: 번역 오류 - {e}")
+async def _translate_ingredients_batch_async(barcode, ingredients_string):
+    """translate_ingredients_batch_async의 실제 처리 (single-flight 안에서 실행)"""
+    start = time.perf_counter()
+    try:
+        ingredients_list = _split_ingredients(ingredients_string)
+        if not ingredients_list:
+            print(f"⚠️ 바코드 {barcode}: 번역할 원료가 없습니다.")
             return {}
 
+        # 1. 원료 사전에서 번역 조회
+        translations, missing = _lookup_ingredients(ingredients_list)
+        if missing:
+            legacy = await run_async(MONGO_POOL, _pending_legacy_translations, barcode)
+            learned = _remember_translations(legacy)
+            if learned:
+                await run_async(
+                    MONGO_POOL, _save_dictionary_entries_safely, barcode, learned
+                )
+                translations, missing = _lookup_ingredients(ingredients_list)
+            missing = _skip_untranslated(missing)
+
+        if not missing:
+            observe_stage(
+                "ingredient_translation", time.perf_counter() - start, CACHE_HIT
+            )
+            return translations
+
+        # 2. 사전에 없는 원료만 번역
+        new_translations = {}
+        for chunk_translations in await asyncio.gather(
+            *(
+                _request_translations_async(barcode, chunk)
+                for chunk in _ingredient_planner.plan(missing)
+            )
+        ):
+            new_translations.update(chunk_translations)
+
+        # 3. 원료 사전에 추가하고 MongoDB에 저장
+        learned = _remember_translations(new_translations)
+        await run_async(MONGO_POOL, _save_dictionary_entries_safely, barcode, learned)
+        _remember_untranslated(missing)
+        translations, _ = _lookup_ingredients(ingredients_list)
+        observe_stage("ingredient_translation", time.perf_counter() - start, CACHE_MISS)
+        return translations
+
     except Exception as e:
         print(f"❌ 바코드 {barcode}: 전체 처리 오류 - {e}")
+        count_stage_error("ingredient_translation")
         return {}
-    finally:
-        # MongoDB 연결 종료
-        if "client_mongo" in locals():
-            client_mongo.close()
+
+
+def get_ingredient_dictionary_stats():
+    """원료 사전 크기와 적중/LLM 호출 통계 반환"""
+    with _ingredient_stats_lock:
+        stats = dict(_ingredient_stats)
+    total = stats["hits"] + stats["misses"]
+    stats["size"] = len(_ingredient_dictionary)
+    stats["untranslated"] = len(_untranslated)
+    stats["hit_ratio"] = round(stats["hits"] / total, 4) if total else 0.0
+    return stats
+
+
+def clear_ingredient_dictionary():
+    """메모리 원료 사전과 통계 초기화"""
+    with _ingredient_dictionary_lock:
+        _ingredient_dictionary.clear()
+    _legacy_checked.clear()
+    _untranslated.clear()
+    with _ingredient_stats_lock:
+        for key in _ingredient_stats:
+            _ingredient_stats[key] = 0
@@ -0,0 +1,142 @@
+import json
+import re
+
+# 번역 응답 JSON 스키마 (structured outputs)
+# 원문을 다시 쓰지 않도록 입력 번호(i)와 번역(k)만 받는다.
+TRANSLATION_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "translations",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "t": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "i": {"type": "integer"},
+                            "k": {"type": "string"},
+                        },
+                        "required": ["i", "k"],
+                        "additionalProperties": False,
+                    },
+                }
+            },
+            "required": ["t"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# 시스템 프롬프트 끝에 붙이는 응답 형식 설명
+TRANSLATION_OUTPUT_INSTRUCTION = (
+    '각 항목의 번호를 i, 한국어 번역을 k로 하여 {"t": [{"i": 번호, "k": "번역"}]} '
+    "형식의 JSON으로 반환해주세요."
+)
+
+_NUMBERED_LINE = re.compile(r"^(\d+)\. (.*)$")
+
+
+def format_numbered_items(items):
+    """번역할 항목을 "1. 항목" 형식의 줄 목록으로 변환"""
+    return "\n".join(f"{index}. {item}" for index, item in enumerate(items, 1))
+
+
+def parse_numbered_items(text):
+    """format_numbered_items로 만든 문자열에서 항목 리스트를 복원"""
+    items = []
+    for line in text.splitlines():
+        match = _NUMBERED_LINE.match(line)
+        if match:
+            items.append(match.group(2))
+    return items
+
+
+class IncrementalArrayParser:
+    """
+    LLM 응답에서 JSON 배열의 원소를 완성되는 대로 꺼내는 파서
+
+    스트리밍 응답은 조각을 받을 때마다 feed로 넘기면 되고, max_tokens에서 잘린 응답도
+    끝까지 완성된 원소는 살린다. 배열 앞의 ```json 펜스나 {"t": 같은 접두부는 건너뛴다.
+    """
+
+    def __init__(self):
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._position = None
+        self.finished = False
+
+    def feed(self, text):
+        """
+        응답 조각을 추가하고 새로 완성된 배열 원소 리스트를 반환
+
+        Returns:
+            list: 이번 조각으로 완성된 원소들
+        """
+        self._buffer += text
+        elements = []
+        if self.finished:
+            return elements
+        if self._position is None:
+            start = self._buffer.find("[")
+            if start == -1:
+                return elements
+            self._position = start + 1
+
+        buffer = self._buffer
+        while True:
+            position = self._position
+            while position < len(buffer) and buffer[position] in " \t\r\n,":
+                position += 1
+            if position >= len(buffer):
+                break
+            if buffer[position] == "]":
+                self.finished = True
+                break
+            try:
+                element, end = self._decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                # 아직 도착하지 않았거나 잘린 원소
+                break
+            elements.append(element)
+            self._position = end
+        return elements
+
+
+def translations_from_elements(elements, items=None):
+    """
+    응답 배열 원소를 [{"original", "korean"}, ...]로 변환
+
+    {"i", "k"} 원소는 items의 번호로 원문을 찾고, 이전 형식의 {"original", "korean"} 원소는 그대로 쓴다.
+    """
+    translations = []
+    for element in elements:
+        if not isinstance(element, dict):
+            continue
+        if "i" in element and "k" in element and items is not None:
+            index = element["i"]
+            if isinstance(index, int) and 1 <= index <= len(items):
+                translations.append({"original": items[index - 1], "korean": element["k"]})
+        elif "original" in element and "korean" in element:
+            translations.append(
+                {"original": element["original"], "korean": element["korean"]}
+            )
+    return translations
+
+
+def parse_translations(content, items=None):
+    """
+    번역 응답 전체를 파싱하는 함수 (잘린 응답에서도 완성된 항목은 살림)
+
+    Args:
+        content (str): LLM 응답 텍스트
+        items (list): 요청에 번호를 붙여 보낸 원문 리스트
+
+    Returns:
+        tuple: (번역 항목 리스트, 응답 배열이 끝까지 완성되었는지 여부)
+    """
+    parser = IncrementalArrayParser()
+    elements = parser.feed(content or "")
+    return translations_from_elements(elements, items), parser.finished
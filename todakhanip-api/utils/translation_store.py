@@ -0,0 +1,229 @@
+import datetime
+import functools
+import json
+import os
+import sqlite3
+import threading
+from dotenv import load_dotenv
+
+# 환경 변수 로드
+load_dotenv()
+
+# 번역 파일 경로 전역변수 (환경 변수에서 로드)
+TRANSLATION_FILES = {
+    "product": os.getenv(
+        "TRANSLATION_PRODUCT_FILE", "data/translated/product_translated.json"
+    ),
+    "food_groups": os.getenv(
+        "TRANSLATION_FOOD_GROUPS_FILE", "data/translated/food_groups_translated.json"
+    ),
+    "allergens": os.getenv(
+        "TRANSLATION_ALLERGENS_FILE", "data/translated/allergens_translated.json"
+    ),
+}
+
+# 원료 사전을 미리 채울 번역 파일 (없는 파일은 건너뜀)
+INGREDIENT_DICTIONARY_FILES = [
+    os.getenv(
+        "TRANSLATION_INGREDIENTS_FILE", "data/translated/ingredients_translated.json"
+    ),
+    TRANSLATION_FILES["allergens"],
+]
+
+# scripts/build_translation_store.py로 컴파일한 읽기 전용 번역 저장소
+# 파일이 있으면 JSON 대신 사용하여 워커마다 JSON을 파싱하지 않음
+TRANSLATION_STORE_FILE = os.getenv(
+    "TRANSLATION_STORE_FILE", "data/translated/translations.sqlite"
+)
+
+# 조회 시 메모리 매핑할 최대 크기 (파일 전체가 들어가도록 넉넉하게)
+STORE_MMAP_SIZE = 64 * 1024 * 1024
+# 워커별로 기억해 둘 최근 조회 결과 수
+STORE_LOOKUP_CACHE_SIZE = 4096
+
+# 열려 있는 번역 저장소 경로 (None이면 사용하지 않음)
+_store_path = None
+_local = threading.local()
+
+
+def normalize_ingredient(text):
+    """원료 사전 키로 쓰기 위해 대소문자, 공백, 하이픈 표기 차이를 없앰"""
+    return " ".join(text.replace("-", " ").replace("_", " ").split()).casefold()
+
+
+def _load_json_items(file_path):
+    with open(file_path, "r", encoding="utf-8") as f:
+        return [
+            (item["original"], item["korean"])
+            for item in json.load(f)
+            if "original" in item and "korean" in item
+        ]
+
+
+def build_translation_store(output_path, translation_files, ingredient_files):
+    """
+    data/translated/*.json 번역 파일을 읽기 전용 sqlite 저장소로 컴파일하는 함수
+
+    임시 파일에 만든 뒤 교체하므로, 실행 중인 워커는 기존 파일을 계속 읽을 수 있다.
+
+    Args:
+        output_path (str): 생성할 sqlite 파일 경로
+        translation_files (dict): {번역 타입: JSON 파일 경로}
+        ingredient_files (list): 원료 사전에 넣을 JSON 파일 경로 (없는 파일은 건너뜀)
+
+    Returns:
+        dict: {번역 타입 또는 "ingredient_dictionary": 저장된 항목 수}
+    """
+    temp_path = f"{output_path}.tmp"
+    if os.path.exists(temp_path):
+        os.remove(temp_path)
+
+    counts = {}
+    conn = sqlite3.connect(temp_path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE translations (
+                type TEXT NOT NULL,
+                original TEXT NOT NULL,
+                korean TEXT NOT NULL,
+                PRIMARY KEY (type, original)
+            ) WITHOUT ROWID;
+            CREATE TABLE ingredient_dictionary (
+                key TEXT PRIMARY KEY,
+                korean TEXT NOT NULL
+            ) WITHOUT ROWID;
+            CREATE TABLE meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            ) WITHOUT ROWID;
+            """
+        )
+
+        for translation_type, file_path in translation_files.items():
+            items = _load_json_items(file_path)
+            conn.executemany(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?)",
+                [(translation_type, original, korean) for original, korean in items],
+            )
+            counts[translation_type] = len(items)
+
+        dictionary = {}
+        for file_path in ingredient_files:
+            if not os.path.exists(file_path):
+                continue
+            for original, korean in _load_json_items(file_path):
+                key = normalize_ingredient(original)
+                if key and korean:
+                    dictionary.setdefault(key, korean)
+        conn.executemany(
+            "INSERT INTO ingredient_dictionary VALUES (?, ?)", dictionary.items()
+        )
+        counts["ingredient_dictionary"] = len(dictionary)
+
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("built_at", datetime.datetime.now().isoformat()),
+                ("counts", json.dumps(counts)),
+            ],
+        )
+        conn.commit()
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+    os.replace(temp_path, output_path)
+    return counts
+
+
+def open_translation_store(path):
+    """
+    번역 저장소를 사용하도록 설정하는 함수
+
+    Returns:
+        bool: 저장소 파일이 있어 사용하게 되었는지 여부
+    """
+    global _store_path
+    close_translation_store()
+    if not path or not os.path.exists(path):
+        return False
+    _store_path = path
+    return True
+
+
+def close_translation_store():
+    """번역 저장소 사용 해제 및 조회 캐시 초기화"""
+    global _store_path
+    _store_path = None
+    lookup_translation.cache_clear()
+    lookup_ingredient.cache_clear()
+
+
+def is_store_open():
+    return _store_path is not None
+
+
+def _connection():
+    """
+    스레드별 읽기 전용 연결을 반환
+
+    파일은 immutable로 열어 잠금 없이 읽고, 페이지는 mmap으로 공유되어
+    여러 워커가 같은 파일을 읽어도 OS 페이지 캐시 하나만 사용한다.
+    fork 이후에는 부모의 연결을 쓰지 않고 새로 연다.
+    """
+    conn = getattr(_local, "conn", None)
+    if (
+        conn is not None
+        and _local.pid == os.getpid()
+        and _local.path == _store_path
+    ):
+        return conn
+
+    conn = sqlite3.connect(
+        f"file:{_store_path}?mode=ro&immutable=1", uri=True, check_same_thread=False
+    )
+    conn.execute(f"PRAGMA mmap_size={STORE_MMAP_SIZE}")
+    _local.conn, _local.pid, _local.path = conn, os.getpid(), _store_path
+    return conn
+
+
+@functools.lru_cache(maxsize=STORE_LOOKUP_CACHE_SIZE)
+def lookup_translation(translation_type, original):
+    """번역 타입과 원문으로 한국어 번역 조회 (없으면 None)"""
+    if _store_path is None:
+        return None
+    row = (
+        _connection()
+        .execute(
+            "SELECT korean FROM translations WHERE type = ? AND original = ?",
+            (translation_type, original),
+        )
+        .fetchone()
+    )
+    return row[0] if row else None
+
+
+@functools.lru_cache(maxsize=STORE_LOOKUP_CACHE_SIZE)
+def lookup_ingredient(key):
+    """정규화된 원료명으로 원료 사전 조회 (없으면 None)"""
+    if _store_path is None:
+        return None
+    row = (
+        _connection()
+        .execute("SELECT korean FROM ingredient_dictionary WHERE key = ?", (key,))
+        .fetchone()
+    )
+    return row[0] if row else None
+
+
+def get_store_counts():
+    """저장소에 기록된 항목 수 반환"""
+    if _store_path is None:
+        return {}
+    row = (
+        _connection()
+        .execute("SELECT value FROM meta WHERE key = 'counts'")
+        .fetchone()
+    )
+    return json.loads(row[0]) if row else {}